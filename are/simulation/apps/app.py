@@ -8,6 +8,7 @@
 import inspect
 import logging
 import random
+import threading
 from abc import ABC
 from enum import Enum, auto
 from typing import Any, Callable
@@ -40,7 +41,8 @@ class App(ABC, SkippableDeepCopy):
     # That is because after apps are registered, it holds on to a reference to the environment
     # Which itself contains non serializable fields like a threading.lock instance.
     # add_event seems to be legacy, but leaving it here to not break existing apps.
-    _skip_deepcopy_fields = ["add_event", "add_event_callbacks"]
+    # The stop event of the environment holds a lock as well.
+    _skip_deepcopy_fields = ["add_event", "add_event_callbacks", "stop_event"]
     _skip_pickle_fields = _skip_deepcopy_fields
 
     def __init__(self, name: str | None = None, *args, **kwargs):
@@ -57,11 +59,16 @@ class App(ABC, SkippableDeepCopy):
         # We can augment App behavior by adding a failure_probability, so that each tool call can fail randomly
         self.failure_probability: float | None = None
         self.time_manager = TimeManager()
+        # Set when the environment of the app stops, to cancel its pending async operations
+        self.stop_event: threading.Event | None = None
         self.set_seed(0)
 
     def register_time_manager(self, time_manager: TimeManager):
         self.time_manager = time_manager
 
+    def register_stop_event(self, stop_event: threading.Event):
+        self.stop_event = stop_event
+
     def set_seed(self, seed: int) -> None:
         # Derive a new seed from the combination of the input seed and app name
         # This ensures each app instance gets a unique but deterministic seed
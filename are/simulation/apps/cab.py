@@ -12,6 +12,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 from are.simulation.apps.app import App
+from are.simulation.apps.utils.quotation_index import QuotationIndex
 from are.simulation.tool_utils import OperationType, app_tool, data_tool, env_tool
 from are.simulation.types import EventType, disable_events, event_registered
 from are.simulation.utils import get_state_dict, type_check, uuid_hex
@@ -135,6 +136,7 @@ class CabApp(App):
 
     def __post_init__(self):
         super().__init__(self.name)
+        self._quotation_index = QuotationIndex()
 
     def get_state(self) -> dict[str, Any]:
         return get_state_dict(
@@ -204,17 +206,9 @@ class CabApp(App):
         service_type: str,
         time_stamp,
     ) -> float:
-        def get_previous_price():
-            for ride in self.quotation_history:
-                if (
-                    ride.start_location == start_location
-                    and ride.end_location == end_location
-                    and ride.service_type == service_type
-                ):
-                    return ride
-            return None
-
-        ex = get_previous_price()
+        ex = self._quotation_index.get_service_ride(
+            self.quotation_history, start_location, end_location, service_type
+        )
         if ex and ex.price:
             variance = 0.01 * (time_stamp - ex.time_stamp) / 3600  # 1% per hour
             variance = min(max(variance, 0.5), 1.5)  # bounded
@@ -516,13 +510,10 @@ class CabApp(App):
         return len(self.ride_history)
 
     def get_distance_from_history(self, start_location, end_location):
-        for ride in self.quotation_history:
-            if (
-                ride.start_location == start_location
-                and ride.end_location == end_location
-            ):
-                return ride.distance_km
-        return None
+        ride = self._quotation_index.get_route_ride(
+            self.quotation_history, start_location, end_location
+        )
+        return ride.distance_km if ride is not None else None
 
     def calculate_distance(self, start_location: str, end_location: str) -> float:
         """
@@ -5,15 +5,19 @@
 # the root directory of this source tree.
 
 
+import bisect
 import json
 import logging
 import time
 import uuid
+from collections import defaultdict
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Any, TypedDict
 
 from are.simulation.apps.app import App
+from are.simulation.apps.utils.text_index import TextIndex
 from are.simulation.tool_utils import OperationType, app_tool, data_tool, env_tool
 from are.simulation.types import EventType, event_registered
 from are.simulation.utils import get_state_dict, type_check, uuid_hex
@@ -66,6 +70,100 @@ class CalendarEvent:
         return f"EventID: {self.event_id}\nTitle: {self.title} - {datetime.fromtimestamp(self.start_datetime, tz=timezone.utc)} to {datetime.fromtimestamp(self.end_datetime, tz=timezone.utc)}"
 
 
+class CalendarEventIndex:
+    """
+    Index of calendar events by start time and by tag.
+
+    Events are registered under their key in the events dict of the calendar, and the index
+    remembers the order in which keys were first added so that results can be returned in the
+    iteration order of the dict.
+
+    The index does not observe the events: every code path which adds, removes, replaces or
+    edits an event must re-register it (or drop the index).
+    """
+
+    def __init__(self, records: Mapping[str, CalendarEvent] | None = None):
+        """
+        :param records: Optional events dict of the calendar, used by `is_current`
+        """
+        self._records = records
+        # (start time, key) of the indexed events, sorted
+        self._starts: list[tuple[float, str]] = []
+        # Start time and tag of each indexed event
+        self._indexed: dict[str, tuple[float, str | None]] = {}
+        self._ranks: dict[str, int] = {}
+        self._next_rank = 0
+        self._tags: dict[str | None, set[str]] = defaultdict(set)
+        # Upper bound of the duration of the indexed events, never decreased on removal
+        self._max_duration = 0.0
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    def is_current(self, records: Mapping[str, CalendarEvent]) -> bool:
+        """
+        Whether the index was built for an events dict, checked by identity and size.
+
+        This only catches events added or removed directly in the dict, edits must go
+        through the calendar.
+
+        :param records: The events dict
+        :returns: True if the index can be used for the dict
+        """
+        return records is self._records and len(records) == len(self)
+
+    def _unindex(self, key: str) -> None:
+        start, tag = self._indexed.pop(key)
+        del self._starts[bisect.bisect_left(self._starts, (start, key))]
+        self._tags[tag].discard(key)
+        if not self._tags[tag]:
+            del self._tags[tag]
+
+    def add(self, key: str, event: CalendarEvent) -> None:
+        """
+        Register an event, replacing the event previously registered under its key.
+        As in a dict, replacing an event keeps its position.
+        """
+        if key in self._indexed:
+            self._unindex(key)
+        if key not in self._ranks:
+            self._ranks[key] = self._next_rank
+            self._next_rank += 1
+        bisect.insort(self._starts, (event.start_datetime, key))
+        self._indexed[key] = (event.start_datetime, event.tag)
+        self._tags[event.tag].add(key)
+        self._max_duration = max(
+            self._max_duration, event.end_datetime - event.start_datetime
+        )
+
+    def remove(self, key: str) -> None:
+        if key in self._indexed:
+            self._unindex(key)
+        self._ranks.pop(key, None)
+
+    def sort_keys(self, keys: list[str] | set[str]) -> list[str]:
+        """Sort keys in the order in which their events were added."""
+        return sorted(keys, key=self._ranks.__getitem__)
+
+    def overlapping(self, start: float, end: float) -> list[str]:
+        """
+        Get the keys of the events which may overlap a time range, a superset of the events
+        starting before `end` and ending after `start`.
+        """
+        # Events starting before start - max_duration end before start, keep a margin for rounding
+        lo = bisect.bisect_left(
+            self._starts, start - self._max_duration - 1, key=lambda x: x[0]
+        )
+        hi = bisect.bisect_left(self._starts, end, key=lambda x: x[0])
+        return [key for _, key in self._starts[lo:hi]]
+
+    def with_tag(self, tag: str | None) -> set[str]:
+        return self._tags.get(tag, set())
+
+    def tags(self) -> list[str | None]:
+        return list(self._tags)
+
+
 # Define TypedDict for calendar events result
 class CalendarEventsResult(TypedDict):
     events: list[CalendarEvent]
@@ -112,16 +210,55 @@ class CalendarApp(App):
 
     def __post_init__(self):
         super().__init__(self.name)
+        self._search_index: TextIndex[str] | None = None
+        self._event_index: CalendarEventIndex | None = None
 
     def get_state(self) -> dict[str, Any]:
         return get_state_dict(self, ["events"])
 
+    def _get_event_index(self) -> CalendarEventIndex:
+        # Every method editing events re-indexes them, rebuild the index if the dict was
+        # replaced or events were added or removed without going through the app
+        if self._event_index is None or not self._event_index.is_current(self.events):
+            self._event_index = CalendarEventIndex(records=self.events)
+            for event_id, event in self.events.items():
+                self._event_index.add(event_id, event)
+        return self._event_index
+
+    def _get_search_index(self) -> TextIndex[str]:
+        # Every method editing events re-indexes them, rebuild the index if the dict was
+        # replaced or events were added or removed without going through the app
+        if self._search_index is None or not self._search_index.is_current(self.events):
+            self._search_index = TextIndex(records=self.events)
+            for event_id, event in self.events.items():
+                self._search_index.add(event_id, self._get_search_texts(event))
+        return self._search_index
+
+    @staticmethod
+    def _get_search_texts(event: CalendarEvent) -> list[str | None]:
+        return [event.title, event.description, event.location, *event.attendees]
+
+    def _index_event(self, event_id: str) -> None:
+        event = self.events.get(event_id)
+        if self._search_index is not None:
+            if event is None:
+                self._search_index.remove(event_id)
+            else:
+                self._search_index.add(event_id, self._get_search_texts(event))
+        if self._event_index is not None:
+            if event is None:
+                self._event_index.remove(event_id)
+            else:
+                self._event_index.add(event_id, event)
+
     def load_state(self, state_dict: dict[str, Any]):
         self.load_calendar_events_from_dict(state_dict["events"])
 
     def reset(self):
         super().reset()
         self.events = {}
+        self._search_index = None
+        self._event_index = None
 
     def load_calendar_events_from_file(self, path):
         try:
@@ -134,6 +271,8 @@ class CalendarApp(App):
     def load_calendar_events_from_dict(self, events):
         try:
             self.events = {}
+            self._search_index = None
+            self._event_index = None
             for e in events:
                 self.events[e] = CalendarEvent(**events[e])
         except Exception as e:
@@ -189,6 +328,7 @@ class CalendarApp(App):
             attendees=attendees,
         )
         self.events[event.event_id] = event
+        self._index_event(event.event_id)
 
         return event.event_id
 
@@ -252,6 +392,7 @@ class CalendarApp(App):
             attendees=attendees,
         )
         self.events[event.event_id] = event
+        self._index_event(event.event_id)
 
         return event.event_id
 
@@ -265,6 +406,7 @@ class CalendarApp(App):
         if isinstance(event, dict):
             event = CalendarEvent(**event)
         self.events[event.event_id] = event
+        self._index_event(event.event_id)
 
     @type_check
     @app_tool()
@@ -294,6 +436,7 @@ class CalendarApp(App):
         if who_delete not in self.events[event_id].attendees:
             raise ValueError(f"{who_delete} is not an attendee of the event.")
         del self.events[event_id]
+        self._index_event(event_id)
         return f"Event {event_id} successfully deleted by {who_delete}."
 
     @type_check
@@ -309,6 +452,7 @@ class CalendarApp(App):
         if event_id not in self.events:
             raise ValueError(f"Calendar Event with id {event_id} does not exist.")
         del self.events[event_id]
+        self._index_event(event_id)
         return f"Event {event_id} successfully deleted."
 
     @type_check
@@ -332,9 +476,11 @@ class CalendarApp(App):
         if start_datetime_ts > end_datetime_ts:
             raise ValueError("Start time cannot be after end time.")
 
+        event_index = self._get_event_index()
+        candidates = event_index.overlapping(start_datetime_ts, end_datetime_ts)
         events_to_return = [
             event
-            for event in self.events.values()
+            for event in map(self.events.__getitem__, event_index.sort_keys(candidates))
             if event.start_datetime < end_datetime_ts
             and event.end_datetime > start_datetime_ts
         ]
@@ -369,7 +515,7 @@ class CalendarApp(App):
         Get all tags from the calendar.
         :returns: List of tags.
         """
-        return list({event.tag for event in self.events.values() if event.tag})
+        return list({tag for tag in self._get_event_index().tags() if tag})
 
     @type_check
     @app_tool()
@@ -382,7 +528,15 @@ class CalendarApp(App):
         """
         if not tag:
             raise ValueError("Tag cannot be empty.")
-        return [event for event in self.events.values() if event.tag == tag]
+        event_index = self._get_event_index()
+        return [
+            event
+            for event in map(
+                self.events.__getitem__,
+                event_index.sort_keys(event_index.with_tag(tag)),
+            )
+            if event.tag == tag
+        ]
 
     @type_check
     @app_tool()
@@ -398,7 +552,15 @@ class CalendarApp(App):
         query = query.lower()
         results = []
 
-        for event in self.events.values():
+        search_index = self._get_search_index()
+        candidates = search_index.candidates(query)
+        if candidates is None:
+            events = list(self.events.values())
+        else:
+            events = [
+                self.events[event_id] for event_id in search_index.sort_keys(candidates)
+            ]
+        for event in events:
             if (
                 query in event.title.lower()
                 or (event.description and query in event.description.lower())
@@ -48,19 +48,22 @@ class CalendarV2(CalendarApp):
             raise IndexError(f"Calendar Event with id {event_id} does not exist.")
 
         event = self.events[event_id]
-        if title:
-            event.title = title
-        if start_datetime:
-            event.start_datetime = _parse_datetime(start_datetime)
-        if end_datetime:
-            event.end_datetime = _parse_datetime(end_datetime)
-        if tag:
-            event.tag = tag
-        if description:
-            event.description = description
-        if location:
-            event.location = location
-        if attendees:
-            event.attendees = attendees
-        event.__post_init__()
+        try:
+            if title:
+                event.title = title
+            if start_datetime:
+                event.start_datetime = _parse_datetime(start_datetime)
+            if end_datetime:
+                event.end_datetime = _parse_datetime(end_datetime)
+            if tag:
+                event.tag = tag
+            if description:
+                event.description = description
+            if location:
+                event.location = location
+            if attendees:
+                event.attendees = attendees
+            event.__post_init__()
+        finally:
+            self._index_event(event_id)
         return f"Calendar event {event_id} successfully edited"
@@ -13,6 +13,7 @@ from enum import Enum
 from typing import Any
 
 from are.simulation.apps.app import App
+from are.simulation.apps.utils.text_index import TextIndex
 from are.simulation.tool_utils import OperationType, app_tool, data_tool
 from are.simulation.types import event_registered
 from are.simulation.utils import get_state_dict, type_check, uuid_hex
@@ -150,10 +151,43 @@ class ContactsApp(App):
 
     def __post_init__(self):
         super().__init__(self.name)
+        self._search_index: TextIndex[str] | None = None
 
     def get_state(self) -> dict[str, Any]:
         return get_state_dict(self, ["contacts", "view_limit"])
 
+    def _get_search_index(self) -> TextIndex[str]:
+        # Every method editing contacts re-indexes them, rebuild the index if the dict was
+        # replaced or contacts were added or removed without going through the app
+        if self._search_index is None or not self._search_index.is_current(
+            self.contacts
+        ):
+            self._search_index = TextIndex(records=self.contacts)
+            for contact_id in self.contacts:
+                self._index_contact(contact_id)
+        return self._search_index
+
+    def _index_contact(self, contact_id: str) -> None:
+        if self._search_index is None:
+            return
+        if contact_id not in self.contacts:
+            self._search_index.remove(contact_id)
+            return
+        contact = self.contacts[contact_id]
+        first_name = contact.first_name.lower()
+        last_name = contact.last_name.lower()
+        self._search_index.add(
+            contact_id,
+            [
+                first_name,
+                last_name,
+                contact.phone,
+                contact.email,
+                first_name + " " + last_name,
+                last_name + " " + first_name,
+            ],
+        )
+
     def load_state(self, state_dict: dict[str, Any]):
         self.load_contacts_from_dict(state_dict["contacts"])
         self.view_limit = state_dict["view_limit"]
@@ -178,10 +212,12 @@ class ContactsApp(App):
                 address=contact_data.get("address", ""),
             )
             self.contacts[contact_id] = contact
+            self._index_contact(contact_id)
 
     def reset(self):
         super().reset()
         self.contacts = {}
+        self._search_index = None
 
     @type_check
     @app_tool()
@@ -242,6 +278,7 @@ class ContactsApp(App):
         :param contact: contact to add
         """
         self.contacts[contact.contact_id] = contact
+        self._index_contact(contact.contact_id)
         return contact.contact_id
 
     @type_check
@@ -317,6 +354,7 @@ class ContactsApp(App):
             address=address,
         )
         self.contacts[contact.contact_id] = contact
+        self._index_contact(contact.contact_id)
         return contact.contact_id
 
     def add_contacts(self, contacts: list[Contact]) -> None:
@@ -325,6 +363,7 @@ class ContactsApp(App):
         """
         for contact in contacts:
             self.contacts[contact.contact_id] = contact
+            self._index_contact(contact.contact_id)
 
     @type_check
     @app_tool()
@@ -352,6 +391,8 @@ class ContactsApp(App):
             except Exception as e:
                 self.contacts[contact_id] = old_contact
                 raise e
+            finally:
+                self._index_contact(contact_id)
         else:
             raise KeyError("Contact does not exist.")
 
@@ -367,6 +408,7 @@ class ContactsApp(App):
         """
         if contact_id in self.contacts:
             del self.contacts[contact_id]
+            self._index_contact(contact_id)
             return f"Contact {contact_id} successfully deleted."
         else:
             raise KeyError("Contact does not exist.")
@@ -384,7 +426,16 @@ class ContactsApp(App):
         query = query.lower()
         results = []
 
-        for contact in self.contacts.values():
+        search_index = self._get_search_index()
+        candidates = search_index.candidates(query)
+        if candidates is None:
+            contacts = list(self.contacts.values())
+        else:
+            contacts = [
+                self.contacts[contact_id]
+                for contact_id in search_index.sort_keys(candidates)
+            ]
+        for contact in contacts:
             if (
                 query in contact.first_name.lower()
                 or query in contact.last_name.lower()
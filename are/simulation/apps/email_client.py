@@ -6,6 +6,7 @@
 
 
 import base64
+import bisect
 import logging
 import os
 import re
@@ -18,6 +19,7 @@ from typing import Any
 
 from are.simulation.apps.app import App, Protocol
 from are.simulation.apps.sandbox_file_system import SandboxLocalFileSystem
+from are.simulation.apps.utils.text_index import TextIndex
 from are.simulation.apps.virtual_file_system import VirtualFileSystem
 from are.simulation.tool_utils import OperationType, app_tool, data_tool, env_tool
 from are.simulation.types import EventType, disable_events, event_registered
@@ -92,17 +94,159 @@ class ReturnedEmails:
 
 
 class EmailFolder:
+    """
+    A folder of emails, sorted from the most recent to the oldest.
+
+    Emails with the same timestamp are kept in insertion order. The folder keeps an index
+    of its emails by id, so that inserting and looking up an email do not scan the folder,
+    and a text index of their contents for searches.
+    """
+
     def __init__(self, folder_name: EmailFolderName):
         assert isinstance(folder_name, EmailFolderName), (
             "Folder name must be an instance of EmailFolderName"
         )
         self.folder_name: EmailFolderName = folder_name
-        self.emails: list[Email] = []
+        self._emails: list[Email] = []
+        # Index of the emails by id, built lazily, and ids present more than once in the folder
+        self._email_id_index: dict[str, Email] | None = {}
+        self._duplicate_email_ids: set[str] = set()
+        self._indexed_count = 0
+        # Text index of the emails keyed by object id, built lazily with the id index
+        self._search_index: TextIndex[int] | None = None
+
+    @property
+    def emails(self) -> list[Email]:
+        return self._emails
+
+    @emails.setter
+    def emails(self, emails: list[Email]):
+        self._emails = sorted(emails, key=lambda x: x.timestamp, reverse=True)
+        self._email_id_index = None
+
+    def __len__(self) -> int:
+        return len(self._emails)
+
+    def _get_email_id_index(self) -> dict[str, Email]:
+        # The emails list is public and may have been modified in place, e.g. by a scenario
+        if self._indexed_count != len(self._emails):
+            self._email_id_index = None
+        if self._email_id_index is None:
+            self._emails.sort(key=lambda x: x.timestamp, reverse=True)
+            self._search_index = None
+            self._email_id_index = {}
+            self._duplicate_email_ids = set()
+            for email in self._emails:
+                if email.email_id in self._email_id_index:
+                    self._duplicate_email_ids.add(email.email_id)
+                else:
+                    self._email_id_index[email.email_id] = email
+            self._indexed_count = len(self._emails)
+        return self._email_id_index
 
     def add_email(self, email: Email):
         assert isinstance(email, Email), "Email must be an instance of Email"
-        self.emails.append(email)
-        self.emails = sorted(self.emails, key=lambda x: x.timestamp, reverse=True)
+        email_id_index = self._get_email_id_index()
+        # Insert after the emails with the same timestamp, as a stable sort would
+        idx = bisect.bisect_right(
+            self._emails, -email.timestamp, key=lambda x: -x.timestamp
+        )
+        self._emails.insert(idx, email)
+        self._indexed_count += 1
+        self._index_email(email)
+        if email.email_id in email_id_index:
+            # The first email in the folder order must be indexed, rebuild the index
+            self._email_id_index = None
+        else:
+            email_id_index[email.email_id] = email
+
+    def remove_email(self, email: Email):
+        """
+        Remove an email from the folder.
+        :param email: The email to remove, as returned by the folder.
+        """
+        email_id_index = self._get_email_id_index()
+        # Look for the email among the ones with the same timestamp
+        idx = bisect.bisect_left(
+            self._emails, -email.timestamp, key=lambda x: -x.timestamp
+        )
+        while idx < len(self._emails) and self._emails[idx] is not email:
+            if self._emails[idx].timestamp != email.timestamp:
+                raise ValueError(f"Email with id {email.email_id} does not exist")
+            idx += 1
+        if idx == len(self._emails):
+            raise ValueError(f"Email with id {email.email_id} does not exist")
+        del self._emails[idx]
+        self._indexed_count -= 1
+        if email.email_id in self._duplicate_email_ids:
+            self._email_id_index = None
+        else:
+            del email_id_index[email.email_id]
+            if self._search_index is not None:
+                self._search_index.remove(id(email))
+
+    def delete_emails_after(self, timestamp: float) -> int:
+        """
+        Delete the emails more recent than a timestamp.
+        :param timestamp: The timestamp after which emails are deleted.
+        :returns: The number of deleted emails.
+        """
+        email_id_index = self._get_email_id_index()
+        # The most recent emails are first in the folder
+        idx = bisect.bisect_left(self._emails, -timestamp, key=lambda x: -x.timestamp)
+        for email in self._emails[:idx]:
+            if email.email_id in self._duplicate_email_ids:
+                self._email_id_index = None
+            else:
+                email_id_index.pop(email.email_id)
+                if self._search_index is not None:
+                    self._search_index.remove(id(email))
+        del self._emails[:idx]
+        self._indexed_count -= idx
+        return idx
+
+    def clear(self):
+        self._emails.clear()
+        self._email_id_index = {}
+        self._duplicate_email_ids = set()
+        self._indexed_count = 0
+        self._search_index = None
+
+    def _index_email(self, email: Email):
+        if self._search_index is not None:
+            self._search_index.add(
+                id(email),
+                [email.sender, *email.recipients, email.subject, email.content],
+            )
+
+    def _get_search_index(self) -> TextIndex[int]:
+        self._get_email_id_index()
+        if self._search_index is None:
+            self._search_index = TextIndex()
+            for email in self._emails:
+                self._index_email(email)
+        return self._search_index
+
+    def search(self, query: str) -> list[Email]:
+        """
+        Search for emails matching a query in their sender, recipients, subject or content, ignoring case.
+        :param query: The search query string
+        :returns: The matching emails, in folder order.
+        """
+        query = query.lower()
+        candidates = self._get_search_index().candidates(query)
+        results = []
+        for email in self._emails:
+            if candidates is not None and id(email) not in candidates:
+                continue
+            if (
+                query in email.sender.lower()
+                or any(query in recipient.lower() for recipient in email.recipients)
+                or query in email.subject.lower()
+                or query in email.content.lower()
+            ):
+                results.append(email)
+        return results
 
     def get_emails(self, offset: int = 0, limit: int = 5) -> ReturnedEmails:
         assert isinstance(offset, int), "Offset must be an integer."
@@ -128,10 +272,10 @@ class EmailFolder:
 
     def get_email_by_id(self, email_id: str) -> Email:
         assert isinstance(email_id, str), "Email ID must be a string."
-        for email in self.emails:
-            if email.email_id == email_id:
-                return email
-        raise ValueError(f"Email with id {email_id} does not exist")
+        email = self._get_email_id_index().get(email_id)
+        if email is None:
+            raise ValueError(f"Email with id {email_id} does not exist")
+        return email
 
     def get_state(self) -> dict[str, Any]:
         return get_state_dict(self, ["folder_name", "emails"])
@@ -205,7 +349,7 @@ class EmailClientApp(App):
     def reset(self):
         super().reset()
         for folder in self.folders:
-            self.folders[folder].emails.clear()
+            self.folders[folder].clear()
 
     @event_registered(operation_type=OperationType.WRITE)
     def add_email(
@@ -676,7 +820,7 @@ class EmailClientApp(App):
             raise ValueError(f"Folder {dest_folder} not found")
         email = self.folders[source_folder].get_email_by_id(email_id)
         self.folders[dest_folder].add_email(email)
-        self.folders[source_folder].emails.remove(email)
+        self.folders[source_folder].remove_email(email)
         return email.email_id
 
     @type_check
@@ -700,7 +844,7 @@ class EmailClientApp(App):
         if folder not in self.folders:
             raise ValueError(f"Folder {folder_name} not found")
         email = self.folders[folder].get_email_by_id(email_id)
-        self.folders[folder].emails.remove(email)
+        self.folders[folder].remove_email(email)
         self.folders[EmailFolderName.TRASH].add_email(email)
         return email.email_id
 
@@ -722,35 +866,15 @@ class EmailClientApp(App):
         :example:
             search_emails("hello", "INBOX")
         """
-        query = query.lower()
-        results = []
         folder = EmailFolderName[folder_name.upper()]
-
-        for email in self.folders[folder].emails:
-            if (
-                query in email.sender.lower()
-                or any(query in recipient.lower() for recipient in email.recipients)
-                or query in email.subject.lower()
-                or query in email.content.lower()
-            ):
-                results.append(email)
-
-        return results
+        return self.folders[folder].search(query)
 
     def delete_future_data(self, timestamp: float):
-        num_emails = sum(len(self.folders[folder].emails) for folder in self.folders)
-        for folder in self.folders:
-            self.folders[folder].emails = [
-                email
-                for email in self.folders[folder].emails
-                if email.timestamp <= timestamp
-            ]
-        num_emails_after = sum(
-            len(self.folders[folder].emails) for folder in self.folders
-        )
-        logger.debug(
-            f"Deleted emails {num_emails - num_emails_after} from {num_emails}"
+        num_emails = sum(len(folder) for folder in self.folders.values())
+        num_deleted = sum(
+            folder.delete_emails_after(timestamp) for folder in self.folders.values()
         )
+        logger.debug(f"Deleted emails {num_deleted} from {num_emails}")
 
 
 @dataclass
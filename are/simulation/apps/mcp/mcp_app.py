@@ -5,17 +5,23 @@
 # the root directory of this source tree.
 
 
-import asyncio
 import logging
 import random
 from typing import Any, Callable, TypeVar
 
-from mcp import ClientSession, StdioServerParameters
+from mcp import StdioServerParameters
 from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 from pydantic.networks import AnyUrl
 
 from are.simulation.apps.app import App, ToolType
+from are.simulation.apps.mcp.session_pool import (
+    MCP_SESSION_POOL,
+    MCPCatalog,
+    MCPConnection,
+    get_server_key,
+)
+from are.simulation.async_runtime import run
 from are.simulation.tool_utils import (
     AppTool,
     AppToolArg,
@@ -38,16 +44,15 @@ class MCPApp(App):
 
     # Fields to skip during deep copying
     _skip_deepcopy_fields = [
-        "_loop",
-        "_session",
-        "_server_context",
-        "_session_context",
+        "_connection",
+        "_catalog",
         "_dynamic_tools",
         "_tools",
         "_resources",
         "_prompts",
         "_connected",
         "add_event_callbacks",
+        "stop_event",
     ]
     _skip_pickle_fields = _skip_deepcopy_fields
 
@@ -63,6 +68,7 @@ class MCPApp(App):
         exclude_tools: list[str] | None = None,
         only_read_only: bool = False,
         timeout: float = 10.0,
+        stateless: bool | None = None,
     ):
         """Initialize the MCP app and connect to the server immediately.
 
@@ -77,6 +83,10 @@ class MCPApp(App):
         :param exclude_tools: List of tool names to exclude from the app.
         :param only_read_only: If True, only include tools marked as read-only.
         :param timeout: Timeout in seconds for async operations. Defaults to 10.0.
+        :param stateless: Whether the server keeps no state between tool calls, so that its
+                          connection is shared with the other apps using the same server and
+                          kept open across resets. Defaults to whether all its tools are
+                          annotated as read-only.
         """
         super().__init__(name=name or "MCPApp")
 
@@ -89,6 +99,7 @@ class MCPApp(App):
         self.exclude_tools = [] if exclude_tools is None else exclude_tools
         self.only_read_only = only_read_only
         self.timeout = timeout  # Timeout for async operations in seconds
+        self.stateless = stateless
 
         # Validate that we have either stdio or sse parameters
         if self.server_url is None and self.server_command is None:
@@ -101,8 +112,10 @@ class MCPApp(App):
                 "server_args and server_env are not supported for SSE connection"
             )
 
-        # MCP client session
-        self._session = None
+        # Connection from the process-wide session pool
+        self._connection: MCPConnection | None = None
+        # Catalog of the server the tools, resources and prompts were filtered from
+        self._catalog: MCPCatalog | None = None
         self._tools = {}
         self._resources = {}
         self._prompts = {}
@@ -113,12 +126,6 @@ class MCPApp(App):
         # Dynamic tool methods that will be created based on MCP server tools
         self._dynamic_tools = {}
 
-        self._loop = asyncio.new_event_loop()
-
-        # Store context managers to keep them alive
-        self._server_context = None
-        self._session_context = None
-
         self._descrition_modifier = description_modifier
 
         # Connect to the server immediately
@@ -151,36 +158,29 @@ class MCPApp(App):
         for key, value in state_dict.items():
             setattr(self, key, value)
 
-        # Reset connection-related attributes
-        self._session = None
-        self._tools = {}
-        self._resources = {}
-        self._prompts = {}
-        self._connected = False
-        self._dynamic_tools = {}
-
-        # Reconnect to the server to recover tools, resources, and prompts
-        self.connect()
+        # Reconnect to the server to recover tools, resources, and prompts,
+        # reusing the shared connection if the server did not change
+        self._reconnect()
 
     # Define a type variable for the return type of the awaitable
     T = TypeVar("T")
 
     def _fake_await(self, coro: Any) -> Any:
-        """run an async coroutine"""
-        return self._loop.run_until_complete(
-            coro,
+        """run an async coroutine on the background loop, cancelled after the app timeout or when the environment stops"""
+        return run(coro, timeout=self.timeout, stop_event=self.stop_event)
+
+    def _get_server_key(self) -> str:
+        return get_server_key(
+            self.server_command,
+            self.server_args,
+            self.server_env,
+            self.server_url,
+            self.sse_headers,
         )
 
     def connect(self):
-        # Temporarily increase timeout for connection as it might take longer
-        original_timeout = self.timeout
-        self.timeout = 30.0  # Use a longer timeout for connection
-        try:
-            # Run this synchronously using our persistent event loop with a timeout
-            result = self._fake_await(self._connect_to_server())
-        finally:
-            # Restore original timeout
-            self.timeout = original_timeout
+        # Use a longer timeout for connection as it might take longer
+        result = self._connect_to_server(timeout=30.0)
         if result:
             logger.info(
                 f"Successfully connected to MCP server. Available tools: {', '.join(self._tools.keys())}"
@@ -194,29 +194,38 @@ class MCPApp(App):
 
         This method should be called when the app is no longer needed.
         """
-        # Clean up existing connections
-        if self._connected:
+        # Release the connection, which is closed unless it is shared
+        if self._connection is not None:
             try:
-                # Run the disconnect method in the event loop with a timeout
-                self._fake_await(self._disconnect_from_server())
+                self._disconnect_from_server()
             except Exception as e:
                 logger.error(f"Error during disconnect: {e}")
 
-            try:
-                self._loop.close()
-            except Exception as e:
-                logger.error(f"Error closing event loop: {e}")
-
         # Reset all attributes
-        self._session = None
-        self._server_context = None
-        self._session_context = None
+        self._connection = None
+        self._catalog = None
         self._tools = {}
         self._resources = {}
         self._prompts = {}
         self._connected = False
         self._dynamic_tools = {}
 
+    def _reconnect(self) -> None:
+        """Connect again to the server, keeping the connection if it is shared."""
+        connection = self._connection
+        if (
+            connection is not None
+            and connection.shared
+            and connection.is_open
+            and connection.key == self._get_server_key()
+        ):
+            # Warm connection to a stateless server
+            self._discover_server_capabilities()
+            self._connected = True
+            return
+        self.close()
+        self.connect()
+
     def reset(self):
         """Reset the app to its initial state."""
         # Don't call super().reset() as it tries to reinitialize with stored args
@@ -235,14 +244,8 @@ class MCPApp(App):
         # Reset the random number generator to initial seed
         self.rng = random.Random(self.seed)
 
-        # Close all connections
-        self.close()
-
-        # Create a new event loop
-        self._loop = asyncio.new_event_loop()
-
-        # Reconnect to the server
-        self.connect()
+        # Reconnect to the server, stateful servers are started again
+        self._reconnect()
 
     @event_registered(operation_type=OperationType.READ)
     def list_resources(self) -> str:
@@ -254,6 +257,7 @@ class MCPApp(App):
         if not self._connected:
             return "Not connected to MCP server. Please connect first."
 
+        self._refresh_capabilities()
         if not self._resources:
             return "No resources available from the MCP server."
 
@@ -289,6 +293,7 @@ class MCPApp(App):
         if not self._connected:
             return "Not connected to MCP server. Please connect first."
 
+        self._refresh_capabilities()
         if not self._prompts:
             return "No prompts available from the MCP server."
 
@@ -324,12 +329,13 @@ class MCPApp(App):
         :return: The result of the tool call as a string.
         :rtype: str
 
-        :raises ConnectionError: If the connection to the server times out.
+        :raises TimeoutError: If the tool call does not complete within the app timeout.
         :raises Exception: Any other exception raised during the tool call.
         """
         if not self._connected:
             return "Not connected to MCP server. Please connect first."
 
+        self._refresh_capabilities()
         if tool_name not in self._tools:
             return f"Tool '{tool_name}' not found. Available tools: {', '.join(self._tools.keys())}"
 
@@ -352,8 +358,8 @@ class MCPApp(App):
         :return: The content of the resource as a string.
         :rtype: str
 
-        :raises ConnectionError: If the connection to the server times out.
-        :raises Exception: Any other exception raised during the resource read.
+        Errors, including a read not completing within the app timeout, are returned as
+        the content.
         """
         if not self._connected:
             return "Not connected to MCP server. Please connect first."
@@ -367,9 +373,10 @@ class MCPApp(App):
             # Return the error as a string since this is a user-facing method
             return f"Error reading MCP resource '{resource_uri}': {str(e)}"
 
-    async def _connect_to_server(self) -> bool:
-        """Connect to the MCP server asynchronously.
+    def _connect_to_server(self, timeout: float | None = None) -> bool:
+        """Connect to the MCP server through the process-wide session pool.
 
+        :param timeout: Maximum time to wait in seconds for the connection.
         :return: True if the connection was successful, False otherwise.
         :rtype: bool
         """
@@ -377,7 +384,11 @@ class MCPApp(App):
             # Determine which client to use based on provided configuration
             if self.server_url:
                 # Use SSE client with the provided URL
-                self._server_context = sse_client(self.server_url, self.sse_headers)
+                server_url, sse_headers = self.server_url, self.sse_headers
+
+                def open_server():
+                    return sse_client(server_url, sse_headers)
+
             elif self.server_command:
                 # Use stdio client with the provided command parameters
                 server_params = StdioServerParameters(
@@ -385,24 +396,24 @@ class MCPApp(App):
                     args=self.server_args,
                     env=self.server_env,
                 )
-                self._server_context = stdio_client(server_params)
+
+                def open_server():
+                    return stdio_client(server_params)
+
             else:
                 # This should never happen due to the validation in __init__
                 raise ValueError("Either server_url or server_command must be provided")
 
-            # Connect to the server using async context manager but store it
-            # to keep it alive throughout the lifetime of this instance
-            (read_stream, write_stream) = await self._server_context.__aenter__()
-
-            # Create a client session and store the context
-            self._session = ClientSession(read_stream, write_stream)
-            await self._session.__aenter__()
-
-            # Initialize the connection
-            await self._session.initialize()
+            # The pool starts the server, or reuses a warm connection to a stateless one
+            self._connection = MCP_SESSION_POOL.acquire(
+                self._get_server_key(),
+                open_server,
+                stateless=self.stateless,
+                timeout=timeout,
+            )
 
             # Discover server capabilities
-            await self._discover_server_capabilities()
+            self._discover_server_capabilities()
 
             self._connected = True
             return True
@@ -413,24 +424,15 @@ class MCPApp(App):
 
         return False
 
-    async def _disconnect_from_server(self) -> None:
-        """Disconnect from the MCP server asynchronously."""
-        # Properly exit the context managers
-        if self._session:
-            try:
-                await self._session.__aexit__(None, None, None)
-            except Exception as e:
-                logger.error(f"Error closing session: {e}")
-            self._session = None
-
-        if self._server_context:
-            try:
-                await self._server_context.__aexit__(None, None, None)
-            except Exception as e:
-                logger.error(f"Error closing server context: {e}")
-            self._server_context = None
+    def _disconnect_from_server(self) -> None:
+        """Release the connection to the MCP server."""
+        connection = self._connection
+        self._connection = None
+        if connection is not None:
+            MCP_SESSION_POOL.release(connection)
 
         self._connected = False
+        self._catalog = None
         self._tools = {}
         self._resources = {}
         self._prompts = {}
@@ -441,78 +443,78 @@ class MCPApp(App):
                 delattr(self, name)
         self._dynamic_tools = {}
 
-    async def _discover_server_capabilities(self) -> None:
-        """Discover the capabilities of the connected MCP server."""
-        if not self._session:
+    def _discover_server_capabilities(self) -> None:
+        """Filter the capabilities of the connected MCP server from its cached catalog."""
+        if self._connection is None:
             return
 
-        # Get available tools
-        try:
-            tools = await self._session.list_tools()
-            tools = tools.tools
-            # Filter out excluded tools and non-read-only tools if requested
-            filtered_tools = []
-            excluded_count = 0
-            non_read_only_count = 0
-
-            for tool in tools:
-                # Skip excluded tools
-                if tool.name in self.exclude_tools:
-                    excluded_count += 1
+        catalog = MCP_SESSION_POOL.get_catalog(self._connection)
+        self._catalog = catalog
+
+        tools = catalog.tools
+        # Filter out excluded tools and non-read-only tools if requested
+        filtered_tools = []
+        excluded_count = 0
+        non_read_only_count = 0
+
+        for tool in tools:
+            # Skip excluded tools
+            if tool.name in self.exclude_tools:
+                excluded_count += 1
+                continue
+
+            # Skip non-read-only tools if only_read_only is True
+            if self.only_read_only:
+                is_read_only = False
+                # Check if tool has annotations attribute
+                if hasattr(tool, "annotations"):
+                    annotations = getattr(tool, "annotations")
+                    if annotations is not None and hasattr(annotations, "readOnlyHint"):
+                        read_only_hint = getattr(annotations, "readOnlyHint")
+                        if read_only_hint is not None:
+                            is_read_only = read_only_hint
+
+                if not is_read_only:
+                    non_read_only_count += 1
                     continue
 
-                # Skip non-read-only tools if only_read_only is True
-                if self.only_read_only:
-                    is_read_only = False
-                    # Check if tool has annotations attribute
-                    if hasattr(tool, "annotations"):
-                        annotations = getattr(tool, "annotations")
-                        if annotations is not None and hasattr(
-                            annotations, "readOnlyHint"
-                        ):
-                            read_only_hint = getattr(annotations, "readOnlyHint")
-                            if read_only_hint is not None:
-                                is_read_only = read_only_hint
+            filtered_tools.append(tool)
 
-                    if not is_read_only:
-                        non_read_only_count += 1
-                        continue
+        self._tools = {tool.name: tool for tool in filtered_tools}
 
-                filtered_tools.append(tool)
+        # Log filtering results
+        if excluded_count > 0:
+            logger.debug(f"Excluded {excluded_count} tools by name.")
 
-            self._tools = {tool.name: tool for tool in filtered_tools}
+        if non_read_only_count > 0:
+            logger.debug(f"Excluded {non_read_only_count} non-read-only tools.")
 
-            # Log filtering results
-            if excluded_count > 0:
-                logger.debug(f"Excluded {excluded_count} tools by name.")
+        self._tools = {tool.name: tool for tool in filtered_tools}
 
-            if non_read_only_count > 0:
-                logger.debug(f"Excluded {non_read_only_count} non-read-only tools.")
+        # Log filtering results
+        if excluded_count > 0:
+            logger.debug(f"Excluded {excluded_count} tools by name.")
 
-            logger.debug(f"Discovered {len(self._tools)} MCP tools after filtering.")
-        except Exception as e:
-            logger.warning(f"Failed to list MCP tools: {e}", exc_info=e)
-            self._tools = {}
+        if non_read_only_count > 0:
+            logger.debug(f"Excluded {non_read_only_count} non-read-only tools.")
 
-        # Get available resources
-        try:
-            resources = await self._session.list_resources()
-            resources = resources.resources if hasattr(resources, "resources") else []
-            self._resources = {resource.name: resource for resource in resources}
-            logger.debug(f"Discovered {len(resources)} MCP resources")
-        except Exception as e:
-            logger.warning(f"Failed to list MCP resources: {e}", exc_info=e)
-            self._resources = {}
+        logger.debug(f"Discovered {len(self._tools)} MCP tools after filtering.")
+
+        self._resources = {resource.name: resource for resource in catalog.resources}
+        logger.debug(f"Discovered {len(catalog.resources)} MCP resources")
 
-        # Get available prompts
+        self._prompts = {prompt.name: prompt for prompt in catalog.prompts}
+        logger.debug(f"Discovered {len(catalog.prompts)} MCP prompts")
+
+    def _refresh_capabilities(self) -> None:
+        """Filter the capabilities again if the catalog of the server changed."""
+        if not self._connected or self._connection is None:
+            return
         try:
-            prompts = await self._session.list_prompts()
-            prompts = prompts.prompts if hasattr(prompts, "prompts") else []
-            self._prompts = {prompt.name: prompt for prompt in prompts}
-            logger.debug(f"Discovered {len(prompts)} MCP prompts")
+            if MCP_SESSION_POOL.get_catalog(self._connection) is not self._catalog:
+                self._discover_server_capabilities()
         except Exception as e:
-            logger.warning(f"Failed to list MCP prompts: {e}", exc_info=e)
-            self._prompts = {}
+            logger.warning(f"Failed to refresh MCP capabilities: {e}", exc_info=e)
 
     async def _call_mcp_tool(self, tool_name: str, arguments: dict[str, Any]) -> Any:
         """Call a tool on the MCP server asynchronously.
@@ -527,10 +529,11 @@ class MCPApp(App):
 
         :raises RuntimeError: If not connected to MCP server.
         """
-        if not self._session:
+        session = self._connection.session if self._connection else None
+        if not session:
             raise RuntimeError("Not connected to MCP server")
 
-        result = await self._session.call_tool(tool_name, arguments=arguments)
+        result = await session.call_tool(tool_name, arguments=arguments)
         return result
 
     async def _read_mcp_resource(self, resource_uri: str) -> tuple[Any, Any]:
@@ -544,10 +547,11 @@ class MCPApp(App):
 
         :raises RuntimeError: If not connected to MCP server.
         """
-        if not self._session:
+        session = self._connection.session if self._connection else None
+        if not session:
             raise RuntimeError("Not connected to MCP server")
 
-        content, mime_type = await self._session.read_resource(AnyUrl(resource_uri))
+        content, mime_type = await session.read_resource(AnyUrl(resource_uri))
         return content, mime_type
 
     def get_tools_with_attribute(
@@ -574,6 +578,7 @@ class MCPApp(App):
             return []
 
         # If not connected or no tools, return empty list
+        self._refresh_capabilities()
         if not self._connected or not self._tools:
             return []
 
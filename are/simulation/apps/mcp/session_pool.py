@@ -0,0 +1,305 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import asyncio
+import atexit
+import json
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, AsyncContextManager, Callable
+
+from mcp import ClientSession, types
+
+from are.simulation.async_runtime import call_soon, run, submit
+
+logger = logging.getLogger(__name__)
+
+# Opens the streams to an MCP server, e.g. stdio_client or sse_client
+ServerOpener = Callable[[], AsyncContextManager[tuple[Any, Any]]]
+
+
+def get_server_key(
+    server_command: str | None,
+    server_args: list[str],
+    server_env: dict[str, str],
+    server_url: str | None,
+    sse_headers: dict[str, Any] | None,
+) -> str:
+    """
+    Get the key identifying an MCP server in the session pool.
+
+    :param server_command: The command running the server for stdio connections
+    :param server_args: The arguments of the command
+    :param server_env: The environment variables of the command
+    :param server_url: The URL of the server for SSE connections, which takes precedence
+    :param sse_headers: The headers of SSE connections
+    :returns: The key
+    """
+    if server_url is not None:
+        return json.dumps(
+            {"url": server_url, "headers": sse_headers}, sort_keys=True, default=str
+        )
+    return json.dumps(
+        {"command": server_command, "args": server_args, "env": server_env},
+        sort_keys=True,
+        default=str,
+    )
+
+
+@dataclass
+class MCPCatalog:
+    """Tools, resources and prompts listed by an MCP server, before any filtering."""
+
+    tools: list[Any] = field(default_factory=list)
+    resources: list[Any] = field(default_factory=list)
+    prompts: list[Any] = field(default_factory=list)
+
+    @property
+    def is_read_only(self) -> bool:
+        """Whether all the tools are annotated as not modifying their environment."""
+        return bool(self.tools) and all(
+            getattr(tool, "annotations", None) is not None
+            and tool.annotations.readOnlyHint
+            for tool in self.tools
+        )
+
+
+class MCPConnection:
+    """
+    A session with an MCP server, served by a task of the background loop of the process.
+
+    The task enters the server and session contexts, and exits them when the connection is
+    closed, so that they are entered and exited in the same task as anyio requires.
+    Requests from any thread are multiplexed on the session.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        open_server: ServerOpener,
+        on_list_changed: Callable[[], None] | None = None,
+    ):
+        self.key = key
+        self.session: ClientSession | None = None
+        # Shared connections are kept open when released, for the next apps with the key
+        self.shared = False
+        self.leases = 0
+        self._open_server = open_server
+        self._on_list_changed = on_list_changed
+        self._ready: Future[None] = Future()
+        self._closing: asyncio.Event | None = None
+        self._served: Future[None] | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.session is not None and not (
+            self._served is not None and self._served.done()
+        )
+
+    async def _handle_message(self, message: Any) -> None:
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root,
+            types.ToolListChangedNotification
+            | types.ResourceListChangedNotification
+            | types.PromptListChangedNotification,
+        ):
+            if self._on_list_changed is not None:
+                self._on_list_changed()
+
+    async def _serve(self) -> None:
+        self._closing = asyncio.Event()
+        try:
+            async with self._open_server() as (read_stream, write_stream):
+                async with ClientSession(
+                    read_stream, write_stream, message_handler=self._handle_message
+                ) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set_result(None)
+                    await self._closing.wait()
+        except BaseException as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            else:
+                logger.error(f"MCP session {self.key} failed", exc_info=e)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self.session = None
+
+    def open(self, timeout: float | None) -> None:
+        """
+        Connect to the server and initialize the session.
+
+        :param timeout: Maximum time to wait in seconds
+        :raises Exception: If the connection failed or timed out
+        """
+        self._served = submit(self._serve())
+        try:
+            self._ready.result(timeout)
+        except BaseException:
+            self._served.cancel()
+            raise
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """
+        Close the session and the connection to the server.
+
+        :param timeout: Maximum time to wait in seconds
+        """
+        if self._served is None or self._served.done():
+            return
+        closing = self._closing
+        if closing is not None:
+            call_soon(closing.set)
+        else:
+            self._served.cancel()
+        try:
+            self._served.result(timeout)
+        except Exception as e:
+            logger.error(f"Error closing MCP session {self.key}: {e}")
+            self._served.cancel()
+
+    def list_catalog(self, timeout: float | None) -> MCPCatalog:
+        """
+        List the tools, resources and prompts of the server.
+
+        :param timeout: Maximum time to wait in seconds for each list
+        :returns: The catalog, with empty lists for the parts which could not be listed
+        """
+        session = self.session
+        if session is None:
+            raise RuntimeError("Not connected to MCP server")
+        catalog = MCPCatalog()
+        try:
+            catalog.tools = run(session.list_tools(), timeout).tools
+        except Exception as e:
+            logger.warning(f"Failed to list MCP tools: {e}", exc_info=e)
+        try:
+            catalog.resources = run(session.list_resources(), timeout).resources
+        except Exception as e:
+            logger.warning(f"Failed to list MCP resources: {e}", exc_info=e)
+        try:
+            catalog.prompts = run(session.list_prompts(), timeout).prompts
+        except Exception as e:
+            logger.warning(f"Failed to list MCP prompts: {e}", exc_info=e)
+        return catalog
+
+
+class MCPSessionPool:
+    """
+    Process-wide pool of MCP server connections keyed by server command or URL, with a
+    cache of the catalog of each server.
+
+    Connections to stateless servers are shared by all the apps using the same server and
+    stay open when released, so that resets and new scenarios reuse warm servers. Other
+    connections belong to a single app and are closed when released. The catalog of a server
+    is listed once, and listed again after the server notifies that it changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shared: dict[str, MCPConnection] = {}
+        self._catalogs: dict[str, MCPCatalog] = {}
+
+    def acquire(
+        self,
+        key: str,
+        open_server: ServerOpener,
+        stateless: bool | None = None,
+        timeout: float | None = 30.0,
+    ) -> MCPConnection:
+        """
+        Get a connection to a server, reusing the shared connection if there is one.
+
+        :param key: The key of the server, see get_server_key
+        :param open_server: Opens the streams to the server
+        :param stateless: Whether the connection can be shared, None to share it if all the
+        tools of the server are annotated as read-only
+        :param timeout: Maximum time to wait in seconds for the connection
+        :returns: The connection, to release when it is no longer used
+        """
+        if stateless is not False:
+            with self._lock:
+                connection = self._shared.get(key)
+                if connection is not None and connection.is_open:
+                    connection.leases += 1
+                    return connection
+
+        connection = MCPConnection(
+            key, open_server, on_list_changed=lambda: self.invalidate_catalog(key)
+        )
+        connection.open(timeout)
+        if stateless is None:
+            stateless = self.get_catalog(connection, timeout).is_read_only
+        with self._lock:
+            if stateless:
+                existing = self._shared.get(key)
+                if existing is not None and existing.is_open:
+                    # Another app connected to the server in the meantime
+                    existing.leases += 1
+                    connection.close()
+                    return existing
+                connection.shared = True
+                self._shared[key] = connection
+            connection.leases = 1
+        return connection
+
+    def release(self, connection: MCPConnection) -> None:
+        """
+        Release a connection, closing it unless it is shared.
+
+        :param connection: The connection
+        """
+        with self._lock:
+            connection.leases -= 1
+            if connection.shared and connection.is_open:
+                return
+            if self._shared.get(connection.key) is connection:
+                del self._shared[connection.key]
+        connection.close()
+
+    def get_catalog(
+        self, connection: MCPConnection, timeout: float | None = 30.0
+    ) -> MCPCatalog:
+        """
+        Get the catalog of a server, listing it only if it is not cached.
+
+        :param connection: A connection to the server
+        :param timeout: Maximum time to wait in seconds for each list
+        :returns: The catalog, which must not be modified
+        """
+        with self._lock:
+            catalog = self._catalogs.get(connection.key)
+        if catalog is None:
+            catalog = connection.list_catalog(timeout)
+            with self._lock:
+                self._catalogs[connection.key] = catalog
+        return catalog
+
+    def invalidate_catalog(self, key: str) -> None:
+        """
+        Forget the catalog of a server, e.g. when its tools changed.
+
+        :param key: The key of the server
+        """
+        with self._lock:
+            self._catalogs.pop(key, None)
+
+    def close_all(self) -> None:
+        """Close all the shared connections."""
+        with self._lock:
+            connections = list(self._shared.values())
+            self._shared.clear()
+        for connection in connections:
+            connection.close()
+
+
+MCP_SESSION_POOL = MCPSessionPool()
+atexit.register(MCP_SESSION_POOL.close_all)
@@ -6,6 +6,7 @@
 
 
 import base64
+import bisect
 import os
 import re
 import textwrap
@@ -17,6 +18,7 @@ from functools import partial
 from typing import Any, Callable
 
 from are.simulation.apps.app import App
+from are.simulation.apps.utils.sorted_messages import TimeSortedMessages, parse_date
 from are.simulation.tool_utils import OperationType, app_tool, data_tool, env_tool
 from are.simulation.types import EventType, event_registered
 from are.simulation.utils import get_state_dict, type_check, uuid_hex
@@ -77,6 +79,7 @@ class Conversation:
         self.participants = list(set(self.participants))
         if self.conversation_id is None or len(self.conversation_id) == 0:
             self.conversation_id = uuid.uuid4().hex
+        self._sorted_messages = TimeSortedMessages()
 
     @property
     def summary(self):
@@ -113,26 +116,23 @@ class Conversation:
     def get_messages_in_date_range(
         self, start_date: str | None, end_date: str | None
     ) -> list[Message]:
-        start_timestamp = -float("inf")
-        end_time_stamp = float("inf")
-        if start_date is not None:
-            start_timestamp = (
-                datetime.strptime(start_date, "%Y-%m-%d %H:%M:%S")
-                .replace(tzinfo=timezone.utc)
-                .timestamp()
-            )
-        if end_date is not None:
-            end_time_stamp = (
-                datetime.strptime(end_date, "%Y-%m-%d %H:%M:%S")
-                .replace(tzinfo=timezone.utc)
-                .timestamp()
-            )
+        start_timestamp = (
+            -float("inf") if start_date is None else parse_date(start_date)
+        )
+        end_time_stamp = float("inf") if end_date is None else parse_date(end_date)
         return [
             msg
             for msg in self.messages
             if start_timestamp <= msg.timestamp <= end_time_stamp
         ]
 
+    def get_sorted_messages(self) -> list[Message]:
+        """
+        Get the messages sorted by timestamp, most recent first.
+        The returned list is cached and must not be modified.
+        """
+        return self._sorted_messages.get(self.messages)
+
 
 @dataclass
 class MessagingApp(App):
@@ -181,6 +181,17 @@ class MessagingApp(App):
 
     def __post_init__(self):
         super().__init__(self.name)
+        self._init_conversation_indexes()
+
+    def _init_conversation_indexes(self) -> None:
+        # Recency order of the conversations, updated lazily by _sync_conversation_indexes
+        # Conversation and last update when indexed
+        self._indexed_conversations: dict[str, tuple[Conversation, float]] = {}
+        # Order in which the conversations were added, i.e. the order of the conversations dict
+        self._conversation_ranks: dict[str, int] = {}
+        self._next_conversation_rank = 0
+        # (-last_updated, rank, conversation_id), sorted from the most recent conversation
+        self._conversations_by_recency: list[tuple[float, int, str]] = []
 
     def get_state(self) -> dict[str, Any]:
         return get_state_dict(
@@ -205,6 +216,7 @@ class MessagingApp(App):
     def reset(self):
         super().reset()
         self.conversations = {}
+        self._init_conversation_indexes()
 
     @event_registered(operation_type=OperationType.WRITE)
     def add_conversation(self, conversation: Conversation) -> None:
@@ -274,9 +286,7 @@ class MessagingApp(App):
 
         new_conversations = []
         for conversation in conversations:
-            sorted_messages = sorted(
-                conversation.messages, key=lambda msg: msg.timestamp, reverse=True
-            )
+            sorted_messages = conversation.get_sorted_messages()
             start_index = offset_recent_messages_per_conversation
             end_index = min(
                 len(conversation.messages),
@@ -325,21 +335,22 @@ class MessagingApp(App):
         if offset > len(self.conversations):
             raise ValueError("Offset is larger than the number of conversations")
 
-        sorted_conversations: list[Conversation] = sorted(
-            self.conversations.values(),
-            key=lambda conv: conv.last_updated,
-            reverse=True,
-        )
+        self._sync_conversation_indexes()
 
         # Calculate the start and end indices based on the offset and view limit
         start_index = offset
         end_index = offset + limit
 
         # Ensure the end index does not exceed the list size
-        end_index = min(end_index, len(sorted_conversations))
+        end_index = min(end_index, len(self._conversations_by_recency))
 
         return self.apply_conversation_limits(
-            sorted_conversations[start_index:end_index],
+            [
+                self.conversations[conversation_id]
+                for _, _, conversation_id in self._conversations_by_recency[
+                    start_index:end_index
+                ]
+            ],
             offset_recent_messages_per_conversation,
             limit_recent_messages_per_conversation,
         )
@@ -621,13 +632,13 @@ class MessagingApp(App):
             raise ValueError("Offset is larger than the number of messages")
 
         conversation = self.conversations[conversation_id]
-        # sort messages by timestamp, most recent first
-        conversation.messages.sort(key=lambda x: x.timestamp, reverse=True)  # type: ignore
+        # messages sorted by timestamp, most recent first
+        sorted_messages = conversation.get_sorted_messages()
 
         # compute the indices of the messages to be shown
         start_index = offset
-        end_index = min(len(conversation.messages), offset + limit)  # type: ignore
-        messages = conversation.messages[start_index:end_index]  # type: ignore
+        end_index = min(len(sorted_messages), offset + limit)
+        messages = sorted_messages[start_index:end_index]
         return {
             "messages": [
                 message
@@ -815,3 +826,57 @@ class MessagingApp(App):
         ):
             return True
         return False
+
+    def _unindex_conversation(self, conversation_id: str) -> None:
+        _, last_updated = self._indexed_conversations.pop(conversation_id)
+        entry = (
+            -last_updated,
+            self._conversation_ranks[conversation_id],
+            conversation_id,
+        )
+        del self._conversations_by_recency[
+            bisect.bisect_left(self._conversations_by_recency, entry)
+        ]
+
+    def _sync_conversation_indexes(self) -> None:
+        """
+        Update the recency order of the conversations with the changes since the last read.
+        Conversations may be modified without going through the app, e.g. by scenarios appending
+        messages, so they are compared to the state they were indexed in.
+        """
+        for conversation_id, conversation in self.conversations.items():
+            indexed_state = self._indexed_conversations.get(conversation_id)
+            if indexed_state is not None:
+                if indexed_state[0] is not conversation:
+                    self._unindex_conversation(conversation_id)
+                    indexed_state = None
+                elif indexed_state[1] == conversation.last_updated:
+                    continue
+            rank = self._conversation_ranks.get(conversation_id)
+            if rank is None:
+                rank = self._conversation_ranks[conversation_id] = (
+                    self._next_conversation_rank
+                )
+                self._next_conversation_rank += 1
+
+            if indexed_state is not None:
+                del self._conversations_by_recency[
+                    bisect.bisect_left(
+                        self._conversations_by_recency,
+                        (-indexed_state[1], rank, conversation_id),
+                    )
+                ]
+            bisect.insort(
+                self._conversations_by_recency,
+                (-conversation.last_updated, rank, conversation_id),
+            )
+            self._indexed_conversations[conversation_id] = (
+                conversation,
+                conversation.last_updated,
+            )
+
+        if len(self._indexed_conversations) != len(self.conversations):
+            for conversation_id in list(self._indexed_conversations):
+                if conversation_id not in self.conversations:
+                    self._unindex_conversation(conversation_id)
+                    del self._conversation_ranks[conversation_id]
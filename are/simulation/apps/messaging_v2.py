@@ -6,11 +6,13 @@
 
 
 import base64
+import bisect
 import os
 import re
 import textwrap
 import time
 import uuid
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
@@ -21,6 +23,8 @@ from rapidfuzz import process
 
 from are.simulation.apps.app import App, Protocol, ToolType
 from are.simulation.apps.sandbox_file_system import SandboxLocalFileSystem
+from are.simulation.apps.utils.sorted_messages import TimeSortedMessages, parse_date
+from are.simulation.apps.utils.text_index import TextIndex
 from are.simulation.apps.virtual_file_system import VirtualFileSystem
 from are.simulation.tool_utils import (
     AppTool,
@@ -88,6 +92,7 @@ class ConversationV2:
         self.participant_ids = list(set(self.participant_ids))
         if self.conversation_id is None or len(self.conversation_id) == 0:
             self.conversation_id = uuid.uuid4().hex
+        self._sorted_messages = TimeSortedMessages()
 
     @property
     def summary(self):
@@ -124,26 +129,37 @@ class ConversationV2:
     def get_messages_in_date_range(
         self, start_date: str | None, end_date: str | None
     ) -> list[MessageV2]:
-        start_timestamp = -float("inf")
-        end_timestamp = float("inf")
-        if start_date is not None:
-            start_timestamp = (
-                datetime.strptime(start_date, "%Y-%m-%d %H:%M:%S")
-                .replace(tzinfo=timezone.utc)
-                .timestamp()
-            )
-        if end_date is not None:
-            end_timestamp = (
-                datetime.strptime(end_date, "%Y-%m-%d %H:%M:%S")
-                .replace(tzinfo=timezone.utc)
-                .timestamp()
-            )
+        start_timestamp = (
+            -float("inf") if start_date is None else parse_date(start_date)
+        )
+        end_timestamp = float("inf") if end_date is None else parse_date(end_date)
         return [
             msg
             for msg in self.messages
             if start_timestamp <= int(msg.timestamp) <= end_timestamp
         ]
 
+    def get_sorted_messages(self) -> list[MessageV2]:
+        """
+        Get the messages sorted by timestamp, most recent first.
+        The returned list is cached and must not be modified.
+        """
+        return self._sorted_messages.get(self.messages)
+
+    def get_sorted_messages_in_date_range(
+        self, start_date: str | None, end_date: str | None
+    ) -> list[MessageV2]:
+        """
+        Same as `get_messages_in_date_range`, but sorted by timestamp, most recent first.
+        """
+        start_timestamp = (
+            -float("inf") if start_date is None else parse_date(start_date)
+        )
+        end_timestamp = float("inf") if end_date is None else parse_date(end_date)
+        return self._sorted_messages.get_in_range(
+            self.messages, start_timestamp, end_timestamp
+        )
+
 
 class MessagingAppMode(Enum):
     """
@@ -218,6 +234,24 @@ class MessagingAppV2(App):
         if self.current_user_id is not None and self.current_user_name is not None:
             self.id_to_name[self.current_user_id] = self.current_user_name
             self.name_to_id[self.current_user_name] = self.current_user_id
+        self._init_conversation_indexes()
+
+    def _init_conversation_indexes(self) -> None:
+        # Indexes of the conversations, updated lazily by _sync_conversation_indexes
+        # The text index is only built by the first search
+        self._search_index: TextIndex[str] | None = None
+        # Conversation, title, participants, number of messages and last update when indexed
+        self._indexed_conversations: dict[
+            str, tuple[ConversationV2, str | None, tuple[str, ...], int, float]
+        ] = {}
+        # Order in which the conversations were added, i.e. the order of the conversations dict
+        self._conversation_ranks: dict[str, int] = {}
+        self._next_conversation_rank = 0
+        # (-last_updated, rank, conversation_id), sorted from the most recent conversation
+        self._conversations_by_recency: list[tuple[float, int, str]] = []
+        self._conversations_by_participants: dict[frozenset[str], set[str]] = (
+            defaultdict(set)
+        )
 
     def connect_to_protocols(self, protocols: dict[Protocol, Any]) -> None:
         file_system = protocols.get(Protocol.FILE_SYSTEM)
@@ -262,6 +296,7 @@ class MessagingAppV2(App):
     def reset(self):
         super().reset()
         self.conversations = {}
+        self._init_conversation_indexes()
 
     def add_users(self, user_names: list[str]):
         for user_name in user_names:
@@ -555,11 +590,11 @@ class MessagingAppV2(App):
         """
         user_ids_set = set(user_ids)
         user_ids_set.add(self.current_user_id)  # type: ignore
-        ids = []
-        for conv_id, conversation in self.conversations.items():
-            if user_ids_set == set(conversation.participant_ids):
-                ids.append(conv_id)
-        return ids
+        self._sync_conversation_indexes()
+        return sorted(
+            self._conversations_by_participants.get(frozenset(user_ids_set), ()),
+            key=self._conversation_ranks.__getitem__,
+        )
 
     def apply_conversation_limits(
         self,
@@ -578,9 +613,7 @@ class MessagingAppV2(App):
         new_conversations = []
         for conversation in conversations:
             start_index = offset_recent_messages_per_conversation
-            sorted_messages = sorted(
-                conversation.messages, key=lambda msg: msg.timestamp, reverse=True
-            )
+            sorted_messages = conversation.get_sorted_messages()
             end_index = min(
                 len(conversation.messages),
                 offset_recent_messages_per_conversation
@@ -627,21 +660,22 @@ class MessagingAppV2(App):
         if offset > len(self.conversations):
             raise ValueError("Offset is larger than the number of conversations")
 
-        sorted_conversations = sorted(
-            self.conversations.values(),
-            key=lambda conv: conv.last_updated,
-            reverse=True,
-        )
+        self._sync_conversation_indexes()
 
         # Calculate the start and end indices based on the offset and view limit
         start_index = offset
         end_index = offset + limit
 
         # Ensure the end index does not exceed the list size
-        end_index = min(end_index, len(sorted_conversations))
+        end_index = min(end_index, len(self._conversations_by_recency))
 
         return self.apply_conversation_limits(
-            sorted_conversations[start_index:end_index],
+            [
+                self.conversations[conversation_id]
+                for _, _, conversation_id in self._conversations_by_recency[
+                    start_index:end_index
+                ]
+            ],
             offset_recent_messages_per_conversation,
             limit_recent_messages_per_conversation,
         )
@@ -840,10 +874,9 @@ class MessagingAppV2(App):
             raise ValueError("Offset must be positive")
 
         conversation = self.conversations[conversation_id]
-        messages = conversation.get_messages_in_date_range(min_date, max_date)
+        messages = conversation.get_sorted_messages_in_date_range(min_date, max_date)
         if offset > len(messages):  # type: ignore
             raise ValueError("Offset is larger than the number of messages")
-        messages.sort(key=lambda x: x.timestamp, reverse=True)
         conversation_length = len(messages)  # type: ignore
 
         start_index = offset
@@ -1005,7 +1038,8 @@ class MessagingAppV2(App):
         results = []
         query = query.lower()
 
-        for conversation in self.conversations.values():
+        candidates = self._get_search_index().candidates(query)
+        for conversation in self._get_candidate_conversations(candidates):
             if self._conversation_matches(conversation, query, min_date, max_date):
                 results.append(conversation.conversation_id)
 
@@ -1037,7 +1071,8 @@ class MessagingAppV2(App):
             query, re.IGNORECASE
         )  # Check if the query is a valid regex
         get_match = partial(re.search, compiled_query)  # Create a partial function
-        for conversation in self.conversations.values():
+        candidates = self._get_search_index().regex_candidates(query)
+        for conversation in self._get_candidate_conversations(candidates):
             if self._regex_conversation_matches(
                 conversation, get_match, min_date, max_date
             ):
@@ -1045,6 +1080,139 @@ class MessagingAppV2(App):
 
         return results
 
+    def _get_candidate_conversations(
+        self, candidates: set[str] | None
+    ) -> list[ConversationV2]:
+        # Candidates are returned in the order of the conversations dict, as a scan would
+        if candidates is None:
+            return list(self.conversations.values())
+        conversation_ids = sorted(candidates, key=self._conversation_ranks.__getitem__)
+        return [
+            self.conversations[conversation_id] for conversation_id in conversation_ids
+        ]
+
+    def _unindex_conversation(self, conversation_id: str) -> None:
+        conversation, _, participant_ids, _, last_updated = (
+            self._indexed_conversations.pop(conversation_id)
+        )
+        if self._search_index is not None:
+            self._search_index.remove(conversation_id)
+        participants = frozenset(participant_ids)
+        self._conversations_by_participants[participants].discard(conversation_id)
+        if not self._conversations_by_participants[participants]:
+            del self._conversations_by_participants[participants]
+        entry = (
+            -last_updated,
+            self._conversation_ranks[conversation_id],
+            conversation_id,
+        )
+        del self._conversations_by_recency[
+            bisect.bisect_left(self._conversations_by_recency, entry)
+        ]
+
+    def _sync_conversation_indexes(self) -> None:
+        """
+        Update the indexes of the conversations with the changes since the last read.
+        Conversations may be modified without going through the app, e.g. by scenarios appending
+        messages, so they are compared to the state they were indexed in. This is a pass over
+        the conversations, while messages are only indexed once.
+        """
+        for conversation_id, conversation in self.conversations.items():
+            state = (
+                conversation,
+                conversation.title,
+                tuple(conversation.participant_ids),
+                len(conversation.messages),
+                conversation.last_updated,
+            )
+            indexed_state = self._indexed_conversations.get(conversation_id)
+            if indexed_state is not None:
+                if indexed_state[0] is not conversation:
+                    self._unindex_conversation(conversation_id)
+                    indexed_state = None
+                elif indexed_state[1:] == state[1:]:
+                    continue
+            rank = self._conversation_ranks.get(conversation_id)
+            if rank is None:
+                rank = self._conversation_ranks[conversation_id] = (
+                    self._next_conversation_rank
+                )
+                self._next_conversation_rank += 1
+
+            if self._search_index is not None:
+                if indexed_state is None or indexed_state[3] > state[3]:
+                    self._search_index.remove(conversation_id)
+                    new_messages = conversation.messages
+                else:
+                    new_messages = conversation.messages[indexed_state[3] :]
+                self._index_conversation_texts(
+                    conversation_id, conversation, new_messages
+                )
+
+            # Participants index
+            if indexed_state is None or indexed_state[2] != state[2]:
+                if indexed_state is not None:
+                    participants = frozenset(indexed_state[2])
+                    self._conversations_by_participants[participants].discard(
+                        conversation_id
+                    )
+                    if not self._conversations_by_participants[participants]:
+                        del self._conversations_by_participants[participants]
+                self._conversations_by_participants[frozenset(state[2])].add(
+                    conversation_id
+                )
+
+            # Recency order
+            if indexed_state is None or indexed_state[4] != state[4]:
+                if indexed_state is not None:
+                    del self._conversations_by_recency[
+                        bisect.bisect_left(
+                            self._conversations_by_recency,
+                            (-indexed_state[4], rank, conversation_id),
+                        )
+                    ]
+                bisect.insort(
+                    self._conversations_by_recency,
+                    (-conversation.last_updated, rank, conversation_id),
+                )
+            self._indexed_conversations[conversation_id] = state
+
+        if len(self._indexed_conversations) != len(self.conversations):
+            for conversation_id in list(self._indexed_conversations):
+                if conversation_id not in self.conversations:
+                    self._unindex_conversation(conversation_id)
+                    del self._conversation_ranks[conversation_id]
+
+    def _index_conversation_texts(
+        self,
+        conversation_id: str,
+        conversation: ConversationV2,
+        messages: list[MessageV2],
+    ) -> None:
+        assert self._search_index is not None
+        self._search_index.extend(
+            conversation_id,
+            [
+                conversation.title,
+                *conversation.participant_ids,
+                *(
+                    message.content
+                    for message in messages
+                    if isinstance(message, MessageV2)
+                ),
+            ],
+        )
+
+    def _get_search_index(self) -> TextIndex[str]:
+        self._sync_conversation_indexes()
+        if self._search_index is None:
+            self._search_index = TextIndex()
+            for conversation_id, conversation in self.conversations.items():
+                self._index_conversation_texts(
+                    conversation_id, conversation, conversation.messages
+                )
+        return self._search_index
+
     def _conversation_matches(
         self,
         conversation: ConversationV2,
@@ -1068,7 +1236,9 @@ class MessagingAppV2(App):
         # Search in messages
         return any(
             isinstance(message, MessageV2) and query in message.content.lower()
-            for message in conversation.get_messages_in_date_range(min_date, max_date)
+            for message in conversation.get_sorted_messages_in_date_range(
+                min_date, max_date
+            )
         )
 
     def _regex_conversation_matches(
@@ -1094,7 +1264,9 @@ class MessagingAppV2(App):
             # Search in messages
         if any(
             isinstance(message, MessageV2) and get_match(message.content)
-            for message in conversation.get_messages_in_date_range(min_date, max_date)
+            for message in conversation.get_sorted_messages_in_date_range(
+                min_date, max_date
+            )
         ):
             return True
         return False
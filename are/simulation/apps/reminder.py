@@ -5,6 +5,9 @@
 # the root directory of this source tree.
 
 
+import bisect
+import heapq
+import itertools
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 
@@ -46,6 +49,102 @@ class ReminderApp(App):
             self.max_future_datetime = datetime.fromtimestamp(
                 self.time_manager.time(), tz=timezone.utc
             ) + timedelta(weeks=12)
+        self._init_due_index()
+
+    def _init_due_index(self) -> None:
+        # Reminders registered in the due index, which must be the ones of the reminders dict
+        self._indexed_reminders: dict[str, Reminder] = {}
+        # Order in which the reminders were added, i.e. the order of the reminders dict
+        self._reminder_ranks: dict[str, int] = {}
+        self._next_reminder_rank = 0
+        # Breaks ties between entries of a reminder and of the reminder it replaced
+        self._entry_counter = itertools.count()
+        # (due timestamp, rank, count, reminder_id, reminder) of the reminders not due at the last check
+        self._due_heap: list[tuple[float, int, int, str, Reminder]] = []
+        # (rank, count, reminder_id, reminder) of the reminders due at the last check, sorted
+        self._due: list[tuple[int, int, str, Reminder]] = []
+        self._last_due_check_time = -float("inf")
+
+    def _index_reminder(self, reminder_id: str) -> None:
+        reminder = self.reminders[reminder_id]
+        if reminder_id not in self._reminder_ranks:
+            self._reminder_ranks[reminder_id] = self._next_reminder_rank
+            self._next_reminder_rank += 1
+        # Entries of a replaced reminder are skipped lazily
+        self._indexed_reminders[reminder_id] = reminder
+        heapq.heappush(
+            self._due_heap,
+            (
+                reminder.due_datetime.timestamp(),
+                self._reminder_ranks[reminder_id],
+                next(self._entry_counter),
+                reminder_id,
+                reminder,
+            ),
+        )
+
+    def _unindex_reminder(self, reminder_id: str) -> None:
+        # Entries of a deleted reminder are skipped lazily
+        self._indexed_reminders.pop(reminder_id, None)
+        self._reminder_ranks.pop(reminder_id, None)
+
+    def _is_indexed(self, reminder_id: str, reminder: Reminder) -> bool:
+        return self._indexed_reminders.get(reminder_id) is reminder
+
+    def _update_due_index(self) -> None:
+        """
+        Move the reminders which became due since the last check from the heap to the due list.
+        The index is rebuilt if reminders were added or removed without going through the app,
+        or if time went backwards.
+        """
+        current_time = self.time_manager.time()
+        if (
+            len(self._indexed_reminders) != len(self.reminders)
+            or current_time < self._last_due_check_time
+        ):
+            self._init_due_index()
+            for reminder_id in self.reminders:
+                self._index_reminder(reminder_id)
+        self._last_due_check_time = current_time
+        while self._due_heap and self._due_heap[0][0] <= current_time:
+            _, rank, count, reminder_id, reminder = heapq.heappop(self._due_heap)
+            if self._is_indexed(reminder_id, reminder):
+                bisect.insort(self._due, (rank, count, reminder_id, reminder))
+        # Drop the deleted reminders from the due list
+        self._due = [
+            entry for entry in self._due if self._is_indexed(entry[2], entry[3])
+        ]
+
+    def next_due_time(self) -> float | None:
+        """
+        Get the due timestamp of the earliest reminder which was not notified yet.
+        :returns: The timestamp, which may be in the past, or None if all the reminders were notified
+        """
+        self._update_due_index()
+        due_times = [
+            reminder.due_datetime.timestamp()
+            for _, _, _, reminder in self._due
+            if not reminder.already_notified
+        ]
+        if due_times:
+            return min(due_times)
+        # Drop the deleted reminders from the top of the heap
+        while self._due_heap and not self._is_indexed(*self._due_heap[0][3:]):
+            heapq.heappop(self._due_heap)
+        if not self._due_heap:
+            return None
+        if not self._due_heap[0][4].already_notified:
+            return self._due_heap[0][0]
+        # Reminders are normally notified once due, fall back to a scan otherwise
+        return min(
+            (
+                due_time
+                for due_time, _, _, reminder_id, reminder in self._due_heap
+                if self._is_indexed(reminder_id, reminder)
+                and not reminder.already_notified
+            ),
+            default=None,
+        )
 
     @app_tool()
     @event_registered(operation_type=OperationType.WRITE)
@@ -89,6 +188,7 @@ class ReminderApp(App):
             repetition_unit=repetition_unit,
             repetition_value=repetition_value,
         )
+        self._index_reminder(reminder_id)
         # add reminder repetitions based on the repetition interval
         count_repeat = 0
         next_reminder_id = reminder_id
@@ -161,6 +261,7 @@ class ReminderApp(App):
                 repetition_unit=reminder.repetition_unit,
                 repetition_value=reminder.repetition_value,
             )
+            self._index_reminder(new_reminder_id)
             return new_reminder_id
         else:
             return None
@@ -177,12 +278,14 @@ class ReminderApp(App):
             raise ValueError(f"Reminder {reminder_id} not found.")
         reminder = self.reminders[reminder_id]
         del self.reminders[reminder_id]
+        self._unindex_reminder(reminder_id)
         if reminder.repetition_unit and reminder.repetition_value:
             # delete all the repetitions of the reminder
             for rep_count in range(1, self.max_reminder_repetitions + 1):
                 r_id = f"{reminder_id}_rep_{rep_count}"
                 if r_id in self.reminders:
                     del self.reminders[r_id]
+                    self._unindex_reminder(r_id)
 
     @app_tool()
     @event_registered(operation_type=OperationType.WRITE)
@@ -191,6 +294,7 @@ class ReminderApp(App):
         Delete all reminders from the system.
         """
         self.reminders.clear()
+        self._init_due_index()
 
     @app_tool(llm_formatter=lambda x: "\n\n".join([str(reminder) for reminder in x]))
     @event_registered(operation_type=OperationType.READ)
@@ -199,12 +303,8 @@ class ReminderApp(App):
         Get all the due reminders.
         :return: List of due Reminder
         """
-        due_reminders = []
-        current_time = self.time_manager.time()
-        for reminder_id, reminder in self.reminders.items():
-            if reminder.due_datetime.timestamp() <= current_time:
-                due_reminders.append(reminder)
-        return due_reminders
+        self._update_due_index()
+        return [reminder for _, _, _, reminder in self._due]
 
     @app_tool(llm_formatter=lambda x: "\n\n".join([str(reminder) for reminder in x]))
     @event_registered(operation_type=OperationType.READ)
@@ -5,6 +5,8 @@
 # the root directory of this source tree.
 
 
+import io
+import itertools
 import logging
 import os
 import random
@@ -19,12 +21,16 @@ from fsspec import AbstractFileSystem
 from fsspec.asyn import functools
 
 from are.simulation.apps.app import App, Protocol
+from are.simulation.apps.utils.directory_walker import CachedDirectoryWalker
+from are.simulation.apps.utils.document_cache import DOCUMENT_CONVERSION_CACHE
 from are.simulation.apps.utils.fallback_file_system import FallbackFileSystem
+from are.simulation.apps.utils.layered_file_system import LayeredFileSystem
 from are.simulation.config import (
     ARE_SIMULATION_SANDBOX_PATH,
     DEMO_FS_DIR,
     DEMO_FS_PATH,
     FS_PATH,
+    LAYERED_SANDBOX_FS,
 )
 from are.simulation.core.mdconvert import MarkdownConverter
 from are.simulation.tool_utils import OperationType, app_tool
@@ -70,6 +76,8 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
         - Directories can be populated programmatically using specified population methods
         - Operations attempting to access paths outside the sandbox will raise a PermissionError
         - File system state can be saved and reloaded for scenario-based testing or persistence
+        - In layered mode, loaded directories are shared read-only base layers and only the
+          modified files are written to the temporary directory
     """
 
     # We make sure to mark this FS as non cacheable otherwise when running multiple scenarios in parallel
@@ -81,7 +89,18 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
         name: str | None = None,
         sandbox_dir: str | None = None,
         state_directory: str = DEMO_FS_PATH,
+        layered: bool | None = None,
+        stream_documents: bool = False,
     ):
+        """
+        :param name: The name of the app
+        :param sandbox_dir: The directory in which to create the temporary directory
+        :param state_directory: The directory backing the files of the loaded states
+        :param layered: Whether to use a LayeredFileSystem instead of a FallbackFileSystem,
+        defaults to the ARE_SIMULATION_LAYERED_FS environment variable
+        :param stream_documents: Whether read_document stops converting plain text documents
+        after max_lines, in which case the total number of lines is not reported
+        """
         super().__init__(name, sandbox_dir)
         # Create a temporary sub-directory.
         # Locate it inside the session's sandbox directory if that exists, otherwise use the default location.
@@ -90,13 +109,20 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
             prefix="are_simulation_fs_sandbox_",
         )
 
-        # Create the fallback filesystem wrapper around the local filesystem
-        self.local_fs: FallbackFileSystem = FallbackFileSystem(
+        if layered is None:
+            layered = LAYERED_SANDBOX_FS
+        # Create the fallback or layered filesystem wrapper around the local filesystem
+        self.local_fs: FallbackFileSystem | LayeredFileSystem = (
+            LayeredFileSystem if layered else FallbackFileSystem
+        )(
             fsspec.filesystem("file"),
             base_root=self.tmpdir,
         )
 
         self.state_directory = state_directory
+        self.stream_documents = stream_documents
+        # Listings of the temporary directory, shared by get_state, tree and sampling
+        self._walker = CachedDirectoryWalker()
 
         # Make sure the temp dir exists
         self.local_fs.makedirs(self.tmpdir, exist_ok=True)
@@ -132,35 +158,27 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
         return full_path
 
     def get_state(self) -> dict[str, Any]:
-        with EventRegisterer.disable():
-
-            def build_tree(path: str = "/") -> dict[str, Any]:
-                # For the root path, use empty name
-                if path == "/":
-                    name = ""
-                else:
-                    name = os.path.basename(path)
-
-                # Use the SandboxFileSystem API to check if it's a directory
-                path_info = self.info(path)
-                is_directory = path_info["type"] == "directory"
-
-                if is_directory:
-                    children = []
-                    # Use the SandboxFileSystem API to list directory contents
-                    items = self.ls(path, detail=True)
-
-                    for item in items:
-                        # Get the path relative to the sandbox root
-                        item_path = item["name"]
-                        children.append(build_tree(item_path))
+        if isinstance(self.local_fs, LayeredFileSystem):
+            # Only the directories modified in the overlay are listed
+            return {
+                "files": self.local_fs.build_tree(self.tmpdir),
+                "tmpdir": self.tmpdir,
+            }
 
-                    return {"name": name, "type": "directory", "children": children}
-                else:
-                    return {"name": name, "type": "file"}
+        # The fallback placeholders mirror the files in the temporary directory, which
+        # can be listed directly. The root node has an empty name.
+        files = self._walker.get_tree(self.tmpdir)
+        files["name"] = ""
+        # Only include the files structure, not the tmpdir
+        return {"files": files, "tmpdir": self.tmpdir}
 
-            # Only include the files structure, not the tmpdir
-            return {"files": build_tree("/"), "tmpdir": self.tmpdir}
+    def _walk_tmpdir(self) -> Iterable[tuple[str, list[str], list[str]]]:
+        """
+        Walk the files of the sandbox top-down, with the real paths of the directories.
+        """
+        if isinstance(self.local_fs, LayeredFileSystem):
+            return self.local_fs.walk(self.tmpdir)  # type: ignore
+        return self._walker.walk(self.tmpdir)
 
     def load_state(self, state_dict: dict[str, Any]):
         with EventRegisterer.disable():
@@ -169,34 +187,50 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
             self.local_fs.mkdir(self.tmpdir)
 
             # Set to track expected paths
-            def restore_tree(node: dict[str, Any], parent_path: str) -> set[str]:
+            def restore_tree(
+                node: dict[str, Any], parent_path: str, create: bool = True
+            ) -> set[str]:
                 node_name = node["name"]
                 node_type = node["type"]
                 node_path = os.path.join(parent_path, node_name)
 
                 paths = set()
                 if node_type == "directory":
-                    if not self.exists(node_path):
+                    if create and not self.exists(node_path):
                         self.mkdir(node_path)
                     if "children" in node:
                         for child in node["children"]:
-                            paths.update(restore_tree(child, node_path))
+                            paths.update(restore_tree(child, node_path, create))
                 elif node_type == "file":
                     # For files, we just create an empty placeholder
                     # The actual content will be copied lazily when accessed
-                    if not self.exists(node_path):
+                    if create and not self.exists(node_path):
                         with self.open(node_path, "w") as _:
                             pass
                     paths = {node_path}
 
                 return paths
 
-            # Restore the tree structure
-            expected_paths = set()
+            children = []
             if "files" in state_dict and "children" in state_dict["files"]:
                 # the first node in the state_dict is the root node, so we ignore it's name, we use '/' instead
-                for child in state_dict["files"]["children"]:
-                    expected_paths.update(restore_tree(child, "/"))
+                children = state_dict["files"]["children"]
+
+            if isinstance(self.local_fs, LayeredFileSystem):
+                # Mount the files of the state first, so that placeholders are only
+                # created for the paths missing from the state directory
+                expected_paths = set()
+                for child in children:
+                    expected_paths.update(restore_tree(child, "/", create=False))
+                self.local_fs.set_fallback_root(self.state_directory, expected_paths)
+                for child in children:
+                    restore_tree(child, "/")
+                return
+
+            # Restore the tree structure
+            expected_paths = set()
+            for child in children:
+                expected_paths.update(restore_tree(child, "/"))
 
             # We use the demo_filesystem to back the files stored in the state
             # Set the fallback root in our FallbackFileSystem wrapper
@@ -469,29 +503,47 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
             tree("/path/to/directory")
         """
         with EventRegisterer.disable():
+            real_path = self._validate_path(path)
+            # Directories of the temporary directory are listed directly
+            use_walker = not isinstance(
+                self.local_fs, LayeredFileSystem
+            ) and os.path.isdir(real_path)
+
+            def _list(current_path) -> list[tuple[str, str, bool]]:
+                # Sorted (name, path, is directory) of the items in the directory
+                if use_walker:
+                    return [
+                        (name, os.path.join(current_path, name), is_dir)
+                        for name, is_dir in sorted(self._walker.list_dir(current_path))
+                    ]
+                items = self.ls(current_path, detail=False)
+                return [
+                    (os.path.basename(item), item, self.isdir(item))  # type: ignore
+                    for item in sorted(items)  # type: ignore
+                ]
 
             def _build_tree(current_path, current_level, tree_str):
                 # List items in the directory
-                items = self.ls(current_path, detail=False)
+                items = _list(current_path)
                 # Iterate through each item
-                for i, item in enumerate(sorted(items)):  # type: ignore
+                for i, (name, item, is_dir) in enumerate(items):
                     # Display indentation and connector symbols
                     indent = "    " * current_level
                     connector = "└── " if i == len(items) - 1 else "├── "
-                    name = os.path.basename(item)
 
                     tree_str += f"{indent}{connector}{name}\n"
 
                     # If item is a directory, recursively build its contents
-                    if self.isdir(item):
+                    if is_dir:
                         tree_str = _build_tree(item, current_level + 1, tree_str)
                 return tree_str
 
-            tree_str = _build_tree(path, 0, f"{os.path.basename(path) or '/'}\n")
-
-            # Build the tree string from the validated path, starting at level 0
-            _build_tree(path, 0, f"{os.path.basename(path)}\n")
-            return tree_str
+            # Build the tree string starting at level 0
+            return _build_tree(
+                real_path if use_walker else path,
+                0,
+                f"{os.path.basename(path) or '/'}\n",
+            )
 
     def populate(self, pop_method: Callable):
         pop_method(self)
@@ -503,7 +555,7 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
         """
         with EventRegisterer.disable():
             # Walk through all directories and files in the temporary directory
-            for root, _, files in self.local_fs.walk(self.tmpdir):
+            for root, _, files in self._walk_tmpdir():
                 for file in files:
                     # Construct the full path to the file
                     full_path = os.path.join(root, file)  # type: ignore
@@ -543,7 +595,7 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
         """
         with EventRegisterer.disable():
             # Walk through all directories and files in the temporary directory
-            for root, _, _ in self.local_fs.walk(self.tmpdir):
+            for root, _, _ in self._walk_tmpdir():
                 # Yield the current directory
                 assert isinstance(root, str)
                 yield root
@@ -563,6 +615,8 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
     @event_registered(operation_type=OperationType.WRITE)
     def set_permissions(self, path, permission):
         path = self._validate_path(path)
+        if isinstance(self.local_fs, LayeredFileSystem):
+            self.local_fs.copy_up(path)
         os.chmod(path, permission)
 
     def save_file_system_state(self, state_name: str):
@@ -582,6 +636,11 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
             )
         os.makedirs(target_path)
 
+        if isinstance(self.local_fs, LayeredFileSystem):
+            # The temporary directory only holds the modified files
+            self.local_fs.export(target_path)
+            return
+
         # Copy contents of self.tmpdir to target_path
         for item in os.listdir(self.tmpdir):
             s = os.path.join(self.tmpdir, item)
@@ -632,6 +691,11 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
         :param path: path to the directory containing the file system.
         :param target_dir: target directory to load the files to.
         """
+        if isinstance(self.local_fs, LayeredFileSystem):
+            # Share the directory as a read-only base layer instead of copying it
+            self.local_fs.mount(from_dir, to_dir)
+            return
+
         # Ensure the target directory exists
         target_path = os.path.join(self.tmpdir, to_dir)
         os.makedirs(target_path, exist_ok=True)
@@ -673,6 +737,16 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
         # Get file extension for the converter
         _, ext = os.path.splitext(file_path)
 
+        # Plain text documents can be converted up to the lines to return only
+        stream_lines = (
+            max_lines
+            if self.stream_documents
+            and max_lines is not None
+            and max_lines > 0
+            and self._md_converter.is_streamable(ext)
+            else None
+        )
+
         # Read the file content through fsspec without materializing to disk
         try:
             with self.local_fs.open(real_path, "rb") as file_handle:
@@ -683,23 +757,23 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
                     raise ValueError(f"File is empty: {file_path}")
 
                 file_handle.seek(0)  # Reset to beginning
-                # Convert using the new IO-based interface
                 # Cast to IO[bytes] for type compatibility
                 file_io = cast("IO[bytes]", file_handle)
-                result = self._md_converter.convert_io(file_io, file_extension=ext)
+                if stream_lines is not None:
+                    return self._read_first_lines(file_io, ext, stream_lines)
+                content_bytes = file_io.read()
+                # Documents are often read several times, convert them only once
+                content = DOCUMENT_CONVERSION_CACHE.get_or_convert(
+                    content_bytes,
+                    ext,
+                    lambda: self._convert_document(content_bytes, ext),
+                )
         except Exception as e:
             # If we can't read the file, it doesn't exist or there's an error
             raise FileNotFoundError(
                 f"File not found or could not be read: {file_path}. Error: {str(e)}"
             )
 
-        # Extract the text content
-        content = result.text_content
-
-        # Add title if available
-        if hasattr(result, "title") and result.title:
-            content = f"# {result.title}\n\n{content}"
-
         # Truncate to max_lines if specified
         if max_lines is not None and max_lines > 0:
             lines = content.split("\n")
@@ -710,6 +784,46 @@ class SandboxLocalFileSystem(App, AbstractFileSystem, metaclass=FinalMeta):
 
         return content
 
+    def _read_first_lines(self, file_io: IO[bytes], ext: str, max_lines: int) -> str:
+        """
+        Convert the first lines of a streamable document, without reading the rest of it.
+
+        :param file_io: The document, opened in binary mode
+        :param ext: The file extension of the document
+        :param max_lines: Maximum number of lines to return
+        :returns: The first lines of the document content
+        """
+        lines_iter = self._md_converter.stream_lines(file_io, ext)
+        try:
+            # Convert one more line to know whether the document is truncated
+            lines = list(itertools.islice(lines_iter, max_lines + 1))
+        finally:
+            lines_iter.close()
+        # The total number of lines is unknown as the rest of the document is not read
+        if len(lines) > max_lines:
+            return (
+                "\n".join(lines[:max_lines])
+                + f"\n\n[Document truncated. Showing the first {max_lines} lines]"
+            )
+        return "\n".join(lines)
+
+    def _convert_document(self, content_bytes: bytes, ext: str) -> str:
+        """
+        Convert a document to text, with its title if it has one.
+
+        :param content_bytes: The content of the document
+        :param ext: The file extension of the document
+        :returns: The document content as structured text
+        """
+        result = self._md_converter.convert_io(
+            io.BytesIO(content_bytes), file_extension=ext
+        )
+        content = result.text_content
+        # Add title if available
+        if hasattr(result, "title") and result.title:
+            content = f"# {result.title}\n\n{content}"
+        return content
+
 
 class Files(SandboxLocalFileSystem):
     """
@@ -738,5 +852,13 @@ class Files(SandboxLocalFileSystem):
         - File system state can be saved and reloaded for scenario-based testing or persistence
     """
 
-    def __init__(self, name: str | None = None, sandbox_dir: str | None = None):
-        super().__init__(name, sandbox_dir)
+    def __init__(
+        self,
+        name: str | None = None,
+        sandbox_dir: str | None = None,
+        layered: bool | None = None,
+        stream_documents: bool = False,
+    ):
+        super().__init__(
+            name, sandbox_dir, layered=layered, stream_documents=stream_documents
+        )
@@ -27,6 +27,8 @@ class ProductListResult(TypedDict):
 import logging
 
 from are.simulation.apps.app import App
+from are.simulation.apps.utils.product_catalog import ProductCatalog
+from are.simulation.apps.utils.text_index import TextIndex
 from are.simulation.tool_utils import app_tool, data_tool, env_tool
 from are.simulation.types import EventType, disable_events, event_registered
 from are.simulation.utils import get_state_dict, serialize_field, type_check
@@ -139,9 +141,35 @@ class ShoppingApp(App):
     # Note that the key is the item_id, not the product_id.
     # Each discount code is a dictionary with key being the code and value the discount percentage.
     discount_codes: dict[str, dict[str, float]] = field(default_factory=dict)
+    # search_product historically returned the last product with a given name once per
+    # product with that name, set to False to return each matching product
+    collapse_duplicate_names: bool = True
 
     def __post_init__(self):
         super().__init__(self.name)
+        self._search_index: TextIndex[str] | None = None
+        self._catalog: ProductCatalog | None = None
+
+    def _get_catalog(self) -> ProductCatalog:
+        # Rebuild the catalog if products were added or removed without going through the app
+        if self._catalog is None or not self._catalog.is_current(self.products):
+            self._catalog = ProductCatalog(self.products)
+        return self._catalog
+
+    def _get_search_index(self) -> TextIndex[str]:
+        # Every method editing products re-indexes them, rebuild the index if the dict was
+        # replaced or products were added or removed without going through the app
+        if self._search_index is None or not self._search_index.is_current(
+            self.products
+        ):
+            self._search_index = TextIndex(records=self.products)
+            for product_id in self.products:
+                self._index_product(product_id)
+        return self._search_index
+
+    def _index_product(self, product_id: str) -> None:
+        if self._search_index is not None:
+            self._search_index.add(product_id, [self.products[product_id].name])
 
     def get_state(self) -> dict[str, Any] | None:
         state = get_state_dict(self, ["products", "cart", "discount_codes"])
@@ -179,7 +207,14 @@ class ShoppingApp(App):
                 product_id=products[p]["product_id"],
             )
             product.load_state(products[p])
+            replaced = p in self.products
             self.products[p] = product
+            self._index_product(p)
+            if replaced:
+                # The replaced product keeps its position, with a possibly different name
+                self._catalog = None
+            elif self._catalog is not None:
+                self._catalog.add_product(p)
 
     def load_discount_codes_from_dict(self, discount_codes):
         try:
@@ -214,6 +249,8 @@ class ShoppingApp(App):
     def reset(self):
         super().reset()
         self.products = {}
+        self._search_index = None
+        self._catalog = None
         self.cart = {}
         self.orders = {}
         self.discount_codes = {}
@@ -222,15 +259,15 @@ class ShoppingApp(App):
         """
         given an item_id, return the item details
         """
-        for product_id in self.products:
-            for it_id in self.products[product_id].variants:
-                if it_id == item_id:
-                    return {
-                        "name": self.products[product_id].name,
-                        "product_id": product_id,
-                        **serialize_field(self.products[product_id].variants[item_id]),
-                    }
-        return {}
+        entry = self._get_catalog().get_item(item_id)
+        if entry is None:
+            return {}
+        product_id, item = entry
+        return {
+            "name": self.products[product_id].name,
+            "product_id": product_id,
+            **serialize_field(item),
+        }
 
     @type_check
     @data_tool()
@@ -246,6 +283,9 @@ class ShoppingApp(App):
         if product_id in self.products:
             raise ValueError("Product already exists")
         self.products[product_id] = Product(name=name, product_id=product_id)
+        self._index_product(product_id)
+        if self._catalog is not None:
+            self._catalog.add_product(product_id)
         return product_id
 
     @type_check
@@ -270,12 +310,15 @@ class ShoppingApp(App):
         item_id: str = uuid.uuid4().hex
         if product_id not in self.products:
             raise ValueError("Product does not exist")
-        self.products[product_id].variants[item_id] = Item(
+        item = Item(
             item_id=item_id,
             options=options,
             available=available,
             price=price,
         )
+        self.products[product_id].variants[item_id] = item
+        if self._catalog is not None and self._catalog.is_current(self.products):
+            self._catalog.add_item(product_id, item)
         return item_id
 
     @type_check
@@ -298,17 +341,15 @@ class ShoppingApp(App):
         if new_price is None and new_availability is None:
             raise ValueError("No update provided")
 
-        for product_id in self.products:
-            for it_id in self.products[product_id].variants:
-                if it_id == item_id:
-                    item = self.products[product_id].variants[item_id]
-                    if new_price is not None:
-                        item.price = new_price
-                    if new_availability is not None:
-                        item.available = new_availability
-                    self.products[product_id].variants[item_id] = item
-                    return item_id
-        raise ValueError(f"Item with id {item_id} does not exist")
+        entry = self._get_catalog().get_item(item_id)
+        if entry is None:
+            raise ValueError(f"Item with id {item_id} does not exist")
+        _, item = entry
+        if new_price is not None:
+            item.price = new_price
+        if new_availability is not None:
+            item.available = new_availability
+        return item_id
 
     @type_check
     @data_tool()
@@ -321,13 +362,7 @@ class ShoppingApp(App):
         :param discount_code: discount code is the dictionary with key being the code and value the discount percentage.
         :return: success message if successful, otherwise raise ValueError.
         """
-        found = False
-        for item in self.products:
-            if item_id in self.products[item].variants:
-                found = True
-                break
-
-        if found is False:
+        if self._get_catalog().get_item(item_id) is None:
             raise ValueError(f"Item {item_id} does not exist in the inventory.")
 
         if item_id not in self.discount_codes:
@@ -380,12 +415,12 @@ class ShoppingApp(App):
         :returns: product details, dictionary of name to product_id, limited to the specified offset and limit, with additional metadata about the range of products retrieved and total number of products.
         """
         products = self.products
+        catalog = self._get_catalog()
+        # Products with the same name are listed once, with the id of the last one
         product_dict = {
-            product.name: product.product_id for product in products.values()
+            name: catalog.get_product_id(name)
+            for name in catalog.get_sorted_names(offset, offset + limit)
         }
-        start_index = offset
-        end_index = offset + limit
-        product_dict = dict(sorted(product_dict.items())[start_index:end_index])
         return {
             "products": product_dict,
             "metadata": {
@@ -425,17 +460,28 @@ class ShoppingApp(App):
         :param limit: number of products to list, default is 10.
         :returns: List of products with the given name, limited to the specified offset and limit.
         """
-        all_products = list(self.products.values())
-        names = []
-        product_name_to_id = {}
-        for p in all_products:
-            names.append(p.name)
-            product_name_to_id[p.name] = p.product_id
+        query = product_name.lower()
+        candidates = self._get_search_index().candidates(query)
+        catalog = self._get_catalog()
+        if candidates is None:
+            product_ids = list(self.products)
+        else:
+            product_ids: list[str] = sorted(
+                (
+                    product_id
+                    for product_id in candidates
+                    if product_id in self.products
+                ),
+                key=catalog.get_position,
+            )
 
         ret_products = []
-        for name in names:
-            if product_name.lower() in name.lower():
-                ret_products.append(self.products[product_name_to_id[name]])
+        for product_id in product_ids:
+            product = self.products[product_id]
+            if query in product.name.lower():
+                if self.collapse_duplicate_names:
+                    product = self.products[catalog.get_product_id(product.name)]
+                ret_products.append(product)
 
         start_index = offset
         end_index = offset + limit
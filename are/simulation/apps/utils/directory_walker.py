@@ -0,0 +1,161 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import os
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+# Directories modified less than this before being listed are listed again on next use,
+# as a modification in the same clock tick would not change their mtime
+RACY_WINDOW_NS = 1_000_000_000
+
+
+def copy_tree(tree: dict[str, Any]) -> dict[str, Any]:
+    """
+    Copy a directory tree in the SandboxLocalFileSystem.get_state format.
+
+    :param tree: The tree
+    :returns: A copy which shares no dict or list with the tree
+    """
+    if "children" not in tree:
+        return dict(tree)
+    return {**tree, "children": [copy_tree(child) for child in tree["children"]]}
+
+
+@dataclass
+class DirectoryListing:
+    mtime_ns: int
+    scanned_ns: int
+    # Names of the entries in scandir order, and whether they are directories
+    entries: list[tuple[str, bool]]
+    # Tree of the directory, valid while neither it nor its subdirectories change
+    tree: dict[str, Any] | None = None
+
+
+class CachedDirectoryWalker:
+    """
+    Walks local directory trees with os.scandir, caching the listing of each directory until
+    its mtime changes.
+
+    Listing an unchanged tree again only costs one stat per directory. Only the names and
+    types of the entries are cached, not the stats of the files.
+    """
+
+    def __init__(self, racy_window_ns: int = RACY_WINDOW_NS):
+        """
+        :param racy_window_ns: Directories modified less than this before being listed are
+        listed again on next use
+        """
+        self.racy_window_ns = racy_window_ns
+        self._listings: dict[str, DirectoryListing] = {}
+        self._lock = threading.RLock()
+
+    def _get_listing(self, path: str) -> tuple[DirectoryListing, bool]:
+        """
+        Get the listing of a directory, from the cache if it did not change.
+
+        :param path: Path of the directory
+        :returns: The listing, and whether the directory was listed again
+        """
+        mtime_ns = os.stat(path).st_mtime_ns
+        listing = self._listings.get(path)
+        if (
+            listing is not None
+            and listing.mtime_ns == mtime_ns
+            and mtime_ns < listing.scanned_ns - self.racy_window_ns
+        ):
+            return listing, False
+
+        scanned_ns = time.time_ns()
+        entries = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    entries.append((entry.name, entry.is_dir(follow_symlinks=False)))
+                except OSError:
+                    # The entry was removed while listing
+                    continue
+        if listing is not None:
+            # Forget the subdirectories which were removed
+            subdirs = {name for name, is_dir in entries if is_dir}
+            for name, is_dir in listing.entries:
+                if is_dir and name not in subdirs:
+                    self._forget(os.path.join(path, name))
+        listing = DirectoryListing(mtime_ns, scanned_ns, entries)
+        self._listings[path] = listing
+        return listing, True
+
+    def _forget(self, path: str) -> None:
+        prefix = path + os.sep
+        for key in [
+            key for key in self._listings if key == path or key.startswith(prefix)
+        ]:
+            del self._listings[key]
+
+    def list_dir(self, path: str) -> list[tuple[str, bool]]:
+        """
+        List a directory.
+
+        :param path: Path of the directory
+        :returns: The names of the entries in scandir order, and whether they are directories
+        """
+        with self._lock:
+            return list(self._get_listing(path)[0].entries)
+
+    def walk(self, path: str) -> Iterator[tuple[str, list[str], list[str]]]:
+        """
+        Walk a directory tree top-down, in the order of fsspec's walk.
+
+        :param path: Path of the root directory
+        :returns: An iterator of (directory path, subdirectory names, file names)
+        """
+        entries = self.list_dir(path)
+        dirs = [name for name, is_dir in entries if is_dir]
+        yield path, dirs, [name for name, is_dir in entries if not is_dir]
+        for name in dirs:
+            yield from self.walk(os.path.join(path, name))
+
+    def get_tree(self, path: str) -> dict[str, Any]:
+        """
+        Get the tree of a directory, in the SandboxLocalFileSystem.get_state format.
+
+        :param path: Path of the root directory
+        :returns: The tree, named after the directory, which the caller may modify
+        """
+        with self._lock:
+            return copy_tree(self._get_tree(path)[0])
+
+    def _get_tree(self, path: str) -> tuple[dict[str, Any], bool]:
+        listing, changed = self._get_listing(path)
+        subtrees = {}
+        for name, is_dir in listing.entries:
+            if is_dir:
+                try:
+                    subtree, subtree_changed = self._get_tree(os.path.join(path, name))
+                except FileNotFoundError:
+                    # The directory was removed since the listing
+                    subtree, subtree_changed = None, True
+                subtrees[name] = subtree
+                changed = changed or subtree_changed
+
+        if not changed and listing.tree is not None:
+            return listing.tree, False
+        children = []
+        for name, is_dir in listing.entries:
+            if not is_dir:
+                children.append({"name": name, "type": "file"})
+            elif subtrees[name] is not None:
+                children.append(subtrees[name])
+        listing.tree = {
+            "name": os.path.basename(path),
+            "type": "directory",
+            "children": children,
+        }
+        return listing.tree, True
@@ -0,0 +1,109 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import logging
+import os
+from pathlib import Path
+from typing import Callable
+
+import xxhash
+
+from are.simulation.core.mdconvert import CONVERTER_VERSION
+from are.simulation.utils.lru_store import LRUDiskStore
+
+logger = logging.getLogger(__name__)
+
+# Maximum total size of the converted documents kept in memory
+DEFAULT_DOCUMENT_CACHE_BYTES = 128 * 1024 * 1024
+
+
+def get_document_key(content: bytes, file_extension: str) -> str:
+    """
+    Get the cache key of the conversion of a document.
+
+    :param content: The content of the document
+    :param file_extension: The file extension the document is converted with
+    :returns: A key covering the content, the extension and the converter version
+    """
+    digest = xxhash.xxh3_128(content).hexdigest()
+    extension = file_extension.lower().lstrip(".") or "none"
+    return f"{digest}-{extension}-v{CONVERTER_VERSION}"
+
+
+class DocumentConversionCache:
+    """
+    Cache of converted documents keyed by content hash, file extension and converter version.
+
+    The converted texts are kept in an in-memory LRU bounded by their total size in bytes, and
+    optionally stored on disk so that they are shared between processes, e.g. by scenarios
+    which load the same file system universe. Failed conversions are not cached.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_DOCUMENT_CACHE_BYTES,
+        cache_dir: str | Path | None = None,
+    ):
+        self._store: LRUDiskStore[str] = LRUDiskStore(
+            max_weight=max_bytes,
+            cache_dir=cache_dir,
+            suffix=".md",
+            weigh=lambda text: len(text.encode("utf-8")),
+            description="document",
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    @property
+    def max_bytes(self) -> int:
+        return self._store.max_weight
+
+    @property
+    def cache_dir(self) -> Path | None:
+        return self._store.cache_dir
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the texts kept in memory."""
+        return self._store.weight
+
+    def clear(self) -> None:
+        self._store.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_convert(
+        self, content: bytes, file_extension: str, convert: Callable[[], str]
+    ) -> str:
+        """
+        Get the converted text of a document, converting it only on a cache miss.
+
+        :param content: The content of the document
+        :param file_extension: The file extension the document is converted with
+        :param convert: Converts the document, called on a cache miss
+        :returns: The converted text
+        """
+        key = get_document_key(content, file_extension)
+        text = self._store.get(key)
+        if text is not None:
+            self.hits += 1
+            return text
+        self.misses += 1
+        text = convert()
+        self._store.put(key, text)
+        return text
+
+
+def _get_document_cache_dir() -> str | None:
+    """Get the on-disk document cache directory, disabled unless the variable is set."""
+    return os.environ.get("ARE_SIMULATION_DOCUMENT_CACHE_DIR") or None
+
+
+DOCUMENT_CONVERSION_CACHE = DocumentConversionCache(cache_dir=_get_document_cache_dir())
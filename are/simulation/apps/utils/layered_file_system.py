@@ -0,0 +1,750 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import errno
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, cast
+
+from fsspec import AbstractFileSystem
+from fsspec.core import url_to_fs
+
+from are.simulation.apps.utils.directory_walker import copy_tree
+
+logger = logging.getLogger(__name__)
+
+DIRECTORY_ENTRY: dict[str, Any] = {"type": "directory", "size": 0}
+
+
+def _relative_to(path: str, prefix: str) -> str | None:
+    """
+    Get a path relative to a prefix, as an absolute path in the prefix.
+
+    :param path: The path, starting with '/'
+    :param prefix: The prefix, starting with '/'
+    :returns: The relative path, or None if the path is not inside the prefix
+    """
+    if prefix == "/":
+        return path
+    if path == prefix:
+        return "/"
+    if path.startswith(prefix + "/"):
+        return path[len(prefix) :]
+    return None
+
+
+def _copy_file(
+    src_fs: AbstractFileSystem,
+    src_path: str,
+    dst_fs: AbstractFileSystem,
+    dst_path: str,
+) -> None:
+    """
+    Stream a file from a file system to another.
+
+    :param src_fs: The file system to read from
+    :param src_path: The path of the file to copy
+    :param dst_fs: The file system to write to
+    :param dst_path: The path of the copy
+    """
+    with src_fs.open(src_path, "rb") as src, dst_fs.open(dst_path, "wb") as dst:
+        # Both files are opened in binary mode
+        shutil.copyfileobj(cast(BinaryIO, src), cast(BinaryIO, dst))
+
+
+def _ancestors(path: str) -> list[str]:
+    """
+    Get a path and all its ancestors, from the path to the root.
+
+    :param path: The path, starting with '/'
+    :returns: The path and its ancestors
+    """
+    ancestors = [path]
+    while path != "/":
+        path = os.path.dirname(path)
+        ancestors.append(path)
+    return ancestors
+
+
+class BaseLayer:
+    """
+    Read-only index of a directory tree, shared by all the layered file systems mounting it.
+
+    The tree is listed once, when the layer is created, and must not be modified afterwards.
+    Use get_base_layer to share a single index per directory within a process.
+    """
+
+    def __init__(self, uri: str):
+        """
+        Index a directory tree.
+
+        :param uri: The path or URI of the root directory
+        """
+        raw_fs, root = url_to_fs(uri)
+        if "://" in uri:
+            # Read remote files through the shared file cache, as FallbackFileSystem does
+            from are.simulation.apps.utils.cached_remote_filesystem import (
+                CachedRemoteFileSystem,
+            )
+
+            self.fs: AbstractFileSystem = CachedRemoteFileSystem(raw_fs, uri)
+        else:
+            self.fs = raw_fs
+        self.uri = uri
+        self.root = root.rstrip("/") or "/"
+        self.entries: dict[str, dict[str, Any]] = {"/": dict(DIRECTORY_ENTRY)}
+        self.children: dict[str, list[str]] = {}
+
+        if raw_fs.isdir(self.root):
+            # One listing per directory, which also gives the types and sizes of the files
+            for dir_path, dirs, files in raw_fs.walk(self.root, detail=True):
+                rel_dir = os.path.relpath(dir_path, self.root)
+                rel_dir = "/" if rel_dir == "." else "/" + rel_dir
+                names = []
+                for name, info in {**dirs, **files}.items():
+                    entry = {k: v for k, v in info.items() if k != "name"}
+                    if entry.get("type") != "directory":
+                        entry["type"] = "file"
+                    self.entries[os.path.join(rel_dir, name)] = entry
+                    names.append(name)
+                self.children[rel_dir] = sorted(names)
+        logger.debug(f"Indexed {len(self.entries)} paths in base layer {uri}")
+
+    def path(self, rel_path: str) -> str:
+        """
+        Get the path of an entry in the file system of the layer.
+
+        :param rel_path: The path relative to the root of the layer
+        :returns: The path in the file system of the layer
+        """
+        return os.path.join(self.root, rel_path.lstrip("/"))
+
+
+# Maximum number of base layers kept indexed in the process. The least recently used are
+# dropped, the file systems mounting them keep them, and they are indexed again on next use.
+MAX_BASE_LAYERS = 16
+
+_BASE_LAYERS: OrderedDict[str, BaseLayer] = OrderedDict()
+_BASE_LAYERS_LOCK = threading.Lock()
+
+
+def get_base_layer(uri: str) -> BaseLayer:
+    """
+    Get the base layer of a directory, indexing it on first use in the process.
+
+    :param uri: The path or URI of the root directory
+    :returns: The shared base layer
+    """
+    with _BASE_LAYERS_LOCK:
+        layer = _BASE_LAYERS.get(uri)
+        if layer is not None:
+            _BASE_LAYERS.move_to_end(uri)
+            return layer
+        layer = BaseLayer(uri)
+        _BASE_LAYERS[uri] = layer
+        while len(_BASE_LAYERS) > MAX_BASE_LAYERS:
+            _BASE_LAYERS.popitem(last=False)
+        return layer
+
+
+@dataclass
+class Mount:
+    """A base layer visible at a prefix of a layered file system."""
+
+    prefix: str
+    layer: BaseLayer
+    # Paths of the layer which are visible, None if they all are
+    include: frozenset[str] | None
+    generation: int
+    # Directory trees in the get_state format, by path relative to the layer
+    trees: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def get_entry(self, layer_rel: str) -> dict[str, Any] | None:
+        if self.include is not None and layer_rel not in self.include:
+            return None
+        return self.layer.entries.get(layer_rel)
+
+    def get_children(self, layer_rel: str) -> list[str]:
+        names = self.layer.children.get(layer_rel, [])
+        if self.include is None:
+            return names
+        return [name for name in names if os.path.join(layer_rel, name) in self.include]
+
+    def get_tree(self, layer_rel: str) -> dict[str, Any]:
+        tree = self.trees.get(layer_rel)
+        if tree is None:
+            entry = self.get_entry(layer_rel)
+            assert entry is not None
+            name = os.path.basename(layer_rel)
+            if entry["type"] == "directory":
+                tree = {
+                    "name": name,
+                    "type": "directory",
+                    "children": [
+                        self.get_tree(os.path.join(layer_rel, child))
+                        for child in self.get_children(layer_rel)
+                    ],
+                }
+            else:
+                tree = {"name": name, "type": "file"}
+            self.trees[layer_rel] = tree
+        return tree
+
+
+class LayeredFileSystem(AbstractFileSystem):
+    """
+    A copy-on-write filesystem made of read-only base layers and a writable overlay.
+
+    The base layers are directory trees indexed once per process and shared by all the
+    layered file systems mounting them, e.g. the universe of every scenario running in
+    parallel. Their files are read in place and are only copied to the overlay, a directory
+    of the underlying filesystem, when they are modified. Deleted and moved base entries are
+    hidden with whiteouts, and moved base files are read from their original location.
+
+    The interface matches FallbackFileSystem, which copies placeholders of all the files to
+    the underlying filesystem instead.
+
+    Key Features:
+        * Reads, listings and stats of base files without copying them
+        * Overlay entries shadow base entries with the same path
+        * Whiteouts for the base entries deleted or moved away
+    """
+
+    # Each sandbox has its own overlay and whiteouts
+    cachable = False
+
+    def __init__(self, fs: AbstractFileSystem, base_root: str):
+        """
+        Initialize the LayeredFileSystem without any base layer, use mount to add them.
+
+        :param fs: The underlying filesystem, which holds the overlay
+        :param base_root: The directory of the underlying filesystem used as the overlay
+        """
+        super().__init__()
+        self.fs = fs
+        self.base_root = base_root
+        # Directories which may differ from the base layers, and their ancestors
+        self._modified_dirs: set[str] = set()
+        self._reset_layers()
+
+    def _reset_layers(self) -> None:
+        self._mounts: list[Mount] = []
+        # Strict ancestors of the mount prefixes, with the generation of the last mount below
+        self._mount_dirs: dict[str, int] = {}
+        # Hidden base paths, with the generation at which they were hidden
+        self._whiteouts: dict[str, int] = {}
+        # Moved base files, by their new path
+        self._renames: dict[str, tuple[BaseLayer, str]] = {}
+        self._generation = 0
+
+    def _next_generation(self) -> int:
+        self._generation += 1
+        return self._generation
+
+    def _rel_path(self, path: str) -> str:
+        """
+        Converts a path in base_root to be relative.
+
+        :param path: Path to convert
+        :return: Relative path
+        """
+        rel_path = os.path.relpath(path, self.base_root)
+        return "/" if rel_path == "." else "/" + rel_path
+
+    def _mark_modified(self, rel_path: str) -> None:
+        for ancestor in _ancestors(rel_path):
+            if ancestor in self._modified_dirs:
+                break
+            self._modified_dirs.add(ancestor)
+
+    def _hidden_since(self, rel_path: str) -> int:
+        """Get the generation of the last whiteout of a path or of one of its ancestors."""
+        if not self._whiteouts:
+            return -1
+        return max(self._whiteouts.get(p, -1) for p in _ancestors(rel_path))
+
+    def _base_lookup(
+        self, rel_path: str
+    ) -> tuple[BaseLayer | None, str, dict[str, Any]] | None:
+        """
+        Find the base entry visible at a path, ignoring the overlay.
+
+        :param rel_path: The relative path
+        :returns: The layer, path in the layer and entry, the layer is None for the directories
+        which only exist as ancestors of a mount point. None if no base entry is visible.
+        """
+        renamed = self._renames.get(rel_path)
+        if renamed is not None:
+            layer, layer_rel = renamed
+            return layer, layer_rel, layer.entries[layer_rel]
+        hidden_since = self._hidden_since(rel_path)
+        for mount in reversed(self._mounts):
+            if mount.generation < hidden_since:
+                continue
+            layer_rel = _relative_to(rel_path, mount.prefix)
+            if layer_rel is None:
+                continue
+            entry = mount.get_entry(layer_rel)
+            if entry is not None:
+                return mount.layer, layer_rel, entry
+        if self._mount_dirs.get(rel_path, -1) > hidden_since:
+            return None, rel_path, DIRECTORY_ENTRY
+        return None
+
+    def _base_children(self, rel_path: str) -> list[str]:
+        """Get the names of the base entries which may be visible in a directory."""
+        names = [
+            os.path.basename(path)
+            for path in self._renames
+            if os.path.dirname(path) == rel_path
+        ]
+        for mount in self._mounts:
+            layer_rel = _relative_to(rel_path, mount.prefix)
+            mount_rel = _relative_to(mount.prefix, rel_path)
+            if layer_rel is not None:
+                names.extend(mount.get_children(layer_rel))
+            elif mount_rel is not None:
+                # The mount point is below the directory
+                names.append(mount_rel.split("/")[1])
+        return list(dict.fromkeys(names))
+
+    def _base_info(self, path: str, entry: dict[str, Any]) -> dict[str, Any]:
+        return {**entry, "name": path}
+
+    def _hide(self, rel_path: str, recursive: bool = False) -> None:
+        """
+        Hide the base entries at a path, after removing it from the overlay.
+
+        :param rel_path: The relative path
+        :param recursive: If True, also forget the moved and hidden entries below the path
+        """
+        if rel_path == "/":
+            # Nothing remains from the base layers
+            self._reset_layers()
+            return
+        self._renames.pop(rel_path, None)
+        if recursive:
+            prefix = rel_path + "/"
+            for path in [p for p in self._renames if p.startswith(prefix)]:
+                del self._renames[path]
+            for path in [p for p in self._whiteouts if p.startswith(prefix)]:
+                del self._whiteouts[path]
+        if self._base_lookup(rel_path) is not None:
+            self._whiteouts[rel_path] = self._next_generation()
+        self._mark_modified(os.path.dirname(rel_path))
+
+    def _ensure_overlay_parent(self, path: str) -> None:
+        """Create the parent directory of a path in the overlay if it is visible."""
+        parent = os.path.dirname(path)
+        if not self.fs.isdir(parent) and self.isdir(parent):
+            self.fs.makedirs(parent, exist_ok=True)
+
+    def mount(
+        self,
+        uri: str,
+        prefix: str = "/",
+        expected_paths: set[str] | None = None,
+    ) -> None:
+        """
+        Make a base layer visible at a prefix, above the layers already mounted.
+
+        :param uri: The path or URI of the root directory of the layer
+        :param prefix: The path at which the layer is visible
+        :param expected_paths: Paths relative to the layer to make visible, with their
+        ancestors. All the paths are visible if None.
+        """
+        prefix = "/" + prefix.strip("/")
+        include = None
+        if expected_paths is not None:
+            visible_paths = set()
+            for path in expected_paths:
+                visible_paths.update(_ancestors("/" + path.strip("/")))
+            include = frozenset(visible_paths)
+        generation = self._next_generation()
+        self._mounts.append(
+            Mount(prefix, get_base_layer(uri), include, generation=generation)
+        )
+        if prefix != "/":
+            for ancestor in _ancestors(os.path.dirname(prefix)):
+                self._mount_dirs[ancestor] = generation
+        self._mark_modified(prefix)
+
+    def set_fallback_root(
+        self,
+        fallback_root: str,
+        expected_paths: set[str] | None = None,
+    ) -> None:
+        """
+        Replace the base layers with the given directory, mounted at the root.
+
+        :param fallback_root: The root directory or URI of the base layer
+        :param expected_paths: Set of paths of the layer to make visible, all if None
+        """
+        self._reset_layers()
+        self.mount(fallback_root, "/", expected_paths)
+
+    def copy_up(self, path: str) -> None:
+        """
+        Copy a base file to the overlay, so that it can be modified in place.
+
+        :param path: Path to the file
+        """
+        if self.fs.exists(path):
+            return
+        found = self._base_lookup(self._rel_path(path))
+        if found is None:
+            return
+        layer, layer_rel, entry = found
+        if layer is None or entry["type"] != "file":
+            return
+        self._ensure_overlay_parent(path)
+        _copy_file(layer.fs, layer.path(layer_rel), self.fs, path)
+        self._renames.pop(self._rel_path(path), None)
+        logger.debug(f"Copied base file to the overlay: {path}")
+
+    def build_tree(self, path: str) -> dict[str, Any]:
+        """
+        Get the directory tree at a path, in the format of SandboxLocalFileSystem.get_state.
+        Subtrees only made of a base layer are built once and copied.
+
+        :param path: Path to the root of the tree
+        :returns: The tree, where the root directory has an empty name
+        """
+        tree = self._build_tree(path, self.info(path))
+        tree["name"] = ""
+        return tree
+
+    def _build_tree(self, path: str, info: dict[str, Any]) -> dict[str, Any]:
+        rel_path = self._rel_path(path)
+        name = os.path.basename(rel_path)
+        if info["type"] != "directory":
+            return {"name": name, "type": "file"}
+        if rel_path not in self._modified_dirs and not self.fs.exists(path):
+            mount = self._get_only_mount(rel_path)
+            if mount is not None:
+                tree = copy_tree(
+                    mount.get_tree(_relative_to(rel_path, mount.prefix))  # type: ignore
+                )
+                tree["name"] = name
+                return tree
+        return {
+            "name": name,
+            "type": "directory",
+            "children": [
+                self._build_tree(item["name"], item) for item in self._ls_infos(path)
+            ],
+        }
+
+    def _get_only_mount(self, rel_path: str) -> Mount | None:
+        """Get the mount providing a path, if no other mount has entries at or below it."""
+        if rel_path in self._mount_dirs:
+            return None
+        hidden_since = self._hidden_since(rel_path)
+        mounts = [
+            mount
+            for mount in self._mounts
+            if mount.generation >= hidden_since
+            and (layer_rel := _relative_to(rel_path, mount.prefix)) is not None
+            and mount.get_entry(layer_rel) is not None
+        ]
+        return mounts[0] if len(mounts) == 1 else None
+
+    def export(self, target_path: str) -> None:
+        """
+        Copy the merged content of the filesystem to a local directory.
+
+        :param target_path: The existing directory to copy to
+        """
+        for root, dirs, files in self.walk(self.base_root):
+            target_root = os.path.join(
+                target_path,
+                self._rel_path(root).lstrip("/"),  # type: ignore
+            )
+            os.makedirs(target_root, exist_ok=True)
+            for name in dirs:
+                os.makedirs(os.path.join(target_root, name), exist_ok=True)
+            for name in files:
+                with self.open(os.path.join(root, name), "rb") as src:  # type: ignore
+                    with open(os.path.join(target_root, name), "wb") as dst:
+                        shutil.copyfileobj(cast(BinaryIO, src), dst)
+
+    # Filesystem operations resolving paths across the layers
+
+    def open(
+        self,
+        path: str,
+        mode: str = "rb",
+        block_size: int | None = None,
+        cache_options: dict | None = None,
+        compression: str | None = None,
+        **kwargs: Any,
+    ):
+        """
+        Open a file for reading or writing.
+
+        :param path: Path to the file to open
+        :param mode: Mode to open the file in
+        :param block_size: Size of blocks to read/write
+        :param cache_options: Cache options
+        :param compression: Compression format
+        :param kwargs: Additional arguments to pass to the file system
+        :return: File handle to the opened file
+        """
+        rel_path = self._rel_path(path)
+        if "r" in mode and "+" not in mode:
+            # Read base files in place
+            found = None if self.fs.exists(path) else self._base_lookup(rel_path)
+            if found is not None:
+                layer, layer_rel, entry = found
+                if layer is not None and entry["type"] == "file":
+                    return layer.fs.open(
+                        layer.path(layer_rel),
+                        mode=mode,
+                        block_size=block_size,
+                        cache_options=cache_options,
+                        compression=compression,
+                        **kwargs,
+                    )
+        elif "w" in mode or "x" in mode:
+            if "x" in mode and self.exists(path):
+                raise FileExistsError(path)
+            self._ensure_overlay_parent(path)
+            self._renames.pop(rel_path, None)
+            self._mark_modified(os.path.dirname(rel_path))
+        else:
+            # Appending to or updating a base file
+            self._ensure_overlay_parent(path)
+            self.copy_up(path)
+            self._mark_modified(os.path.dirname(rel_path))
+
+        return self.fs.open(
+            path,
+            mode=mode,
+            block_size=block_size,
+            cache_options=cache_options,
+            compression=compression,
+            **kwargs,
+        )
+
+    def cat_file(
+        self,
+        path: str,
+        start: int | None = None,
+        end: int | None = None,
+        **kwargs: Any,
+    ) -> bytes | str:
+        """
+        Read the contents of a file.
+
+        :param path: Path to the file to read
+        :param start: Start byte position
+        :param end: End byte position
+        :param kwargs: Additional arguments to pass to the file system
+        :return: Contents of the file
+        """
+        with self.open(path, "rb", **kwargs) as f:
+            if start is not None:
+                f.seek(start)
+            if end is not None:
+                return f.read(end - (start or 0))
+            return f.read()
+
+    def cat(
+        self, path: str, recursive: bool = False, on_error: str = "raise", **kwargs: Any
+    ) -> bytes | str:
+        """
+        Read the contents of a file.
+
+        :param path: Path to the file to read
+        :param recursive: If True, recursively read files in directories
+        :param on_error: What to do on error ('raise' or 'omit')
+        :param kwargs: Additional arguments to pass to the file system
+        :return: Contents of the file
+        """
+        if not recursive:
+            return self.cat_file(path, **kwargs)
+        result = super().cat(path, recursive=recursive, on_error=on_error, **kwargs)
+        if isinstance(result, (bytes, str)):
+            return result
+        # Same as FallbackFileSystem.cat, the contents of several files are not supported
+        raise TypeError(f"Unexpected return type from cat: {type(result)}")
+
+    def info(self, path: str, **kwargs: Any) -> dict[str, Any]:
+        """
+        Get information about a file or directory.
+
+        :param path: Path to the file or directory to get information about
+        :param kwargs: Additional arguments to pass to the file system
+        :return: Information about the file or directory
+        """
+        path = path.rstrip("/") or "/"
+        if self.fs.exists(path):
+            return self.fs.info(path, **kwargs)
+        found = self._base_lookup(self._rel_path(path))
+        if found is None:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+        return self._base_info(path, found[2])
+
+    def ls(
+        self, path: str = ".", detail: bool = False, **kwargs: Any
+    ) -> list[str | dict[str, Any]]:
+        """
+        List the contents of a directory, merging the overlay and the base layers.
+
+        :param path: Path to list, defaults to '.'
+        :param detail: If True, return detailed information about each file
+        :param kwargs: Additional arguments to pass to the file system
+        :return: List of files and directories in the directory
+        """
+        infos = self._ls_infos(path, **kwargs)
+        if not detail:
+            return [item["name"] for item in infos]
+        return infos  # type: ignore
+
+    def _ls_infos(self, path: str, **kwargs: Any) -> list[dict[str, Any]]:
+        """Get the information of the entries of a directory, or of a file."""
+        path = path.rstrip("/") or "/"
+        info = self.info(path)
+        if info["type"] != "directory":
+            return [info]
+        infos = []
+        names = set()
+        if self.fs.isdir(path):
+            for item in self.fs.ls(path, detail=True, **kwargs):
+                infos.append(item)
+                names.add(os.path.basename(item["name"]))
+        rel_path = self._rel_path(path)
+        for name in self._base_children(rel_path):
+            if name in names:
+                continue
+            found = self._base_lookup(os.path.join(rel_path, name))
+            if found is not None:
+                infos.append(self._base_info(os.path.join(path, name), found[2]))
+        return infos
+
+    def mv(
+        self,
+        path1: str,
+        path2: str,
+        recursive: bool = False,
+        maxdepth: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Move a file or directory, moving base files without copying them.
+
+        :param path1: Path to the file or directory to move
+        :param path2: Path to the destination, or to a directory to move into
+        :param recursive: Unused, directories are always moved with their content
+        :param maxdepth: Unused
+        :param kwargs: Unused
+        """
+        path1 = path1.rstrip("/")
+        path2 = path2.rstrip("/")
+        if self.isdir(path2):
+            path2 = os.path.join(path2, os.path.basename(path1))
+        if self.info(path1)["type"] == "directory":
+            if self.exists(path2):
+                raise FileExistsError(path2)
+            self._move_dir(path1, path2)
+        else:
+            self._move_file(path1, path2)
+
+    def _move_file(self, path1: str, path2: str) -> None:
+        rel_path1 = self._rel_path(path1)
+        rel_path2 = self._rel_path(path2)
+        self._ensure_overlay_parent(path2)
+        self._renames.pop(rel_path2, None)
+        if self.fs.exists(path1):
+            self.fs.mv(path1, path2)
+        else:
+            found = self._base_lookup(rel_path1)
+            assert found is not None and found[0] is not None
+            if self.fs.isfile(path2):
+                self.fs.rm(path2)
+            self._renames[rel_path2] = (found[0], found[1])
+        self._hide(rel_path1)
+        self._mark_modified(os.path.dirname(rel_path2))
+
+    def _move_dir(self, path1: str, path2: str) -> None:
+        for root, _, files in list(self.walk(path1)):
+            target_root = path2 + root[len(path1) :]  # type: ignore
+            self.fs.makedirs(target_root, exist_ok=True)
+            for name in files:
+                self._move_file(
+                    os.path.join(root, name),  # type: ignore
+                    os.path.join(target_root, name),
+                )
+        if self.fs.exists(path1):
+            self.fs.rm(path1, recursive=True)
+        self._hide(self._rel_path(path1), recursive=True)
+        self._mark_modified(self._rel_path(path2))
+
+    def rm(
+        self, path: str, recursive: bool = False, maxdepth: int | None = None
+    ) -> None:
+        """
+        Remove a file or directory, hiding the base entries at this path.
+
+        :param path: Path to the file or directory to remove
+        :param recursive: If True, remove the directory and all its contents
+        :param maxdepth: Unused
+        """
+        path = path.rstrip("/") or "/"
+        is_dir = self.info(path)["type"] == "directory"
+        if is_dir and not recursive:
+            raise ValueError("Cannot delete directory, set recursive=True")
+        if self.fs.exists(path):
+            self.fs.rm(path, recursive=recursive)
+        self._hide(self._rel_path(path), recursive=is_dir)
+
+    def rmdir(self, path: str) -> None:
+        """
+        Remove a directory, if empty.
+
+        :param path: Path to the directory to remove
+        """
+        if self.ls(path):
+            raise OSError(errno.ENOTEMPTY, os.strerror(errno.ENOTEMPTY), path)
+        if self.fs.exists(path):
+            self.fs.rmdir(path)
+        self._hide(self._rel_path(path))
+
+    def mkdir(self, path: str, create_parents: bool = True, **kwargs: Any) -> None:
+        """
+        Create a directory in the overlay.
+
+        :param path: Path to the directory to create
+        :param create_parents: if True, this is equivalent to ``makedirs``
+        :param kwargs: may be permissions, etc.
+        """
+        if self.exists(path):
+            raise FileExistsError(path)
+        if create_parents:
+            self.fs.makedirs(path, exist_ok=True)
+        else:
+            self._ensure_overlay_parent(path)
+            self.fs.mkdir(path, create_parents=False, **kwargs)
+        self._mark_modified(self._rel_path(path))
+
+    def makedirs(self, path: str, exist_ok: bool = False) -> None:
+        """
+        Recursively make directories in the overlay.
+
+        :param path: leaf directory name
+        :param exist_ok: If False, will error if the target already exists
+        """
+        if self.exists(path):
+            if not exist_ok or not self.isdir(path):
+                raise FileExistsError(path)
+            return
+        self.fs.makedirs(path, exist_ok=True)
+        self._mark_modified(self._rel_path(path))
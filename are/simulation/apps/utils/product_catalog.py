@@ -0,0 +1,120 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import bisect
+from typing import Any
+
+
+class ProductCatalog:
+    """
+    Secondary indexes over the products of a shopping catalog, a dict of product id to
+    product with a `name` and `variants`, a dict of item id to item.
+
+    The catalog keeps the position of each product in the dict, the ids of the products
+    with each name in dict order, the sorted product names for pagination, and the product
+    of each item. Products must only be appended to the dict through `add_product` and items
+    added through `add_item`, callers must build a new catalog when products are replaced,
+    renamed or removed.
+    """
+
+    def __init__(self, products: dict[str, Any]):
+        self._products = products
+        self._positions: dict[str, int] = {}
+        self._ids_by_name: dict[str, list[str]] = {}
+        self._sorted_names: list[str] = []
+        self._items: dict[str, tuple[str, Any]] = {}
+        for product_id, product in products.items():
+            self._positions[product_id] = len(self._positions)
+            self._ids_by_name.setdefault(product.name, []).append(product_id)
+        self._sorted_names = sorted(self._ids_by_name)
+        self._index_items()
+
+    def is_current(self, products: dict[str, Any]) -> bool:
+        """
+        Whether the catalog indexes a products dict, checked by identity and size.
+
+        :param products: The products dict
+        :returns: True if the indexes can be used for the dict
+        """
+        return products is self._products and len(products) == len(self._positions)
+
+    def _index_items(self) -> None:
+        self._items = {}
+        for product_id, product in self._products.items():
+            for item_id, item in product.variants.items():
+                # The first product with the item wins, as a scan of the catalog would find
+                self._items.setdefault(item_id, (product_id, item))
+
+    def add_product(self, product_id: str) -> None:
+        """
+        Index a product appended to the products dict.
+
+        :param product_id: The id of the product
+        """
+        product = self._products[product_id]
+        self._positions[product_id] = len(self._positions)
+        ids = self._ids_by_name.setdefault(product.name, [])
+        if not ids:
+            bisect.insort(self._sorted_names, product.name)
+        ids.append(product_id)
+        for item_id, item in product.variants.items():
+            self._items.setdefault(item_id, (product_id, item))
+
+    def add_item(self, product_id: str, item: Any) -> None:
+        """
+        Index an item added to the variants of a product.
+
+        :param product_id: The id of the product
+        :param item: The item
+        """
+        self._items.setdefault(item.item_id, (product_id, item))
+
+    def get_item(self, item_id: str) -> tuple[str, Any] | None:
+        """
+        Get the first product, in catalog order, with an item.
+
+        :param item_id: The id of the item
+        :returns: The product id and the item, or None if no product has the item
+        """
+        entry = self._items.get(item_id)
+        if entry is None:
+            return None
+        product = self._products.get(entry[0])
+        if product is None or product.variants.get(item_id) is not entry[1]:
+            # The item was replaced or removed without going through the catalog
+            self._index_items()
+            entry = self._items.get(item_id)
+        return entry
+
+    def get_position(self, product_id: str) -> int:
+        """
+        Get the position of a product in the products dict.
+
+        :param product_id: The id of the product
+        :returns: The position
+        """
+        return self._positions[product_id]
+
+    def get_product_id(self, name: str) -> str:
+        """
+        Get the id of the last product with a name, as a name to id dict built in catalog order
+        would map it.
+
+        :param name: The name of a product
+        :returns: The product id
+        """
+        return self._ids_by_name[name][-1]
+
+    def get_sorted_names(self, start: int, end: int) -> list[str]:
+        """
+        Get a slice of the distinct product names in sorted order.
+
+        :param start: Start of the slice
+        :param end: End of the slice
+        :returns: The names
+        """
+        return self._sorted_names[start:end]
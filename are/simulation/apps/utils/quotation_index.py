@@ -0,0 +1,66 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+from typing import Any
+
+
+class QuotationIndex:
+    """
+    Index of a quotation history giving the first ride of each route, and of each route and
+    service type, as a scan of the history from its start would find them.
+
+    The index is updated incrementally when rides are appended to the history, and rebuilt
+    when the list is replaced or shrinks. Rides must not be reordered or replaced in place,
+    and their locations and service type must not change.
+    """
+
+    def __init__(self):
+        self._source: list | None = None
+        self._count = 0
+        self._routes: dict[tuple[Any, Any], Any] = {}
+        self._service_routes: dict[tuple[Any, Any, Any], Any] = {}
+
+    def _update(self, rides: list) -> None:
+        if rides is not self._source or len(rides) < self._count:
+            self._source = rides
+            self._count = 0
+            self._routes = {}
+            self._service_routes = {}
+        for ride in rides[self._count :]:
+            route = (ride.start_location, ride.end_location)
+            self._routes.setdefault(route, ride)
+            self._service_routes.setdefault((*route, ride.service_type), ride)
+        self._count = len(rides)
+
+    def get_route_ride(
+        self, rides: list, start_location: str, end_location: str
+    ) -> Any | None:
+        """
+        Get the first ride of a route.
+
+        :param rides: The quotation history, in insertion order
+        :param start_location: The starting point of the route
+        :param end_location: The ending point of the route
+        :returns: The first ride with these locations, or None
+        """
+        self._update(rides)
+        return self._routes.get((start_location, end_location))
+
+    def get_service_ride(
+        self, rides: list, start_location: str, end_location: str, service_type: str
+    ) -> Any | None:
+        """
+        Get the first ride of a route with a service type.
+
+        :param rides: The quotation history, in insertion order
+        :param start_location: The starting point of the route
+        :param end_location: The ending point of the route
+        :param service_type: The service type
+        :returns: The first ride with these locations and service type, or None
+        """
+        self._update(rides)
+        return self._service_routes.get((start_location, end_location, service_type))
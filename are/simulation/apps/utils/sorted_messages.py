@@ -0,0 +1,91 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import bisect
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+
+@lru_cache(maxsize=1024)
+def parse_date(date: str) -> float:
+    """
+    Parse a date in the YYYY-MM-DD HH:MM:SS format, as a UTC timestamp.
+
+    :param date: The date to parse
+    :returns: The timestamp
+    """
+    return (
+        datetime.strptime(date, "%Y-%m-%d %H:%M:%S")
+        .replace(tzinfo=timezone.utc)
+        .timestamp()
+    )
+
+
+def _negative_timestamp(message: Any) -> float:
+    return -message.timestamp
+
+
+class TimeSortedMessages:
+    """
+    View of a list of messages sorted from the most recent to the oldest, as a stable sort by
+    decreasing timestamp would return them: messages with the same timestamp are in list order.
+
+    The view is updated incrementally when messages are appended to the list, and rebuilt
+    when the list is replaced or shrinks. Messages must not be reordered or replaced in place.
+    """
+
+    def __init__(self):
+        self._source: list | None = None
+        self._count = 0
+        self._messages: list = []
+
+    def get(self, messages: list) -> list:
+        """
+        Get the messages sorted from the most recent to the oldest.
+
+        :param messages: The messages, in insertion order
+        :returns: The sorted messages, which must not be modified
+        """
+        if messages is not self._source or len(messages) < self._count:
+            self._source = messages
+            self._messages = sorted(messages, key=lambda x: x.timestamp, reverse=True)
+        else:
+            for message in messages[self._count :]:
+                # Insert after the messages with the same timestamp, as a stable sort would
+                idx = bisect.bisect_right(
+                    self._messages, -message.timestamp, key=_negative_timestamp
+                )
+                self._messages.insert(idx, message)
+        self._count = len(messages)
+        return self._messages
+
+    def get_in_range(
+        self, messages: list, start_timestamp: float, end_timestamp: float
+    ) -> list:
+        """
+        Get the messages such that `start_timestamp <= int(message.timestamp) <= end_timestamp`,
+        sorted from the most recent to the oldest.
+
+        :param messages: The messages, in insertion order
+        :param start_timestamp: The minimum timestamp
+        :param end_timestamp: The maximum timestamp
+        :returns: The sorted messages in the range
+        """
+        sorted_messages = self.get(messages)
+        # int() truncates timestamps by less than one second
+        lo = bisect.bisect_left(
+            sorted_messages, -(end_timestamp + 1), key=_negative_timestamp
+        )
+        hi = bisect.bisect_right(
+            sorted_messages, -(start_timestamp - 1), key=_negative_timestamp
+        )
+        return [
+            message
+            for message in sorted_messages[lo:hi]
+            if start_timestamp <= int(message.timestamp) <= end_timestamp
+        ]
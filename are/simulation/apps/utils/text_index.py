@@ -0,0 +1,184 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+from collections import defaultdict
+from collections.abc import Hashable, Iterable, Mapping
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+# Characters with a special meaning in a regular expression
+REGEX_SPECIAL_CHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+def get_regex_literal(pattern: str) -> str | None:
+    """
+    Get the literal string matched by a regular expression without special characters.
+
+    :param pattern: The regular expression
+    :returns: The literal, or None if the pattern is not a plain ASCII literal
+    """
+    if not pattern.isascii() or any(c in REGEX_SPECIAL_CHARS for c in pattern):
+        return None
+    return pattern
+
+
+class TextIndex(Generic[K]):
+    """
+    Inverted n-gram index over the text fields of records, to speed up case-insensitive
+    substring searches.
+
+    Each record is registered under a key with the texts of its searchable fields. For a
+    query, the index returns candidate keys: a superset of the records having a field which
+    contains the query. Callers must check candidates with their own match condition, so that
+    results are identical to a scan. Texts added to a record are only ever added to its
+    n-grams until it is re-registered, which only adds false positives.
+
+    Queries shorter than `n` characters cannot use the index, and callers should scan all
+    the records in that case.
+
+    The index does not observe the records: every code path which adds, removes, replaces or
+    edits the searchable fields of a record must re-register it (or drop the index). Keys are
+    ordered as in a dict, a key keeps its position when re-registered and moves to the end
+    when removed and added again, so candidates can be returned in the order of the records.
+    """
+
+    def __init__(self, n: int = 3, records: Mapping | None = None):
+        """
+        :param n: Length of the n-grams
+        :param records: Optional mapping of the indexed records, used by `is_current`
+        """
+        assert n > 0, "n must be positive"
+        self.n = n
+        self._records = records
+        self._ranks: dict[K, int] = {}
+        self._next_rank = 0
+        self._postings: dict[str, set[K]] = defaultdict(set)
+        self._key_ngrams: dict[K, set[str]] = {}
+        # Records with non ASCII texts, where case-insensitive regex matching and
+        # lowercasing may disagree
+        self._non_ascii_keys: set[K] = set()
+
+    def __len__(self) -> int:
+        return len(self._key_ngrams)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._key_ngrams
+
+    def is_current(self, records: Mapping) -> bool:
+        """
+        Whether the index was built for a records mapping, checked by identity and size.
+
+        This only catches records added or removed directly in the mapping, edits must go
+        through the owner of the index.
+
+        :param records: The records mapping
+        :returns: True if the index can be used for the mapping
+        """
+        return records is self._records and len(records) == len(self)
+
+    def sort_keys(self, keys: Iterable[K]) -> list[K]:
+        """
+        Sort keys in the order the records were registered, i.e. the order of the records dict.
+
+        :param keys: Registered keys, e.g. candidates
+        :returns: The sorted keys
+        """
+        return sorted(keys, key=self._ranks.__getitem__)
+
+    def _ngrams(self, text: str) -> set[str]:
+        text = text.lower()
+        return {text[i : i + self.n] for i in range(len(text) - self.n + 1)}
+
+    def add(self, key: K, texts: Iterable[str | None]) -> None:
+        """
+        Register a record, replacing the texts previously registered under its key.
+
+        :param key: The key of the record
+        :param texts: The texts of the searchable fields of the record, None values are skipped
+        """
+        rank = self._ranks.get(key)
+        self.remove(key)
+        if rank is not None:
+            self._ranks[key] = rank
+        self._key_ngrams[key] = set()
+        self.extend(key, texts)
+
+    def extend(self, key: K, texts: Iterable[str | None]) -> None:
+        """
+        Add texts to a registered record, e.g. a new message in a conversation.
+
+        :param key: The key of the record
+        :param texts: The texts to add, None values are skipped
+        """
+        if key not in self._ranks:
+            self._ranks[key] = self._next_rank
+            self._next_rank += 1
+        key_ngrams = self._key_ngrams.setdefault(key, set())
+        for text in texts:
+            if text is None:
+                continue
+            if not text.isascii():
+                self._non_ascii_keys.add(key)
+            for ngram in self._ngrams(text) - key_ngrams:
+                key_ngrams.add(ngram)
+                self._postings[ngram].add(key)
+
+    def remove(self, key: K) -> None:
+        """
+        Unregister a record, if it is registered.
+
+        :param key: The key of the record
+        """
+        self._ranks.pop(key, None)
+        for ngram in self._key_ngrams.pop(key, ()):
+            postings = self._postings[ngram]
+            postings.discard(key)
+            if not postings:
+                del self._postings[ngram]
+        self._non_ascii_keys.discard(key)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._key_ngrams.clear()
+        self._non_ascii_keys.clear()
+        self._ranks.clear()
+
+    def candidates(self, query: str) -> set[K] | None:
+        """
+        Get the records which may contain a query in one of their texts, ignoring case.
+
+        :param query: The query
+        :returns: The candidate keys, or None if the query is too short to use the index
+        """
+        if len(query.lower()) < self.n:
+            return None
+        postings = sorted(
+            (self._postings.get(ngram, set()) for ngram in self._ngrams(query)),
+            key=len,
+        )
+        candidates = set(postings[0])
+        for keys in postings[1:]:
+            candidates &= keys
+            if not candidates:
+                break
+        return candidates
+
+    def regex_candidates(self, pattern: str) -> set[K] | None:
+        """
+        Get the records which may match a case-insensitive regular expression in one of their texts.
+
+        :param pattern: The regular expression
+        :returns: The candidate keys, or None if the pattern cannot use the index
+        """
+        literal = get_regex_literal(pattern)
+        if literal is None:
+            return None
+        candidates = self.candidates(literal)
+        if candidates is None:
+            return None
+        return candidates | self._non_ascii_keys
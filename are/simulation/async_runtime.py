@@ -0,0 +1,172 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+# Interval in seconds at which the stop events of the running coroutines are checked
+STOP_CHECK_INTERVAL = 0.05
+
+
+class BackgroundLoop:
+    """
+    An asyncio loop running forever in a daemon thread, on which synchronous code runs its
+    coroutines instead of creating private loops.
+
+    Coroutines can be cancelled after a timeout, or when a stop event is set, e.g. the stop
+    event of the environment of the app running them. Stop events are checked by a single
+    task of the loop while coroutines wait for them.
+    """
+
+    def __init__(self, name: str = "async-runtime"):
+        self.loop = asyncio.new_event_loop()
+        # Tasks cancelled when their stop event is set, only used on the loop thread
+        self._stop_events: dict[asyncio.Future[Any], threading.Event] = {}
+        self._stop_watcher: asyncio.Task[None] | None = None
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name=name, daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread.is_alive() and not self.loop.is_closed()
+
+    def submit(
+        self,
+        coro: Coroutine[Any, Any, T],
+        timeout: float | None = None,
+        stop_event: threading.Event | None = None,
+    ) -> Future[T]:
+        """
+        Run a coroutine on the loop from any thread.
+
+        :param coro: The coroutine
+        :param timeout: Maximum time to run the coroutine in seconds, after which it is
+            cancelled and the future raises TimeoutError
+        :param stop_event: Event cancelling the coroutine when it is set
+        :returns: The future of the result, cancelling it cancels the coroutine
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self._run(coro, timeout, stop_event), self.loop
+        )
+
+    def run(
+        self,
+        coro: Coroutine[Any, Any, T],
+        timeout: float | None = None,
+        stop_event: threading.Event | None = None,
+    ) -> T:
+        """
+        Run a coroutine on the loop and wait for its result, see submit.
+
+        :returns: The result of the coroutine
+        :raises TimeoutError: If the coroutine did not finish in time
+        :raises concurrent.futures.CancelledError: If the stop event was set
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Cannot wait for a coroutine on the loop thread")
+        return self.submit(coro, timeout, stop_event).result()
+
+    def call_soon(self, callback: Callable[..., Any], *args: Any) -> None:
+        """Schedule a callback on the loop from any thread."""
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def stop(self, timeout: float | None = 10.0) -> None:
+        """Stop the loop and wait for its thread."""
+        if self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+
+    async def _run(
+        self,
+        coro: Coroutine[Any, Any, T],
+        timeout: float | None,
+        stop_event: threading.Event | None,
+    ) -> T:
+        task = asyncio.ensure_future(coro)
+        if stop_event is not None:
+            self._watch(task, stop_event)
+        try:
+            return await asyncio.wait_for(task, timeout)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(
+                f"Coroutine did not finish within {timeout} seconds"
+            ) from e
+
+    def _watch(self, task: asyncio.Future[Any], stop_event: threading.Event) -> None:
+        if stop_event.is_set():
+            task.cancel()
+            return
+        self._stop_events[task] = stop_event
+        task.add_done_callback(lambda t: self._stop_events.pop(t, None))
+        if self._stop_watcher is None or self._stop_watcher.done():
+            self._stop_watcher = self.loop.create_task(self._watch_stop_events())
+
+    async def _watch_stop_events(self) -> None:
+        while self._stop_events:
+            await asyncio.sleep(STOP_CHECK_INTERVAL)
+            for task, stop_event in list(self._stop_events.items()):
+                if stop_event.is_set():
+                    task.cancel()
+
+
+_background_loop: BackgroundLoop | None = None
+_background_loop_pid: int | None = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """
+    Get the background loop of the process, starting it on first use. Forked processes
+    start their own loop, since the thread of the parent loop does not exist in them.
+    """
+    global _background_loop, _background_loop_pid
+    with _background_loop_lock:
+        if (
+            _background_loop is None
+            or _background_loop_pid != os.getpid()
+            or not _background_loop.is_running
+        ):
+            _background_loop = BackgroundLoop()
+            _background_loop_pid = os.getpid()
+        return _background_loop
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Get the asyncio loop of the background loop of the process."""
+    return get_background_loop().loop
+
+
+def submit(
+    coro: Coroutine[Any, Any, T],
+    timeout: float | None = None,
+    stop_event: threading.Event | None = None,
+) -> Future[T]:
+    """Run a coroutine on the background loop of the process, see BackgroundLoop.submit."""
+    return get_background_loop().submit(coro, timeout, stop_event)
+
+
+def run(
+    coro: Coroutine[Any, Any, T],
+    timeout: float | None = None,
+    stop_event: threading.Event | None = None,
+) -> T:
+    """Run a coroutine on the background loop of the process and wait for its result, see BackgroundLoop.run."""
+    return get_background_loop().run(coro, timeout, stop_event)
+
+
+def call_soon(callback: Callable[..., Any], *args: Any) -> None:
+    """Schedule a callback on the background loop of the process."""
+    get_background_loop().call_soon(callback, *args)
@@ -313,6 +313,12 @@ def validate_benchmark_scenario_sources(**scenario_params):
     default=3,
     help="Number of times to run each scenario to improve variance. Defaults to 3.",
 )
+@click.option(
+    "--share_run_initialization",
+    is_flag=True,
+    default=False,
+    help="Initialize each scenario once and start each of its runs from a copy, with a seed derived from the scenario seed and the run number. Only the initialization is shared, each run is executed in full.",
+)
 @click.option(
     "--judge_model",
     type=str,
@@ -369,6 +375,7 @@ def main(
     a2a_model_provider: str | None = None,
     a2a_endpoint: str | None = None,
     num_runs: int = 3,
+    share_run_initialization: bool = False,
     judge_model: str = DEFAULT_JUDGE_MODEL,
     judge_provider: str | None = None,
     judge_endpoint: str | None = None,
@@ -582,6 +589,7 @@ def main(
                 tool_augmentation_config=tool_augmentation_config,
                 env_events_config=env_events_config,
                 num_runs=num_runs,
+                share_run_initialization=share_run_initialization,
                 judge_model=judge_model,
                 judge_provider=judge_provider,
                 judge_endpoint=judge_endpoint,
@@ -9,7 +9,9 @@ import logging
 import os
 from pathlib import Path
 
+from are.simulation.benchmark.hf_config_utils import create_config_name
 from are.simulation.benchmark.hf_upload_utils import (
+    ParquetTraceWriter,
     generate_submission_summary,
     upload_consolidated_results_to_hf,
 )
@@ -118,6 +120,14 @@ def handle_gaia2_run(
     failed_configs = []
     total_scenarios_processed = 0
 
+    # Stream the traces to the Parquet shards of the dataset as the scenarios finish, so
+    # that uploading them is a push of the shards
+    trace_writer = (
+        ParquetTraceWriter(os.path.join(output_dir, "hf_dataset"), split)
+        if hf_upload
+        else None
+    )
+
     # Define phase configurations with their specific parameters and configs
     phase_configs = [
         {
@@ -174,8 +184,21 @@ def handle_gaia2_run(
                 if remaining_limit <= 0:
                     break
 
+            # Create a flattened, hashable key with all phase info
+            result_key = (
+                phase_name,
+                config,
+                phase_config["a2a_app_prop"],
+                phase_config["tool_augmentation_config"] is not None,
+                phase_config["env_events_config"] is not None,
+            )
+
             try:
                 run_dataset_kwargs = {}
+                if trace_writer is not None:
+                    run_dataset_kwargs["on_result"] = trace_writer.result_callback(
+                        result_key
+                    )
 
                 result = run_dataset(
                     model=model,
@@ -217,14 +240,6 @@ def handle_gaia2_run(
                 scenarios_in_this_run = len(result.scenario_results)
                 total_scenarios_processed += scenarios_in_this_run
 
-                # Create a flattened, hashable key with all phase info
-                result_key = (
-                    phase_name,
-                    config,
-                    phase_config["a2a_app_prop"],
-                    phase_config["tool_augmentation_config"] is not None,
-                    phase_config["env_events_config"] is not None,
-                )
                 all_results[result_key] = result
                 logger.info(f"Completed {phase_name} config: {config}.")
             except Exception as e:
@@ -232,6 +247,8 @@ def handle_gaia2_run(
                     f"Phase '{phase_name}' config '{config}' failed with error: {e}"
                 )
                 failed_configs.append((phase_name, config))
+                if trace_writer is not None:
+                    trace_writer.discard(create_config_name(config, phase_name))
                 # Continue with next config
 
         # Break out of outer loop if limit reached
@@ -269,6 +286,8 @@ def handle_gaia2_run(
 
     # Upload to HuggingFace if requested
     if hf_upload:
+        assert trace_writer is not None
+        trace_writer.close()
         logger.info("=== Uploading consolidated results to HuggingFace ===")
         upload_consolidated_results_to_hf(
             all_results,
@@ -278,6 +297,7 @@ def handle_gaia2_run(
             hf_public,
             hf or "local",
             split or "validation",
+            trace_writer=trace_writer,
         )
         logger.info(f"Traces uploaded to HuggingFace dataset: {hf_upload}")
     else:
@@ -5,18 +5,19 @@
 # the root directory of this source tree.
 
 
+import json
 import logging
+import shutil
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Iterator
 
 import pyarrow as pa
 import yaml
-from datasets import Dataset, DatasetInfo
-from datasets.splits import Split
 
 from are.simulation.benchmark.hf_config_utils import create_config_name
 from are.simulation.benchmark.report_stats import (
-    build_trace_rows_polars,
     combine_results_to_dataframe,
     generate_json_stats_report,
     generate_validation_report,
@@ -27,8 +28,19 @@ from are.simulation.scenarios.validation_result import (
     ScenarioValidationResult,
 )
 
+if TYPE_CHECKING:
+    import pyarrow.parquet as pq
+
+    from are.simulation.scenarios.config import MultiScenarioRunnerConfig
+
 logger = logging.getLogger(__name__)
 
+# Number of rows per row group of the Parquet shards, each row holding a whole trace
+DEFAULT_ROW_GROUP_SIZE = 64
+# Maximum number of rows per Parquet shard
+DEFAULT_MAX_ROWS_PER_SHARD = 2048
+DEFAULT_PARQUET_COMPRESSION = "zstd"
+
 
 def get_scenario_result_info(
     scenario_result: ScenarioValidationResult,
@@ -52,6 +64,92 @@ def get_scenario_result_info(
             return None, "no_validation"
 
 
+def build_trace_row(
+    scenario_id: str,
+    run_number: int | None,
+    scenario_result: ScenarioValidationResult,
+    result_key: tuple[str, str, float, bool, bool],
+    run_config_json: str,
+) -> dict[str, Any]:
+    """Convert a scenario result to a HuggingFace dataset row, with its trace data.
+
+    :param scenario_id: The scenario ID
+    :type scenario_id: str
+    :param run_number: The run number of the scenario
+    :type run_number: int | None
+    :param scenario_result: The result of the scenario
+    :type scenario_result: ScenarioValidationResult
+    :param result_key: Tuple containing (phase_name, config, a2a_app_prop, has_tool_augmentation, has_env_events)
+    :type result_key: tuple[str, str, float, bool, bool]
+    :param run_config_json: The run config serialized to JSON
+    :type run_config_json: str
+    :returns: Dictionary representing the dataset row
+    :rtype: dict[str, Any]
+    """
+    # Unpack the result key
+    phase_name, config, a2a_app_prop, has_tool_augmentation, has_env_events = result_key
+
+    # Load trace data if available
+    data = None
+    if scenario_result.export_path:
+        try:
+            with open(scenario_result.export_path, "r") as f:
+                data = f.read()
+        except Exception as e:
+            logger.warning(
+                f"Failed to read trace file {scenario_result.export_path}: {e}"
+            )
+            data = None
+
+    # Get score and status using shared function
+    score, status = get_scenario_result_info(scenario_result)
+
+    # Build the row with enhanced metadata
+    row = {
+        "scenario_id": scenario_id,
+        "run_number": run_number,
+        "task_id": scenario_id,
+        "score": score,
+        "status": status,
+        "data": data,
+        "has_exception": scenario_result.exception is not None,
+        "exception_type": (
+            type(scenario_result.exception).__name__
+            if scenario_result.exception
+            else None
+        ),
+        "exception_message": (
+            str(scenario_result.exception) if scenario_result.exception else None
+        ),
+        "rationale": scenario_result.rationale,
+        "config": config,
+        "phase_name": phase_name,
+        "a2a_app_prop": a2a_app_prop,
+        "has_app_noise": has_tool_augmentation,
+        "has_env_noise": has_env_events,
+        "run_config": run_config_json,
+    }
+
+    # Remove None values to keep the dataset clean
+    return {k: v for k, v in row.items() if v is not None}
+
+
+def iter_trace_rows(
+    scenario_results: dict[tuple[str, int | None], ScenarioValidationResult],
+    result_key: tuple[str, str, float, bool, bool],
+    multi_scenario_result: MultiScenarioValidationResult,
+) -> Iterator[dict[str, Any]]:
+    """Convert scenario results to HuggingFace dataset rows one at a time, see build_trace_rows."""
+    # Serialize the run config to JSON
+    run_config_json = json.dumps(
+        multi_scenario_result.run_config.model_dump(), indent=2
+    )
+    for (scenario_id, run_number), scenario_result in scenario_results.items():
+        yield build_trace_row(
+            scenario_id, run_number, scenario_result, result_key, run_config_json
+        )
+
+
 def build_trace_rows(
     scenario_results: dict[tuple[str, int | None], ScenarioValidationResult],
     result_key: tuple[str, str, float, bool, bool],
@@ -68,67 +166,7 @@ def build_trace_rows(
     :returns: List of dictionaries representing dataset rows
     :rtype: list[dict[str, Any]]
     """
-    import json
-
-    # Unpack the result key
-    phase_name, config, a2a_app_prop, has_tool_augmentation, has_env_events = result_key
-
-    # Serialize the run config to JSON
-    run_config_json = json.dumps(
-        multi_scenario_result.run_config.model_dump(), indent=2
-    )
-
-    rows = []
-    for scenario_key, scenario_result in scenario_results.items():
-        # Deconstruct the tuple key to get scenario_id and run_number
-        scenario_id, run_number = scenario_key
-
-        # Load trace data if available
-        data = None
-        if scenario_result.export_path:
-            try:
-                with open(scenario_result.export_path, "r") as f:
-                    data = f.read()
-            except Exception as e:
-                logger.warning(
-                    f"Failed to read trace file {scenario_result.export_path}: {e}"
-                )
-                data = None
-
-        # Get score and status using shared function
-        score, status = get_scenario_result_info(scenario_result)
-
-        # Build the row with enhanced metadata
-        row = {
-            "scenario_id": scenario_id,
-            "run_number": run_number,
-            "task_id": scenario_id,
-            "score": score,
-            "status": status,
-            "data": data,
-            "has_exception": scenario_result.exception is not None,
-            "exception_type": (
-                type(scenario_result.exception).__name__
-                if scenario_result.exception
-                else None
-            ),
-            "exception_message": (
-                str(scenario_result.exception) if scenario_result.exception else None
-            ),
-            "rationale": scenario_result.rationale,
-            "config": config,
-            "phase_name": phase_name,
-            "a2a_app_prop": a2a_app_prop,
-            "has_app_noise": has_tool_augmentation,
-            "has_env_noise": has_env_events,
-            "run_config": run_config_json,
-        }
-
-        # Remove None values to keep the dataset clean
-        row = {k: v for k, v in row.items() if v is not None}
-        rows.append(row)
-
-    return rows
+    return list(iter_trace_rows(scenario_results, result_key, multi_scenario_result))
 
 
 def create_hf_schema() -> pa.Schema:
@@ -165,6 +203,168 @@ def create_hf_schema() -> pa.Schema:
     return pa.schema(schema_fields)
 
 
+class ParquetTraceWriter:
+    """Stream trace rows to a local Parquet dataset laid out like the HuggingFace dataset.
+
+    Each config gets a directory of ``<split>-<index>.parquet`` shards matching the
+    ``data_files`` of the dataset card, so that uploading the dataset is a push of the
+    shards. Rows are buffered per config and written one row group at a time, so that at
+    most a row group of traces per config is held in memory.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path,
+        split: str,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        max_rows_per_shard: int = DEFAULT_MAX_ROWS_PER_SHARD,
+        compression: str = DEFAULT_PARQUET_COMPRESSION,
+    ):
+        """
+        :param output_dir: Directory of the dataset
+        :param split: Dataset split of the rows
+        :param row_group_size: Number of rows per row group
+        :param max_rows_per_shard: Number of rows after which a new shard is started
+        :param compression: Compression codec of the shards
+        """
+        if max_rows_per_shard < row_group_size:
+            raise ValueError("A shard must hold at least one row group.")
+        self.output_dir = Path(output_dir)
+        self.split = split
+        self.row_group_size = row_group_size
+        self.max_rows_per_shard = max_rows_per_shard
+        self.compression = compression
+        self.schema = create_hf_schema()
+        # Shards and number of rows written per config
+        self.shards: dict[str, list[Path]] = {}
+        self.row_counts: dict[str, int] = {}
+        self._buffers: dict[str, list[dict[str, Any]]] = {}
+        self._writers: dict[str, "pq.ParquetWriter"] = {}
+        self._shard_rows: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ParquetTraceWriter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def config_names(self) -> list[str]:
+        return list(self.shards)
+
+    def write(self, config_name: str, row: dict[str, Any]) -> None:
+        """Append a row, see build_trace_row, to the shards of a config."""
+        with self._lock:
+            buffer = self._buffers.setdefault(config_name, [])
+            buffer.append(row)
+            self.row_counts[config_name] = self.row_counts.get(config_name, 0) + 1
+            if len(buffer) >= self.row_group_size:
+                self._flush(config_name)
+
+    def write_results(
+        self,
+        results: dict[
+            tuple[str, str, float, bool, bool], MultiScenarioValidationResult
+        ],
+    ) -> None:
+        """Append the rows of all the results of a submission, one trace at a time."""
+        for result_key, multi_scenario_result in results.items():
+            phase_name, config = result_key[0], result_key[1]
+            config_name = create_config_name(config, phase_name)
+            for row in iter_trace_rows(
+                multi_scenario_result.scenario_results,
+                result_key,
+                multi_scenario_result,
+            ):
+                self.write(config_name, row)
+
+    def result_callback(
+        self, result_key: tuple[str, str, float, bool, bool]
+    ) -> Callable[
+        [str, int | None, ScenarioValidationResult, "MultiScenarioRunnerConfig"], None
+    ]:
+        """
+        Get a callback of MultiScenarioRunner.run_with_events appending the row of each
+        scenario as soon as it finishes.
+
+        :param result_key: Tuple containing (phase_name, config, a2a_app_prop, has_tool_augmentation, has_env_events)
+        :returns: The callback
+        """
+        config_name = create_config_name(result_key[1], result_key[0])
+
+        def write_result(
+            scenario_id: str,
+            run_number: int | None,
+            scenario_result: ScenarioValidationResult,
+            run_config: "MultiScenarioRunnerConfig",
+        ) -> None:
+            run_config_json = json.dumps(run_config.model_dump(), indent=2)
+            self.write(
+                config_name,
+                build_trace_row(
+                    scenario_id,
+                    run_number,
+                    scenario_result,
+                    result_key,
+                    run_config_json,
+                ),
+            )
+
+        return write_result
+
+    def discard(self, config_name: str) -> None:
+        """Remove the rows and shards of a config, e.g. when its run failed."""
+        with self._lock:
+            self._buffers.pop(config_name, None)
+            self.row_counts.pop(config_name, None)
+            self._shard_rows.pop(config_name, None)
+            writer = self._writers.pop(config_name, None)
+            if writer is not None:
+                writer.close()
+            for path in self.shards.pop(config_name, []):
+                path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Write the buffered rows and close the shards."""
+        with self._lock:
+            for config_name in list(self._buffers):
+                self._flush(config_name)
+            for writer in self._writers.values():
+                writer.close()
+            self._writers.clear()
+
+    def _flush(self, config_name: str) -> None:
+        import pyarrow.parquet as pq
+
+        buffer = self._buffers.get(config_name)
+        if not buffer:
+            return
+        table = pa.Table.from_pylist(buffer, schema=self.schema)
+        self._buffers[config_name] = []
+
+        writer = self._writers.get(config_name)
+        if writer is None:
+            shards = self.shards.setdefault(config_name, [])
+            config_dir = self.output_dir / config_name
+            if not shards:
+                # Do not mix the shards with those of a previous run
+                config_dir.mkdir(parents=True, exist_ok=True)
+                for path in config_dir.glob(f"{self.split}-*.parquet"):
+                    path.unlink()
+            path = config_dir / f"{self.split}-{len(shards):05d}.parquet"
+            writer = pq.ParquetWriter(path, self.schema, compression=self.compression)
+            shards.append(path)
+            self._writers[config_name] = writer
+            self._shard_rows[config_name] = 0
+
+        writer.write_table(table, row_group_size=self.row_group_size)
+        self._shard_rows[config_name] += table.num_rows
+        if self._shard_rows[config_name] >= self.max_rows_per_shard:
+            writer.close()
+            del self._writers[config_name]
+
+
 def generate_validation_report_wrapper(
     results: dict[tuple[str, str, float, bool, bool], MultiScenarioValidationResult],
     model: str,
@@ -448,6 +648,68 @@ def generate_submission_summary(
     logger.info(f"Submission summary saved to: {summary_path}")
 
 
+def upload_trace_shards(
+    trace_writer: ParquetTraceWriter,
+    dataset_name: str,
+    readme_content: str,
+    json_stats: dict,
+    commit_message: str,
+    public: bool,
+    api: Any = None,
+) -> None:
+    """Push the shards written by a ParquetTraceWriter to HuggingFace in a single commit.
+
+    The dataset card and the JSON statistics are written next to the shards and pushed
+    with them. The shards of the split already on the Hub are deleted in the same commit.
+
+    :param trace_writer: The closed writer of the shards
+    :type trace_writer: ParquetTraceWriter
+    :param dataset_name: Name of the dataset to upload to
+    :type dataset_name: str
+    :param readme_content: Content of the dataset card
+    :type readme_content: str
+    :param json_stats: Statistics saved as computed_stats.json
+    :type json_stats: dict
+    :param commit_message: Message of the commit
+    :type commit_message: str
+    :param public: Whether to make the dataset public
+    :type public: bool
+    :param api: HuggingFace Hub client, a new HfApi by default
+    :type api: Any
+    """
+    if api is None:
+        from huggingface_hub import HfApi
+
+        api = HfApi()
+
+    output_dir = trace_writer.output_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / "README.md").write_text(readme_content)
+    (output_dir / "computed_stats.json").write_text(json.dumps(json_stats, indent=2))
+
+    api.create_repo(
+        repo_id=dataset_name,
+        repo_type="dataset",
+        private=not public,
+        exist_ok=True,
+    )
+    shard_patterns = [
+        f"{config_name}/{trace_writer.split}-*.parquet"
+        for config_name in trace_writer.config_names
+    ]
+    api.upload_folder(
+        folder_path=str(output_dir),
+        repo_id=dataset_name,
+        repo_type="dataset",
+        commit_message=commit_message,
+        commit_description=readme_content,
+        # Only push the shards of this submission
+        allow_patterns=shard_patterns + ["README.md", "computed_stats.json"],
+        # The shards of previous submissions match the data files of the dataset card
+        delete_patterns=shard_patterns,
+    )
+
+
 def upload_consolidated_results_to_hf(
     results: dict[tuple[str, str, float, bool, bool], MultiScenarioValidationResult],
     dataset_name: str,
@@ -456,10 +718,13 @@ def upload_consolidated_results_to_hf(
     public: bool,
     original_dataset: str,
     split: str,
+    trace_writer: ParquetTraceWriter | None = None,
+    api: Any = None,
 ) -> bool:
     """Upload consolidated results from all phases to HuggingFace as separate configs/partitions.
 
-    Uses polars-based data processing for improved performance and cleaner code.
+    The traces are uploaded as the Parquet shards of a ParquetTraceWriter. When no writer
+    streamed them during the runs, they are written to a temporary directory first.
 
     :param results: Dictionary mapping (phase_name, config, a2a_app_prop, has_tool_augmentation, has_env_events) tuples to results
     :type results: dict[tuple[str, str, float, bool, bool], MultiScenarioValidationResult]
@@ -475,10 +740,13 @@ def upload_consolidated_results_to_hf(
     :type original_dataset: str
     :param split: Dataset split used
     :type split: str
+    :param trace_writer: Writer which streamed the rows of the results, closed
+    :type trace_writer: ParquetTraceWriter | None
+    :param api: HuggingFace Hub client, a new HfApi by default
+    :type api: Any
     :returns: True if upload succeeded, False otherwise
     :rtype: bool
     """
-
     logger.info("Uploading all results as separate configs to HuggingFace...")
 
     # Convert to DataFrame for easier processing
@@ -506,144 +774,36 @@ def upload_consolidated_results_to_hf(
         f"{overall_success_rate:.2f}% ({total_successful}/{total_scenarios})"
     )
 
-    # Group results by config and create separate datasets for each config
-    configs_to_upload = {}
-
-    if not df.is_empty():
-        # Group by phase and config to create config names
-        for phase_name in df.select("phase_name").unique().to_series():
-            for config in (
-                df.filter(df["phase_name"] == phase_name)
-                .select("config")
-                .unique()
-                .to_series()
-            ):
-                config_name = create_config_name(config, phase_name)
-
-                if config_name not in configs_to_upload:
-                    configs_to_upload[config_name] = []
-
-                # Filter DataFrame for this specific config
-                config_df = df.filter(
-                    (df["phase_name"] == phase_name) & (df["config"] == config)
-                )
-
-                # Convert to HuggingFace rows format
-                rows = build_trace_rows_polars(config_df)
-                configs_to_upload[config_name].extend(rows)
+    temporary_dir = None
+    if trace_writer is None:
+        temporary_dir = tempfile.mkdtemp(prefix="gaia2_results_")
+        with ParquetTraceWriter(temporary_dir, split) as trace_writer:
+            trace_writer.write_results(results)
 
     logger.info(
-        f"Will upload {len(configs_to_upload)} configs: {list(configs_to_upload.keys())}"
+        f"Will upload {len(trace_writer.config_names)} configs: {trace_writer.config_names}"
     )
 
-    # Create schema
-    schema = create_hf_schema()
-
-    success = True
-
-    # Upload each config separately
-    for config_name, rows in configs_to_upload.items():
-        try:
-            logger.info(f"Uploading config '{config_name}' with {len(rows)} rows...")
-
-            # Create table and dataset for this config
-            table = pa.Table.from_pylist(rows, schema=schema)
-
-            hf_split = Split.TEST if split == "test" else Split.VALIDATION
-
-            dataset = Dataset(
-                table,
-                split=hf_split,
-                info=DatasetInfo(description=readme_content),
-            )
-
-            # Upload with config parameter
-            dataset.push_to_hub(
-                dataset_name,
-                config_name=config_name,
-                split=split,
-                commit_message=f"{commit_msg} - config: {config_name}",
-                commit_description=readme_content,
-                private=not public,
-            )
-
-            logger.info(f"Successfully uploaded config '{config_name}'")
-
-        except Exception as e:
-            logger.error(f"Failed to upload config '{config_name}': {e}")
-            success = False
-
-    # Upload README and JSON report using HuggingFace Hub
-    if success:
-        try:
-            import json
-
-            from huggingface_hub import HfApi
-
-            api = HfApi()
-
-            # Upload dataset card (README)
-            api.upload_file(
-                path_or_fileobj=readme_content.encode(),
-                path_in_repo="README.md",
-                repo_id=dataset_name,
-                repo_type="dataset",
-                commit_message=f"Update dataset card for {model} results",
-            )
-            logger.info(f"Successfully uploaded dataset card to {dataset_name}")
-
-            # Generate and upload JSON report
-            json_stats = generate_json_stats_report_wrapper(
-                results, model, model_provider
-            )
-            json_content = json.dumps(json_stats, indent=2)
-
-            api.upload_file(
-                path_or_fileobj=json_content.encode(),
-                path_in_repo="computed_stats.json",
-                repo_id=dataset_name,
-                repo_type="dataset",
-                commit_message=f"Upload computed statistics for {model} results",
-            )
-            logger.info(f"Successfully uploaded JSON statistics to {dataset_name}")
-
-        except Exception as upload_error:
-            logger.warning(f"Failed to upload README or JSON report: {upload_error}")
-            # Continue anyway as the main dataset upload succeeded
-
-    if success:
-        logger.info(f"Successfully uploaded all configs to {dataset_name}")
-        return True
-    else:
-        logger.error(f"Failed to upload some configs to {dataset_name}")
-
-        # Try to save locally as fallback
-        try:
-            output_ds_path = Path("./gaia2_results") / dataset_name.replace("/", "_")
-
-            for config_name, rows in configs_to_upload.items():
-                config_path = output_ds_path / config_name
-                config_path.mkdir(parents=True, exist_ok=True)
-
-                table = pa.Table.from_pylist(rows, schema=schema)
-
-                dataset = Dataset(
-                    table,
-                    info=DatasetInfo(description=readme_content),
-                )
-                dataset.save_to_disk(config_path)
-
-            # Also save the README.md file
-            readme_path = output_ds_path / "README.md"
-            with open(readme_path, "w") as f:
-                f.write(readme_content)
-
-            logger.info(
-                f"Saved dataset locally to {output_ds_path}. "
-                "You can upload it manually to HuggingFace Hub."
-            )
-            return False
-        except Exception as save_error:
-            logger.error(f"Failed to save dataset locally: {save_error}")
-
+    try:
+        json_stats = generate_json_stats_report_wrapper(results, model, model_provider)
+        upload_trace_shards(
+            trace_writer,
+            dataset_name,
+            readme_content,
+            json_stats,
+            commit_msg,
+            public,
+            api=api,
+        )
+    except Exception as e:
+        logger.error(f"Failed to upload to {dataset_name}: {e}")
+        logger.info(
+            f"The dataset is saved locally in {trace_writer.output_dir}. "
+            "You can upload it manually to HuggingFace Hub."
+        )
         return False
+
+    if temporary_dir is not None:
+        shutil.rmtree(temporary_dir, ignore_errors=True)
+    logger.info(f"Successfully uploaded all configs to {dataset_name}")
+    return True
@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+"""
+Offline batch re-judging of exported traces.
+
+This script takes a directory (searched recursively) or a JSONL file of exported
+traces in HuggingFace format and re-runs the judge on all of them without re-running
+the agents:
+1. Index the traces and group them by scenario, so that traces of the same scenario
+   share a single parsed scenario and a single oracle run
+2. Judge every group in a worker pool
+3. Write a results table and the report statistics for the new judge
+
+Usage:
+    python -m are.simulation.benchmark.rejudge --input ~/gaia2_run --output_dir ~/gaia2_rejudge --judge_model meta-llama/Meta-Llama-3.3-70B-Instruct
+
+The judge can also be configured with a JSON file passed with --judge_config, holding an
+optional "engine" object (LLMEngineConfig fields, overriding the --judge_* flags) and any of
+the GraphPerEventJudgeConfig fields listed in JUDGE_OPTION_FIELDS, e.g.
+    {"engine": {"model_name": "...", "provider": "..."}, "pre_event_tolerance_seconds": 5.0}
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import xxhash
+
+from are.simulation.agents.are_simulation_agent_config import LLMEngineConfig
+from are.simulation.benchmark.report_stats import (
+    combine_results_to_dataframe,
+    generate_json_stats_report,
+    generate_validation_report,
+)
+from are.simulation.benchmark.scenario_loader import APPS_TO_SKIP, find_scenario_paths
+from are.simulation.data_handler.importer import (
+    JsonScenarioImporter,
+    TraceSection,
+    iter_json_object_members,
+)
+from are.simulation.data_handler.models import ExportedTraceMetadata
+from are.simulation.environment import Environment
+from are.simulation.scenarios.config import (
+    MultiScenarioRunnerConfig,
+    ScenarioRunnerConfig,
+)
+from are.simulation.scenarios.scenario_imported_from_json.utils import (
+    preprocess_scenario_from_config,
+)
+from are.simulation.scenarios.validation_result import (
+    MultiScenarioValidationResult,
+    ScenarioValidationResult,
+)
+from are.simulation.types import EventLog
+from are.simulation.utils.streaming_utils import stream_pool
+from are.simulation.validation.configs import DEFAULT_JUDGE_MODEL
+
+logger = logging.getLogger(__name__)
+
+# Sections of a trace which define the scenario, traces of the same scenario have the same values
+SCENARIO_SECTIONS = ("version", "apps", "events", "augmentation")
+
+# Runner config fields which change how a scenario is preprocessed before judging
+PREPROCESSING_CONFIG_FIELDS = {
+    "tool_augmentation_config",
+    "env_events_config",
+    "max_scenario_duration",
+    "max_time_scenario_duration",
+}
+
+# GraphPerEventJudgeConfig fields which can be set from a judge config file
+JUDGE_OPTION_FIELDS = {
+    "check_time_threshold_seconds",
+    "pre_event_tolerance_seconds",
+    "post_event_tolerance_seconds",
+    "extra_send_message_to_user_allowed",
+}
+
+
+@dataclass
+class TraceRef:
+    """Lightweight reference to an exported trace, built without importing the trace."""
+
+    path: str
+    scenario_id: str
+    run_number: int | None
+    model: str
+    model_provider: str | None
+    agent: str | None
+    phase_name: str
+    config: str
+    a2a_app_prop: float
+    has_tool_augmentation: bool
+    has_env_events: bool
+    runner_config: ScenarioRunnerConfig | None = None
+
+
+@dataclass
+class TraceGroup:
+    """Traces which share the same scenario definition and can be judged together."""
+
+    fingerprint: str
+    traces: list[TraceRef] = field(default_factory=list)
+
+
+@dataclass
+class RejudgedTrace:
+    """Result of re-judging a single trace."""
+
+    trace: TraceRef
+    result: ScenarioValidationResult
+
+
+def _read_trace(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _phase_of(metadata: ExportedTraceMetadata) -> tuple[str, float, bool, bool]:
+    """Recover the (phase_name, a2a_app_prop, has_tool_augmentation, has_env_events) of a run."""
+    definition = metadata.definition
+    runner_config = metadata.runner_config
+    a2a_app_prop = (
+        runner_config.a2a_app_prop
+        if runner_config is not None
+        else (1.0 if definition.has_a2a_augmentation else 0.0)
+    )
+    has_tool_augmentation = definition.has_tool_augmentation
+    has_env_events = definition.has_env_events_augmentation
+    if has_tool_augmentation or has_env_events:
+        phase_name = "noise"
+    elif definition.has_a2a_augmentation or a2a_app_prop > 0:
+        phase_name = "agent2agent"
+    else:
+        phase_name = "standard"
+    return phase_name, a2a_app_prop, has_tool_augmentation, has_env_events
+
+
+def index_trace(path: str) -> tuple[str, TraceRef]:
+    """
+    Read the metadata of a trace and compute the fingerprint of its scenario.
+
+    Only the sections defining the scenario are decoded, the completed events and
+    world logs are skipped. Two traces with the same fingerprint share the same
+    scenario definition and preprocessing config, so their oracle run can be shared.
+
+    :param path: Path to the exported trace
+    :returns: Tuple of (scenario fingerprint, trace reference)
+    :raises ValueError: If the file is not a trace in HuggingFace format
+    """
+    sections = dict(
+        iter_json_object_members(
+            _read_trace(path), keys=(*SCENARIO_SECTIONS, "metadata")
+        )
+    )
+    if "metadata" not in sections or "version" not in sections:
+        raise ValueError(f"{path} is not a trace in HuggingFace format")
+    metadata = ExportedTraceMetadata.model_validate(sections.pop("metadata"))
+    definition = metadata.definition
+    runner_config = metadata.runner_config
+    simulation = metadata.simulation
+
+    # Everything except the run specific fields (run number, exceptions) defines the scenario
+    sections["definition"] = definition.model_dump(
+        exclude={"run_number", "has_exception", "exception_type", "exception_message"}
+    )
+    if runner_config is not None:
+        sections["runner_config"] = runner_config.model_dump(
+            include=PREPROCESSING_CONFIG_FIELDS
+        )
+    fingerprint = xxhash.xxh64(
+        json.dumps(sections, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+    phase_name, a2a_app_prop, has_tool_augmentation, has_env_events = _phase_of(
+        metadata
+    )
+    model = (
+        runner_config.model
+        if runner_config is not None
+        else (simulation.model_id if simulation and simulation.model_id else "unknown")
+    )
+    trace = TraceRef(
+        path=path,
+        scenario_id=definition.scenario_id,
+        run_number=definition.run_number,
+        model=model,
+        model_provider=runner_config.model_provider if runner_config else None,
+        agent=(
+            runner_config.agent
+            if runner_config is not None
+            else (simulation.agent_id if simulation else None)
+        ),
+        phase_name=phase_name,
+        config=definition.config or "unknown",
+        a2a_app_prop=a2a_app_prop,
+        has_tool_augmentation=has_tool_augmentation,
+        has_env_events=has_env_events,
+        runner_config=runner_config,
+    )
+    return fingerprint, trace
+
+
+def find_trace_paths(input_path: str) -> list[str]:
+    """
+    Find the exported traces in a directory (recursively) or in a JSONL file of trace_id references.
+
+    :param input_path: Path to a directory of traces or to a JSONL file
+    :returns: Sorted list of trace paths
+    """
+    if os.path.isdir(input_path):
+        return sorted(str(path) for path in Path(input_path).rglob("*.json"))
+    _, paths = find_scenario_paths(input_path)
+    return paths
+
+
+def group_traces(paths: list[str]) -> list[TraceGroup]:
+    """
+    Index traces and group them by scenario fingerprint.
+
+    Files which are not traces in HuggingFace format (e.g. lite traces or reports) are skipped.
+
+    :param paths: Paths of the traces to group
+    :returns: List of trace groups, in the order their first trace appears in `paths`
+    """
+    groups: dict[str, TraceGroup] = {}
+    for path in paths:
+        try:
+            fingerprint, trace = index_trace(path)
+        except Exception as e:
+            logger.warning(f"Skipping {path}: {e}")
+            continue
+        groups.setdefault(
+            fingerprint, TraceGroup(fingerprint=fingerprint)
+        ).traces.append(trace)
+    return list(groups.values())
+
+
+def load_judge_config(
+    path: str,
+) -> tuple[LLMEngineConfig | None, dict[str, Any]]:
+    """
+    Load a judge config file.
+
+    :param path: Path to a JSON object with an optional "engine" object of LLMEngineConfig
+        fields and any of the GraphPerEventJudgeConfig fields in JUDGE_OPTION_FIELDS
+    :returns: Tuple of (engine config if given, judge options)
+    :raises ValueError: If the file is not a JSON object or has unknown fields
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Judge config {path} must be a JSON object")
+    engine = data.pop("engine", None)
+    unknown_fields = set(data) - JUDGE_OPTION_FIELDS
+    if unknown_fields:
+        raise ValueError(
+            f"Unknown judge config fields in {path}: {sorted(unknown_fields)}, "
+            f"expected 'engine' or one of {sorted(JUDGE_OPTION_FIELDS)}"
+        )
+    engine_config = (
+        LLMEngineConfig.model_validate(engine) if engine is not None else None
+    )
+    return engine_config, data
+
+
+def rejudge_trace_group(
+    group: TraceGroup,
+    judge_engine_config: LLMEngineConfig | None = None,
+    judge_options: dict[str, Any] | None = None,
+) -> list[RejudgedTrace]:
+    """
+    Re-judge all the traces of a group.
+
+    The scenario is imported and preprocessed (which runs the oracle) once for the whole
+    group. Each trace then only needs its completed events, and the judge state is reset
+    from the preprocessed scenario before judging it.
+
+    :param group: Group of traces sharing the same scenario
+    :param judge_engine_config: Engine configuration of the judge, defaults to the default judge
+    :param judge_options: GraphPerEventJudgeConfig fields overriding the judge defaults
+    :returns: One result per trace of the group
+    """
+    importer = JsonScenarioImporter()
+    first_trace = group.traces[0]
+    runner_config = (first_trace.runner_config or ScenarioRunnerConfig()).model_copy(
+        update={
+            "oracle": False,
+            "judge_only": True,
+            "judge_engine_config": judge_engine_config
+            or LLMEngineConfig(model_name=DEFAULT_JUDGE_MODEL),
+        }
+    )
+
+    results = []
+    try:
+        scenario, _, _ = importer.import_from_json_to_benchmark(
+            _read_trace(first_trace.path),
+            apps_to_skip=APPS_TO_SKIP,
+            load_completed_events=False,
+        )
+        preprocess_scenario_from_config(
+            scenario=scenario, config=runner_config, judge_options=judge_options
+        )
+    except Exception as exception:
+        logger.exception(
+            f"Failed to preprocess scenario {first_trace.scenario_id}: {exception}"
+        )
+        return [
+            RejudgedTrace(
+                trace=trace,
+                result=ScenarioValidationResult(
+                    success=False, exception=exception, export_path=trace.path
+                ),
+            )
+            for trace in group.traces
+        ]
+
+    judge = getattr(scenario, "judge", None)
+    for i, trace in enumerate(group.traces):
+        start_time = time.time()
+        try:
+            completed_events = importer.import_partial(
+                _read_trace(trace.path), sections=(TraceSection.COMPLETED_EVENTS,)
+            ).completed_events
+            if judge is not None and i > 0:
+                # The first trace uses the state initialized by the preprocessing
+                judge.initialize_state(scenario)
+            environment = Environment()
+            environment.event_log = EventLog.from_list_view(completed_events or [])
+            result = scenario.validate(environment)
+        except Exception as exception:
+            logger.exception(f"Failed to judge trace {trace.path}: {exception}")
+            result = ScenarioValidationResult(success=None, exception=exception)
+        # Convert exception into failure, as in ScenarioRunner.run
+        if result.success is None and result.exception is not None:
+            result.success = False
+        result.export_path = trace.path
+        result.duration = time.time() - start_time
+        results.append(RejudgedTrace(trace=trace, result=result))
+    return results
+
+
+def rejudge_traces(
+    input_path: str,
+    judge_engine_config: LLMEngineConfig | None = None,
+    judge_options: dict[str, Any] | None = None,
+    max_workers: int = 1,
+    executor_type: str = "process",
+    timeout_seconds: int | None = None,
+) -> dict[str, dict[tuple[str, str, float, bool, bool], MultiScenarioValidationResult]]:
+    """
+    Re-judge exported traces and collect the results in the structure used by report_stats.
+
+    :param input_path: Directory of traces (searched recursively) or JSONL file of trace_id references
+    :param judge_engine_config: Engine configuration of the judge
+    :param judge_options: GraphPerEventJudgeConfig fields overriding the judge defaults
+    :param max_workers: Maximum number of scenario groups judged concurrently
+    :param executor_type: Type of executor to use: "sequential", "thread" or "process"
+    :param timeout_seconds: Optional timeout for judging one scenario group
+    :returns: Mapping from the model which produced the traces to its results, keyed by
+        (phase_name, config, a2a_app_prop, has_tool_augmentation, has_env_events)
+    """
+    start_time = time.time()
+    groups = group_traces(find_trace_paths(input_path))
+    nb_traces = sum(len(group.traces) for group in groups)
+    logger.info(f"Re-judging {nb_traces} traces of {len(groups)} scenarios")
+
+    results: dict[
+        str, dict[tuple[str, str, float, bool, bool], MultiScenarioValidationResult]
+    ] = {}
+
+    def add_group_failure(group: TraceGroup, error: Exception) -> None:
+        for trace in group.traces:
+            add_result(
+                trace,
+                ScenarioValidationResult(
+                    success=False, exception=error, export_path=trace.path
+                ),
+            )
+
+    def add_result(trace: TraceRef, result: ScenarioValidationResult) -> None:
+        model_results = results.setdefault(trace.model, {})
+        result_key = (
+            trace.phase_name,
+            trace.config,
+            trace.a2a_app_prop,
+            trace.has_tool_augmentation,
+            trace.has_env_events,
+        )
+        if result_key not in model_results:
+            model_results[result_key] = MultiScenarioValidationResult(
+                run_config=MultiScenarioRunnerConfig(
+                    model=trace.model,
+                    model_provider=trace.model_provider,
+                    agent=trace.agent,
+                    judge_only=True,
+                    judge_engine_config=judge_engine_config,
+                    a2a_app_prop=trace.a2a_app_prop,
+                    max_concurrent_scenarios=max_workers,
+                    executor_type=executor_type,
+                )
+            )
+        model_results[result_key].add_result(
+            result, trace.scenario_id, trace.run_number
+        )
+
+    with stream_pool(
+        iter(groups),
+        rejudge_trace_group,
+        max_workers=max_workers,
+        timeout_seconds=timeout_seconds,
+        executor_type=executor_type,
+        judge_engine_config=judge_engine_config,
+        judge_options=judge_options,
+    ) as stream:
+        for group, group_results, error in stream:
+            if error is None and not group_results:
+                error = RuntimeError("Judging the scenario returned no results")
+            if error is not None:
+                logger.error(
+                    f"Failed to judge scenario {group.traces[0].scenario_id}: {error}"
+                )
+                add_group_failure(group, error)
+                continue
+            assert group_results is not None
+            for rejudged in group_results:
+                add_result(rejudged.trace, rejudged.result)
+
+    duration = time.time() - start_time
+    for model_results in results.values():
+        for multi_result in model_results.values():
+            multi_result.duration = duration
+    return results
+
+
+def save_rejudge_results(
+    results: dict[
+        str, dict[tuple[str, str, float, bool, bool], MultiScenarioValidationResult]
+    ],
+    output_dir: str,
+    num_runs: int = 3,
+) -> None:
+    """
+    Write the re-judged results table and the report statistics of each model.
+
+    The table of all results is saved as `rejudge_results.parquet` and can be loaded
+    with polars to be passed to the report_stats functions. The statistics are saved in
+    `<model>/benchmark_stats.json` and `<model>/validation_report.txt`.
+
+    :param results: Results returned by rejudge_traces
+    :param output_dir: Directory where the results are saved
+    :param num_runs: Number of runs per scenario for display
+    """
+    import polars as pl
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    dataframes = []
+    for model, model_results in results.items():
+        df = combine_results_to_dataframe(model_results)
+        if df.is_empty():
+            continue
+        dataframes.append(df)
+        provider = (
+            next(iter(model_results.values())).run_config.model_provider or "unknown"
+        )
+
+        model_path = output_path / model.replace("/", "_")
+        model_path.mkdir(parents=True, exist_ok=True)
+        report = generate_validation_report(df, model, provider, num_runs)
+        logger.info("\n" + report)
+        with open(model_path / "validation_report.txt", "w", encoding="utf-8") as f:
+            f.write(report)
+        with open(model_path / "benchmark_stats.json", "w", encoding="utf-8") as f:
+            json.dump(generate_json_stats_report(df, model, provider), f, indent=2)
+
+    if not dataframes:
+        logger.warning("No results available for reporting.")
+        return
+    table_path = output_path / "rejudge_results.parquet"
+    pl.concat(dataframes, how="diagonal_relaxed").write_parquet(table_path)
+    logger.info(f"Re-judged results saved to {table_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-judge exported traces offline")
+    parser.add_argument(
+        "--input",
+        required=True,
+        help="Directory of exported traces (searched recursively) or JSONL file of trace_id references",
+    )
+    parser.add_argument(
+        "--output_dir", required=True, help="Directory to save the re-judged results"
+    )
+    parser.add_argument(
+        "--judge_model", default=DEFAULT_JUDGE_MODEL, help="Model used by the judge"
+    )
+    parser.add_argument("--judge_provider", help="Provider of the judge model")
+    parser.add_argument("--judge_endpoint", help="Endpoint of the judge model")
+    parser.add_argument(
+        "--judge_config",
+        help="JSON file with the judge engine and GraphPerEventJudgeConfig fields, see the module docstring",
+    )
+    parser.add_argument(
+        "--max_concurrent_scenarios",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Maximum number of scenarios judged concurrently",
+    )
+    parser.add_argument(
+        "--executor_type",
+        default="process",
+        choices=["sequential", "thread", "process"],
+        help="Type of executor used to judge the scenarios",
+    )
+    parser.add_argument(
+        "--scenario_timeout",
+        type=int,
+        help="Timeout in seconds for judging all the traces of one scenario",
+    )
+    parser.add_argument(
+        "--num_runs", type=int, default=3, help="Number of runs per scenario"
+    )
+    parser.add_argument("--log_level", default="INFO", help="Logging level")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper()),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    judge_engine_config = LLMEngineConfig(
+        model_name=args.judge_model,
+        provider=args.judge_provider,
+        endpoint=args.judge_endpoint,
+    )
+    judge_options = None
+    if args.judge_config is not None:
+        file_engine_config, judge_options = load_judge_config(args.judge_config)
+        judge_engine_config = file_engine_config or judge_engine_config
+
+    results = rejudge_traces(
+        args.input,
+        judge_engine_config=judge_engine_config,
+        judge_options=judge_options,
+        max_workers=args.max_concurrent_scenarios,
+        executor_type=args.executor_type,
+        timeout_seconds=args.scenario_timeout,
+    )
+    if not results:
+        logger.error(f"No traces found in {args.input}")
+        return 1
+
+    save_rejudge_results(results, args.output_dir, args.num_runs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
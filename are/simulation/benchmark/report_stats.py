@@ -17,23 +17,6 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-def _safe_mean_to_float(mean_value: Any) -> float | None:
-    """Safely convert polars mean() result to float or None.
-
-    Polars .mean() can return PythonLiteral types including date objects,
-    but we expect numeric values for success rates.
-
-    :param mean_value: Result from polars .mean() operation
-    :returns: Float value or None if conversion fails
-    """
-    if mean_value is None:
-        return None
-    if isinstance(mean_value, (int, float)):
-        return float(mean_value)
-    # If it's not a numeric type, return None to indicate invalid data
-    return None
-
-
 def combine_results_to_dataframe(
     results: dict[tuple[str, str, float, bool, bool], "MultiScenarioValidationResult"],
 ) -> pl.DataFrame:
@@ -117,6 +100,137 @@ def generate_validation_report_header(model: str, model_provider: str) -> str:
     return header
 
 
+def _aggregate(lf: pl.LazyFrame, by: list[str], exprs: list[pl.Expr]) -> pl.LazyFrame:
+    """Aggregate a frame per group, or into a single row when there are no group keys.
+
+    :param lf: Frame to aggregate
+    :type lf: pl.LazyFrame
+    :param by: Group keys, empty to aggregate the whole frame
+    :type by: list[str]
+    :param exprs: Aggregation expressions
+    :type exprs: list[pl.Expr]
+    :returns: Frame with one row per group
+    :rtype: pl.LazyFrame
+    """
+    if by:
+        return lf.group_by(by, maintain_order=True).agg(exprs)
+    return lf.select(exprs)
+
+
+def _run_count_exprs() -> list[pl.Expr]:
+    """Expressions counting the different types of runs.
+
+    :returns: Aggregation expressions, one per run count
+    :rtype: list[pl.Expr]
+    """
+    return [
+        pl.len().alias("total_runs"),
+        pl.col("success_numeric").is_not_null().sum().alias("validated_runs"),
+        (pl.col("status") == "success").sum().alias("success_runs"),
+        (pl.col("status") == "failed").sum().alias("failed_runs"),
+        (pl.col("status") == "exception").sum().alias("exception_runs"),
+        (pl.col("status") == "no_validation").sum().alias("no_validation_runs"),
+    ]
+
+
+def _run_duration_exprs() -> list[pl.Expr]:
+    """Expressions for the mean and standard deviation of the non-null run durations.
+
+    :returns: Aggregation expressions, 0.0 when there are not enough durations
+    :rtype: list[pl.Expr]
+    """
+    return [
+        pl.col("run_duration").mean().fill_null(0.0).alias("avg_run_duration"),
+        pl.col("run_duration").std().fill_null(0.0).alias("avg_run_duration_std"),
+    ]
+
+
+def _std_and_sem_exprs(scores: pl.Expr, prefix: str) -> list[pl.Expr]:
+    """Expressions for the standard deviation and standard error of run-level scores.
+
+    :param scores: Run-level scores, one per run
+    :type scores: pl.Expr
+    :param prefix: Prefix of the output columns
+    :type prefix: str
+    :returns: Aggregation expressions, 0.0 when there are less than two runs
+    :rtype: list[pl.Expr]
+    """
+    num_runs = scores.count()
+    return [
+        pl.when(num_runs > 1)
+        .then(scores.std(ddof=1))
+        .otherwise(0.0)
+        .alias(f"{prefix}_std"),
+        pl.when(num_runs > 1)
+        .then(scores.std(ddof=1) / num_runs.sqrt())
+        .otherwise(0.0)
+        .alias(f"{prefix}_sem"),
+    ]
+
+
+def _success_rate_frame(lf: pl.LazyFrame, by: list[str]) -> pl.LazyFrame:
+    """Success rate of the validated runs of each group.
+
+    The STD and SEM are computed across run-level success rates.
+
+    :param lf: Frame with scenario results
+    :type lf: pl.LazyFrame
+    :param by: Group keys, empty for a single row over the whole frame
+    :type by: list[str]
+    :returns: Frame with success_rate, success_rate_std and success_rate_sem per group
+    :rtype: pl.LazyFrame
+    """
+    run_level = (
+        lf.filter(pl.col("success_numeric").is_not_null())
+        .group_by([*by, "run_number"])
+        .agg(
+            pl.col("success_numeric").sum().alias("successes"),
+            pl.len().alias("validated_runs"),
+            (pl.col("success_numeric").mean() * 100.0).alias("run_success_rate"),
+        )
+    )
+    # Runs without a run number count toward the success rate but not toward its spread
+    run_success_rates = pl.col("run_success_rate").filter(
+        pl.col("run_number").is_not_null()
+    )
+    return _aggregate(
+        run_level,
+        by,
+        [
+            (pl.col("successes").sum() / pl.col("validated_runs").sum() * 100.0).alias(
+                "success_rate"
+            ),
+            *_std_and_sem_exprs(run_success_rates, "success_rate"),
+        ],
+    )
+
+
+def _pass_at_k_frame(lf: pl.LazyFrame, by: list[str]) -> pl.LazyFrame:
+    """Number of scenarios with at least one success and with only successes per group.
+
+    :param lf: Frame with scenario results
+    :type lf: pl.LazyFrame
+    :param by: Group keys, empty for a single row over the whole frame
+    :type by: list[str]
+    :returns: Frame with pass_at_k and pass_k per group
+    :rtype: pl.LazyFrame
+    """
+    scenario_keys = list(dict.fromkeys([*by, "base_scenario_id", "phase_name"]))
+    scenario_stats = (
+        lf.filter(pl.col("success_numeric").is_not_null())
+        .group_by(scenario_keys)
+        .agg(pl.col("success_numeric").mean().alias("scenario_success_rate"))
+    )
+    return _aggregate(
+        scenario_stats,
+        by,
+        [
+            (pl.col("scenario_success_rate") > 0.0).sum().alias("pass_at_k"),
+            (pl.col("scenario_success_rate") == 1.0).sum().alias("pass_k"),
+        ],
+    )
+
+
 def _count_runs_by_type(df: pl.DataFrame) -> dict[str, int]:
     """Count different types of runs in the dataframe.
 
@@ -135,21 +249,7 @@ def _count_runs_by_type(df: pl.DataFrame) -> dict[str, int]:
             "no_validation_runs": 0,
         }
 
-    total_runs = len(df)
-    validated_runs = len(df.filter(pl.col("success_numeric").is_not_null()))
-    success_runs = len(df.filter(pl.col("status") == "success"))
-    failed_runs = len(df.filter(pl.col("status") == "failed"))
-    exception_runs = len(df.filter(pl.col("status") == "exception"))
-    no_validation_runs = len(df.filter(pl.col("status") == "no_validation"))
-
-    return {
-        "total_runs": total_runs,
-        "validated_runs": validated_runs,
-        "success_runs": success_runs,
-        "failed_runs": failed_runs,
-        "exception_runs": exception_runs,
-        "no_validation_runs": no_validation_runs,
-    }
+    return df.select(_run_count_exprs()).row(0, named=True)
 
 
 def _calculate_success_rate_stats(df: pl.DataFrame) -> dict[str, float]:
@@ -164,51 +264,14 @@ def _calculate_success_rate_stats(df: pl.DataFrame) -> dict[str, float]:
     :returns: Dictionary with success rate statistics
     :rtype: dict[str, float]
     """
-    # Filter to only validated runs (non-null success_numeric)
-    validated_df = df.filter(pl.col("success_numeric").is_not_null())
-
-    if validated_df.is_empty():
+    if df.filter(pl.col("success_numeric").is_not_null()).is_empty():
         return {
             "success_rate": 0.0,
             "success_rate_std": 0.0,
             "success_rate_sem": 0.0,
         }
 
-    # Calculate overall success rate from individual runs
-    success_values = validated_df.select("success_numeric").to_series()
-    mean_success = _safe_mean_to_float(success_values.mean())
-    success_rate = (mean_success * 100.0) if mean_success is not None else 0.0
-
-    # Calculate STD across run-level means (not individual runs)
-    run_numbers = validated_df.select("run_number").unique().to_series().sort()
-    run_level_means = []
-
-    for run_num in run_numbers:
-        run_df = validated_df.filter(pl.col("run_number") == run_num)
-        if not run_df.is_empty():
-            run_mean = _safe_mean_to_float(
-                run_df.select("success_numeric").to_series().mean()
-            )
-            if run_mean is not None:
-                run_level_means.append(run_mean * 100.0)
-
-    # Standard deviation across run-level means
-    success_rate_std = (
-        float(np.std(run_level_means, ddof=1)) if len(run_level_means) > 1 else 0.0
-    )
-
-    # Standard error of the mean
-    success_rate_sem = (
-        success_rate_std / float(np.sqrt(len(run_level_means)))
-        if len(run_level_means) > 1
-        else 0.0
-    )
-
-    return {
-        "success_rate": success_rate,
-        "success_rate_std": success_rate_std,
-        "success_rate_sem": success_rate_sem,
-    }
+    return _success_rate_frame(df.lazy(), []).collect().row(0, named=True)
 
 
 def _calculate_pass_at_k_stats(df: pl.DataFrame) -> dict[str, Any]:
@@ -238,18 +301,7 @@ def _calculate_pass_at_k_stats(df: pl.DataFrame) -> dict[str, Any]:
     # Count total unique scenarios (from original df, not just validated)
     total_scenarios = df.select(["base_scenario_id", "phase_name"]).n_unique()
 
-    # Calculate per-scenario success rates
-    scenario_stats = validated_df.group_by(["base_scenario_id", "phase_name"]).agg(
-        [
-            pl.col("success_numeric").mean().alias("scenario_success_rate"),
-        ]
-    )
-
-    # Pass@k: scenarios with at least one success (success_rate > 0)
-    pass_at_k = len(scenario_stats.filter(pl.col("scenario_success_rate") > 0.0))
-
-    # Pass^k: scenarios with all successes (success_rate = 1.0)
-    pass_k = len(scenario_stats.filter(pl.col("scenario_success_rate") == 1.0))
+    pass_at_k, pass_k = _pass_at_k_frame(df.lazy(), []).collect().row(0)
 
     return {
         "pass_at_k": pass_at_k,
@@ -272,55 +324,86 @@ def _calculate_run_duration_stats(df: pl.DataFrame) -> dict[str, float]:
     :returns: Dictionary with run duration statistics
     :rtype: dict[str, float]
     """
-    # Filter to only runs with non-null run_duration
-    duration_df = df.filter(pl.col("run_duration").is_not_null())
+    return df.select(_run_duration_exprs()).row(0, named=True)
 
-    if duration_df.is_empty():
-        return {
-            "avg_run_duration": 0.0,
-            "avg_run_duration_std": 0.0,
-        }
 
-    # Calculate overall average run duration
-    avg_duration = _safe_mean_to_float(
-        duration_df.select("run_duration").to_series().mean()
-    )
-    avg_duration = avg_duration if avg_duration is not None else 0.0
+def _calculate_per_capability_stats(df: pl.DataFrame) -> dict[str, dict[str, Any]]:
+    """Calculate statistics for each capability, grouped by config and phase_name.
 
-    # Calculate standard deviation of run durations
-    duration_std = _safe_mean_to_float(
-        duration_df.select("run_duration").to_series().std()
-    )
-    duration_std = duration_std if duration_std is not None else 0.0
-
-    return {
-        "avg_run_duration": avg_duration,
-        "avg_run_duration_std": duration_std,
-    }
-
-
-def _calculate_capability_stats(df: pl.DataFrame, capability: str) -> dict[str, Any]:
-    """Calculate statistics for a single capability.
-
-    :param df: DataFrame with scenario results for this capability
+    :param df: DataFrame with scenario results
     :type df: pl.DataFrame
-    :param capability: Capability name
-    :type capability: str
-    :returns: Dictionary with capability statistics
-    :rtype: dict[str, Any]
+    :returns: Dictionary mapping capability keys to capability statistics
+    :rtype: dict[str, dict[str, Any]]
     """
-    run_counts = _count_runs_by_type(df)
-    success_rate_stats = _calculate_success_rate_stats(df)
-    pass_k_stats = _calculate_pass_at_k_stats(df)
-    duration_stats = _calculate_run_duration_stats(df)
+    lf = df.lazy()
+    by = ["config", "phase_name"]
+    stats = (
+        _aggregate(
+            lf,
+            by,
+            [
+                *_run_count_exprs(),
+                pl.struct("base_scenario_id", "phase_name")
+                .n_unique()
+                .alias("total_scenarios"),
+                *_run_duration_exprs(),
+            ],
+        )
+        .join(_success_rate_frame(lf, by), on=by, how="left")
+        .join(_pass_at_k_frame(lf, by), on=by, how="left")
+        .with_columns(
+            pl.col("success_rate", "success_rate_std", "success_rate_sem").fill_null(
+                0.0
+            ),
+            pl.col("pass_at_k", "pass_k").fill_null(0),
+        )
+        .with_columns(
+            (pl.col("pass_at_k") / pl.col("total_scenarios") * 100).alias(
+                "pass_at_k_percent"
+            ),
+            (pl.col("pass_k") / pl.col("total_scenarios") * 100).alias(
+                "pass_k_percent"
+            ),
+        )
+        .collect()
+    )
 
-    return {
-        "capability": capability,
-        **run_counts,
-        **success_rate_stats,
-        **pass_k_stats,
-        **duration_stats,
-    }
+    per_capability = {}
+    for row in stats.to_dicts():
+        config, phase_name = row["config"], row["phase_name"]
+        # Create a key that combines config and phase for mini capability
+        if config == "mini":
+            capability_key = f"{config}_{phase_name}"
+            display_name = f"{config} ({phase_name})"
+        else:
+            capability_key = config
+            display_name = config
+
+        per_capability[capability_key] = {
+            "capability": display_name,
+            **{
+                key: row[key]
+                for key in [
+                    "total_runs",
+                    "validated_runs",
+                    "success_runs",
+                    "failed_runs",
+                    "exception_runs",
+                    "no_validation_runs",
+                    "success_rate",
+                    "success_rate_std",
+                    "success_rate_sem",
+                    "pass_at_k",
+                    "pass_at_k_percent",
+                    "pass_k",
+                    "pass_k_percent",
+                    "total_scenarios",
+                    "avg_run_duration",
+                    "avg_run_duration_std",
+                ]
+            },
+        }
+    return per_capability
 
 
 def _calculate_cross_run_stats(
@@ -379,60 +462,29 @@ def _calculate_cross_run_stats(
     else:
         raise ValueError(f"Unknown aggregation_type: {aggregation_type}")
 
-    # Calculate STD across run-level scores
-    run_numbers = validated_df.select("run_number").unique().to_series().sort()
-    run_level_scores = []
-
-    for run_num in run_numbers:
-        run_df = validated_df.filter(pl.col("run_number") == run_num)
-        run_capability_scores = []
-        run_capability_counts = []
-
-        # Calculate success rate and count for each capability in this run
-        # Group by both config and phase_name to match the per_capability grouping
-        for config_phase in (
-            validated_df.select(["config", "phase_name"]).unique().iter_rows()
-        ):
-            config, phase_name = config_phase
-            config_phase_run_df = run_df.filter(
-                (pl.col("config") == config) & (pl.col("phase_name") == phase_name)
-            )
-            if not config_phase_run_df.is_empty():
-                run_capability_score = _safe_mean_to_float(
-                    config_phase_run_df.select("success_numeric").to_series().mean()
-                )
-                if run_capability_score is not None:
-                    run_capability_scores.append(run_capability_score * 100.0)
-                    run_capability_counts.append(len(config_phase_run_df))
-
-        # Aggregate across capabilities for this run
-        if run_capability_scores:
-            if aggregation_type == "macro":
-                # Macro: unweighted average across capabilities
-                run_score = float(np.mean(run_capability_scores))
-            elif aggregation_type == "micro":
-                # Micro: weighted average across capabilities
-                if sum(run_capability_counts) > 0:
-                    run_score = sum(
-                        score * count
-                        for score, count in zip(
-                            run_capability_scores, run_capability_counts
-                        )
-                    ) / sum(run_capability_counts)
-                else:
-                    continue  # Skip this run if no valid counts
-
-            run_level_scores.append(run_score)
-
-    # Calculate STD and SEM across run-level scores
-    success_rate_std = (
-        float(np.std(run_level_scores, ddof=1)) if len(run_level_scores) > 1 else 0.0
+    # Calculate STD across run-level scores, grouping by both config and phase_name
+    # to match the per_capability grouping
+    capability_scores = (
+        validated_df.lazy()
+        .filter(pl.col("run_number").is_not_null())
+        .group_by(["run_number", "config", "phase_name"])
+        .agg(
+            (pl.col("success_numeric").mean() * 100.0).alias("score"),
+            pl.len().alias("count"),
+        )
     )
-
-    success_rate_sem = (
-        success_rate_std / float(np.sqrt(len(run_level_scores)))
-        if len(run_level_scores) > 1
-        else 0.0
+    if aggregation_type == "macro":
+        # Macro: unweighted average across capabilities
+        run_score = pl.col("score").mean()
+    else:
+        # Micro: weighted average across capabilities
+        run_score = (pl.col("score") * pl.col("count")).sum() / pl.col("count").sum()
+    success_rate_std, success_rate_sem = (
+        capability_scores.group_by("run_number")
+        .agg(run_score.alias("run_score"))
+        .select(_std_and_sem_exprs(pl.col("run_score"), "success_rate"))
+        .collect()
+        .row(0)
     )
 
     return {
@@ -509,24 +561,7 @@ def calculate_statistics(df: pl.DataFrame) -> dict[str, Any]:
         }
 
     # Calculate per-capability statistics, grouped by config and phase_name
-    per_capability = {}
-    for config_phase in df.select(["config", "phase_name"]).unique().iter_rows():
-        config, phase_name = config_phase
-        config_phase_df = df.filter(
-            (pl.col("config") == config) & (pl.col("phase_name") == phase_name)
-        )
-
-        # Create a key that combines config and phase for mini capability
-        if config == "mini":
-            capability_key = f"{config}_{phase_name}"
-            display_name = f"{config} ({phase_name})"
-        else:
-            capability_key = config
-            display_name = config
-
-        per_capability[capability_key] = _calculate_capability_stats(
-            config_phase_df, display_name
-        )
+    per_capability = _calculate_per_capability_stats(df)
 
     # Calculate global statistics
     global_run_counts = _count_runs_by_type(df)
@@ -691,41 +726,22 @@ def generate_json_stats_report(
     # Get run configurations
     run_configs = []
     if not df.is_empty():
-        config_df = df.group_by(
-            [
-                "phase_name",
-                "config",
-                "a2a_app_prop",
-                "has_tool_augmentation",
-                "has_env_events",
-            ]
-        ).agg(
-            [
-                pl.len().alias("total_runs"),
-                (pl.col("success_numeric").is_not_null()).sum().alias("validated_runs"),
-                (pl.col("status") == "success").sum().alias("success_runs"),
-                (pl.col("status") == "failed").sum().alias("failed_runs"),
-                (pl.col("status") == "exception").sum().alias("exception_runs"),
-                (pl.col("status") == "no_validation").sum().alias("no_validation_runs"),
-            ]
-        )
-
-        for row in config_df.iter_rows(named=True):
-            run_configs.append(
-                {
-                    "phase_name": row["phase_name"],
-                    "config": row["config"],
-                    "a2a_app_prop": row["a2a_app_prop"],
-                    "has_tool_augmentation": row["has_tool_augmentation"],
-                    "has_env_events": row["has_env_events"],
-                    "total_runs": row["total_runs"],
-                    "validated_runs": row["validated_runs"],
-                    "success_runs": row["success_runs"],
-                    "failed_runs": row["failed_runs"],
-                    "exception_runs": row["exception_runs"],
-                    "no_validation_runs": row["no_validation_runs"],
-                }
+        run_configs = (
+            df.lazy()
+            .group_by(
+                [
+                    "phase_name",
+                    "config",
+                    "a2a_app_prop",
+                    "has_tool_augmentation",
+                    "has_env_events",
+                ],
+                maintain_order=True,
             )
+            .agg(_run_count_exprs())
+            .collect()
+            .to_dicts()
+        )
 
     return {
         "metadata": {
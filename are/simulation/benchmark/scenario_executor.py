@@ -5,11 +5,16 @@
 # the root directory of this source tree.
 
 
+import copy
 import logging
+import random
 
 from are.simulation.agents.are_simulation_agent_config import LLMEngineConfig
 from are.simulation.benchmark.scenario_loader import setup_scenarios_iterator
-from are.simulation.multi_scenario_runner import MultiScenarioRunner
+from are.simulation.multi_scenario_runner import (
+    MultiScenarioRunner,
+    ScenarioResultCallback,
+)
 from are.simulation.scenarios.config import (
     DEFAULT_SCENARIO_TIMEOUT,
     MultiScenarioRunnerConfig,
@@ -18,6 +23,7 @@ from are.simulation.scenarios.scenario_imported_from_json.benchmark_scenario imp
     BenchmarkScenarioImportedFromJson,
 )
 from are.simulation.scenarios.scenario_imported_from_json.utils import (
+    initialize_scenario_from_config,
     preprocess_scenario_from_config,
 )
 from are.simulation.scenarios.utils.scenario_expander import EnvEventsConfig
@@ -80,6 +86,75 @@ def multiply_scenarios_iterator(
     return CountableIterator(iterator(), new_total_count)
 
 
+def get_run_seed(seed: int, run_number: int) -> int:
+    """Derive the seed of a run of a scenario from the scenario seed and the run number.
+
+    :param seed: The seed of the scenario
+    :param run_number: The run number, starting at 1
+    :return: A 32-bit seed, the same in every process
+    :rtype: int
+    """
+    # Seeding with a string hashes it with SHA-512, unlike hash() it does not vary across processes
+    return random.Random(f"{seed}_{run_number}").getrandbits(32)
+
+
+def share_initialization_scenarios_iterator(
+    scenarios_iterator: CountableIterator[
+        tuple[BenchmarkScenarioImportedFromJson, list[CompletedEvent] | None]
+    ],
+    num_runs: int,
+    config: MultiScenarioRunnerConfig,
+) -> CountableIterator[
+    tuple[BenchmarkScenarioImportedFromJson, list[CompletedEvent] | None]
+]:
+    """Run each scenario N times from a single initialization.
+
+    Unlike multiply_scenarios_iterator, each scenario is initialized once, i.e. its apps are
+    populated and its events flow is built, and each run starts from a copy of the
+    initialized scenario. Only the initialization is shared: each run is then preprocessed
+    and executed from the start, as a separate run. Each run gets its own seed derived from
+    the scenario seed and its run number, see get_run_seed, and is reported with the same run
+    number as with multiply_scenarios_iterator.
+
+    :param scenarios_iterator: Iterator of scenarios and completed events
+    :param num_runs: Number of runs of each scenario
+    :param config: Configuration of the runs, used to initialize the scenarios
+    :return: Iterator with each initialized scenario repeated num_runs times
+    :rtype: CountableIterator[tuple[BenchmarkScenarioImportedFromJson, list[CompletedEvent]]]
+    """
+
+    def iterator():
+        for scenario, completed_events in scenarios_iterator:
+            try:
+                initialize_scenario_from_config(scenario=scenario, config=config)
+            except Exception as e:
+                logger.error(
+                    f"Failed to initialize scenario {scenario.scenario_id}: {e}"
+                )
+                # Continue with the next scenario instead of crashing
+                continue
+
+            for run_num in range(num_runs):
+                scenario_copy = copy.deepcopy(scenario)
+                scenario_copy.run_number = run_num + 1
+                # The populated apps are shared, the randomness of the runs is not
+                scenario_copy.seed = get_run_seed(scenario.seed, run_num + 1)
+                for app in scenario_copy.apps or []:
+                    app.set_seed(scenario_copy.seed)
+                completed_events_copy = (
+                    copy.deepcopy(completed_events) if completed_events else None
+                )
+                yield scenario_copy, completed_events_copy
+
+    new_total_count = (
+        scenarios_iterator.total_count * num_runs
+        if scenarios_iterator.total_count is not None
+        else None
+    )
+
+    return CountableIterator(iterator(), new_total_count)
+
+
 def preprocess_scenarios_iterator(
     scenarios_iterator: CountableIterator[
         tuple[BenchmarkScenarioImportedFromJson, list[CompletedEvent] | None]
@@ -171,6 +246,7 @@ def run_scenarios(
         tuple[BenchmarkScenarioImportedFromJson, list[CompletedEvent] | None] | str
     ],
     progress_description: str | None = None,
+    on_result: ScenarioResultCallback | None = None,
 ) -> MultiScenarioValidationResult:
     """Run the scenarios and return the results.
 
@@ -179,6 +255,7 @@ def run_scenarios(
     :param config: Configuration for the MultiScenarioRunner
     :param scenarios_iterator: Iterator of preprocessed scenarios and completed events
     :param progress_description: Optional description for the progress bar
+    :param on_result: Called with the result of each scenario as soon as it finishes
     :return: The validation result object
     :rtype: MultiScenarioValidationResult
     """
@@ -189,6 +266,7 @@ def run_scenarios(
         config,
         scenarios_iterator,
         progress_description,
+        on_result=on_result,
     )
 
     return result
@@ -223,11 +301,13 @@ def run_dataset(
     tool_augmentation_config: ToolAugmentationConfig | None = None,
     env_events_config: EnvEventsConfig | None = None,
     num_runs: int = 3,
+    share_run_initialization: bool = False,
     judge_model: str = DEFAULT_JUDGE_MODEL,
     judge_provider: str | None = None,
     judge_endpoint: str | None = None,
     log_level: str = "INFO",
     phase_name: str | None = None,
+    on_result: ScenarioResultCallback | None = None,
     **kwargs,
 ) -> MultiScenarioValidationResult:
     """Run a dataset of scenarios with the specified configuration.
@@ -265,6 +345,11 @@ def run_dataset(
     :param tool_augmentation_config: Configuration for tool augmentation
     :param env_events_config: Configuration for environment events augmentation
     :param num_runs: Number of times to run each scenario (default: 3)
+    :param share_run_initialization: Whether the runs of a scenario start from a single
+        initialization of the scenario, each with its own seed, instead of initializing it
+        for each run
+    :param on_result: Called with the result of each scenario as soon as it finishes, e.g.
+        ParquetTraceWriter.result_callback
     :return: The validation result object
     :rtype: MultiScenarioValidationResult
     """
@@ -327,7 +412,14 @@ def run_dataset(
     )
 
     # Multiply scenarios iterator to run each scenario num_runs times
-    if num_runs > 1:
+    if num_runs > 1 and share_run_initialization:
+        logger.info(
+            f"Running each scenario {num_runs} times from a single initialization to improve variance"
+        )
+        multiplied_scenarios_iterator = share_initialization_scenarios_iterator(
+            scenarios_with_metadata, num_runs, runner_config
+        )
+    elif num_runs > 1:
         logger.info(f"Running each scenario {num_runs} times to improve variance")
         multiplied_scenarios_iterator = multiply_scenarios_iterator(
             scenarios_with_metadata, num_runs
@@ -361,4 +453,9 @@ def run_dataset(
     elif config:
         progress_description = f"Running {config.title()} scenarios"
 
-    return run_scenarios(runner_config, final_scenarios_iterator, progress_description)
+    return run_scenarios(
+        runner_config,
+        final_scenarios_iterator,
+        progress_description,
+        on_result=on_result,
+    )
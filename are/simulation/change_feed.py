@@ -0,0 +1,141 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+# Maximum number of changes kept for subscribers catching up, older subscribers resync
+DEFAULT_CHANGE_HISTORY = 10_000
+
+
+@dataclass
+class EnvironmentChanges:
+    """Changes of an environment between two sequence numbers of its change feed."""
+
+    sequence: int
+    # Completed events added to the event log, in the order they were added
+    events: list[Any] = field(default_factory=list)
+    # Names of the apps whose state may have changed
+    app_names: set[str] = field(default_factory=set)
+    world_logs_changed: bool = False
+    scenario_changed: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self.events
+            or self.app_names
+            or self.world_logs_changed
+            or self.scenario_changed
+        )
+
+
+@dataclass
+class _Change:
+    sequence: int
+    events: list[Any]
+    app_names: set[str]
+    world_logs_changed: bool
+    scenario_changed: bool
+
+
+class ChangeFeed:
+    """
+    Notifications of the changes of an environment: completed events, apps whose state may have
+    changed, world logs and scenario edits.
+
+    Each publication increments the sequence number of the feed and wakes up the threads
+    waiting for changes, which then get the changes after the last sequence number they saw.
+    Changes which cannot be described as additions, e.g. removed events, are published as a
+    reset, after which subscribers must resync their whole state.
+    """
+
+    def __init__(self, max_history: int = DEFAULT_CHANGE_HISTORY):
+        self._condition = threading.Condition()
+        self._history: deque[_Change] = deque(maxlen=max_history)
+        self.sequence = 0
+        # Changes after this sequence number are all in the history
+        self._base_sequence = 0
+
+    def publish(
+        self,
+        events: Iterable[Any] = (),
+        app_names: Iterable[str] = (),
+        world_logs_changed: bool = False,
+        scenario_changed: bool = False,
+        reset: bool = False,
+    ) -> int:
+        """
+        Publish a change and wake up the waiting subscribers.
+
+        A publication without changes only wakes them up, e.g. after the environment state
+        changed.
+
+        :param events: The completed events added to the event log
+        :param app_names: The names of the apps whose state may have changed
+        :param world_logs_changed: Whether world logs were added or replaced
+        :param scenario_changed: Whether the scenario events or hints were edited
+        :param reset: Whether subscribers must resync their whole state
+        :returns: The sequence number of the change
+        """
+        with self._condition:
+            self.sequence += 1
+            if reset:
+                self._history.clear()
+                self._base_sequence = self.sequence
+            else:
+                if len(self._history) == self._history.maxlen:
+                    self._base_sequence = self._history[0].sequence
+                self._history.append(
+                    _Change(
+                        sequence=self.sequence,
+                        events=list(events),
+                        app_names=set(app_names),
+                        world_logs_changed=world_logs_changed,
+                        scenario_changed=scenario_changed,
+                    )
+                )
+            self._condition.notify_all()
+            return self.sequence
+
+    def wait(self, sequence: int, timeout: float | None = None) -> int:
+        """
+        Wait for a change after a sequence number.
+
+        :param sequence: The last sequence number seen by the caller
+        :param timeout: Maximum time to wait in seconds, None to wait forever
+        :returns: The current sequence number, equal to the given one on timeout
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.sequence != sequence, timeout)
+            return self.sequence
+
+    def get_changes(self, sequence: int) -> EnvironmentChanges | None:
+        """
+        Get the changes after a sequence number, merged together.
+
+        :param sequence: The last sequence number seen by the caller
+        :returns: The changes, or None if they are no longer known and the caller must resync
+        """
+        with self._condition:
+            if sequence < self._base_sequence or sequence > self.sequence:
+                return None
+            # The history is sorted by sequence number, only its end is newer
+            newer: list[_Change] = []
+            for change in reversed(self._history):
+                if change.sequence <= sequence:
+                    break
+                newer.append(change)
+            changes = EnvironmentChanges(sequence=self.sequence)
+            for change in reversed(newer):
+                changes.events.extend(change.events)
+                changes.app_names |= change.app_names
+                changes.world_logs_changed |= change.world_logs_changed
+                changes.scenario_changed |= change.scenario_changed
+            return changes
@@ -0,0 +1,180 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from are.simulation.types import Action, CompletedEvent
+from are.simulation.utils import EnumEncoder
+
+if TYPE_CHECKING:
+    from are.simulation.agents.agent_log import BaseAgentLog
+    from are.simulation.environment import Environment
+
+logger = logging.getLogger(__name__)
+
+# Maximum total size of the serialized app states kept by a checkpoint store
+DEFAULT_CHECKPOINT_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class EnvironmentCheckpoint:
+    """
+    State of an environment after the first world logs of a run, as replaying these logs on
+    the initial state of the scenario would produce it.
+
+    The completed events which are not logged as actions, such as condition checks, are left
+    out since a replay does not complete them. The changes of the apps made without events,
+    e.g. with events disabled, are kept although a replay does not reproduce them.
+    """
+
+    # Number of world logs before the checkpoint
+    world_log_count: int
+    # Id of the last of these world logs, identifying the run
+    world_log_id: str
+    # Serialized state of each app, in the format of the scenario initial app states
+    app_states: dict[str, str]
+    # State of the random generator of each app
+    app_rng_states: dict[str, Any]
+    completed_events: list[CompletedEvent]
+    # Ids of the completed events, whose logs are not replayed after a restore
+    event_ids: set[str] = field(default_factory=set)
+
+
+class CheckpointStore:
+    """
+    Checkpoints of an environment taken at the agent steps of a run, so that replaying the
+    run up to a log restores the nearest checkpoint and replays only the following logs.
+
+    The serialized app states are shared with the previous checkpoint when they did not change,
+    and the checkpoints are bounded by the total size of the distinct states. The oldest
+    checkpoints are evicted first, since the runs before them are the cheapest to replay.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CHECKPOINT_BYTES):
+        self.max_bytes = max_bytes
+        self._checkpoints: OrderedDict[int, EnvironmentCheckpoint] = OrderedDict()
+        # Number of checkpoints referencing each serialized state, by object id
+        self._state_refs: dict[int, int] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._checkpoints)
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the distinct serialized states kept."""
+        return self._size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._checkpoints.clear()
+            self._state_refs.clear()
+            self._size = 0
+
+    def _add_refs(self, checkpoint: EnvironmentCheckpoint) -> None:
+        for state in checkpoint.app_states.values():
+            refs = self._state_refs.get(id(state), 0)
+            if refs == 0:
+                self._size += len(state)
+            self._state_refs[id(state)] = refs + 1
+
+    def _remove_refs(self, checkpoint: EnvironmentCheckpoint) -> None:
+        for state in checkpoint.app_states.values():
+            refs = self._state_refs.pop(id(state)) - 1
+            if refs == 0:
+                self._size -= len(state)
+            else:
+                self._state_refs[id(state)] = refs
+
+    def take(
+        self, env: "Environment", world_logs: list["BaseAgentLog"]
+    ) -> EnvironmentCheckpoint | None:
+        """
+        Take a checkpoint of an environment after the world logs of its run.
+
+        It must be taken between agent steps, when all the actions of the logs completed.
+
+        :param env: The environment
+        :param world_logs: The world logs of the run so far
+        :returns: The checkpoint, or None if there are no logs or it does not fit in the store
+        """
+        if not world_logs:
+            return None
+        with self._lock:
+            previous = next(reversed(self._checkpoints.values()), None)
+        app_states = {}
+        for name, app in env.apps.items():
+            state = json.dumps(app.get_state(), cls=EnumEncoder)
+            if previous is not None and previous.app_states.get(name) == state:
+                # Keep a single copy of the states which did not change
+                state = previous.app_states[name]
+            app_states[name] = state
+        # Copy the events shared with the running environment, keeping the ones a replay completes
+        completed_events = [
+            event.copy()
+            for event in env.event_log.list_view()
+            if isinstance(event.action, Action)
+        ]
+        checkpoint = EnvironmentCheckpoint(
+            world_log_count=len(world_logs),
+            world_log_id=world_logs[-1].id,
+            app_states=app_states,
+            app_rng_states={name: app.rng.getstate() for name, app in env.apps.items()},
+            completed_events=completed_events,
+            event_ids={event.event_id for event in completed_events},
+        )
+
+        with self._lock:
+            # Checkpoints after this one belong to a run which was replaced
+            for count in [c for c in self._checkpoints if c >= len(world_logs)]:
+                self._remove_refs(self._checkpoints.pop(count))
+            self._checkpoints[checkpoint.world_log_count] = checkpoint
+            self._add_refs(checkpoint)
+            while self._size > self.max_bytes and self._checkpoints:
+                _, evicted = self._checkpoints.popitem(last=False)
+                self._remove_refs(evicted)
+            if checkpoint.world_log_count not in self._checkpoints:
+                logger.warning(
+                    f"Checkpoint of {len(app_states)} apps exceeds the budget of {self.max_bytes} bytes"
+                )
+                return None
+        return checkpoint
+
+    def find(self, world_logs: list["BaseAgentLog"]) -> EnvironmentCheckpoint | None:
+        """
+        Find the latest checkpoint taken after a prefix of world logs.
+
+        :param world_logs: The world logs to replay
+        :returns: The checkpoint, or None if no checkpoint matches the logs
+        """
+        with self._lock:
+            checkpoints = list(self._checkpoints.values())
+        for checkpoint in reversed(checkpoints):
+            count = checkpoint.world_log_count
+            if (
+                count <= len(world_logs)
+                and world_logs[count - 1].id == checkpoint.world_log_id
+            ):
+                return checkpoint
+        return None
+
+    def truncate(self, world_log_count: int) -> None:
+        """
+        Forget the checkpoints taken after a number of world logs, e.g. when the run is
+        replayed from there.
+
+        :param world_log_count: The number of world logs
+        """
+        with self._lock:
+            for count in [c for c in self._checkpoints if c > world_log_count]:
+                self._remove_refs(self._checkpoints.pop(count))
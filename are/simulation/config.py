@@ -28,6 +28,9 @@ DEMO_FS_PATH: str = os.environ.get(
 # Root folder for all are.simulation files.
 ARE_SIMULATION_SANDBOX_PATH: str = tempfile.mkdtemp(prefix="are_simulation_sandbox_")
 
+# Whether sandbox file systems share read-only base layers instead of copying their files.
+LAYERED_SANDBOX_FS: bool = os.environ.get("ARE_SIMULATION_LAYERED_FS", "0") == "1"
+
 
 PROVIDERS = [
     "azure",
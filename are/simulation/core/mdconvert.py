@@ -11,99 +11,60 @@ import base64
 import binascii
 import copy
 import html
+import importlib
 import io
 import mimetypes
 import os
 import re
+import sys
 import tempfile
 import traceback
 import xml.etree.ElementTree as ET
-from itertools import combinations
-from typing import IO, Any
-from urllib.parse import parse_qs, quote, unquote, urlparse, urlunparse
-
-import mammoth
-import markdownify
-import pandas as pd
-import pdfminer
-import pdfminer.high_level
-import pptx
-import puremagic
-import requests
-from bs4 import BeautifulSoup
-from requests.models import Response
+from collections.abc import Generator, Iterable, Iterator
+from typing import IO, TYPE_CHECKING, Any
+from urllib.parse import parse_qs, urlparse
 
 from are.simulation.exceptions import MarkdownConverterError
 
-INTERACTIONS_BY_TAG = {
-    "button": "click",
-    "details": "click",
-    "label": "click",
-    "menu": "click",
-    "menuitem": "click",
-    "select": "select",
-    "textarea": "input_text",
-    "summary": "click",
+if TYPE_CHECKING:
+    from requests.models import Response
+
+    from are.simulation.core.markdownify_converter import CustomMarkdownConverter
+
+# Dependencies of the converters, imported by each converter on first use so that importing
+# this module stays cheap. They remain available as attributes of the module.
+LAZY_MODULES = {
+    "mammoth": "mammoth",
+    "markdownify": "markdownify",
+    "pd": "pandas",
+    "pdfminer": "pdfminer.high_level",
+    "pptx": "pptx",
+    "puremagic": "puremagic",
+    "requests": "requests",
 }
-
-INTERACTIVE_ROLES = {
-    "button",
-    "menu",
-    "menuitem",
-    "link",
-    "checkbox",
-    "radio",
-    "slider",
-    "tab",
-    "tabpanel",
-    "textbox",
-    "combobox",
-    "grid",
-    "listbox",
-    "option",
-    "progressbar",
-    "scrollbar",
-    "searchbox",
-    "switch",
-    "tree",
-    "treeitem",
-    "spinbutton",
-    "tooltip",
+LAZY_ATTRIBUTES = {
+    "BeautifulSoup": "bs4",
+    "Response": "requests.models",
+    "CustomMarkdownConverter": "are.simulation.core.markdownify_converter",
 }
 
-INTERACTIVE_ARIA_ROLES = {
-    "menu",
-    "menuitem",
-    "button",
-}
 
-HIDDEN_CLASSES = {
-    "hidden",
-    "invisible",
-    "d-none",
-    "sr-only",
-    "collapse",
-    "fade",
-    "modal-hidden",
-}
+def __getattr__(name: str) -> Any:
+    if name in LAZY_MODULES:
+        module_name = LAZY_MODULES[name]
+        importlib.import_module(module_name)
+        return sys.modules[module_name.split(".")[0]]
+    if name in LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-FILTER_ATTRIBUTES = {
-    "id",
-    "name",
-    "placeholder",
-    "title",
-    "href",
-    "src",
-    "aria-label",
-    "aria-name",
-    "aria-role",
-    "aria-description",
-    "aria-expanded",
-    "aria-haspopup",
-    "type",
-    "value",
-    "required",
-}
+
+# Version of the conversion output, to bump whenever a change to the converters changes the
+# text they produce so that cached conversions are invalidated
+CONVERTER_VERSION = "1"
+
+# Text extensions handled by a more specific converter than PlainTextConverter
+STRUCTURED_TEXT_EXTENSIONS = {".html", ".htm", ".xml"}
 
 
 class FileConversionMarkdownError(MarkdownConverterError):
@@ -122,408 +83,6 @@ class UnsupportedFormatMarkdownError(MarkdownConverterError):
     pass
 
 
-class CustomMarkdownConverter(markdownify.MarkdownConverter):
-    """
-    A custom version of markdownify's MarkdownConverter. Changes include:
-
-    - Altering the default heading style to use '#', '##', etc.
-    - Removing javascript hyperlinks.
-    - Truncating images with large data:uri sources.
-    - Ensuring URIs are properly escaped, and do not conflict with Markdown syntax
-    - Add interactive elements in simplified HTML format to allow for interaction (if self.interactive)
-    """
-
-    def __init__(self, **options: Any):
-        options["heading_style"] = options.get("heading_style", markdownify.ATX)
-        self.interactive = options.get("interactive", False)
-        self.suggest_actions = options.get("suggest_actions", True)
-        self.interactive_elements = []
-        self.element_counter = 0
-        super().__init__(**options)
-
-    def convert_soup(self, soup: Any) -> str:
-        self.element_counter = 0  # reset on every page update
-        self.interactive_elements = []
-        markdown = super().convert_soup(soup)  # type: ignore
-        for elem_info in self.interactive_elements:
-            elem_info["css_selector"] = self.build_css_selector(elem_info)
-        return markdown
-
-    def convert_hn(self, n: int, el: Any, text: str, convert_as_inline: bool) -> str:
-        """Same as usual, but be sure to start with a new line"""
-        if not convert_as_inline:
-            if not re.search(r"^\n", text):
-                return "\n" + super().convert_hn(n, el, text, convert_as_inline)  # type: ignore
-
-        return super().convert_hn(n, el, text, convert_as_inline)  # type: ignore
-
-    def convert_a(self, el: Any, text: str, convert_as_inline: bool):
-        """Same as usual converter, but removes Javascript links and escapes URIs."""
-        try:
-            prefix, suffix, text = markdownify.chomp(text)  # type: ignore
-            if not text:
-                return ""
-            href = el.get("href")
-            title = el.get("title")
-
-            # Escape URIs and skip non-http or file schemes
-            if href:
-                try:
-                    parsed_url = urlparse(href)  # type: ignore
-                    if parsed_url.scheme and parsed_url.scheme.lower() not in [
-                        "http",
-                        "https",
-                        "file",
-                    ]:  # type: ignore
-                        return "%s%s%s" % (prefix, text, suffix)
-                    href = urlunparse(
-                        parsed_url._replace(path=quote(unquote(parsed_url.path)))
-                    )  # type: ignore
-                except ValueError:  # It's not clear if this ever gets thrown
-                    return "%s%s%s" % (prefix, text, suffix)
-
-            # For the replacement see #29: text nodes underscores are escaped
-            if (
-                self.options["autolinks"]
-                and text.replace(r"\_", "_") == href
-                and not title
-                and not self.options["default_title"]
-            ):
-                # Shortcut syntax
-                return "<%s>" % href
-            if self.options["default_title"] and not title:
-                title = href
-            title_part = ' "%s"' % title.replace('"', r"\"") if title else ""
-            return (
-                "%s[%s](%s%s)%s" % (prefix, text, href, title_part, suffix)
-                if href
-                else text
-            )
-        except Exception:
-            return super().convert_a(el, text, convert_as_inline)  # type: ignore
-
-    def convert_img(self, el: Any, text: str, convert_as_inline: bool) -> str:
-        """Same as usual converter, but removes data URIs"""
-
-        alt = el.attrs.get("alt", None) or ""
-        src = el.attrs.get("src", None) or ""
-        title = el.attrs.get("title", None) or ""
-        title_part = ' "%s"' % title.replace('"', r"\"") if title else ""
-        # if (
-        #    convert_as_inline
-        #    and el.parent.name not in self.options["keep_inline_images_in"]
-        # ):
-        #    return alt
-
-        # Remove dataURIs
-        if src.startswith("data:"):
-            src = src.split(",")[0] + "..."
-
-        return f"![{alt}]({src}{title_part})"
-
-    def convert_button(self, el: Any, text: str, convert_as_inline: bool):
-        return self.convert_interactive_element("button", el, text)
-
-    def convert_input(self, el: Any, text: str, convert_as_inline: bool) -> str:
-        return self.convert_interactive_element("input", el, text)
-
-    def convert_textarea(self, el: Any, text: str, convert_as_inline: bool) -> str:
-        return self.convert_interactive_element("textarea", el, text)
-
-    def convert_menu(self, el: Any, text: str, convert_as_inline: bool) -> str:
-        return self.convert_interactive_element("menu", el, text)
-
-    def convert_menuitem(self, el: Any, text: str, convert_as_inline: bool) -> str:
-        return self.convert_interactive_element("menuitem", el, text)
-
-    def convert_summary(self, el: Any, text: str, convert_as_inline: bool):
-        return self.convert_interactive_element("summary", el, text)
-
-    def convert_details(self, el: Any, text: str, convert_as_inline: bool):
-        return self.convert_interactive_element("details", el, text)
-
-    def convert_select(self, el: Any, text: str, convert_as_inline: bool) -> str:
-        tag_name = "select"
-        if (
-            self.interactive
-            and self._is_visible(el)
-            and self._is_interactive(el, tag_name)
-        ):
-            try:
-                attributes = self._get_attributes(tag_name, el, text)
-                options = []
-                for option in el.find_all("option"):
-                    option_text = option.get_text(strip=True)
-                    option_attributes = self._get_attributes(
-                        "option", option, option_text
-                    )
-                    options.append(option_attributes)
-                attributes["options"] = options
-                placeholder = self._get_placeholder(el, tag_name, attributes)
-                if placeholder:
-                    return placeholder
-            except Exception:
-                pass
-        return text
-
-    def _is_unique(self, candidate_locator: dict) -> bool:
-        """Check attribute subset uniqueness"""
-        matches = 0
-        for other in self.interactive_elements:
-            if all(
-                other["attributes"].get(k) == v for k, v in candidate_locator.items()
-            ):
-                matches += 1
-        return matches == 1
-
-    def _is_visible(self, el: Any) -> bool:
-        """Check if an element is visible to users."""
-        style = el.get("style", "").lower()
-        if any(
-            x in style for x in ["display: none", "visibility: hidden", "opacity: 0"]
-        ):
-            return False
-        classes = set(el.get("class", []))
-        if classes & HIDDEN_CLASSES:
-            return False
-        if el.get("hidden") is not None:
-            return False
-        if el.get("aria-hidden", "").lower() == "true":
-            return False
-        return True
-
-    def _is_interactive(self, el: Any, tag_name: str) -> bool:
-        role = el.get("role", "").lower()
-        return (
-            tag_name in INTERACTIONS_BY_TAG
-            or role in INTERACTIVE_ROLES
-            or role in INTERACTIVE_ARIA_ROLES
-            or el.get("onclick")
-            or el.get("onchange")
-            or el.get("contenteditable") == "true"
-        )
-
-    def convert_interactive_element(self, tag_name: str, el: Any, text: str):
-        """Convert an interactive element to a simplified ArchiveSearchTool format."""
-        if (
-            self.interactive
-            and self._is_visible(el)
-            and self._is_interactive(el, tag_name)
-        ):
-            try:
-                attributes = self._get_attributes(tag_name, el, text)
-                placeholder = self._get_placeholder(el, tag_name, attributes)
-                if placeholder:
-                    return placeholder
-            except Exception:
-                pass
-        return text
-
-    def _suggest_action(self, tag_name: str, attributes: dict[str, Any]):
-        """Determine the appropriate default action for an element."""
-        # If element is contenteditable (explicitly "true" or empty string), assume text input.
-        contenteditable = attributes.get("contenteditable", "").lower()
-        if contenteditable == "true" or (
-            contenteditable == "" and "contenteditable" in attributes
-        ):
-            return "input_text"
-
-        # Textareas are clearly for text input.
-        if tag_name == "textarea":
-            return "input_text"
-
-        # For input elements, decide based on the type.
-        if tag_name == "input":
-            input_type = attributes.get("type", "text").lower()
-            # For checkbox or radio, use "check"
-            if input_type in ["checkbox", "radio"]:
-                return "check"
-            # For submit or button inputs, clicking is appropriate.
-            elif input_type in ["submit", "button"]:
-                return "click"
-            # For file inputs, allow file uploads.
-            elif input_type == "file":
-                return "upload_files"
-            # Otherwise, assume a text input field.
-            else:
-                return "input_text"
-
-        # For select elements, use select action.
-        if tag_name == "select":
-            return "select"
-
-        # If the element has an explicit role attribute, adjust accordingly.
-        role = attributes.get("role", "").lower()
-        if role == "button":
-            return "click"
-        if role in ["textbox", "searchbox", "combobox"]:
-            return "input_text"
-
-        # Default fallback action is "click"
-        return "click"
-
-    def _get_attributes(self, tag_name: str, el: Any, text: str) -> dict[str, Any]:
-        """Extract attributes to display from an interactive element."""
-        attributes = {}
-        for k in el.attrs:
-            if k in FILTER_ATTRIBUTES:  # Filter relevant attributes
-                attributes[k] = el.get(k)
-            elif k.startswith("data-"):  # Collect data- attributes
-                attributes[k] = el.get(k)
-        # Don’t store text for container-like tags
-        if tag_name not in ["details", "summary"]:
-            attributes["text"] = text.replace("\n", " ").strip()
-        return attributes
-
-    def _get_placeholder(
-        self, el: Any, tag_name: str, attributes: dict[str, str]
-    ) -> str:
-        """Show an interactive element in simplified HTML format."""
-        idx = self.element_counter
-        self.element_counter += 1
-        if self.suggest_actions:
-            action = self._suggest_action(tag_name, attributes)
-            if action:
-                attributes["allowed"] = action
-        xpath = self._generate_xpath(el)
-        attr_str = " ".join(
-            "{}='{}'".format(k, re.sub(r"\s+", " ", str(v)).strip())
-            for k, v in attributes.items()
-            if v
-        )
-        placeholder = f"<{tag_name} idx={idx} {attr_str}/>"
-        element_info = {
-            "idx": idx,
-            "tag_name": tag_name,
-            "element": el,
-            "attributes": attributes,
-            "xpath": xpath,
-            "placeholder": placeholder,
-        }
-        self.interactive_elements.append(element_info)
-        return placeholder
-
-    def _generate_xpath(self, element):
-        """Generate a unique XPath for an element."""
-        components = []
-        current = element
-        for parent in current.parents:
-            siblings = parent.find_all(current.name, recursive=False)
-            if len(siblings) > 1:
-                index = siblings.index(current) + 1
-                components.append(f"{current.name}[{index}]")
-            else:
-                components.append(current.name)
-            current = parent
-        components.reverse()
-        xpath = "//" + "/".join(components)
-        return xpath
-
-    def _select_attributes(self, elem_info) -> dict:
-        """
-        Return a dict of (attribute -> value) that uniquely identifies the element
-        among all interactive elements, giving priority to more stable attributes.
-        """
-        raw_attrs = elem_info["attributes"]
-        # Data attributes are volatile; do not use them as locators
-        candidate_keys = [
-            k for k, v in raw_attrs.items() if not k.startswith("data-") and v
-        ]
-
-        # Define a prioritized list of stable attributes
-        stable_priority = [
-            "id",
-            "name",
-            "aria-label",
-            "aria-labelledby",
-            "placeholder",
-            "title",
-        ]
-
-        # Sort candidate_keys so that keys appearing in stable_priority come first
-        candidate_keys.sort(
-            key=lambda k: (
-                stable_priority.index(k)
-                if k in stable_priority
-                else len(stable_priority)
-            )
-        )
-
-        # Try each candidate key on its own first.
-        for key in candidate_keys:
-            candidate_locator = {key: raw_attrs[key]}
-            if self._is_unique(candidate_locator):
-                return candidate_locator
-
-        # If no single attribute is unique, try combinations (starting from size 2)
-        for size in range(2, len(candidate_keys) + 1):
-            for subset in combinations(candidate_keys, size):
-                candidate_locator = {k: raw_attrs[k] for k in subset}
-                if self._is_unique(candidate_locator):
-                    return candidate_locator
-
-        return {}
-
-    def build_css_selector(self, elem_info: dict) -> str:
-        """
-        Create a unique Playwright element locator using a stable set of attributes.
-        Priority:
-        1. If an 'id' attribute exists, use that.
-        2. Otherwise, use a minimal set of stable attributes.
-        3. Finally, fall back to a generated XPath.
-        """
-        attributes = elem_info["attributes"]
-        # (1) Use the `id` attribute if present
-        elem_id = attributes.get("id")
-        if elem_id:
-            return f"#{elem_id}"
-
-        # 2. Build selector with tag and minimal unique attributes
-        candidate_attrs = {
-            k: v
-            for k, v in attributes.items()
-            if k in FILTER_ATTRIBUTES and v and not k.startswith("data-")
-        }
-
-        # Prioritize stable attributes
-        priority_attrs = ["id", "name", "aria-label", "type", "placeholder"]
-        tag_name = elem_info["tag_name"]
-        selector_parts = [tag_name]
-
-        for attr in priority_attrs:
-            if attr in candidate_attrs:
-                value = candidate_attrs[attr].replace('"', '\\"')
-                selector_parts.append(f'[{attr}="{value}"]')
-                locator = "".join(selector_parts)
-                if self._is_unique({attr: candidate_attrs[attr]}):
-                    return locator
-
-        # 3. Add more attributes if needed
-        for attr, value in candidate_attrs.items():
-            if attr not in priority_attrs:
-                value = value.replace('"', '\\"')
-                selector_parts.append(f'[{attr}="{value}"]')
-                locator = "".join(selector_parts)
-                if self._is_unique(
-                    {
-                        k: candidate_attrs[k]
-                        for k in candidate_attrs.keys()
-                        if f'[{k}="' in locator
-                    }
-                ):
-                    return locator
-
-        # 4. Fallback to text content if unique
-        text = attributes.get("text")
-        if text and self._is_unique({"text": text}):
-            clean_text = text.replace('"', '\\"')
-            return f'{tag_name}:has-text("{clean_text}")'
-
-        # (3) Fallback to positional XPath (this is brittle)
-        xpath = self._generate_xpath(elem_info["element"])
-        return f"xpath={xpath}"
-
-
 class DocumentConverterResult:
     """The result of converting a document to text."""
 
@@ -591,7 +150,17 @@ class HtmlConverter(DocumentConverter):
 
     def __init__(self, interactive: bool = False):
         self.interactive = interactive
-        self.markdownify = CustomMarkdownConverter(interactive=self.interactive)
+        self._markdownify: "CustomMarkdownConverter | None" = None
+
+    @property
+    def markdownify(self) -> "CustomMarkdownConverter":
+        if self._markdownify is None:
+            from are.simulation.core.markdownify_converter import (
+                CustomMarkdownConverter,
+            )
+
+            self._markdownify = CustomMarkdownConverter(interactive=self.interactive)
+        return self._markdownify
 
     def convert_io(
         self, file_io: IO[bytes], file_extension: str | None = None, **kwargs: Any
@@ -615,6 +184,8 @@ class HtmlConverter(DocumentConverter):
 
     def _convert(self, html_content) -> DocumentConverterResult | None:
         """Helper function that converts and HTML string."""
+        from bs4 import BeautifulSoup
+
         # Parse the string
         soup = BeautifulSoup(html_content, "html.parser")
 
@@ -659,6 +230,10 @@ class BingSerpConverter(DocumentConverter):
         parsed_params = parse_qs(urlparse(url).query)
         query = parsed_params.get("q", [""])[0]
 
+        from bs4 import BeautifulSoup
+
+        from are.simulation.core.markdownify_converter import CustomMarkdownConverter
+
         # Parse the file
         soup = None
         with open(local_path, "rt", encoding="utf-8") as fh:
@@ -724,6 +299,8 @@ class PdfConverter(DocumentConverter):
         if extension.lower() != ".pdf":
             return None
 
+        import pdfminer.high_level
+
         # pdfminer doesn't support IO[bytes] directly, so we need to use a temporary file
         # This is a fallback for libraries that don't support IO objects
         file_io.seek(0)  # Ensure we're at the beginning
@@ -753,6 +330,8 @@ class DocxConverter(HtmlConverter):
         if extension.lower() != ".docx":
             return None
 
+        import mammoth
+
         file_io.seek(0)  # Ensure we're at the beginning
         result = mammoth.convert_to_html(file_io)
         html_content = result.value
@@ -780,6 +359,8 @@ class XlsxConverter(HtmlConverter):
         ]:
             return None
 
+        import pandas as pd
+
         file_io.seek(0)  # Ensure we're at the beginning
         sheets = pd.read_excel(file_io, sheet_name=None)
         md_content = ""
@@ -873,6 +454,8 @@ class PptxConverter(HtmlConverter):
         if extension.lower() != ".pptx":
             return None
 
+        import pptx
+
         file_io.seek(0)  # Ensure we're at the beginning
         presentation = pptx.Presentation(file_io)
         return self._convert_presentation(presentation)
@@ -953,6 +536,8 @@ class PptxConverter(HtmlConverter):
         )
 
     def _is_picture(self, shape):
+        import pptx
+
         if shape.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.PICTURE:  # type: ignore
             return True
         if shape.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.PLACEHOLDER:  # type: ignore
@@ -961,11 +546,42 @@ class PptxConverter(HtmlConverter):
         return False
 
     def _is_table(self, shape):
+        import pptx
+
         if shape.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.TABLE:  # type: ignore
             return True
         return False
 
 
+def _iter_split_lines(text_io: Iterable[str]) -> Iterator[str]:
+    """Iterate over the lines of a text as splitting it on newlines would return them."""
+    line = ""
+    for line in text_io:
+        yield line
+    if not line or line.endswith("\n"):
+        yield ""
+
+
+def _normalize_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Strip the lines and collapse the runs of blank lines like MarkdownConverter._convert_io,
+    which replaces 3 or more consecutive newlines with 2.
+    """
+    blank_lines = 0
+    started = False
+    for line in lines:
+        line = line.rstrip()
+        if not line:
+            blank_lines += 1
+            continue
+        # Runs of blank lines are collapsed to 1 line between lines, and 2 at the start
+        yield from [""] * min(blank_lines, 1 if started else 2)
+        blank_lines = 0
+        started = True
+        yield line
+    yield from [""] * min(blank_lines, 2 if started else 3)
+
+
 class MarkdownConverter:
     """(In preview) An extremely simple text-based document reader, suitable for LLM use.
     This reader will convert common file-types or webpages to Markdown."""
@@ -993,6 +609,47 @@ class MarkdownConverter:
     def add_converter(self, converter: DocumentConverter):
         self._page_converters.append(converter)
 
+    @staticmethod
+    def is_streamable(file_extension: str | None) -> bool:
+        """
+        Whether files with an extension are converted as plain text, whose lines can be
+        streamed with stream_lines.
+
+        :param file_extension: The file extension, including the dot
+        :returns: True if the lines of the files can be streamed
+        """
+        extension = (file_extension or "").lower()
+        if extension in STRUCTURED_TEXT_EXTENSIONS:
+            return False
+        content_type, _ = mimetypes.guess_type("__placeholder" + extension)
+        return content_type is not None and content_type.startswith("text/")
+
+    def stream_lines(
+        self, file_io: IO[bytes], file_extension: str
+    ) -> Generator[str, None, None]:
+        """
+        Convert a plain text file one line at a time, so that reading only the first lines
+        does not read the whole file. The lines are normalized as convert_io normalizes them.
+
+        :param file_io: The file, opened in binary mode
+        :param file_extension: The file extension, for which is_streamable must be True
+        :returns: A generator of the lines of the converted text, close it to release the
+            file before reading it to the end
+        :raises UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        if not self.is_streamable(file_extension):
+            raise UnsupportedFormatMarkdownError(
+                f"Cannot stream the conversion of {file_extension} files."
+            )
+        file_io.seek(0)
+        # Only split on \n like convert_io, carriage returns are stripped with the whitespace
+        text_io = io.TextIOWrapper(file_io, encoding="utf-8", newline="\n")
+        try:
+            yield from _normalize_lines(_iter_split_lines(text_io))
+        finally:
+            # Do not close the file with the wrapper
+            text_io.detach()
+
     def convert_io(self, file_io: IO[bytes], **kwargs: Any) -> DocumentConverterResult:
         """Convert from IO object"""
         # Prepare a list of extensions to try (in order of priority)
@@ -1018,13 +675,15 @@ class MarkdownConverter:
 
     def convert_url(self, url: str, **kwargs: Any) -> DocumentConverterResult:
         """Convert from URL"""
+        import requests
+
         # Send a HTTP request to the URL
         response = requests.get(url, stream=True)
         response.raise_for_status()
         return self.convert_response(response, **kwargs)
 
     def convert_response(
-        self, response: Response, **kwargs: Any
+        self, response: "Response", **kwargs: Any
     ) -> DocumentConverterResult:
         """Convert from HTTP response"""
         # Prepare a list of extensions to try (in order of priority)
@@ -1076,7 +735,7 @@ class MarkdownConverter:
 
     # Deprecated - kept for backward compatibility
     def convert(
-        self, source: str | Response, **kwargs: Any
+        self, source: "str | Response", **kwargs: Any
     ) -> DocumentConverterResult:  # TODO: deal with kwargs
         """
         Args:
@@ -1095,7 +754,9 @@ class MarkdownConverter:
             else:
                 return self.convert_path(source, **kwargs)
         # Request response
-        elif isinstance(source, Response):
+        from requests.models import Response
+
+        if isinstance(source, Response):
             return self.convert_response(source, **kwargs)
 
     def _convert_io(
@@ -1197,6 +858,8 @@ class MarkdownConverter:
 
     def _guess_ext_magic(self, path):
         """Use puremagic (a Python implementation of libmagic) to guess a file's extension based on the first few bytes."""
+        import puremagic
+
         # Use puremagic to guess
         try:
             guesses = puremagic.magic_file(path)
@@ -7,14 +7,23 @@
 
 import json
 import logging
+import re
+from collections.abc import Collection, Iterator
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
 
 from are.simulation.agents.are_simulation_agent import BaseAgentLog
 from are.simulation.apps import SystemApp
 from are.simulation.data_handler.models import (
     TRACE_V1_VERSION,
+    ExportedApp,
+    ExportedEvent,
     ExportedHuggingFaceMetadata,
+    ExportedOracleEvent,
     ExportedTrace,
     ExportedTraceBase,
+    ExportedTraceMetadata,
 )
 from are.simulation.scenarios.scenario import Scenario, ScenarioStatus
 from are.simulation.scenarios.scenario_imported_from_json.benchmark_scenario import (
@@ -32,6 +41,91 @@ def _importer() -> type[ExportedTraceBase]:
     return ExportedTrace
 
 
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def iter_json_object_members(
+    json_str: str | bytes, keys: Collection[str] | None = None
+) -> Iterator[tuple[str, Any]]:
+    """
+    Incrementally walk the top-level members of a JSON object.
+
+    Each member value is decoded on its own with the C JSON scanner, and values whose
+    key is not in `keys` are discarded right away, so at most one unrequested section
+    of the document is alive at any time and no pydantic validation is performed.
+    The walk stops as soon as every requested key has been seen.
+
+    :param json_str: The JSON document, which must be an object at the top level.
+    :param keys: The keys to yield. If None, every member is yielded.
+    :returns: An iterator of (key, decoded value) pairs in document order.
+    :raises ValueError: If the document is not a well-formed JSON object.
+    """
+    if isinstance(json_str, (bytes, bytearray)):
+        json_str = json_str.decode("utf-8")
+    remaining = set(keys) if keys is not None else None
+    if remaining is not None and not remaining:
+        return
+    idx = _WHITESPACE.match(json_str, 0).end()  # type: ignore
+    if json_str[idx : idx + 1] != "{":
+        raise ValueError("Expected a JSON object at the top level")
+    idx = _WHITESPACE.match(json_str, idx + 1).end()  # type: ignore
+    if json_str[idx : idx + 1] == "}":
+        return
+    while True:
+        key, idx = _DECODER.raw_decode(json_str, idx)
+        if not isinstance(key, str):
+            raise ValueError(f"Expected a string key at position {idx}")
+        idx = _WHITESPACE.match(json_str, idx).end()  # type: ignore
+        if json_str[idx : idx + 1] != ":":
+            raise ValueError(f"Expected ':' at position {idx}")
+        idx = _WHITESPACE.match(json_str, idx + 1).end()  # type: ignore
+        value, idx = _DECODER.raw_decode(json_str, idx)
+        if remaining is None or key in remaining:
+            yield key, value
+            if remaining is not None:
+                remaining.discard(key)
+                if not remaining:
+                    return
+        idx = _WHITESPACE.match(json_str, idx).end()  # type: ignore
+        separator = json_str[idx : idx + 1]
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or '}}' at position {idx}")
+        idx = _WHITESPACE.match(json_str, idx + 1).end()  # type: ignore
+
+
+class TraceSection(Enum):
+    """
+    Sections of an exported trace that can be imported independently.
+    """
+
+    METADATA = "metadata"
+    APPS = "apps"
+    EVENTS = "events"
+    COMPLETED_EVENTS = "completed_events"
+    WORLD_LOGS = "world_logs"
+    AUGMENTATION = "augmentation"
+
+
+@dataclass
+class PartialTrace:
+    """
+    The sections of an exported trace loaded by `JsonScenarioImporter.import_partial`.
+    Sections that were not requested are left to None.
+    """
+
+    version: str
+    context: str | None = None
+    metadata: ExportedTraceMetadata | None = None
+    apps: list[ExportedApp] | None = None
+    events: list[ExportedEvent | ExportedOracleEvent] | None = None
+    completed_events: list[CompletedEvent] | None = None
+    world_logs: list[BaseAgentLog] | None = None
+    augmentation: dict | None = None
+
+
 class JsonScenarioImporter:
     """
     JSON Scenario Importer.
@@ -44,11 +138,11 @@ class JsonScenarioImporter:
         args = (
             {
                 arg["name"]: Scenario._parse_parameter_value(
-                    arg["value"], arg["value_type"]
+                    arg.get("value"), arg.get("value_type")
                 )
                 for arg in action_data["args"]
             }
-            if action_data["args"] is not None
+            if action_data.get("args") is not None
             else {}
         )
 
@@ -56,23 +150,33 @@ class JsonScenarioImporter:
             "action_id": action_data["action_id"],
             "class_name": (
                 app_name_to_class[action_data["app"]]
-                if action_data["app"] is not None
+                if action_data.get("app") is not None
                 else "ConditionCheckAction"
             ),
             "args": args,
-            "function_name": action_data["function"],
-            "operation_type": action_data["operation_type"],
+            "function_name": action_data.get("function"),
+            "operation_type": action_data.get("operation_type"),
         }
 
     @staticmethod
     def map_event_metadata(metadata_data):
+        # Missing keys default to None, as in ExportedEventMetadata
         return {
-            "exception": metadata_data["exception"],
-            "exception_stack_trace": metadata_data["exception_stack_trace"],
-            "return_value": metadata_data["return_value"],
-            "return_value_type": metadata_data["return_value_type"],
+            "exception": metadata_data.get("exception"),
+            "exception_stack_trace": metadata_data.get("exception_stack_trace"),
+            "return_value": metadata_data.get("return_value"),
+            "return_value_type": metadata_data.get("return_value_type"),
         }
 
+    @staticmethod
+    def build_app_name_to_class(apps: list[dict[str, Any]]) -> dict[str, str | None]:
+        app_name_to_class = {app["name"]: app.get("class_name") for app in apps}
+        app_name_to_class["SystemApp"] = SystemApp.__name__
+        from are.simulation.apps.agent_user_interface import AgentUserInterface
+
+        app_name_to_class["AgentUserInterface"] = AgentUserInterface.__name__
+        return app_name_to_class
+
     @staticmethod
     def map_event(input_json, app_name_to_class):
         mapped_json = {
@@ -111,7 +215,11 @@ class JsonScenarioImporter:
             - A list of base agent logs.
         """
 
-        data = _importer().model_validate_json(json_str)
+        # Completed events are mapped straight from the raw JSON below, so they are
+        # excluded from the pydantic validation of the trace.
+        sections = dict(iter_json_object_members(json_str))
+        raw_completed_events = sections.pop("completed_events", None) or []
+        data = _importer().model_validate(sections)
 
         if data.version not in self.SUPPORTED_VERSIONS:
             raise Exception(f"Unsupported version: {data.version}")
@@ -119,19 +227,11 @@ class JsonScenarioImporter:
         scenario_metadata = data.metadata  # type: ignore
         events = data.events
 
-        app_name_to_class = {app.name: app.class_name for app in data.apps}
-
-        app_name_to_class["SystemApp"] = SystemApp.__name__
-        from are.simulation.apps.agent_user_interface import AgentUserInterface
-
-        app_name_to_class["AgentUserInterface"] = AgentUserInterface.__name__
         completed_events = (
-            [
-                CompletedEvent.from_dict(
-                    self.map_event(completed_event.model_dump(), app_name_to_class)
-                )
-                for completed_event in data.completed_events
-            ]
+            self.map_completed_events(
+                raw_completed_events,
+                self.build_app_name_to_class(sections.get("apps") or []),
+            )
             if load_completed_events
             else []
         )
@@ -230,16 +330,130 @@ class JsonScenarioImporter:
         scenario.serialized_events = events
         scenario.augmentation_data = data.augmentation  # type: ignore
 
-        world_logs = []
+        world_logs = self.map_world_logs(data.world_logs)
+
+        return scenario, completed_events, world_logs
+
+    @staticmethod
+    def map_completed_events(
+        raw_completed_events: list[dict[str, Any]],
+        app_name_to_class: dict[str, str | None],
+    ) -> list[CompletedEvent]:
+        """
+        Build completed events directly from their raw exported JSON dicts.
 
-        for agent_log_str in data.world_logs:
+        One app instance is created per app class and shared by all the events, instead
+        of one per event.
+
+        :param raw_completed_events: The decoded `completed_events` section of a trace.
+        :param app_name_to_class: Mapping from app name to app class name.
+        :returns: The list of completed events.
+        """
+        app_instances: dict[str, Any] = {}
+        return [
+            CompletedEvent.from_dict(
+                JsonScenarioImporter.map_event(completed_event, app_name_to_class),
+                app_instances=app_instances,
+            )
+            for completed_event in raw_completed_events
+        ]
+
+    @staticmethod
+    def map_world_logs(agent_log_strs: list[str]) -> list[BaseAgentLog]:
+        world_logs = []
+        for agent_log_str in agent_log_strs:
             agent_log_dict = json.loads(agent_log_str)
             # Ensure agent_id is present for backward compatibility
             if "agent_id" not in agent_log_dict:
                 agent_log_dict["agent_id"] = "unknown"
             world_logs.append(BaseAgentLog.from_dict(agent_log_dict))
+        return world_logs
 
-        return scenario, completed_events, world_logs
+    @staticmethod
+    def select_turn(
+        raw_completed_events: list[dict[str, Any]], turn_idx: int
+    ) -> list[dict[str, Any]]:
+        """
+        Select the raw completed events of a given turn.
+        Turns are delimited by the agent messages to the user, in event time order,
+        consistently with `extract_agent_events`.
+
+        :param raw_completed_events: The decoded `completed_events` section of a trace.
+        :param turn_idx: The index of the turn to select.
+        :returns: The raw completed events of the turn, sorted by event time.
+        """
+        selected = []
+        turn = 0
+        for event in sorted(raw_completed_events, key=lambda e: e["event_time"]):
+            if turn == turn_idx:
+                selected.append(event)
+            action = event.get("action") or {}
+            if (
+                event["event_type"] == "AGENT"
+                and action.get("app") == "AgentUserInterface"
+                and action.get("function") == "send_message_to_user"
+            ):
+                turn += 1
+                if turn > turn_idx:
+                    break
+        return selected
+
+    def import_partial(
+        self,
+        json_str: str | bytes,
+        sections: Collection[TraceSection] = (TraceSection.METADATA,),
+        turn_idx: int | None = None,
+    ) -> PartialTrace:
+        """
+        Imports only some sections of an exported trace.
+
+        Unrequested sections are skipped without being validated, and completed events
+        are built directly from the raw JSON. Completed events need the app names, so
+        requesting them also reads the app list, but app states are only validated
+        when `TraceSection.APPS` is requested.
+
+        :param json_str: The JSON data representing the trace.
+        :param sections: The sections to import. Defaults to the metadata only.
+        :param turn_idx: If set, only the completed events of this turn are imported.
+        :returns: A `PartialTrace` with the requested sections set.
+        """
+        keys = {"version", "context"} | {section.value for section in sections}
+        if TraceSection.COMPLETED_EVENTS in sections:
+            keys.add(TraceSection.APPS.value)
+        raw = dict(iter_json_object_members(json_str, keys))
+
+        version = raw.get("version")
+        if version not in self.SUPPORTED_VERSIONS:
+            raise Exception(f"Unsupported version: {version}")
+
+        trace = PartialTrace(version=version, context=raw.get("context"))
+        if TraceSection.METADATA in sections and "metadata" in raw:
+            trace.metadata = ExportedTraceMetadata.model_validate(raw["metadata"])
+        if TraceSection.APPS in sections or TraceSection.EVENTS in sections:
+            base = ExportedTraceBase.model_validate(
+                {
+                    "version": version,
+                    "apps": raw.get("apps") or [],
+                    "events": raw.get("events") or [],
+                }
+            )
+            if TraceSection.APPS in sections:
+                trace.apps = base.apps
+            if TraceSection.EVENTS in sections:
+                trace.events = base.events
+        if TraceSection.COMPLETED_EVENTS in sections:
+            raw_completed_events = raw.get("completed_events") or []
+            if turn_idx is not None:
+                raw_completed_events = self.select_turn(raw_completed_events, turn_idx)
+            trace.completed_events = self.map_completed_events(
+                raw_completed_events,
+                self.build_app_name_to_class(raw.get("apps") or []),
+            )
+        if TraceSection.WORLD_LOGS in sections:
+            trace.world_logs = self.map_world_logs(raw.get("world_logs") or [])
+        if TraceSection.AUGMENTATION in sections:
+            trace.augmentation = raw.get("augmentation")
+        return trace
 
     def _fetch_apps_from_huggingface(
         self, hf_metadata: ExportedHuggingFaceMetadata, scenario_id: str
@@ -313,9 +527,9 @@ class JsonScenarioImporter:
         # Check if we need to fetch apps from HuggingFace
         # If apps are empty and HuggingFace metadata is available, try to fetch apps
         if not _scenario.serialized_apps:
-            # Get the metadata from the already parsed data
-            data = _importer().model_validate_json(json_str)
-            scenario_metadata = data.metadata  # type: ignore
+            # Only the metadata is needed here
+            scenario_metadata = self.import_partial(json_str).metadata
+            assert scenario_metadata is not None
 
             if scenario_metadata.definition.hf_metadata:
                 hf_metadata = scenario_metadata.definition.hf_metadata
@@ -15,17 +15,19 @@ import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Callable, Type, TypeVar
+from typing import Any, Callable, Iterable, Type, TypeVar
 
 from termcolor import colored
 
-from are.simulation.agents.agent_log import ActionLog
+from are.simulation.agents.agent_log import ActionLog, StepLog
 from are.simulation.agents.are_simulation_agent import BaseAgentLog
 from are.simulation.apps import INTERNAL_APPS
 from are.simulation.apps.agent_user_interface import AgentUserInterface
 from are.simulation.apps.app import App, Protocol
 from are.simulation.apps.reminder import ReminderApp
 from are.simulation.apps.system import SystemApp
+from are.simulation.change_feed import ChangeFeed
+from are.simulation.checkpoints import CheckpointStore, EnvironmentCheckpoint
 from are.simulation.notification_system import (
     BaseNotificationSystem,
     Message,
@@ -152,6 +154,8 @@ class Environment(AbstractEnvironment):
         self.event_log = EventLog()
         self.event_queue = EventQueue()
         self.initial_config = config
+        # Notifies subscribers such as the GUI of new events, app changes and world logs
+        self.changes = ChangeFeed()
 
         # Time management
         self.time_manager = TimeManager()
@@ -199,6 +203,8 @@ class Environment(AbstractEnvironment):
         )
         self.world_logs = []
         self.is_replaying = False
+        # Checkpoints taken at each agent step when set, to replay runs from the nearest step
+        self.checkpoints: CheckpointStore | None = None
 
     def set_is_replaying(self, is_replaying: bool):
         self.is_replaying = is_replaying
@@ -221,6 +227,7 @@ class Environment(AbstractEnvironment):
         self.thread = threading.Thread(target=self._event_loop, name="EventLoop")
         self.thread.daemon = True
         self.thread.start()
+        self.changes.publish()
 
     def stop(self, final_state: EnvironmentState = EnvironmentState.STOPPED):
         """
@@ -228,6 +235,7 @@ class Environment(AbstractEnvironment):
         """
         self.stop_event.set()
         self.state = final_state
+        self.changes.publish()
 
         if self.notification_system is not None:
             self.notification_system.message_queue.put(
@@ -270,6 +278,7 @@ class Environment(AbstractEnvironment):
         self.pause_event.set()
         self.time_manager.pause()
         self.state = EnvironmentState.PAUSED
+        self.changes.publish()
 
     def resume(self):
         """
@@ -282,6 +291,7 @@ class Environment(AbstractEnvironment):
         self.log_debug("Environment is resumed.")
         self.pause_event.clear()
         self.state = EnvironmentState.RUNNING
+        self.changes.publish()
 
     def resume_with_offset(self, offset: float):
         """
@@ -295,6 +305,7 @@ class Environment(AbstractEnvironment):
         self.log_debug("Environment is resumed.")
         self.pause_event.clear()
         self.state = EnvironmentState.RUNNING
+        self.changes.publish()
         self.tick()  # We tick once to make sure the time is updated
 
     def prepare_events_for_start(self):
@@ -313,17 +324,22 @@ class Environment(AbstractEnvironment):
 
     def delete_all_completed_events(self):
         self.event_log = EventLog()
+        self.changes.publish(reset=True)
 
-    def get_apps_state(self) -> Any:
+    def get_apps_state(self, app_names: Iterable[str] | None = None) -> Any:
         """
         Get the state of the apps
+
+        :param app_names: Names of the apps to include, None to include all the apps
         """
         apps_to_skip = set(internal_app.name for internal_app in INTERNAL_APPS)
+        apps_to_include = set(app_names) if app_names is not None else None
         return {
             "apps": [
                 {"app_name": name, **(app.get_state() or {})}
                 for name, app in self.apps.items()
                 if name not in apps_to_skip
+                and (apps_to_include is None or name in apps_to_include)
             ]
         }
 
@@ -361,6 +377,7 @@ class Environment(AbstractEnvironment):
     def reset_app_states(self):
         for app in self.apps.values():
             app.reset()
+        self.changes.publish(app_names=self.apps.keys())
 
     def put_last_event_from_log_to_queue(self):
         """
@@ -372,6 +389,7 @@ class Environment(AbstractEnvironment):
             last_event: CompletedEvent = self.event_log.past_events[-1]
             del self.event_log.past_events[-1]
             self.event_queue.put(last_event.to_future_event())
+            self.changes.publish(reset=True)
 
     def _event_loop(self):
         """
@@ -392,6 +410,7 @@ class Environment(AbstractEnvironment):
         except ValidationException as e:
             self.log_error(f"Final Validation failed with exception: {e}")
             self.state = EnvironmentState.FAILED
+        self.changes.publish()
         # Send notification that the environment has stopped
         if self.notification_system is not None:
             self.notification_system.message_queue.put(
@@ -553,6 +572,17 @@ class Environment(AbstractEnvironment):
                 next_notification_time = (
                     self.notification_system.get_next_notification_time()
                 )
+                # Reminders are notified by the first tick after they are due
+                next_reminder_time = self.notification_system.get_next_reminder_time()
+                if next_reminder_time is not None:
+                    next_reminder_time = max(
+                        next_reminder_time, self.time_manager.time()
+                    )
+                    if (
+                        next_notification_time is None
+                        or next_reminder_time < next_notification_time
+                    ):
+                        next_notification_time = next_reminder_time
                 # filter next event and next notif time to only consider those that are before the timeout
                 if next_event_time is not None and next_event_time > timeout_timestamp:
                     next_event_time = None
@@ -818,6 +848,7 @@ class Environment(AbstractEnvironment):
         """
         for app in apps:
             app.register_time_manager(self.time_manager)
+            app.register_stop_event(self.stop_event)
             app.register_to_env("environment", self.add_to_log)
             if app.__class__ == AgentUserInterface:
                 # Here for the AgentUserInterface we need to add the pause and resume functions
@@ -844,8 +875,60 @@ class Environment(AbstractEnvironment):
         for app in self.apps.values():
             app.connect_to_protocols(self.protocol_to_app)
 
+    def _configure_agent_user_interface(self):
+        if AgentUserInterface.__name__ in self.apps:
+            aui: AgentUserInterface = self.get_app(AgentUserInterface.__name__)  # type: ignore
+            if self.environment_type == EnvironmentType.GUI:
+                aui.set_cli(is_cli=False)
+            elif self.environment_type == EnvironmentType.CLI:
+                aui.set_cli(is_cli=True)
+
+            if self.oracle_mode and aui.user_proxy is None:
+                self.log_debug(
+                    "Oracle mode is enabled but no user proxy is set, configuring AUI to not wait for user response"
+                )
+                aui.wait_for_user_response = False
+
+    def restore_checkpoint(self, checkpoint: EnvironmentCheckpoint):
+        """
+        Restore the apps and the event log from a checkpoint of a run of the same scenario.
+        The apps are reset and registered again, as when the scenario is run.
+        """
+        for name, app in self.apps.items():
+            state = checkpoint.app_states.get(name)
+            if state is None:
+                continue
+            failure_probability = app.failure_probability
+            app.reset()
+            app.name = name
+            state_dict = json.loads(state)
+            if state_dict is not None:
+                app.load_state(state_dict)
+            if failure_probability is not None:
+                app.set_failure_probability(failure_probability)
+            app.rng.setstate(checkpoint.app_rng_states[name])
+
+        self.protocol_to_app = {}
+        self.register_apps(list(self.apps.values()))
+        self._configure_agent_user_interface()
+        self.event_log = EventLog.from_list_view(
+            [event.copy() for event in checkpoint.completed_events]
+        )
+        self.changes.publish(reset=True)
+
     def append_to_world_logs(self, world_log: BaseAgentLog):
+        if (
+            self.checkpoints is not None
+            and isinstance(world_log, StepLog)
+            and not self.is_replaying
+        ):
+            # The actions of the previous steps completed, the state matches the logs so far
+            try:
+                self.checkpoints.take(self, self.world_logs)
+            except Exception as e:
+                self.log_warning(f"Failed to take a checkpoint: {e}")
         self.world_logs.append(world_log)
+        self.changes.publish(world_logs_changed=True)
 
     def add_to_log(self, events: CompletedEvent | list[CompletedEvent]):
         """
@@ -854,8 +937,28 @@ class Environment(AbstractEnvironment):
         if not isinstance(events, list):
             events = [events]
 
+        added: list[CompletedEvent] = []
+        try:
+            self._add_to_log(events, added)
+        finally:
+            self.changes.publish(
+                events=added,
+                app_names=(
+                    app_name
+                    for event in added
+                    if (
+                        app_name := getattr(
+                            getattr(event.action, "app", None), "name", None
+                        )
+                    )
+                    is not None
+                ),
+            )
+
+    def _add_to_log(self, events: list[CompletedEvent], added: list[CompletedEvent]):
         for event in events:
             self.event_log.put(event)
+            added.append(event)
 
             if self.is_replaying:
                 logger.info("Ignore this event since it happened during a replay")
@@ -921,6 +1024,7 @@ class Environment(AbstractEnvironment):
 
     def set_world_logs(self, world_logs: list[BaseAgentLog]):
         self.world_logs = world_logs
+        self.changes.publish(world_logs_changed=True)
 
     def append_world_logs(self, log: BaseAgentLog):
         self.world_logs.append(log)
@@ -973,18 +1077,7 @@ class Environment(AbstractEnvironment):
         if self.dump_dir is not None:
             self._dump_state("initial_state.jsonl")
 
-        if AgentUserInterface.__name__ in self.apps:
-            aui: AgentUserInterface = self.get_app(AgentUserInterface.__name__)  # type: ignore
-            if self.environment_type == EnvironmentType.GUI:
-                aui.set_cli(is_cli=False)
-            elif self.environment_type == EnvironmentType.CLI:
-                aui.set_cli(is_cli=True)
-
-            if self.oracle_mode and aui.user_proxy is None:
-                self.log_debug(
-                    "Oracle mode is enabled but no user proxy is set, configuring AUI to not wait for user response"
-                )
-                aui.wait_for_user_response = False
+        self._configure_agent_user_interface()
 
         self.start()
         if wait_for_end:
@@ -21,6 +21,7 @@ from are.simulation.gui.server.graphql.schema import Mutation
 from are.simulation.gui.server.graphql.subscription import Subscription
 from are.simulation.gui.server.scenarios import GUI_SCENARIOS
 from are.simulation.gui.server.server import ARESimulationGuiServer
+from are.simulation.gui.server.session_manager import DEFAULT_HIBERNATE_AFTER
 from are.simulation.notification_system import VerboseNotificationSystem
 from are.simulation.utils.huggingface import parse_huggingface_url
 
@@ -93,6 +94,26 @@ shutdown_event = threading.Event()
     default=int(os.environ.get("ARE_SIMULATION_CLEANUP_INTERVAL", 300)),
     help="Interval in seconds between session cleanup checks",
 )
+@click.option(
+    "--memory-budget",
+    type=int,
+    required=False,
+    default=(
+        int(os.environ["ARE_SIMULATION_SESSION_MEMORY_BUDGET"])
+        if "ARE_SIMULATION_SESSION_MEMORY_BUDGET" in os.environ
+        else None
+    ),
+    help="Estimated memory budget in megabytes of the sessions, over which idle sessions are hibernated to disk",
+)
+@click.option(
+    "--hibernate-after",
+    type=int,
+    required=False,
+    default=int(
+        os.environ.get("ARE_SIMULATION_HIBERNATE_AFTER", DEFAULT_HIBERNATE_AFTER)
+    ),
+    help="Minimum idle time in seconds before a session can be hibernated",
+)
 @click.option(
     "--dataset-path",
     type=click.Path(exists=True, file_okay=False, dir_okay=True),
@@ -116,6 +137,8 @@ def main(
     ui_view: str | None = None,
     inactivity_limit: int = 3600,
     cleanup_interval: int = 300,
+    memory_budget: int | None = None,
+    hibernate_after: int = DEFAULT_HIBERNATE_AFTER,
     dataset_path: str | None = None,
 ):
     """
@@ -156,6 +179,10 @@ def main(
         default_ui_view=ui_view,
         inactivity_limit=inactivity_limit,
         cleanup_interval=cleanup_interval,
+        memory_budget=memory_budget * 1024 * 1024
+        if memory_budget is not None
+        else None,
+        hibernate_after=hibernate_after,
         dataset_path=dataset_path,
         notification_system_builder=VerboseNotificationSystem,
     )
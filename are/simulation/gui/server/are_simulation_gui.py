@@ -31,7 +31,13 @@ from are.simulation.agents.are_simulation_agent_config import (
     RunnableARESimulationAgentConfig,
 )
 from are.simulation.agents.multimodal import Attachment
-from are.simulation.apps import AgentUserInterface, Files, SandboxLocalFileSystem
+from are.simulation.apps import (
+    ALL_APPS,
+    AgentUserInterface,
+    Files,
+    SandboxLocalFileSystem,
+)
+from are.simulation.checkpoints import CheckpointStore
 from are.simulation.config import ARE_SIMULATION_SANDBOX_PATH
 from are.simulation.data_handler.exporter import JsonScenarioExporter
 from are.simulation.data_handler.importer import JsonScenarioImporter
@@ -63,6 +69,7 @@ from are.simulation.types import (
     EventType,
     disable_events,
 )
+from are.simulation.utils import EnumEncoder
 from are.simulation.utils.huggingface import (
     get_scenario_from_huggingface,
     parse_huggingface_url,
@@ -111,6 +118,8 @@ class ARESimulationGui:
         self.apply_agent_config_defaults()
 
         self.env: Environment | None = None
+        # Checkpoints of the current run, so that replays restore the nearest agent step
+        self.checkpoints = CheckpointStore()
         self.annotator_name = annotator_name
         self.notification_system_builder = notification_system_builder
 
@@ -132,6 +141,16 @@ class ARESimulationGui:
         self.set_scenario(default_scenario_id)
 
     def __del__(self):
+        self.remove_tmpdir()
+
+    def remove_tmpdir(self) -> None:
+        """
+        Remove the temporary directory of the session. It is removed only once, so that a
+        later instance of the same session, e.g. restored after a hibernation, keeps its own.
+        """
+        if getattr(self, "_tmpdir_removed", False):
+            return
+        self._tmpdir_removed = True
         if os.path.exists(self.tmpdir):
             logger.info(f"Removing session's temporary directory: {self.tmpdir}")
             shutil.rmtree(self.tmpdir, ignore_errors=True)
@@ -339,6 +358,22 @@ class ARESimulationGui:
             raise ValueError("Environment is not initialized.")
         return self.env.get_state()
 
+    def get_memory_usage(self) -> int:
+        """
+        Estimate the memory used by the session, as the size of the serialized states of the
+        apps, of the world logs and of the checkpoints of the run.
+
+        :returns: The estimated size in bytes
+        """
+        if self.env is None:
+            return self.checkpoints.size
+        apps_size = sum(
+            len(json.dumps(app.get_state(), cls=EnumEncoder))
+            for app in list(self.env.apps.values())
+        )
+        world_logs_size = sum(len(log.serialize()) for log in self.get_world_logs())
+        return apps_size + world_logs_size + self.checkpoints.size
+
     def pause(self):
         if self.env is not None:
             self.env.pause()
@@ -360,7 +395,7 @@ class ARESimulationGui:
         self.env.run(self.scenario, wait_for_end=False, schedule_events=schedule_events)
 
         if initial_world_logs is not None:
-            replay_logs(initial_world_logs, self.env)
+            replay_logs(initial_world_logs, self.env, self.checkpoints)
             if task is not None:
                 self.send_user_message_to_agent(task, None)
 
@@ -368,11 +403,16 @@ class ARESimulationGui:
 
     def load(self):
         self.scenario.soft_reset()
-        self._post_load()
+        # The checkpoints of the run can be restored when it is replayed
+        self._post_load(keep_checkpoints=True)
 
     def _post_load(
-        self, completed_events: CompletedEvent | list[CompletedEvent] | None = None
+        self,
+        completed_events: CompletedEvent | list[CompletedEvent] | None = None,
+        keep_checkpoints: bool = False,
     ) -> None:
+        if not keep_checkpoints:
+            self.checkpoints.clear()
         if self.notification_system_builder is None:
             logger.warning("No notification system builder provided - using default.")
             self.notification_system = None
@@ -392,6 +432,7 @@ class ARESimulationGui:
         )
         self._configure_environment()
         self.env.register_apps(self.scenario.apps if self.scenario.apps else [])
+        self.env.checkpoints = self.checkpoints
 
         if completed_events is not None:
             self.env.add_to_log(completed_events)
@@ -420,6 +461,7 @@ class ARESimulationGui:
             event_time=event_time,
             event_time_comparator=event_time_comparator,
         )
+        self._publish_scenario_changed()
 
         return event.event_id
 
@@ -448,9 +490,15 @@ class ARESimulationGui:
             event_time=event_time,
             event_time_comparator=event_time_comparator,
         )
+        self._publish_scenario_changed()
 
         return event.event_id
 
+    def _publish_scenario_changed(self) -> None:
+        """Notify the GUI subscriptions that the scenario events or hints were edited."""
+        if self.env is not None:
+            self.env.changes.publish(scenario_changed=True)
+
     def edit_scenario_duration(
         self,
         duration: float | None,
@@ -478,6 +526,7 @@ class ARESimulationGui:
             logger.error("Cannot delete scenario event: scenario is None.")
             return
         self.scenario.delete_event(event_id)
+        self._publish_scenario_changed()
 
     def delete_all_scenario_events(self) -> None:
         if self.scenario is None:
@@ -486,12 +535,14 @@ class ARESimulationGui:
         self.scenario.delete_completed_events()
         assert self.env is not None, "Environment not found."
         self.env.delete_all_completed_events()
+        self._publish_scenario_changed()
 
     def edit_scenario_event_hint_content(self, event_id: str, hints: str) -> None:
         if self.scenario is None:
             logger.error("Cannot edit scenario event hint content: scenario is None.")
             return
         self.scenario.edit_hint_content(event_id, hints)
+        self._publish_scenario_changed()
 
     def stop(self):
         if self.env is not None:
@@ -758,6 +809,7 @@ class ARESimulationGui:
                 # Write the file
                 with fs.open(full_file_path, "wb") as f:
                     f.write(file_data)
+            self.env.changes.publish(app_names=[filesystem_app_name])
 
             logger.info(
                 f"Successfully uploaded file {file_name} to {full_file_path} in filesystem {filesystem_app_name}"
@@ -796,6 +848,72 @@ class ARESimulationGui:
             logger.exception(f"Failed to import scenario: {e}.")
             return False
 
+    def hibernate(self) -> str | None:
+        """
+        Serialize the session, i.e. its scenario and run exported as a trace with the agent
+        and annotator settings, so that another instance can restore it.
+
+        :returns: The serialized session, or None if it has a running or paused agent run, if
+            the export failed or if its apps cannot be imported back
+        """
+        if self.env is not None and self.env.state in (
+            EnvironmentState.RUNNING,
+            EnvironmentState.PAUSED,
+        ):
+            # The live agent run could only come back as a replay of its trace
+            return None
+        # Apps are imported back by class name, scenarios with other apps stay in memory
+        importable_apps = {cls.__name__ for cls in ALL_APPS}
+        unknown_apps = [
+            app.name
+            for app in self.scenario.apps or []
+            if type(app).__name__ not in importable_apps
+        ]
+        if unknown_apps:
+            logger.warning(
+                f"Session {self.session_id} cannot be restored, its apps {unknown_apps} cannot be imported."
+            )
+            return None
+        trace = self.export_trace(
+            scenario_id=self.scenario.scenario_id,
+            validation_decision=None,
+            annotation_id=None,
+            annotator_name=self.annotator_name,
+        )
+        if trace is None:
+            return None
+        return json.dumps(
+            {
+                "trace": trace,
+                "agent_name": self.agent_name,
+                "agent_config": (
+                    self.agent_config.get_model_dump()
+                    if self.agent_config is not None
+                    else None
+                ),
+                "annotator_name": self.annotator_name,
+            },
+            cls=EnumEncoder,
+        )
+
+    def restore(self, hibernated_session: str) -> bool:
+        """
+        Restore a session serialized by hibernate, replaying its run as import_trace does.
+
+        :param hibernated_session: The serialized session
+        :returns: True if the session was restored, False otherwise
+        """
+        try:
+            session = json.loads(hibernated_session)
+            self.annotator_name = session["annotator_name"]
+            self.set_agent_name(session["agent_name"])
+            if session["agent_config"] is not None:
+                self.set_agent_config(session["agent_config"])
+        except Exception as e:
+            logger.exception(f"Failed to restore session: {e}.")
+            return False
+        return self.import_trace(session["trace"])
+
     def import_from_huggingface(
         self,
         dataset_name: str,
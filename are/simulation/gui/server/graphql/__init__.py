@@ -4,3 +4,8 @@
 # This source code is licensed under the terms described in the LICENSE file in
 # the root directory of this source tree.
 
+
+from are.simulation.types import register_graphql_types
+
+# The schema of the GUI exposes types of the simulation
+register_graphql_types()
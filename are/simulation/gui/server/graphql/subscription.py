@@ -14,7 +14,6 @@ import mimetypes
 import os
 import pickle
 import time
-from collections import deque
 from threading import Thread
 from typing import Any, AsyncGenerator, Callable, Type
 
@@ -60,6 +59,13 @@ graphql_cache: dict[str, dict[str, Any]] = {}
 attachment_cache: dict[str, dict[int, tuple[str, int]]] = {}
 logger = logging.getLogger(__name__)
 
+# Log types that should be completely ignored in the UI
+# These are internal logs that don't provide value to end users
+SKIPPED_LOG_TYPES: set[Type[BaseAgentLog]] = {
+    StopLog,  # Internal signal for stopping execution - not user-relevant
+    ActionLog,  # Low-level action details - too verbose for UI display
+}
+
 
 def save_attachment_to_disk(
     log_id: str,
@@ -117,6 +123,254 @@ class EnvironmentSubscriptionState:
     hints: list[Hint] | None = None
     world_logs: list[AgentLogForGraphQL] | None = None
     environment_time: float | None = None
+    # Sequence number of the last environment change included in the update
+    sequence: int | None = None
+    # Whether the update contains the whole state, which replaces the state of the client
+    full_resync: bool | None = None
+    # Delta updates: completed events added to the event log, to merge by event id
+    appended_events_json: str | None = None
+    # Delta updates: states of the apps which changed, to merge by app name
+    changed_apps_json: str | None = None
+    # Delta updates: position of the first world log sent, replacing the following logs
+    world_logs_offset: int | None = None
+
+
+def _get_world_log_key(log: AgentLogForGraphQL) -> tuple:
+    return (log.id, log.type, log.group_id, log.is_subagent, log.content)
+
+
+class EnvironmentStateTracker:
+    """
+    Builds the updates of a GUI subscription from the change feed of the environment of a
+    session, so that nothing is serialized or hashed while the environment is idle.
+
+    The first update, and the updates after the environment was replaced or its changes could
+    not be followed, contain the whole state and set `full_resync`. With deltas, the other
+    updates only contain the appended events, the states of the changed apps and the changed
+    world logs, otherwise they contain the whole event log and apps state when they changed,
+    assembled from the cached JSON of the events and apps which did not change.
+    Events added while a whole state is built may be sent again in the next update.
+
+    Scenario edits are published on the change feed, so the scenario is only serialized when
+    its sequence number shows an edit or when the scenario was replaced.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        are_simulation_instance: Any,
+        cache_dir: str,
+        hosting_root: str,
+        deltas: bool = False,
+    ):
+        self.session_id = session_id
+        self.are_simulation_instance = are_simulation_instance
+        self.cache_dir = cache_dir
+        self.hosting_root = hosting_root
+        self.deltas = deltas
+        self.sequence = 0
+        self._env = None
+        self._event_log = None
+        self._env_state: EnvironmentState | None = None
+        self._environment_time: float | None = None
+        self._world_logs_source: list[BaseAgentLog] | None = None
+        self._world_logs_count = 0
+        self._world_log_keys: list[tuple] = []
+        self._scenario: Any = None
+        # JSON of the logged events by object id, and of the state of each app by name
+        self._event_jsons: dict[int, tuple[Any, str]] = {}
+        self._app_jsons: dict[str, str] = {}
+
+    def wait(self, timeout: float) -> None:
+        """
+        Wait for a change of the environment, or until the timeout for time updates.
+
+        :param timeout: Maximum time to wait in seconds
+        """
+        env = self.are_simulation_instance.env
+        if env is None:
+            # Wait for the environment to be created
+            time.sleep(min(timeout, 0.25))
+        elif env is self._env:
+            env.changes.wait(self.sequence, timeout)
+
+    def resync(self) -> None:
+        """Send the whole state in the next update."""
+        self._env = None
+
+    def get_update(self) -> EnvironmentSubscriptionState | None:
+        """
+        Get the update for the changes since the last update.
+
+        :returns: The update, or None if nothing changed
+        """
+        env = self.are_simulation_instance.env
+        if env is None:
+            return None
+        changes = None
+        if env is self._env and env.event_log is self._event_log:
+            changes = env.changes.get_changes(self.sequence)
+        if changes is None:
+            return self._get_full_state(env)
+        self.sequence = changes.sequence
+
+        update = EnvironmentSubscriptionState()
+        if changes.events or changes.app_names:
+            if self.deltas:
+                update.appended_events_json = json.dumps(
+                    make_serializable([event.to_dict() for event in changes.events])
+                )
+                update.changed_apps_json = json.dumps(
+                    make_serializable(env.get_apps_state(changes.app_names))
+                )
+            else:
+                update.event_log_json = self._get_event_log_json(env)
+                update.apps_state_json = self._get_apps_state_json(
+                    env, changes.app_names
+                )
+        if changes.world_logs_changed:
+            self._update_world_logs(update)
+        if (
+            changes.scenario_changed
+            or self.are_simulation_instance.scenario is not self._scenario
+        ):
+            self._update_scenario(update)
+        self._update_env_state(update, env, full=False)
+
+        if not any(
+            [
+                update.apps_state_json,
+                update.event_log_json,
+                update.appended_events_json,
+                update.changed_apps_json,
+                update.initial_event_queue_json,
+                update.env_state,
+                update.hints is not None,
+                update.world_logs is not None,
+                update.environment_time,
+            ]
+        ):
+            return None
+        update.sequence = self.sequence
+        update.full_resync = False
+        return update
+
+    def _get_full_state(self, env: Any) -> EnvironmentSubscriptionState:
+        # Read the sequence number first, changes made while building the state are sent again
+        self.sequence = env.changes.sequence
+        self._env = env
+        self._event_log = env.event_log
+        self._world_logs_source = None
+        self._world_log_keys = []
+        self._event_jsons = {}
+        self._app_jsons = {}
+
+        update = EnvironmentSubscriptionState(
+            sequence=self.sequence,
+            full_resync=True,
+            event_log_json=self._get_event_log_json(env),
+            apps_state_json=self._get_apps_state_json(env),
+        )
+        self._update_world_logs(update)
+        self._update_scenario(update)
+        self._update_env_state(update, env, full=True)
+        return update
+
+    def _get_event_log_json(self, env: Any) -> str:
+        """
+        Get the JSON of the event log, as `env.event_log_json()` would return it, serializing
+        only the events which were not serialized yet.
+        """
+        event_jsons: dict[int, tuple[Any, str]] = {}
+        for event in env.event_log.list_view():
+            entry = self._event_jsons.get(id(event))
+            if entry is None or entry[0] is not event:
+                entry = (event, json.dumps(make_serializable(event.to_dict())))
+            event_jsons[id(event)] = entry
+        self._event_jsons = event_jsons
+        past_events = ", ".join(event_json for _, event_json in event_jsons.values())
+        return f'{{"event_log": {{"past_events": [{past_events}]}}}}'
+
+    def _get_apps_state_json(
+        self, env: Any, changed_app_names: set[str] | None = None
+    ) -> str:
+        """
+        Get the JSON of the state of the apps, as `env.apps_state_json()` would return it,
+        serializing only the changed apps and the apps which were not serialized yet.
+        """
+        for app_name in changed_app_names or ():
+            self._app_jsons.pop(app_name, None)
+        missing_app_names = [name for name in env.apps if name not in self._app_jsons]
+        if missing_app_names:
+            for app_state in env.get_apps_state(missing_app_names)["apps"]:
+                self._app_jsons[app_state["app_name"]] = json.dumps(
+                    make_serializable(app_state)
+                )
+        apps = ", ".join(
+            self._app_jsons[name] for name in env.apps if name in self._app_jsons
+        )
+        return f'{{"apps": [{apps}]}}'
+
+    def _update_world_logs(self, update: EnvironmentSubscriptionState) -> None:
+        source = self.are_simulation_instance.env.world_logs
+        if (
+            source is self._world_logs_source
+            and len(source) >= self._world_logs_count
+            and all(
+                type(log) in SKIPPED_LOG_TYPES
+                for log in source[self._world_logs_count :]
+            )
+        ):
+            # Only logs which are not displayed were appended, e.g. the logs of the actions
+            self._world_logs_count = len(source)
+            return
+        self._world_logs_source = source
+        self._world_logs_count = len(source)
+
+        # We need to use an array as default because having no logs is a valid state (e.g. on soft reset)
+        world_logs = self.are_simulation_instance.get_world_logs() or []
+        world_logs_for_graphql = get_world_logs_for_graphql(
+            world_logs, self.cache_dir, self.hosting_root
+        )
+        keys = [_get_world_log_key(log) for log in world_logs_for_graphql]
+        if update.full_resync or not self.deltas:
+            if update.full_resync or keys != self._world_log_keys:
+                update.world_logs = world_logs_for_graphql
+        elif keys != self._world_log_keys:
+            # Logs can be inserted or regrouped, e.g. when a facts or plan subagent is detected
+            offset = 0
+            for key, sent_key in zip(keys, self._world_log_keys):
+                if key != sent_key:
+                    break
+                offset += 1
+            update.world_logs = world_logs_for_graphql[offset:]
+            update.world_logs_offset = offset
+        self._world_log_keys = keys
+
+    def _update_scenario(self, update: EnvironmentSubscriptionState) -> None:
+        scenario = self.are_simulation_instance.scenario
+        self._scenario = scenario
+        if scenario is None:
+            return
+        update.initial_event_queue_json = json.dumps(
+            make_serializable([event.to_dict() for event in scenario.events])
+        )
+        update.hints = scenario.hints or []
+
+    def _update_env_state(
+        self, update: EnvironmentSubscriptionState, env: Any, full: bool
+    ) -> None:
+        if full or env.state != self._env_state:
+            self._env_state = env.state
+            update.env_state = env.state
+        environment_time = env.time_manager.time()
+        if (
+            full
+            or self._environment_time is None
+            or environment_time - self._environment_time > 1
+        ):
+            self._environment_time = environment_time
+            update.environment_time = environment_time
 
 
 @strawberry.type
@@ -125,24 +379,26 @@ class Subscription:
 
     @strawberry.subscription
     async def environment_subscription_state(
-        self, session_id: str
+        self, session_id: str, deltas: bool = False
     ) -> AsyncGenerator[EnvironmentSubscriptionState, None]:
         """
         Asynchronous generator function that yields the state of the environment
-        for a given session. It monitors changes in the environment state and
+        for a given session. It waits for the changes published by the environment and
         updates the client with the latest state.
 
         :param session_id: The unique identifier for the session.
         :type session_id: str
+        :param deltas: Whether to send only the changes after the first update, see
+            EnvironmentStateTracker.
+        :type deltas: bool
         :return: An asynchronous generator yielding EnvironmentSubscriptionState objects.
         :rtype: AsyncGenerator[EnvironmentSubscriptionState, None]
         """
 
         def _run_apps_state_json(session_id: str):
             """
-            Internal function that runs in a separate thread to monitor and
-            update the state of applications, event logs, and environment state
-            for a given session.
+            Internal function that runs in a separate thread to wait for the
+            changes of the environment of a session and queue the updates.
 
             :param session_id: The unique identifier for the session.
             :type session_id: str
@@ -153,116 +409,33 @@ class Subscription:
                 are_simulation_instance = (
                     Subscription.server.get_or_create_are_simulation(session_id)
                 )
-
-                cache_dir = os.path.join(are_simulation_instance.tmpdir, "cache")
-                hosting_root = f"{FILES_PATH}/{session_id}/cache"
-
-                while keep_alive:
-                    try:
-                        # Create a new EnvironmentSubscriptionState object to store new changes
-                        changed_state = EnvironmentSubscriptionState()
-
-                        # Handle any changes in the event log
-                        event_log = make_serializable(
-                            {
-                                "event_log": are_simulation_instance.env.event_log.to_dict()
-                            }
-                        )
-
-                        if update_graphql_cache(session_id, event_log, "event_log"):
-                            changed_state.event_log_json = json.dumps(event_log)
-
-                        # Handle any changes in the app state
-                        apps_modified = any(
-                            app.is_state_modified
-                            for app in are_simulation_instance.env.apps.values()  # type: ignore
-                        )
-
-                        if changed_state.event_log_json is not None or apps_modified:
-                            apps_state = are_simulation_instance.env.get_apps_state()
-                            changed_state.apps_state_json = json.dumps(
-                                make_serializable(apps_state)
-                            )
-
-                        # Handle any changes in the initial event queue
-                        initial_event_queue = make_serializable(
-                            [
-                                event.to_dict()
-                                for event in are_simulation_instance.scenario.events  # type: ignore
-                            ]
-                        )
-                        if update_graphql_cache(
-                            session_id, initial_event_queue, "initial_event_queue"
-                        ):
-                            changed_state.initial_event_queue_json = json.dumps(
-                                initial_event_queue
-                            )
-
-                        # Handle any changes in the environment state
-                        env_state = are_simulation_instance.env.state
-                        if update_graphql_cache(session_id, env_state, "env_state"):
-                            changed_state.env_state = env_state
-
-                        # Handle any changes in agent logs
-                        # We need to use an array as default because having no logs is a valid state (e.g. on soft reset)
-                        world_logs: list[BaseAgentLog] | None = (
-                            are_simulation_instance.get_world_logs()
-                        ) or []
-                        if update_graphql_cache(
-                            session_id,
-                            world_logs,
-                            "world_logs",
-                            check_length_only=True,
-                        ):
-                            world_logs_for_graphql = get_world_logs_for_graphql(
-                                world_logs, cache_dir, hosting_root
-                            )
-                            changed_state.world_logs = world_logs_for_graphql
-
-                        # Handle any changes in hints
-                        hints = are_simulation_instance.scenario.hints or []
-                        if update_graphql_cache(session_id, hints, "hints"):
-                            changed_state.hints = hints
-
-                        # Reset the is_state_modified flag for all apps
-                        for app in are_simulation_instance.env.apps.values():  # type: ignore
-                            app.is_state_modified = False
-
-                        # Handle any changes in environment time
-                        environment_time = (
-                            are_simulation_instance.env.time_manager.time()
-                        )
-                        cached_environment_time = graphql_cache.get(session_id, {}).get(
-                            "environment_time"
-                        )
-                        if (
-                            cached_environment_time is None
-                            or environment_time - cached_environment_time > 1
-                        ):
-                            graphql_cache.setdefault(session_id, {})[
-                                "environment_time"
-                            ] = environment_time
-                            changed_state.environment_time = environment_time
-
-                        # If any of the states have changed, add the changed_state to the update queue
-                        if any(
-                            [
-                                changed_state.apps_state_json,
-                                changed_state.event_log_json,
-                                changed_state.initial_event_queue_json,
-                                changed_state.env_state,
-                                changed_state.hints,
-                                changed_state.world_logs,
-                                changed_state.environment_time,
-                            ]
-                        ):
-                            update_queue.append(changed_state)
-                        else:
-                            # If no states have changed, wait for 0.25 seconds before checking again
+                # The session is not hibernated while it is streamed
+                session_manager = Subscription.server.session_manager
+                session_manager.add_subscriber(session_id)
+                try:
+                    tracker = EnvironmentStateTracker(
+                        session_id,
+                        are_simulation_instance,
+                        cache_dir=os.path.join(are_simulation_instance.tmpdir, "cache"),
+                        hosting_root=f"{FILES_PATH}/{session_id}/cache",
+                        deltas=deltas,
+                    )
+                    while keep_alive:
+                        try:
+                            update = tracker.get_update()
+                            if update is not None:
+                                loop.call_soon_threadsafe(
+                                    update_queue.put_nowait, update
+                                )
+                            # Wake up at least every second to send time updates
+                            tracker.wait(timeout=1.0)
+                        except Exception as e:
+                            logger.exception(f"An error occurred: {e}")
+                            # Resync so that the client gets the latest state
+                            tracker.resync()
                             time.sleep(0.25)
-                    except Exception as e:
-                        logger.exception(f"An error occurred: {e}")
-                        continue  # Restart the loop on error so client can get the latest state
+                finally:
+                    session_manager.remove_subscriber(session_id)
             except Exception as e:
                 logger.exception(f"An error occurred: {e}")
 
@@ -271,8 +444,9 @@ class Subscription:
             if Subscription.server is None:
                 raise ValueError("Subscription.server is not initialized.")
             keep_alive = True
-            update_queue = deque()
-            # State change detection is done in a separate thread to avoid blocking.
+            loop = asyncio.get_running_loop()
+            update_queue: asyncio.Queue[EnvironmentSubscriptionState] = asyncio.Queue()
+            # Waiting for the changes is done in a separate thread to avoid blocking.
             t = Thread(
                 target=_run_apps_state_json,
                 args=(session_id,),
@@ -284,9 +458,10 @@ class Subscription:
             while not Subscription.server.session_manager.session_exists(session_id):
                 await asyncio.sleep(0.1)
             while Subscription.server.session_manager.session_exists(session_id):
-                while not update_queue:
-                    await asyncio.sleep(0.1)
-                yield update_queue.popleft()
+                try:
+                    yield await asyncio.wait_for(update_queue.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
         except asyncio.CancelledError:
             logger.debug(f"Subscription for session {session_id} was cancelled.")
         except Exception as e:
@@ -488,11 +663,7 @@ def get_world_logs_for_graphql(
     }
 
     # Log types that should be completely ignored in the UI
-    # These are internal logs that don't provide value to end users
-    skip_log_types: set[Type[BaseAgentLog]] = {
-        StopLog,  # Internal signal for stopping execution - not user-relevant
-        ActionLog,  # Low-level action details - too verbose for UI display
-    }
+    skip_log_types = SKIPPED_LOG_TYPES
 
     # Log types that are not yet supported in the UI but may be in the future
     # These generate warnings to help track what functionality is missing
@@ -28,7 +28,10 @@ from are.simulation.config import ARE_SIMULATION_ROOT, ARE_SIMULATION_SANDBOX_PA
 from are.simulation.gui.server.are_simulation_gui import ARESimulationGui
 from are.simulation.gui.server.constants import FILES_PATH, UI_PATH
 from are.simulation.gui.server.graphql.schema import schema
-from are.simulation.gui.server.session_manager import SessionManager
+from are.simulation.gui.server.session_manager import (
+    DEFAULT_HIBERNATE_AFTER,
+    SessionManager,
+)
 from are.simulation.notification_system import BaseNotificationSystem
 
 logger = logging.getLogger(__name__)
@@ -78,6 +81,8 @@ class ARESimulationGuiServer:
         default_ui_view: str | None = None,
         inactivity_limit: int = 3600,
         cleanup_interval: int = 300,
+        memory_budget: int | None = None,
+        hibernate_after: int = DEFAULT_HIBERNATE_AFTER,
         notification_system_builder: Callable[[], BaseNotificationSystem] | None = None,
         dataset_path: str | None = None,
     ):
@@ -121,7 +126,11 @@ class ARESimulationGuiServer:
         async def get_sessions():
             return JSONResponse(
                 status_code=200,
-                content={"sessions": self.session_manager.get_status()},
+                content={
+                    "sessions": self.session_manager.get_status(),
+                    "memory_bytes": self.session_manager.get_memory_usage(),
+                    "memory_budget": self.session_manager.memory_budget,
+                },
             )
 
         self.app.add_api_route("/sessions", get_sessions, methods=["GET"])
@@ -156,7 +165,13 @@ class ARESimulationGuiServer:
         self.lock = Lock()
 
         # Initialize SessionManager.
-        self.session_manager = SessionManager(inactivity_limit, cleanup_interval)
+        self.session_manager = SessionManager(
+            inactivity_limit,
+            cleanup_interval,
+            memory_budget=memory_budget,
+            hibernate_after=hibernate_after,
+            session_factory=self._create_are_simulation,
+        )
         # There is no open implementation for db manager.
         self.db_manager = None
 
@@ -200,20 +215,7 @@ class ARESimulationGuiServer:
             if self.session_manager.session_exists(session_id):
                 return self.session_manager.get_are_simulation_instance(session_id)
 
-            are_simulation_instance = ARESimulationGui(
-                session_id=session_id,
-                scenario_id=self.scenario_id,
-                scenario_args=self.scenario_args,
-                agent_config_builder=self.agent_config_builder,
-                agent_builder=self.agent_builder,
-                default_agent_name=self.agent,
-                default_model_name=self.model,
-                default_provider=self.provider,
-                default_endpoint=self.endpoint,
-                notification_system_builder=self.notification_system_builder,
-                db_manager=self.db_manager,
-                dataset_path=self.dataset_path,
-            )
+            are_simulation_instance = self._create_are_simulation(session_id)
             self.session_manager.add_are_simulation_instance(
                 session_id, are_simulation_instance
             )
@@ -222,6 +224,22 @@ class ARESimulationGuiServer:
             )
             return are_simulation_instance
 
+    def _create_are_simulation(self, session_id: str) -> ARESimulationGui:
+        return ARESimulationGui(
+            session_id=session_id,
+            scenario_id=self.scenario_id,
+            scenario_args=self.scenario_args,
+            agent_config_builder=self.agent_config_builder,
+            agent_builder=self.agent_builder,
+            default_agent_name=self.agent,
+            default_model_name=self.model,
+            default_provider=self.provider,
+            default_endpoint=self.endpoint,
+            notification_system_builder=self.notification_system_builder,
+            db_manager=self.db_manager,
+            dataset_path=self.dataset_path,
+        )
+
     def run(self):
         # Handle the are.simulation run through the GraphQL mutation
         self.session_manager.start()
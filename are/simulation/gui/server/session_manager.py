@@ -6,19 +6,57 @@
 
 
 import logging
+import os
+import tempfile
 import time
 from dataclasses import dataclass, field
-from threading import Thread
+from threading import Event, Lock, Thread
+from typing import Any, Callable
 
 from are.simulation.gui.server.are_simulation_gui import ARESimulationGui
+from are.simulation.types import EnvironmentState
 
 logger = logging.getLogger(__name__)
 
+# Minimum time in seconds without requests nor environment changes before a session can be
+# hibernated
+DEFAULT_HIBERNATE_AFTER = 300
+
 
 @dataclass
 class Session:
-    are_simulation_instance: ARESimulationGui
+    # None while the session is hibernated
+    are_simulation_instance: ARESimulationGui | None
     last_active: float = field(default_factory=time.time)
+    # Estimated memory used by the session, updated by the cleanup routine
+    memory_bytes: int = 0
+    # Time of the last memory estimate, None when the session must be estimated again
+    memory_estimated_at: float | None = None
+    # File of the serialized session while it is hibernated
+    hibernation_path: str | None = None
+    # Number of subscriptions streaming the session, which is not hibernated meanwhile
+    subscribers: int = 0
+    # Last sequence number of the environment change feed seen by the cleanup routine
+    change_sequence: int | None = None
+    last_changed: float = field(default_factory=time.time)
+    lock: Lock = field(default_factory=Lock)
+
+    @property
+    def is_hibernated(self) -> bool:
+        return self.are_simulation_instance is None
+
+    @property
+    def has_live_run(self) -> bool:
+        """Whether an agent run of the session is running or paused."""
+        env = (
+            self.are_simulation_instance.env
+            if self.are_simulation_instance is not None
+            else None
+        )
+        return env is not None and env.state in (
+            EnvironmentState.RUNNING,
+            EnvironmentState.PAUSED,
+        )
 
     def update_last_active(self) -> None:
         """Update the last active time of the session."""
@@ -26,43 +64,114 @@ class Session:
 
 
 class SessionManager:
-    def __init__(self, inactivity_limit: int, cleanup_interval: int):
+    """
+    Sessions of the GUI server, cleaned up after an inactivity limit.
+
+    With a memory budget, the memory used by each session is estimated by the cleanup
+    routine, and when the sessions exceed the budget the least recently active idle sessions
+    are hibernated: they are serialized to disk and dropped from memory, then restored
+    transparently on their next request.
+    """
+
+    def __init__(
+        self,
+        inactivity_limit: int,
+        cleanup_interval: int,
+        memory_budget: int | None = None,
+        hibernate_after: int = DEFAULT_HIBERNATE_AFTER,
+        hibernation_dir: str | None = None,
+        session_factory: Callable[[str], ARESimulationGui] | None = None,
+    ):
+        """
+        :param inactivity_limit: Time in seconds without requests before a session is deleted
+        :param cleanup_interval: Time in seconds between two cleanup checks
+        :param memory_budget: Maximum estimated memory in bytes of the sessions in memory,
+            None to never hibernate sessions
+        :param hibernate_after: Minimum time in seconds without requests nor environment
+            changes before a session can be hibernated
+        :param hibernation_dir: Directory of the hibernated sessions, a temporary directory
+            by default
+        :param session_factory: Creates the instance of a session, in which hibernated
+            sessions are restored
+        """
         self.sessions: dict[str, Session] = {}
         self.inactivity_limit = inactivity_limit
         self.cleanup_interval = cleanup_interval
+        self.memory_budget = memory_budget
+        self.hibernate_after = hibernate_after
+        self.hibernation_dir = hibernation_dir
+        self.session_factory = session_factory
         self.cleanup_timer: Thread | None = None
         self.keep_cleanup = False
+        self._wakeup = Event()
+        self._lock = Lock()
+
+    @property
+    def can_hibernate(self) -> bool:
+        return self.memory_budget is not None and self.session_factory is not None
 
     def get_are_simulation_instance(self, session_id: str) -> ARESimulationGui:
-        """Retrieve a ARESimulationGui instance by session ID."""
+        """Retrieve a ARESimulationGui instance by session ID, restoring it if it is hibernated."""
         session = self.sessions.get(session_id)
         if session is None:
             raise ValueError(f"Session {session_id} does not exist.")
 
         session.update_last_active()
-        return session.are_simulation_instance
+        # Wait for the session to be hibernated if it is, to restore it
+        with session.lock:
+            if session.are_simulation_instance is None:
+                self._restore(session_id, session)
+            assert session.are_simulation_instance is not None
+            return session.are_simulation_instance
 
     def add_are_simulation_instance(
         self, session_id: str, are_simulation_instance: ARESimulationGui
     ) -> None:
         """Add a ARESimulationGui instance to the session manager."""
-        self.sessions[session_id] = Session(
-            are_simulation_instance=are_simulation_instance
-        )
+        with self._lock:
+            self.sessions[session_id] = Session(
+                are_simulation_instance=are_simulation_instance
+            )
+        if self.can_hibernate:
+            # Account for the new session without waiting for the next check
+            self._wakeup.set()
 
     def session_exists(self, session_id: str) -> bool:
-        """Check if a session exists."""
+        """Check if a session exists, in memory or hibernated."""
         return session_id in self.sessions
 
+    def add_subscriber(self, session_id: str) -> None:
+        """Register a subscription streaming a session, which is not hibernated meanwhile."""
+        session = self.sessions.get(session_id)
+        if session is not None:
+            with session.lock:
+                session.subscribers += 1
+
+    def remove_subscriber(self, session_id: str) -> None:
+        """Unregister a subscription registered with add_subscriber."""
+        session = self.sessions.get(session_id)
+        if session is not None:
+            with session.lock:
+                session.subscribers = max(session.subscribers - 1, 0)
+                session.update_last_active()
+
     def get_total_sessions(self) -> int:
         """Return the total number of active sessions."""
         return len(self.sessions)
 
-    def get_status(self) -> dict[str, float]:
+    def get_memory_usage(self) -> int:
+        """Return the estimated memory in bytes used by the sessions in memory."""
+        return sum(session.memory_bytes for session in list(self.sessions.values()))
+
+    def get_status(self) -> dict[str, dict[str, Any]]:
         """Return the status of all active sessions."""
         return {
-            session_id: session.last_active
-            for session_id, session in self.sessions.items()
+            session_id: {
+                "last_active": session.last_active,
+                "memory_bytes": session.memory_bytes,
+                "hibernated": session.is_hibernated,
+            }
+            for session_id, session in list(self.sessions.items())
         }
 
     def start(self) -> None:
@@ -71,48 +180,195 @@ class SessionManager:
 
     def stop(self) -> None:
         """Stop the session manager and all active sessions."""
-        for session in self.sessions.values():
-            session.are_simulation_instance.stop()
+        for session in list(self.sessions.values()):
+            if session.are_simulation_instance is not None:
+                session.are_simulation_instance.stop()
+            self._remove_hibernation_file(session)
         self._stop_cleanup_timer()
 
     def _start_cleanup_timer(self):
         self.cleanup_timer = Thread(target=self._cleanup_routine, name="SessionManager")
         self.keep_cleanup = True
+        self._wakeup.clear()
         self.cleanup_timer.start()
 
     def _stop_cleanup_timer(self):
         self.keep_cleanup = False
+        self._wakeup.set()
         if self.cleanup_timer is not None and self.cleanup_timer.is_alive():
             self.cleanup_timer.join()
 
     def _cleanup_routine(self) -> None:
-        while (
-            self.keep_cleanup
-            and self.cleanup_timer is not None
-            and self.cleanup_timer.is_alive()
-        ):
+        while self.keep_cleanup:
             logger.info("Checking for inactive are_simulation instances.")
             self._cleanup_inactive_are_simulation()
-            cleanup_wait_started = time.time()
-            while (
-                self.keep_cleanup
-                and self.cleanup_timer is not None
-                and self.cleanup_timer.is_alive()
-                and time.time() - cleanup_wait_started < self.cleanup_interval
-            ):
-                time.sleep(1)
+            if self.can_hibernate:
+                try:
+                    self._enforce_memory_budget()
+                except Exception as e:
+                    logger.exception(f"Failed to enforce the memory budget: {e}")
+            # Wake up early when the manager is stopped or a session is added
+            self._wakeup.wait(self.cleanup_interval)
+            self._wakeup.clear()
 
     def _cleanup_inactive_are_simulation(self):
         current_time = time.time()
         inactive_sessions = [
             session_id
-            for session_id, session in self.sessions.items()
+            for session_id, session in list(self.sessions.items())
             if current_time - session.last_active > self.inactivity_limit
         ]
         for session_id in inactive_sessions:
-            if session_id in self.sessions:
-                self.sessions[session_id].are_simulation_instance.stop()
-                del self.sessions[session_id]
+            with self._lock:
+                session = self.sessions.pop(session_id, None)
+            if session is not None:
+                if session.are_simulation_instance is not None:
+                    session.are_simulation_instance.stop()
+                self._remove_hibernation_file(session)
                 logger.info(
                     f"Cleaned up inactive ARESimulationGui instance for session: {session_id}"
                 )
+
+    def _update_memory_usage(self) -> None:
+        current_time = time.time()
+        for session_id, session in list(self.sessions.items()):
+            are_simulation_instance = session.are_simulation_instance
+            if are_simulation_instance is None:
+                continue
+            # Changes of the environment, e.g. by a running agent, count as activity
+            env = are_simulation_instance.env
+            sequence = env.changes.sequence if env is not None else None
+            if sequence != session.change_sequence:
+                if session.change_sequence is not None:
+                    session.last_changed = current_time
+                session.change_sequence = sequence
+            # Only sessions which changed or got requests since their last estimate are
+            # estimated again, idle sessions keep their estimate
+            if (
+                session.memory_estimated_at is not None
+                and max(session.last_active, session.last_changed)
+                < session.memory_estimated_at
+            ):
+                continue
+            try:
+                session.memory_bytes = are_simulation_instance.get_memory_usage()
+                session.memory_estimated_at = current_time
+            except Exception as e:
+                logger.warning(
+                    f"Failed to estimate the memory of session {session_id}: {e}"
+                )
+
+    def _enforce_memory_budget(self) -> None:
+        """Hibernate the least recently active idle sessions until the sessions fit in the budget."""
+        assert self.memory_budget is not None
+        self._update_memory_usage()
+        memory_usage = self.get_memory_usage()
+        if memory_usage <= self.memory_budget:
+            return
+
+        current_time = time.time()
+        candidates = sorted(
+            (
+                (max(session.last_active, session.last_changed), session_id)
+                for session_id, session in list(self.sessions.items())
+                if not session.is_hibernated
+                and session.subscribers == 0
+                and not session.has_live_run
+            ),
+        )
+        for last_activity, session_id in candidates:
+            if memory_usage <= self.memory_budget:
+                break
+            if current_time - last_activity < self.hibernate_after:
+                # The following sessions are even more recently active
+                break
+            session = self.sessions.get(session_id)
+            if session is None:
+                continue
+            memory_bytes = session.memory_bytes
+            if self.hibernate(session_id, min_idle_time=self.hibernate_after):
+                memory_usage -= memory_bytes
+        if memory_usage > self.memory_budget:
+            logger.warning(
+                f"Sessions use {memory_usage} bytes, over the budget of {self.memory_budget} bytes"
+            )
+
+    def hibernate(self, session_id: str, min_idle_time: float = 0) -> bool:
+        """
+        Serialize a session to disk and drop it from memory, until its next request.
+
+        :param session_id: The session ID
+        :param min_idle_time: Minimum time in seconds since the last activity of the session
+        :returns: True if the session was hibernated, False otherwise
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            return False
+        with session.lock:
+            are_simulation_instance = session.are_simulation_instance
+            if are_simulation_instance is None or session.subscribers > 0:
+                return False
+            # A running or paused agent could only come back as a replay of its trace
+            if session.has_live_run:
+                return False
+            last_activity = max(session.last_active, session.last_changed)
+            if time.time() - last_activity < min_idle_time:
+                return False
+            hibernated_session = are_simulation_instance.hibernate()
+            if hibernated_session is None:
+                logger.warning(f"Failed to serialize session {session_id}")
+                return False
+            if self.hibernation_dir is None:
+                self.hibernation_dir = tempfile.mkdtemp(
+                    prefix="are_simulation_hibernated_"
+                )
+            os.makedirs(self.hibernation_dir, exist_ok=True)
+            path = os.path.join(self.hibernation_dir, f"{session_id}.json")
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(hibernated_session)
+            os.replace(tmp_path, path)
+
+            are_simulation_instance.stop()
+            are_simulation_instance.remove_tmpdir()
+            session.are_simulation_instance = None
+            session.hibernation_path = path
+            session.memory_bytes = 0
+            session.memory_estimated_at = None
+            session.change_sequence = None
+        logger.info(f"Hibernated session {session_id} to {path}")
+        return True
+
+    def _restore(self, session_id: str, session: Session) -> None:
+        """
+        Restore a hibernated session. Its hibernation file is kept until it is restored, so
+        that a failed restore can be retried by the next request.
+
+        :raises ValueError: If the session cannot be restored
+        """
+        if self.session_factory is None:
+            raise ValueError(f"Session {session_id} cannot be restored.")
+        path = session.hibernation_path
+        if path is None or not os.path.exists(path):
+            raise ValueError(f"Hibernated session {session_id} was not found.")
+        with open(path) as f:
+            hibernated_session = f.read()
+        are_simulation_instance = self.session_factory(session_id)
+        if not are_simulation_instance.restore(hibernated_session):
+            are_simulation_instance.stop()
+            are_simulation_instance.remove_tmpdir()
+            raise ValueError(
+                f"Failed to restore hibernated session {session_id} from {path}."
+            )
+        self._remove_hibernation_file(session)
+        session.are_simulation_instance = are_simulation_instance
+        session.last_changed = time.time()
+        logger.info(f"Restored hibernated session {session_id}")
+
+    def _remove_hibernation_file(self, session: Session) -> None:
+        if session.hibernation_path is not None:
+            try:
+                os.remove(session.hibernation_path)
+            except FileNotFoundError:
+                pass
+            session.hibernation_path = None
@@ -14,6 +14,7 @@ import signal
 import sys
 import tempfile
 import time
+from typing import Callable
 
 from tqdm import tqdm
 
@@ -38,6 +39,11 @@ from are.simulation.utils.streaming_utils import stream_pool
 
 logger = logging.getLogger(__name__)
 
+# Called with the result of each scenario as soon as it finishes, e.g. to stream it to disk
+ScenarioResultCallback = Callable[
+    [str, int | None, ScenarioValidationResult, MultiScenarioRunnerConfig], None
+]
+
 
 class ScenarioTimeoutError(Exception):
     pass
@@ -274,11 +280,13 @@ class MultiScenarioRunner:
         self,
         config: MultiScenarioRunnerConfig,
         scenarios: list[Scenario],
+        on_result: ScenarioResultCallback | None = None,
     ) -> MultiScenarioValidationResult:
         assert len(scenarios) > 0, "No scenarios provided"
         return self.run_with_events(
             config,
             itertools.zip_longest(scenarios, [], fillvalue=None),  # type: ignore
+            on_result=on_result,
         )
 
     def run_with_events(
@@ -288,6 +296,7 @@ class MultiScenarioRunner:
             tuple[Scenario, list[CompletedEvent] | None] | str
         ],
         progress_description: str | None = None,
+        on_result: ScenarioResultCallback | None = None,
     ):
         multi_scenario_validation_result = MultiScenarioValidationResult(
             run_config=config
@@ -408,6 +417,8 @@ class MultiScenarioRunner:
                     multi_scenario_validation_result.add_result(
                         result, scenario_id, run_number
                     )
+                    if on_result is not None:
+                        on_result(scenario_id, run_number, result, config)
 
                     # Update progress bar with success percentage
                     success_rate = multi_scenario_validation_result.success_rate()
@@ -224,6 +224,12 @@ class BaseNotificationSystem:
             next_message.timestamp.timestamp(), tz=timezone.utc
         ).timestamp()
 
+    def get_next_reminder_time(self) -> float | None:
+        """Get the due time of the next reminder to notify, which may be in the past."""
+        if self.reminder_app is None:
+            return None
+        return self.reminder_app.next_due_time()
+
     def handle_time_based_notifications(self) -> None:
         if self.reminder_app:
             due_reminders = self.reminder_app.get_due_reminders()
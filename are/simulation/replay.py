@@ -9,18 +9,49 @@ import logging
 
 from are.simulation.agents.agent_log import ActionLog, BaseAgentLog, StepLog
 from are.simulation.apps import AgentUserInterface
+from are.simulation.checkpoints import CheckpointStore
 from are.simulation.environment import Environment
 from are.simulation.utils import truncate_string
 
 logger = logging.getLogger(__name__)
 
 
-def replay_logs(world_logs: list[BaseAgentLog], env: Environment) -> None:
+def replay_logs(
+    world_logs: list[BaseAgentLog],
+    env: Environment,
+    checkpoints: CheckpointStore | None = None,
+) -> None:
+    """
+    Replay the actions of world logs in an environment running their scenario from its
+    initial state.
+
+    :param world_logs: The world logs to replay
+    :param env: The environment
+    :param checkpoints: Checkpoints of the run the logs come from, the latest checkpoint taken
+        after a prefix of the logs is restored and only the following logs are replayed.
+        Unlike a full replay, the restored apps keep the changes made without events
+    """
     if env is None:
         logger.error("Cannot replay logs, Environment is None.")
         return
 
-    logger.info(f"Replaying {len(world_logs)} agent logs.")
+    logs_to_replay = world_logs
+    replayed_event_ids: set[str] = set()
+    if checkpoints is not None:
+        checkpoint = checkpoints.find(world_logs)
+        if checkpoint is None:
+            # The checkpoints belong to other runs
+            checkpoints.clear()
+        else:
+            count = checkpoint.world_log_count
+            logger.info(f"Restoring the checkpoint taken after {count} agent logs.")
+            env.restore_checkpoint(checkpoint)
+            env.time_manager.reset(start_time=world_logs[count - 1].timestamp)
+            checkpoints.truncate(count)
+            logs_to_replay = world_logs[count:]
+            replayed_event_ids = checkpoint.event_ids
+
+    logger.info(f"Replaying {len(logs_to_replay)} agent logs.")
 
     aui = env.apps.get(AgentUserInterface.__name__, None)
 
@@ -32,7 +63,7 @@ def replay_logs(world_logs: list[BaseAgentLog], env: Environment) -> None:
     env.set_is_replaying(True)
     aui.set_wait_for_user_response(False)
 
-    for log in world_logs:
+    for log in logs_to_replay:
         env.time_manager.reset(start_time=log.timestamp)
 
         if not isinstance(log, ActionLog):
@@ -41,6 +72,10 @@ def replay_logs(world_logs: list[BaseAgentLog], env: Environment) -> None:
             )
             continue
 
+        if log.id in replayed_event_ids:
+            # The action completed before the checkpoint but was logged after it
+            continue
+
         action_name = log.action_name
         action_args = log.input
         app_name = log.app_name
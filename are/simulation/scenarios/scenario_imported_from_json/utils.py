@@ -7,7 +7,7 @@
 
 import logging
 import re
-from typing import cast
+from typing import Any, cast
 
 from are.simulation.apps import SystemApp
 from are.simulation.data_handler.exporter import JsonScenarioExporter
@@ -15,6 +15,7 @@ from are.simulation.data_handler.importer import JsonScenarioImporter
 from are.simulation.data_handler.models import ExportedApp
 from are.simulation.environment import Environment, EnvironmentConfig
 from are.simulation.scenarios.config import ScenarioRunnerConfig
+from are.simulation.scenarios.utils.oracle_cache import ORACLE_RUN_CACHE
 from are.simulation.scenarios.utils.scenario_expander import EnvEventsConfig
 from are.simulation.scenarios.utils.turn_conditions import (
     is_conditional_event,
@@ -40,18 +41,17 @@ ORACLE_EVENT_CLASS_NAME = "OracleEvent"
 logger: logging.Logger = logging.getLogger(__name__)
 
 
-def preprocess_scenario(
+def initialize_scenario(
     scenario: BenchmarkScenarioImportedFromJson,
-    judge_config: BaseJudgeConfig | None = None,
     max_scenario_duration: int | None = None,
-    offline_validation: bool = False,
     tool_augmentation_config: ToolAugmentationConfig | None = None,
     env_events_config: EnvEventsConfig | None = None,
 ):
     """
-    Preprocess the scenario by running it in oracle mode and attaching the oracle run events to the scenario.
-    These oracle events will  be used to validate the scenario.
-    It then initializes the turns of the scenario by triggering the judge and creates a validation function.
+    Initialize the scenario before its preprocessing: add the SystemApp, apply the duration and
+    augmentation configs, and populate the apps.
+    This part does not depend on the run, so copies of the initialized scenario can be
+    preprocessed and run independently, see preprocess_scenario.
     """
     # If SystemApp not in apps, add it
     if scenario.serialized_apps and "SystemApp" not in [
@@ -67,12 +67,12 @@ def preprocess_scenario(
         scenario.apps.append(SystemApp())
 
     if max_scenario_duration is not None:
-        if scenario.duration is not None:
+        if scenario.duration is None:
+            logger.info(f"Scenario duration set to {max_scenario_duration} seconds")
+        elif scenario.duration != max_scenario_duration:
             logger.warning(
                 f"Scenario duration overridden to {max_scenario_duration} instead of {scenario.duration} seconds"
             )
-        else:
-            logger.info(f"Scenario duration set to {max_scenario_duration} seconds")
         scenario.duration = max_scenario_duration
 
     scenario.tool_augmentation_config = tool_augmentation_config
@@ -80,6 +80,27 @@ def preprocess_scenario(
 
     # Initialize the scenario
     scenario.initialize()
+
+
+def preprocess_scenario(
+    scenario: BenchmarkScenarioImportedFromJson,
+    judge_config: BaseJudgeConfig | None = None,
+    max_scenario_duration: int | None = None,
+    offline_validation: bool = False,
+    tool_augmentation_config: ToolAugmentationConfig | None = None,
+    env_events_config: EnvEventsConfig | None = None,
+):
+    """
+    Preprocess the scenario by running it in oracle mode and attaching the oracle run events to the scenario.
+    These oracle events will  be used to validate the scenario.
+    It then initializes the turns of the scenario by triggering the judge and creates a validation function.
+    """
+    initialize_scenario(
+        scenario,
+        max_scenario_duration=max_scenario_duration,
+        tool_augmentation_config=tool_augmentation_config,
+        env_events_config=env_events_config,
+    )
     # Set the judge
     judge = None
     has_oracle_events = any(isinstance(e, OracleEvent) for e in scenario.events)
@@ -88,24 +109,33 @@ def preprocess_scenario(
             f"{scenario.scenario_id}: scenario has no oracle events, judge is not set"
         )
     if judge_config and has_oracle_events:
-        # Run the scenario in oracle mode to get the oracle completed events
-        env = Environment(
-            EnvironmentConfig(
-                oracle_mode=True, queue_based_loop=True, start_time=scenario.start_time
+
+        def run_oracle() -> list[CompletedEvent]:
+            # Run the scenario in oracle mode to get the oracle completed events
+            env = Environment(
+                EnvironmentConfig(
+                    oracle_mode=True,
+                    queue_based_loop=True,
+                    start_time=scenario.start_time,
+                )
             )
+            env.run(scenario)
+            env.stop()
+            oracle_run_event_log = env.event_log.list_view()
+            # Check clean run
+            if any(e.failed() for e in oracle_run_event_log):
+                raise Exception(
+                    f"Oracle run failed: {[e.metadata.exception for e in oracle_run_event_log if e.failed()]}"
+                )
+            # Soft reset the scenario
+            scenario.soft_reset()
+            return env.event_log.list_view()
+
+        # Attach the oracle run events to the scenario for the judge,
+        # the oracle only runs once for all the copies of the same scenario
+        scenario.oracle_run_event_log = ORACLE_RUN_CACHE.get_or_run(
+            scenario, run_oracle, namespace="preprocess_scenario"
         )
-        env.run(scenario)
-        env.stop()
-        oracle_run_event_log = env.event_log.list_view()
-        # Check clean run
-        if any(e.failed() for e in oracle_run_event_log):
-            raise Exception(
-                f"Oracle run failed: {[e.metadata.exception for e in oracle_run_event_log if e.failed()]}"
-            )
-        # Soft reset the scenario
-        scenario.soft_reset()
-        # Attach the oracle run events to the scenario for the judge
-        scenario.oracle_run_event_log = env.event_log.list_view()
         # Instantiate the judge
         judge_factory = JudgeFactory()
         judge = judge_factory(judge_config)
@@ -374,11 +404,44 @@ def get_scenario_duration(
     return max_scenario_duration
 
 
+def initialize_scenario_from_config(
+    scenario: BenchmarkScenarioImportedFromJson,
+    config: ScenarioRunnerConfig,
+):
+    """
+    Initialize the scenario as preprocess_scenario_from_config does before creating the judge.
+
+    :param scenario: The scenario
+    :param config: The runner config of the runs of the scenario
+    """
+    if not config.oracle:
+        initialize_scenario(
+            scenario,
+            max_scenario_duration=get_scenario_duration(
+                scenario,
+                config.max_time_scenario_duration,
+                config.max_scenario_duration,
+            ),
+            tool_augmentation_config=config.tool_augmentation_config,
+            env_events_config=config.env_events_config,
+        )
+    else:
+        scenario.initialize()
+
+
 def preprocess_scenario_from_config(
     scenario: BenchmarkScenarioImportedFromJson,
     config: ScenarioRunnerConfig,
+    judge_options: dict[str, Any] | None = None,
 ):
-    # Preprocess the scenario
+    """
+    Preprocess the scenario as the runner does before running it.
+
+    :param scenario: The scenario
+    :param config: The runner config of the runs of the scenario
+    :param judge_options: Optional GraphPerEventJudgeConfig fields (e.g. tolerances)
+        overriding the defaults of the judge built from `config.judge_engine_config`
+    """
     if not config.oracle:
         # Create judge configuration using provided parameters
         # If judge_engine_config is None, skip judge creation entirely
@@ -390,7 +453,9 @@ def preprocess_scenario_from_config(
             )
 
             judge_engine = create_judge_engine(config.judge_engine_config)
-            judge_config = GraphPerEventJudgeConfig(engine=judge_engine)
+            judge_config = GraphPerEventJudgeConfig(
+                engine=judge_engine, **(judge_options or {})
+            )
 
         preprocess_scenario(
             scenario=scenario,
@@ -431,4 +496,4 @@ def load_and_preprocess_scenario_str(
         scenario=scenario,
         config=config,
     )
-    return scenario, completed_events
\ No newline at end of file
+    return scenario, completed_events
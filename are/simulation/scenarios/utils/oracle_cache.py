@@ -0,0 +1,265 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable
+
+import xxhash
+
+from are import __version__
+from are.simulation.scenarios.scenario import Scenario
+from are.simulation.types import Action, CompletedEvent, Event, OracleEvent
+from are.simulation.utils.lru_store import LRUDiskStore
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of oracle runs kept in memory
+DEFAULT_ORACLE_CACHE_SIZE = 128
+
+
+def _describe_event(event: Any) -> dict[str, Any] | None:
+    """Describe an event with plain data, or return None if it runs arbitrary code."""
+    description: dict[str, Any] = {
+        "class_name": type(event).__name__,
+        "event_id": event.event_id,
+        "event_type": str(event.event_type),
+        "event_time": event.event_time,
+        "event_relative_time": event.event_relative_time,
+        "dependencies": [dependency.event_id for dependency in event.dependencies],
+    }
+    if type(event) is Event:
+        description["action"] = [
+            event.action.class_name,
+            event.action.function_name,
+            {k: v for k, v in event.action.args.items() if k != "self"},
+        ]
+    elif type(event) is OracleEvent and event.action_desc is not None:
+        description["action"] = asdict(event.action_desc)
+        description["event_time_comparator"] = str(event.event_time_comparator)
+    else:
+        # Condition checks, validations and oracle events without description
+        # are defined by code which cannot be fingerprinted
+        return None
+    return description
+
+
+def get_scenario_fingerprint(scenario: Scenario, namespace: str = "") -> str | None:
+    """
+    Compute a fingerprint of everything that determines the oracle run of a scenario.
+
+    The scenario must be initialized: the fingerprint covers the serialized initial state of
+    the apps, the events, the seed, the timing and the augmentation configs of the scenario.
+
+    :param scenario: The initialized scenario
+    :param namespace: Distinguishes oracle runs of the same scenario with different environment configs
+    :returns: The fingerprint, or None if the scenario cannot be fingerprinted
+    """
+    initial_apps = getattr(scenario, "_initial_apps", None)
+    if not isinstance(initial_apps, dict) or not isinstance(scenario.events, list):
+        return None
+    events = []
+    for event in scenario.events:
+        description = _describe_event(event)
+        if description is None:
+            return None
+        events.append(description)
+    tool_augmentation_config = getattr(scenario, "tool_augmentation_config", None)
+    env_events_config = getattr(scenario, "env_events_config", None)
+    try:
+        scenario_json = json.dumps(
+            {
+                "version": __version__,
+                "namespace": namespace,
+                "class_name": type(scenario).__name__,
+                "scenario_id": scenario.scenario_id,
+                "seed": scenario.seed,
+                "start_time": scenario.start_time,
+                "duration": scenario.duration,
+                "time_increment_in_seconds": scenario.time_increment_in_seconds,
+                "tool_augmentation_config": (
+                    asdict(tool_augmentation_config)
+                    if tool_augmentation_config is not None
+                    else None
+                ),
+                "env_events_config": (
+                    asdict(env_events_config) if env_events_config is not None else None
+                ),
+                "augmentation_data": getattr(scenario, "augmentation_data", None),
+                "apps": initial_apps,
+                "events": events,
+            },
+            sort_keys=True,
+            default=str,
+        )
+    except Exception as e:
+        logger.debug(f"Failed to fingerprint scenario {scenario.scenario_id}: {e}")
+        return None
+    return xxhash.xxh64(scenario_json.encode()).hexdigest()
+
+
+class OracleRunCache:
+    """
+    Cache of oracle run event logs keyed by scenario fingerprint.
+
+    The event logs are kept in an in-memory LRU, and optionally stored on disk as JSON so
+    that they are shared between processes. They are stored as dicts and rebuilt against the
+    apps of the scenario requesting them, so that scenarios never share event objects.
+    Concurrent requests for the same fingerprint wait for the first one to run the oracle.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_ORACLE_CACHE_SIZE,
+        cache_dir: str | Path | None = None,
+    ):
+        self._store: LRUDiskStore[list[dict[str, Any]]] = LRUDiskStore(
+            max_weight=max_size,
+            cache_dir=cache_dir,
+            suffix=".json",
+            encode=self._encode,
+            decode=self._decode,
+            on_evict=self._forget_key_lock,
+            description="oracle run",
+        )
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    @property
+    def max_size(self) -> int:
+        return self._store.max_weight
+
+    @property
+    def cache_dir(self) -> Path | None:
+        return self._store.cache_dir
+
+    def clear(self) -> None:
+        self._store.clear()
+        with self._lock:
+            self._key_locks.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _forget_key_lock(self, key: str) -> None:
+        with self._lock:
+            self._key_locks.pop(key, None)
+
+    @staticmethod
+    def _encode(entry: list[dict[str, Any]]) -> str | None:
+        try:
+            entry_json = json.dumps(entry)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Oracle run is not stored on disk: {e}")
+            return None
+        if json.loads(entry_json) != entry:
+            # e.g. tuple args, which would be read back as lists
+            logger.debug("Oracle run is not stored on disk: not JSON round-trippable")
+            return None
+        return entry_json
+
+    @staticmethod
+    def _decode(entry_json: str) -> list[dict[str, Any]] | None:
+        entry = json.loads(entry_json)
+        if not isinstance(entry, list) or not all(isinstance(d, dict) for d in entry):
+            return None
+        return entry
+
+    @staticmethod
+    def _serialize(events: list[CompletedEvent]) -> list[dict[str, Any]] | None:
+        entry = []
+        for event in events:
+            d = event.to_dict()
+            if "class_name" not in d["action"]:
+                # Events without a rebuildable action, e.g. validation events
+                return None
+            # Successors are not used by the judge and would duplicate the whole graph
+            d["successors"] = []
+            # The bound app is dropped from the args by to_dict, remember to restore it
+            d["action"]["has_self_arg"] = "self" in getattr(event.action, "args", {})
+            entry.append(d)
+        return entry
+
+    @staticmethod
+    def _rebuild(
+        entry: list[dict[str, Any]], scenario: Scenario
+    ) -> list[CompletedEvent]:
+        apps_by_name = {app.name: app for app in scenario.apps or []}
+        events = []
+        for d in entry:
+            action = dict(d["action"])
+            # Each scenario gets its own args since the judge resolves placeholders in place
+            action["args"] = dict(action.get("args", {}))
+            action["resolved_args"] = dict(action.get("resolved_args", {}))
+            app_name = action.get("app_name")
+            app = apps_by_name.get(app_name) if app_name is not None else None
+            event = CompletedEvent.from_dict(
+                {**d, "action": action},
+                app_instances={action["class_name"]: app} if app is not None else {},
+            )
+            if action.get("has_self_arg") and isinstance(event.action, Action):
+                event.action.args = {"self": event.action.app, **event.action.args}
+            events.append(event)
+        return events
+
+    def get_or_run(
+        self,
+        scenario: Scenario,
+        run_oracle: Callable[[], list[CompletedEvent]],
+        namespace: str = "",
+    ) -> list[CompletedEvent]:
+        """
+        Get the oracle run event log of a scenario, running the oracle only on a cache miss.
+
+        :param scenario: The initialized scenario
+        :param run_oracle: Runs the scenario in oracle mode and returns its event log
+        :param namespace: Distinguishes oracle runs of the same scenario with different environment configs
+        :returns: The oracle run event log, bound to the apps of `scenario`
+        """
+        key = get_scenario_fingerprint(scenario, namespace)
+        if key is None:
+            return run_oracle()
+        with self._key_lock(key):
+            entry = self._store.get(key)
+            if entry is not None:
+                try:
+                    events = self._rebuild(entry, scenario)
+                    self.hits += 1
+                    logger.debug(
+                        f"Reusing cached oracle run of scenario {scenario.scenario_id}"
+                    )
+                    return events
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to rebuild cached oracle run of scenario {scenario.scenario_id}: {e}"
+                    )
+            self.misses += 1
+            events = run_oracle()
+            entry = self._serialize(events)
+            if entry is not None:
+                self._store.put(key, entry)
+            return events
+
+
+def _get_oracle_cache_dir() -> str | None:
+    """Get the on-disk oracle run cache directory, disabled unless the variable is set."""
+    return os.environ.get("ARE_SIMULATION_ORACLE_CACHE_DIR") or None
+
+
+ORACLE_RUN_CACHE = OracleRunCache(cache_dir=_get_oracle_cache_dir())
@@ -8,12 +8,12 @@
 import json
 import os
 import random
+import threading
 import uuid
-from dataclasses import replace
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta, timezone
-from typing import Any
-
-from jinja2 import Environment, Template, meta
+from typing import TYPE_CHECKING, Any
 
 from are.simulation.apps.agent_user_interface import AgentUserInterface
 from are.simulation.apps.calendar import CalendarApp
@@ -22,18 +22,94 @@ from are.simulation.apps.messaging import Message, MessagingApp
 from are.simulation.scenarios.utils.personalization.types import UserContext
 from are.simulation.types import Event
 
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
 random.seed(33)
 
+# Maximum number of compiled templates kept by jinja_format
+DEFAULT_TEMPLATE_CACHE_SIZE = 512
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    template: "Template"
+    # Variables of the template which must be passed to render it
+    variables: frozenset[str]
+
+
+class TemplateCache:
+    """
+    Process-wide LRU of compiled Jinja templates keyed by their text, so that templates
+    rendered repeatedly, e.g. the prompts of the judges, are parsed and compiled once.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_TEMPLATE_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, CompiledTemplate] = OrderedDict()
+        self._environment: "Environment | None" = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get(self, template: str) -> CompiledTemplate:
+        """
+        Get the compiled version of a template, compiling it on first use.
+
+        :param template: The text of the template
+        :returns: The compiled template and its variables
+        """
+        with self._lock:
+            compiled = self._entries.get(template)
+            if compiled is not None:
+                self._entries.move_to_end(template)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+        # Compile outside of the lock, concurrent misses compile the same template
+        compiled = self._compile(template)
+        with self._lock:
+            self._entries[template] = compiled
+            self._entries.move_to_end(template)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def _compile(self, template: str) -> CompiledTemplate:
+        from jinja2 import Environment, meta
+
+        if self._environment is None:
+            # Same options as jinja2.Template
+            self._environment = Environment(keep_trailing_newline=True)
+        ast = self._environment.parse(template)
+        return CompiledTemplate(
+            template=self._environment.from_string(ast),
+            variables=frozenset(meta.find_undeclared_variables(ast)),
+        )
+
+
+TEMPLATE_CACHE = TemplateCache()
+
 
 def jinja_format(template: str, skip_validation: bool = True, **kwargs: Any) -> str:
+    compiled = TEMPLATE_CACHE.get(template)
     if not skip_validation:
-        variables = meta.find_undeclared_variables(Environment().parse(template))
+        variables = compiled.variables
         if not all(k in kwargs for k in variables):
             raise ValueError(
-                f"Expected: {variables}, got: {sorted(kwargs)}.\nTemplate:\n{template}"
+                f"Expected: {set(variables)}, got: {sorted(kwargs)}.\nTemplate:\n{template}"
             )
         kwargs = {k: kwargs[k] for k in variables}
-    return Template(template, keep_trailing_newline=True).render(**kwargs)
+    return compiled.template.render(**kwargs)
 
 
 def _parse_timestamp(date_string, date_format="%Y-%m-%d %H:%M") -> datetime:
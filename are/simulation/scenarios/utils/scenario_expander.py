@@ -10,8 +10,6 @@ import random
 from dataclasses import dataclass, field
 from typing import cast
 
-import numpy as np
-
 from are.simulation.apps.agent_user_interface import AgentUserInterface
 from are.simulation.apps.apartment_listing import ApartmentListingApp
 from are.simulation.apps.email_client import EmailClientApp
@@ -141,6 +139,8 @@ class EnvEventsExpander:
         Expands the scenario in-place with ENV events.
         :param scenario: scenario to expand
         """
+        import numpy as np
+
         augmentation_data = scenario.augmentation_data or {}
         apps_augmentation_data = (
             augmentation_data["apps"] if "apps" in augmentation_data else []
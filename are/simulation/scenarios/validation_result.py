@@ -9,12 +9,10 @@ import datetime
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, TypedDict
 
-import polars as pl
-
 from are.simulation.scenarios.config import MultiScenarioRunnerConfig
 
 if TYPE_CHECKING:
-    pass
+    import polars as pl
 
 
 class ScenarioMetadata(TypedDict):
@@ -74,7 +72,7 @@ class MultiScenarioValidationResult:
     exception_count: int = 0
     no_validation_count: int = 0
 
-    def to_polars(self, extra_columns: dict[str, str] | None = None) -> pl.DataFrame:
+    def to_polars(self, extra_columns: dict[str, str] | None = None) -> "pl.DataFrame":
         """Convert this MultiScenarioValidationResult to a polars DataFrame.
 
         :param extra_columns: Additional columns to add to each row (e.g., phase_name, config, etc.)
@@ -82,6 +80,7 @@ class MultiScenarioValidationResult:
         :returns: Polars DataFrame with one row per scenario run
         :rtype: pl.DataFrame
         """
+        import polars as pl
 
         rows = []
 
@@ -108,3 +108,53 @@ def test_deterministic_duration():
     assert duration2_x == duration2_y, (
         f"duration2_x: {duration2_x}, duration2_y: {duration2_y}"
     )
+
+
+class ScanCabApp(CabApp):
+    """CabApp looking up previous rides by scanning the quotation history."""
+
+    def calculate_price(
+        self, start_location, end_location, distance_km, service_type, time_stamp
+    ):
+        for ride in self.quotation_history:
+            if (
+                ride.start_location == start_location
+                and ride.end_location == end_location
+                and ride.service_type == service_type
+            ):
+                if ride.price:
+                    variance = 0.01 * (time_stamp - ride.time_stamp) / 3600
+                    variance = min(max(variance, 0.5), 1.5)
+                    return ride.price * (1 + self.rng.uniform(-variance, variance))
+                break
+        return distance_km * self.d_service_config[service_type]["price_per_km"]
+
+    def get_distance_from_history(self, start_location, end_location):
+        for ride in self.quotation_history:
+            if (
+                ride.start_location == start_location
+                and ride.end_location == end_location
+            ):
+                return ride.distance_km
+        return None
+
+
+def test_indexed_quotations_match_scan():
+    def run(app: CabApp) -> list:
+        rides = []
+        locations = ["A", "B", "C", "D"]
+        for i in range(40):
+            start, end = locations[i % 4], locations[(i * 3 + 1) % 4]
+            ride_time = f"2022-01-01 {10 + i % 12:02d}:00:00"
+            rides.extend(app.list_rides(start, end, ride_time=ride_time))
+            if i % 9 == 0:
+                app.add_new_ride("Van", end, start, price=0.0, time_stamp=i * 3600.0)
+            if i == 20:
+                app.delete_future_data(1641038400.0)
+        state = app.get_state()
+        app.reset()
+        app.load_state(state)
+        rides.append(app.get_quotation("B", "C", "Premium", "2022-01-02 10:00:00"))
+        return rides
+
+    assert run(CabApp(name="Cab")) == run(ScanCabApp(name="Cab"))
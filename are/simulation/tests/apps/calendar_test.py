@@ -5,11 +5,13 @@
 # the root directory of this source tree.
 
 
+import random
 from datetime import datetime, timezone
 
 import pytest
 
-from are.simulation.apps.calendar import CalendarApp
+from are.simulation.apps.calendar import CalendarApp, CalendarEvent
+from are.simulation.apps.calendar_v2 import CalendarV2
 from are.simulation.environment import Environment
 
 
@@ -196,6 +198,96 @@ def test_read_calendar_events_by_tag():
     assert len(events) == 0
 
 
+def test_calendar_event_index_matches_scan():
+    rng = random.Random(0)
+    app = CalendarV2()
+    environment = Environment()
+    environment.register_apps([app])
+
+    def fmt(ts):
+        return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+    base = 1_700_000_000
+    event_ids = []
+    for i in range(200):
+        start = base + rng.randrange(0, 30 * 86400, 900)
+        event_ids.append(
+            app.add_calendar_event(
+                title=f"Event {i}",
+                start_datetime=fmt(start),
+                end_datetime=fmt(start + rng.choice([0, 900, 3600, 86400 * 3])),
+                tag=rng.choice([None, "work", "home"]),
+            )
+        )
+    for event_id in rng.sample(event_ids, 20):
+        app.delete_calendar_event(event_id)
+        event_ids.remove(event_id)
+    for event_id in rng.sample(event_ids, 20):
+        start = base + rng.randrange(0, 30 * 86400, 900)
+        app.edit_calendar_event(
+            event_id, start_datetime=fmt(start), end_datetime=fmt(start + 1800)
+        )
+    # Replacing an event keeps its position
+    app.set_calendar_event(
+        CalendarEvent(
+            event_id=event_ids[0],
+            start_datetime=base,
+            end_datetime=base + 60,
+            tag="new",
+        )
+    )
+
+    for _ in range(50):
+        start = base + rng.randrange(-86400, 31 * 86400, 900)
+        end = start + rng.choice([0, 900, 86400, 7 * 86400])
+        expected = [
+            event
+            for event in app.events.values()
+            if event.start_datetime < end and event.end_datetime > start
+        ]
+        result = app.get_calendar_events_from_to(fmt(start), fmt(end), limit=1000)
+        assert result["events"] == expected
+        assert result["total"] == len(expected)
+
+    for tag in ["work", "home", "new"]:
+        assert app.get_calendar_events_by_tag(tag) == [
+            event for event in app.events.values() if event.tag == tag
+        ]
+    assert sorted(app.get_all_tags()) == ["home", "new", "work"]
+
+
+def test_calendar_event_index_follows_replaced_events():
+    app = CalendarApp()
+    environment = Environment()
+    environment.register_apps([app])
+    app.add_calendar_event(
+        title="Morning",
+        start_datetime="2024-01-01 09:00:00",
+        end_datetime="2024-01-01 10:00:00",
+        tag="work",
+    )
+    # Build the indexes
+    assert len(app.get_calendar_events_by_tag("work")) == 1
+
+    # A dict of the same size with another event
+    event = CalendarEvent(
+        title="Evening",
+        start_datetime=datetime(2024, 1, 2, 18, tzinfo=timezone.utc).timestamp(),
+        end_datetime=datetime(2024, 1, 2, 19, tzinfo=timezone.utc).timestamp(),
+        tag="home",
+    )
+    app.events = {event.event_id: event}
+
+    assert app.get_calendar_events_by_tag("work") == []
+    assert app.get_calendar_events_by_tag("home") == [event]
+    assert app.get_all_tags() == ["home"]
+    result = app.get_calendar_events_from_to(
+        "2024-01-02 00:00:00", "2024-01-03 00:00:00"
+    )
+    assert result["events"] == [event]
+    assert app.search_events("evening") == [event]
+
+
 def test_adversarial_calendar_event():
     app = CalendarApp()
     environment = Environment()
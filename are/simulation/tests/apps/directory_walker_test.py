@@ -0,0 +1,121 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import os
+from unittest.mock import patch
+
+import fsspec
+
+from are.simulation.apps.sandbox_file_system import SandboxLocalFileSystem
+from are.simulation.apps.utils import directory_walker
+from are.simulation.apps.utils.directory_walker import CachedDirectoryWalker
+
+FILES = [
+    "a/one.txt",
+    "a/b/two.txt",
+    "a/b/c/three.txt",
+    "d/four.txt",
+    "five.txt",
+]
+
+
+def populate(root, paths=FILES):
+    for path in paths:
+        target = os.path.join(root, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "w") as f:
+            f.write(path)
+
+
+def set_old_mtimes(root):
+    # Make the listings old enough to be cached
+    for dir_path, _, _ in os.walk(root):
+        os.utime(dir_path, ns=(1_000_000_000, 1_000_000_000))
+
+
+def fsspec_tree(fs, path):
+    info = fs.info(path)
+    if info["type"] != "directory":
+        return {"name": os.path.basename(path), "type": "file"}
+    return {
+        "name": os.path.basename(path),
+        "type": "directory",
+        "children": [fsspec_tree(fs, item) for item in fs.ls(path)],
+    }
+
+
+def test_walker_matches_fsspec(tmp_path):
+    root = str(tmp_path)
+    populate(root)
+    local_fs = fsspec.filesystem("file")
+    walker = CachedDirectoryWalker()
+
+    assert walker.get_tree(root) == fsspec_tree(local_fs, root)
+    assert list(walker.walk(root)) == list(local_fs.walk(root))
+
+
+def test_walker_lists_unchanged_directories_once(tmp_path):
+    root = str(tmp_path)
+    populate(root)
+    set_old_mtimes(root)
+    walker = CachedDirectoryWalker()
+    tree = walker.get_tree(root)
+
+    with patch.object(
+        directory_walker.os, "scandir", side_effect=os.scandir
+    ) as scandir:
+        assert walker.get_tree(root) == tree
+        assert list(walker.walk(root))[0][2] == ["five.txt"]
+        scandir.assert_not_called()
+
+        # Only the modified directory is listed again
+        populate(root, ["a/b/new.txt"])
+        os.utime(os.path.join(root, "a", "b"), ns=(2_000_000_000, 2_000_000_000))
+        new_tree = walker.get_tree(root)
+        assert scandir.call_count == 1
+    assert new_tree == fsspec_tree(fsspec.filesystem("file"), root)
+    assert new_tree != tree
+
+    # Returned trees are copies
+    new_tree["children"].clear()
+    assert walker.get_tree(root)["children"]
+
+
+def test_sandbox_state_and_tree_use_the_walker():
+    fs = SandboxLocalFileSystem()
+    for path in FILES:
+        fs.makedirs(os.path.dirname(path), exist_ok=True)
+        with fs.open(path, "w") as f:
+            f.write(path)
+
+    state = fs.get_state()
+    expected = fsspec_tree(fs.local_fs, fs.tmpdir)
+    expected["name"] = ""
+    assert state == {"files": expected, "tmpdir": fs.tmpdir}
+
+    assert fs.tree("a").splitlines() == [
+        "a",
+        "├── b",
+        "    ├── c",
+        "        └── three.txt",
+        "    └── two.txt",
+        "└── one.txt",
+    ]
+
+    expected_files = [
+        os.path.join(root, name)  # type: ignore
+        for root, _, files in fs.local_fs.walk(fs.tmpdir)
+        for name in files
+    ]
+    assert list(fs.get_file_paths_list()) == expected_files
+    assert fs.get_sample_files(k=2, seed=1) == fs.get_sample_files(k=2, seed=1)
+
+    fs.rm("a", recursive=True)
+    assert [c["name"] for c in fs.get_state()["files"]["children"]] == [
+        c["name"] for c in fsspec_tree(fs.local_fs, fs.tmpdir)["children"]
+    ]
+    assert "a" not in {c["name"] for c in fs.get_state()["files"]["children"]}
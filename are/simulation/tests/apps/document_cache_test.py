@@ -0,0 +1,140 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import io
+from unittest.mock import patch
+
+import pytest
+
+from are.simulation.apps.sandbox_file_system import SandboxLocalFileSystem
+from are.simulation.apps.utils.document_cache import (
+    DOCUMENT_CONVERSION_CACHE,
+    DocumentConversionCache,
+)
+from are.simulation.core.mdconvert import MarkdownConverter
+
+TEXTS = [
+    "",
+    "one line",
+    "trailing newline\n",
+    "a\n\nb\n\n\nc\n\n\n\nd",
+    "\n\n\n\nleading blank lines",
+    "\n\nfew leading blank lines",
+    "trailing blank lines\n\n\n\n",
+    "\n\n\n",
+    "\n",
+    "windows\r\nline  \r\n\r\n\r\n\r\nendings\r\n",
+    "   \n \t \nwhitespace only lines\n  \n\t\n  \nend  ",
+    "inner \r carriage return",
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    DOCUMENT_CONVERSION_CACHE.clear()
+    yield
+    DOCUMENT_CONVERSION_CACHE.clear()
+
+
+def write(fs: SandboxLocalFileSystem, path: str, content: str) -> None:
+    with fs.open(path, "w") as f:
+        f.write(content)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_streamed_lines_match_conversion(text):
+    converter = MarkdownConverter()
+    expected = converter.convert_io(
+        io.BytesIO(text.encode()), file_extension=".txt"
+    ).text_content
+    lines = list(converter.stream_lines(io.BytesIO(text.encode()), ".txt"))
+    assert "\n".join(lines) == expected
+
+
+def test_streamable_extensions():
+    assert MarkdownConverter.is_streamable(".txt")
+    assert MarkdownConverter.is_streamable(".CSV")
+    assert not MarkdownConverter.is_streamable(".html")
+    assert not MarkdownConverter.is_streamable(".xml")
+    assert not MarkdownConverter.is_streamable(".pdf")
+    assert not MarkdownConverter.is_streamable("")
+
+
+def test_read_document_converts_once():
+    fs = SandboxLocalFileSystem()
+    write(fs, "report.html", "<h1>Report</h1>" + "<p>line</p>" * 50)
+    converter = fs._md_converter
+
+    with patch.object(converter, "convert_io", wraps=converter.convert_io) as convert:
+        content = fs.read_document("report.html", max_lines=None)
+        lines = content.split("\n")
+        assert (
+            fs.read_document("report.html", max_lines=5)
+            == "\n".join(lines[:5])
+            + f"\n\n[Document truncated. Showing 5 of {len(lines)} lines]"
+        )
+        # Sandboxes share the cache
+        other_fs = SandboxLocalFileSystem()
+        write(other_fs, "copy.html", "<h1>Report</h1>" + "<p>line</p>" * 50)
+        assert other_fs.read_document("copy.html", max_lines=None) == content
+        assert convert.call_count == 1
+
+        # Modified documents are converted again
+        write(fs, "report.html", "<h1>New report</h1>")
+        assert fs.read_document("report.html").strip() == "# New report"
+        assert convert.call_count == 2
+    assert DOCUMENT_CONVERSION_CACHE.hits == 2
+
+
+def test_cache_evicts_by_bytes():
+    cache = DocumentConversionCache(max_bytes=10)
+    cache.get_or_convert(b"a", ".txt", lambda: "aaaa")
+    cache.get_or_convert(b"b", ".txt", lambda: "bbbb")
+    # Refresh the first entry so that the second one is evicted
+    cache.get_or_convert(b"a", ".txt", lambda: "not converted")
+    cache.get_or_convert(b"c", ".txt", lambda: "cccc")
+    assert len(cache) == 2
+    assert cache.size == 8
+    assert cache.get_or_convert(b"a", ".txt", lambda: "converted") == "aaaa"
+    assert cache.get_or_convert(b"b", ".txt", lambda: "converted") == "converted"
+
+    # Texts larger than the cache are not kept
+    cache.get_or_convert(b"d", ".txt", lambda: "d" * 11)
+    assert cache.size <= 10
+    # The extension is part of the key
+    assert cache.get_or_convert(b"a", ".md", lambda: "converted") == "converted"
+
+
+def test_cache_is_persisted(tmp_path):
+    cache = DocumentConversionCache(cache_dir=tmp_path)
+    cache.get_or_convert(b"content", ".txt", lambda: "line\r\nwith \r returns")
+
+    other_cache = DocumentConversionCache(cache_dir=tmp_path)
+    assert (
+        other_cache.get_or_convert(b"content", ".txt", lambda: "converted")
+        == "line\r\nwith \r returns"
+    )
+    assert other_cache.hits == 1
+
+
+def test_read_document_streams_plain_text():
+    fs = SandboxLocalFileSystem(stream_documents=True)
+    rows = "\n".join(f"{i},value {i}  " for i in range(1000))
+    write(fs, "data.csv", "id,value\n" + rows)
+
+    with patch.object(fs._md_converter, "convert_io") as convert:
+        assert fs.read_document("data.csv", max_lines=3) == (
+            "id,value\n0,value 0\n1,value 1\n\n"
+            "[Document truncated. Showing the first 3 lines]"
+        )
+        write(fs, "short.txt", "a\n\n\n\nb")
+        assert fs.read_document("short.txt", max_lines=3) == "a\n\nb"
+        convert.assert_not_called()
+
+    # Other documents and whole documents are converted
+    assert fs.read_document("data.csv", max_lines=None).count("\n") == 1000
+    assert DOCUMENT_CONVERSION_CACHE.misses == 1
@@ -194,6 +194,59 @@ class TestEmailFolder:
         with pytest.raises(Exception):
             folder.get_email_by_id("nonexistent_id")
 
+    def test_emails_stay_sorted_by_timestamp(self):
+        folder = EmailFolder(EmailFolderName.INBOX)
+        emails = [
+            Email(email_id=f"email_{i}", timestamp=timestamp)
+            for i, timestamp in enumerate([3.0, 1.0, 2.0, 3.0, 1.0])
+        ]
+        for email in emails:
+            folder.add_email(email)
+        # Same order as a stable sort, most recent first
+        expected = sorted(emails, key=lambda x: x.timestamp, reverse=True)
+        assert [e.email_id for e in folder.emails] == [e.email_id for e in expected]
+
+    def test_remove_email(self):
+        folder = EmailFolder(EmailFolderName.INBOX)
+        emails = [Email(email_id=f"email_{i}", timestamp=1.0) for i in range(3)]
+        for email in emails:
+            folder.add_email(email)
+        folder.remove_email(emails[1])
+        assert folder.emails == [emails[0], emails[2]]
+        with pytest.raises(ValueError):
+            folder.get_email_by_id("email_1")
+        with pytest.raises(ValueError):
+            folder.remove_email(emails[1])
+
+    def test_delete_emails_after(self):
+        folder = EmailFolder(EmailFolderName.INBOX)
+        for i in range(5):
+            folder.add_email(Email(email_id=f"email_{i}", timestamp=float(i)))
+        assert folder.delete_emails_after(2.0) == 2
+        assert [e.email_id for e in folder.emails] == ["email_2", "email_1", "email_0"]
+        with pytest.raises(ValueError):
+            folder.get_email_by_id("email_3")
+        assert folder.get_email_by_id("email_2").timestamp == 2.0
+
+    def test_duplicate_email_ids(self):
+        folder = EmailFolder(EmailFolderName.INBOX)
+        older = Email(email_id="email", timestamp=1.0)
+        newer = Email(email_id="email", timestamp=2.0)
+        folder.add_email(older)
+        folder.add_email(newer)
+        # The first email in the folder is returned, as with a scan
+        assert folder.get_email_by_id("email") is newer
+        folder.remove_email(newer)
+        assert folder.get_email_by_id("email") is older
+
+    def test_emails_modified_in_place(self):
+        folder = EmailFolder(EmailFolderName.INBOX)
+        folder.add_email(Email(email_id="email_0", timestamp=1.0))
+        folder.emails.append(Email(email_id="email_1", timestamp=2.0))
+        assert folder.get_email_by_id("email_1").timestamp == 2.0
+        folder.add_email(Email(email_id="email_2", timestamp=0.0))
+        assert [e.email_id for e in folder.emails] == ["email_1", "email_0", "email_2"]
+
 
 class TestEmailClientApp:
     def test_instantiate_email_client_app(self):
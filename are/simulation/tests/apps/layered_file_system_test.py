@@ -0,0 +1,204 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import os
+
+import pytest
+
+from are.simulation.apps.sandbox_file_system import SandboxLocalFileSystem
+from are.simulation.apps.utils import layered_file_system
+from are.simulation.apps.utils.layered_file_system import (
+    LayeredFileSystem,
+    get_base_layer,
+)
+
+FILES = {
+    "/Documents/notes.txt": "Some notes",
+    "/Documents/reports/q1.txt": "Q1 report",
+    "/Pictures/cat.png": "A cat picture",
+    "/readme.md": "# Universe",
+}
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    base = tmp_path / "universe"
+    for path, content in FILES.items():
+        target = base / path.lstrip("/")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+    return str(base)
+
+
+def list_files(fs: SandboxLocalFileSystem) -> set[str]:
+    return {
+        os.path.join(root or "/", name)  # type: ignore
+        for root, _, files in fs.walk("/", detail=False)
+        for name in files
+    }
+
+
+def state_files(node: dict, parent: str = "/") -> set[str]:
+    path = os.path.join(parent, node["name"])
+    if node["type"] == "file":
+        return {path}
+    return set().union(*(state_files(c, path) for c in node["children"]))
+
+
+def test_base_layer_is_read_in_place(base_dir):
+    fs = SandboxLocalFileSystem(layered=True)
+    fs.load_file_system_from_path(base_dir)
+
+    assert isinstance(fs.local_fs, LayeredFileSystem)
+    # Nothing is copied to the sandbox
+    assert os.listdir(fs.tmpdir) == []
+    assert list_files(fs) == set(FILES)
+    assert set(fs.ls("/Documents")) == {"/Documents/notes.txt", "/Documents/reports"}
+    assert fs.cat("/Documents/notes.txt") == b"Some notes"
+    assert fs.info("/Pictures/cat.png")["size"] == len(FILES["/Pictures/cat.png"])
+    assert fs.info("/Pictures/cat.png")["name"] == "/Pictures/cat.png"
+    assert fs.isdir("/Documents/reports")
+
+    # The index is shared by all the file systems of the process
+    other_fs = SandboxLocalFileSystem(layered=True)
+    other_fs.load_file_system_from_path(base_dir)
+    assert other_fs.local_fs._mounts[0].layer is fs.local_fs._mounts[0].layer
+    assert fs.local_fs._mounts[0].layer is get_base_layer(base_dir)
+
+
+def test_writes_go_to_the_overlay(base_dir):
+    fs = SandboxLocalFileSystem(layered=True)
+    other_fs = SandboxLocalFileSystem(layered=True)
+    fs.load_file_system_from_path(base_dir)
+    other_fs.load_file_system_from_path(base_dir)
+
+    with fs.open("/Documents/notes.txt", "a") as f:
+        f.write(" and more")
+    with fs.open("/Documents/reports/q2.txt", "w") as f:
+        f.write("Q2 report")
+
+    assert fs.cat("/Documents/notes.txt") == b"Some notes and more"
+    assert fs.cat("/Documents/reports/q2.txt") == b"Q2 report"
+    assert set(fs.ls("/Documents/reports")) == {
+        "/Documents/reports/q1.txt",
+        "/Documents/reports/q2.txt",
+    }
+    # Only the modified files are in the sandbox
+    assert sorted(os.listdir(os.path.join(fs.tmpdir, "Documents"))) == [
+        "notes.txt",
+        "reports",
+    ]
+    assert os.listdir(os.path.join(fs.tmpdir, "Documents", "reports")) == ["q2.txt"]
+
+    # Neither the base nor the other sandboxes are modified
+    with open(os.path.join(base_dir, "Documents", "notes.txt")) as f:
+        assert f.read() == "Some notes"
+    assert other_fs.cat("/Documents/notes.txt") == b"Some notes"
+    assert not other_fs.exists("/Documents/reports/q2.txt")
+
+
+def test_rm_and_mv_use_whiteouts(base_dir):
+    fs = SandboxLocalFileSystem(layered=True)
+    fs.load_file_system_from_path(base_dir)
+
+    fs.rm("/readme.md")
+    assert not fs.exists("/readme.md")
+    with pytest.raises(FileNotFoundError):
+        fs.cat("/readme.md")
+
+    fs.mv("/Pictures/cat.png", "/Documents")
+    assert not fs.exists("/Pictures/cat.png")
+    assert fs.cat("/Documents/cat.png") == b"A cat picture"
+    # Moved files are not copied
+    assert not os.path.exists(os.path.join(fs.tmpdir, "Documents", "cat.png"))
+
+    fs.mv("/Documents", "/Archive", recursive=True)
+    assert not fs.exists("/Documents")
+    assert list_files(fs) == {
+        "/Archive/notes.txt",
+        "/Archive/reports/q1.txt",
+        "/Archive/cat.png",
+    }
+    assert fs.cat("/Archive/reports/q1.txt") == b"Q1 report"
+
+    with pytest.raises(ValueError):
+        fs.rm("/Archive")
+    fs.rm("/Archive", recursive=True)
+    assert list_files(fs) == set()
+    assert set(fs.ls("/")) == {"/Pictures"}
+
+    # A directory created where a base directory was deleted is empty
+    fs.rm("/Pictures", recursive=True)
+    fs.mkdir("/Pictures")
+    assert fs.ls("/Pictures") == []
+    assert os.path.exists(os.path.join(base_dir, "Pictures", "cat.png"))
+
+
+def test_get_state_matches_the_merged_tree(base_dir):
+    fs = SandboxLocalFileSystem(layered=True)
+    fs.load_file_system_from_path(base_dir)
+    assert state_files(fs.get_state()["files"]) == set(FILES)
+
+    fs.rm("/Documents/reports", recursive=True)
+    fs.mv("/readme.md", "/Pictures/readme.md")
+    with fs.open("/Pictures/dog.png", "w") as f:
+        f.write("A dog picture")
+    state = fs.get_state()
+    assert state["tmpdir"] == fs.tmpdir
+    assert state_files(state["files"]) == list_files(fs)
+    assert list_files(fs) == {
+        "/Documents/notes.txt",
+        "/Pictures/cat.png",
+        "/Pictures/dog.png",
+        "/Pictures/readme.md",
+    }
+
+    # The state can be loaded in a sandbox backed by the same directory
+    new_fs = SandboxLocalFileSystem(state_directory=base_dir, layered=True)
+    new_fs.load_state(state)
+    assert list_files(new_fs) == list_files(fs)
+    assert new_fs.cat("/Documents/notes.txt") == b"Some notes"
+    # Files missing from the state directory are empty placeholders
+    assert new_fs.cat("/Pictures/dog.png") == b""
+    assert sorted(os.listdir(new_fs.tmpdir)) == ["Pictures"]
+
+
+def test_load_directory_from_path_mounts_a_layer(base_dir):
+    fs = SandboxLocalFileSystem(layered=True)
+    with fs.open("/local.txt", "w") as f:
+        f.write("Local file")
+    fs.load_directory_from_path(os.path.join(base_dir, "Documents"), "shared/docs")
+
+    assert list_files(fs) == {
+        "/local.txt",
+        "/shared/docs/notes.txt",
+        "/shared/docs/reports/q1.txt",
+    }
+    assert fs.cat("/shared/docs/reports/q1.txt") == b"Q1 report"
+    assert state_files(fs.get_state()["files"]) == list_files(fs)
+
+    fs.rm("/shared", recursive=True)
+    assert list_files(fs) == {"/local.txt"}
+    # Layers mounted after a deletion are visible
+    fs.load_directory_from_path(os.path.join(base_dir, "Pictures"), "shared/pics")
+    assert list_files(fs) == {"/local.txt", "/shared/pics/cat.png"}
+
+
+def test_least_recently_used_base_layers_are_dropped(tmp_path, monkeypatch, base_dir):
+    monkeypatch.setattr(layered_file_system, "MAX_BASE_LAYERS", 2)
+    fs = SandboxLocalFileSystem(layered=True)
+    fs.load_file_system_from_path(base_dir)
+    layer = get_base_layer(base_dir)
+    for name in ["first", "second"]:
+        (tmp_path / name).mkdir()
+        get_base_layer(str(tmp_path / name))
+
+    assert base_dir not in layered_file_system._BASE_LAYERS
+    assert len(layered_file_system._BASE_LAYERS) <= 2
+    # Mounted layers stay usable, and are indexed again on their next use
+    assert fs.cat("/readme.md") == b"# Universe"
+    assert get_base_layer(base_dir) is not layer
@@ -5,10 +5,14 @@
 # the root directory of this source tree.
 
 
+import asyncio
+import threading
 import unittest
+from unittest.mock import patch
 
 from are.simulation.apps.app import ToolType
 from are.simulation.apps.mcp.mcp_app import MCPApp
+from are.simulation.apps.mcp.session_pool import MCP_SESSION_POOL
 from are.simulation.config import ARE_SIMULATION_ROOT
 from are.simulation.tool_utils import ToolAttributeName
 from are.simulation.utils import time_limit
@@ -21,6 +25,13 @@ SERVER_SCRIPT_PATH = str(
     / "scenario_mcp_demo"
     / "math_server.py"
 )
+TODO_SERVER_SCRIPT_PATH = str(
+    ARE_SIMULATION_ROOT
+    / "simulation"
+    / "scenarios"
+    / "scenario_mcp_demo"
+    / "todo_server.py"
+)
 
 
 def desc_modifier(name, description):
@@ -124,6 +135,112 @@ class MCPAppTest(unittest.TestCase):
                 # Clean up resources
                 mcp_app.close()
 
+    def test_stateless_server_connection_is_shared(self):
+        """Test that apps of a read-only server share one warm connection."""
+        with time_limit(30):
+            MCP_SESSION_POOL.close_all()
+            first_app = MCPApp(
+                name="First", server_command="python", server_args=[SERVER_SCRIPT_PATH]
+            )
+            second_app = MCPApp(
+                name="Second", server_command="python", server_args=[SERVER_SCRIPT_PATH]
+            )
+            try:
+                connection = first_app._connection
+                self.assertIsNotNone(connection)
+                self.assertTrue(connection.shared)  # type: ignore
+                self.assertIs(second_app._connection, connection)
+
+                # Resets keep the warm connection
+                first_app.reset()
+                self.assertIs(first_app._connection, connection)
+                self.assertIn("8", first_app._call_tool("add", a=3, b=5))
+
+                # The server stays open when its apps are closed
+                first_app.close()
+                second_app.close()
+                self.assertTrue(connection.is_open)  # type: ignore
+                third_app = MCPApp(
+                    name="Third",
+                    server_command="python",
+                    server_args=[SERVER_SCRIPT_PATH],
+                )
+                self.assertIs(third_app._connection, connection)
+                third_app.close()
+            finally:
+                first_app.close()
+                second_app.close()
+                MCP_SESSION_POOL.close_all()
+
+    def test_slow_tool_call_times_out(self):
+        """Test that a tool call which does not complete within the app timeout is cancelled."""
+        with time_limit(30):
+            mcp_app = MCPApp(
+                name="TestApp",
+                server_command="python",
+                server_args=[SERVER_SCRIPT_PATH],
+                timeout=0.5,
+            )
+            cancelled = threading.Event()
+
+            async def slow_call(tool_name, arguments):
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+            try:
+                with patch.object(mcp_app, "_call_mcp_tool", slow_call):
+                    with self.assertRaises(TimeoutError):
+                        mcp_app._call_tool("add", a=3, b=5)
+                self.assertTrue(cancelled.wait(5))
+                # The app keeps working after the timeout
+                self.assertIn("8", mcp_app._call_tool("add", a=3, b=5))
+            finally:
+                mcp_app.close()
+
+    def test_stateful_server_is_restarted_on_reset(self):
+        """Test that apps of a stateful server get their own server, restarted on reset."""
+        with time_limit(30):
+            first_app = MCPApp(
+                name="First",
+                server_command="python",
+                server_args=[TODO_SERVER_SCRIPT_PATH],
+            )
+            second_app = MCPApp(
+                name="Second",
+                server_command="python",
+                server_args=[TODO_SERVER_SCRIPT_PATH],
+            )
+            try:
+                connection = first_app._connection
+                self.assertFalse(connection.shared)  # type: ignore
+                self.assertIsNot(second_app._connection, connection)
+                # The catalog is listed once for both apps
+                self.assertIs(first_app._catalog, second_app._catalog)
+
+                first_app._call_tool("add_todo", title="Buy milk")
+                self.assertIn("Buy milk", first_app._call_tool("list_todos"))
+                self.assertNotIn("Buy milk", second_app._call_tool("list_todos"))
+
+                first_app.reset()
+                self.assertIsNot(first_app._connection, connection)
+                self.assertFalse(connection.is_open)  # type: ignore
+                self.assertNotIn("Buy milk", first_app._call_tool("list_todos"))
+
+                # Invalidating the catalog lists the tools again
+                catalog = first_app._catalog
+                MCP_SESSION_POOL.invalidate_catalog(first_app._connection.key)  # type: ignore
+                tools = first_app.get_tools_with_attribute(
+                    ToolAttributeName.APP, ToolType.APP
+                )
+                self.assertIsNot(first_app._catalog, catalog)
+                self.assertIn("First__add_todo", {tool.name for tool in tools})
+            finally:
+                first_app.close()
+                second_app.close()
+
 
 if __name__ == "__main__":
     unittest.main()
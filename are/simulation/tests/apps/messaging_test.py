@@ -12,7 +12,12 @@ import time
 
 import pytest
 
-from are.simulation.apps.messaging import FileMessage, Message, MessagingApp
+from are.simulation.apps.messaging import (
+    Conversation,
+    FileMessage,
+    Message,
+    MessagingApp,
+)
 from are.simulation.apps.sandbox_file_system import SandboxLocalFileSystem
 from are.simulation.environment import Environment
 
@@ -430,6 +435,50 @@ def test_list_conversations_ordered_by_most_recent():
     )  # No conversations should be returned
 
 
+def test_recent_conversations_follow_changes():
+    app = MessagingApp()
+    conversation_ids = [
+        app.create_conversation(participants=[name]) for name in ["A", "B", "C"]
+    ]
+    for conversation_id in conversation_ids:
+        app.conversations[conversation_id].last_updated = 0
+
+    def recent_ids():
+        return [
+            conversation.conversation_id
+            for conversation in app.list_recent_conversations(offset=0, limit=5)
+        ]
+
+    # Conversations updated at the same time are in insertion order
+    assert recent_ids() == conversation_ids
+
+    app.add_message(conversation_ids[2], "C", "Hello", timestamp=10.0)
+    assert recent_ids() == [conversation_ids[2], *conversation_ids[:2]]
+
+    # Conversations modified directly are reordered too
+    app.conversations[conversation_ids[1]].last_updated = 20
+    del app.conversations[conversation_ids[2]]
+    assert recent_ids() == [conversation_ids[1], conversation_ids[0]]
+
+    app.conversations[conversation_ids[0]] = Conversation(
+        participants=["A"], conversation_id=conversation_ids[0], last_updated=30
+    )
+    assert recent_ids() == [conversation_ids[0], conversation_ids[1]]
+
+
+def test_read_conversation_keeps_message_order():
+    app = MessagingApp()
+    conversation_id = app.create_conversation(participants=["Foo"])
+    for i, timestamp in enumerate([2.0, 1.0, 3.0]):
+        app.add_message(conversation_id, "Foo", str(i), timestamp=timestamp)
+
+    res = app.read_conversation(conversation_id=conversation_id)
+    assert [message.content for message in res["messages"]] == ["2", "0", "1"]
+    # The stored messages stay in insertion order
+    messages = app.conversations[conversation_id].messages
+    assert [message.content for message in messages] == ["0", "1", "2"]
+
+
 def test_add_participant_to_conversation_success():
     app = MessagingApp()
     environment = Environment()
@@ -6,6 +6,7 @@
 
 
 import datetime
+import random
 import re
 import time
 from unittest.mock import MagicMock
@@ -13,6 +14,7 @@ from unittest.mock import MagicMock
 import pytest
 
 from are.simulation.apps.messaging_v2 import (
+    ConversationV2,
     FileMessageV2,
     MessageV2,
     MessagingAppMode,
@@ -1567,3 +1569,94 @@ def test_regex_search_edge_cases():
     result = app.regex_search(alice_id[:8])  # Search for first 8 chars of Alice's UUID
     assert len(result) == 1
     assert result[0] == conv_key
+
+
+def test_indexed_reads_match_scans():
+    """Test that the sorted messages and conversation indexes give the results of full scans."""
+    rng = random.Random(0)
+    app = MessagingAppV2(current_user_id="0", current_user_name="Me")
+    app.add_users([f"user {i}" for i in range(6)])
+    user_ids = [user_id for user_id in app.id_to_name if user_id != "0"]
+    base = 1_700_000_000
+
+    def fmt(ts):
+        return datetime.datetime.fromtimestamp(ts, tz=datetime.timezone.utc).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+
+    def check():
+        for conversation_id, conversation in app.conversations.items():
+            for _ in range(5):
+                min_date = rng.choice([None, fmt(base + rng.randrange(100))])
+                max_date = rng.choice([None, fmt(base + rng.randrange(100))])
+                expected = sorted(
+                    conversation.get_messages_in_date_range(min_date, max_date),
+                    key=lambda x: x.timestamp,
+                    reverse=True,
+                )
+                result = app.read_conversation(
+                    conversation_id, 0, 1000, min_date=min_date, max_date=max_date
+                )
+                assert result["messages"] == expected
+        expected_recent = sorted(
+            app.conversations.values(), key=lambda c: c.last_updated, reverse=True
+        )
+        app.conversation_view_limit = len(app.conversations)
+        app.messages_view_limit = 1000
+        recent = app.list_recent_conversations(
+            0, len(app.conversations), 0, app.messages_view_limit
+        )
+        assert [c.conversation_id for c in recent] == [
+            c.conversation_id for c in expected_recent
+        ]
+        for conversation in recent:
+            assert conversation.messages == sorted(
+                app.conversations[conversation.conversation_id].messages,
+                key=lambda x: x.timestamp,
+                reverse=True,
+            )
+        for _ in range(10):
+            participants = rng.sample(user_ids, 2)
+            assert app.get_existing_conversation_ids(participants) == [
+                conversation_id
+                for conversation_id, conversation in app.conversations.items()
+                if set(participants + ["0"]) == set(conversation.participant_ids)
+            ]
+
+    for i in range(20):
+        participants = rng.sample(user_ids, 2)
+        conversation_id = app.create_group_conversation(participants)
+        for _ in range(rng.randrange(10)):
+            # Out of order and equal timestamps
+            app.add_message(
+                conversation_id,
+                rng.choice(participants),
+                f"message {i}",
+                timestamp=base + rng.randrange(0, 100, 10) + rng.choice([0.0, 0.5]),
+            )
+    check()
+
+    conversation_ids = list(app.conversations)
+    for conversation_id in rng.sample(conversation_ids, 5):
+        # Scenarios may modify conversations without going through the app
+        conversation = app.conversations[conversation_id]
+        conversation.messages.append(
+            MessageV2(sender_id="0", content="direct", timestamp=base + 50)
+        )
+        conversation.update_last_updated(base + 200)
+    new_participant = next(
+        user_id
+        for user_id in user_ids
+        if user_id not in app.conversations[conversation_ids[0]].participant_ids
+    )
+    app.add_participant_to_conversation(conversation_ids[0], new_participant)
+    app.remove_participant_from_conversation(conversation_ids[1], "0")
+    del app.conversations[conversation_ids[2]]
+    app.add_conversation(
+        ConversationV2(
+            participant_ids=["0", *user_ids[:2]],
+            conversation_id=conversation_ids[3],
+            last_updated=base,
+        )
+    )
+    check()
@@ -7,7 +7,7 @@
 
 import datetime
 
-from are.simulation.apps.reminder import ReminderApp
+from are.simulation.apps.reminder import Reminder, ReminderApp
 
 
 def test_add_reminder():
@@ -112,3 +112,69 @@ def test_get_all_reminders():
     total_days = (max_future_datetime - due_date).days
 
     assert len(all_reminders) == total_days, f"{len(all_reminders)} != {total_days}"
+
+
+def test_due_reminders_match_scan():
+    start = datetime.datetime(2024, 3, 1, 10, 0, 0, tzinfo=datetime.timezone.utc)
+    reminder_app = ReminderApp(
+        reminders={}, max_future_datetime=start + datetime.timedelta(days=10)
+    )
+    time_manager = reminder_app.time_manager
+    time_manager.reset(start.timestamp())
+
+    def scan():
+        return [
+            reminder
+            for reminder in reminder_app.reminders.values()
+            if reminder.due_datetime.timestamp() <= time_manager.time()
+        ]
+
+    daily_id = reminder_app.add_reminder(
+        title="Daily",
+        due_datetime="2024-03-01 12:00:00",
+        description="Repeated reminder.",
+        repetition_unit="day",
+    )
+    once_id = reminder_app.add_reminder(
+        title="Once",
+        due_datetime="2024-03-02 09:00:00",
+        description="Single reminder.",
+    )
+    assert reminder_app.get_due_reminders() == scan() == []
+    assert (
+        reminder_app.next_due_time()
+        == (start + datetime.timedelta(hours=2)).timestamp()
+    )
+
+    time_manager.add_offset(2 * 86400)
+    assert reminder_app.get_due_reminders() == scan()
+    assert [r.title for r in scan()] == ["Daily", "Daily", "Once"]
+
+    # Notified reminders are still due, but next_due_time skips them
+    for reminder in reminder_app.get_due_reminders():
+        reminder.time_notified = time_manager.time()
+    assert (
+        reminder_app.next_due_time()
+        == (start + datetime.timedelta(days=2, hours=2)).timestamp()
+    )
+
+    reminder_app.delete_reminder(once_id)
+    reminder_app.delete_reminder(f"{daily_id}_rep_1")
+    assert reminder_app.get_due_reminders() == scan()
+    assert [r.title for r in scan()] == ["Daily"]
+
+    # Reminders added without going through the app and time going backwards
+    reminder_app.reminders["direct"] = Reminder(
+        reminder_id="direct",
+        title="Direct",
+        due_datetime=start,
+        description="Added directly.",
+    )
+    time_manager.reset(start.timestamp())
+    assert reminder_app.get_due_reminders() == scan()
+    assert [r.title for r in scan()] == ["Direct"]
+    assert reminder_app.next_due_time() == start.timestamp()
+
+    reminder_app.delete_all_reminders()
+    assert reminder_app.get_due_reminders() == []
+    assert reminder_app.next_due_time() is None
@@ -6,10 +6,12 @@
 
 
 import os
+from unittest.mock import patch
 
 import pytest
 
-from are.simulation.apps.shopping import ShoppingApp
+from are.simulation.apps.shopping import Item, ShoppingApp
+from are.simulation.apps.utils.product_catalog import ProductCatalog
 from are.simulation.dataset_helpers import get_data_path
 from are.simulation.environment import Environment
 from are.simulation.tests.utils import IN_GITHUB_ACTIONS
@@ -318,3 +320,84 @@ def test_update_item():
     assert app._get_item("4153505238")["price"] == 100.0
     app.update_item(item_id="4153505238", new_availability=False)
     assert app._get_item("4153505238")["available"] is False
+
+
+def make_catalog_app(**kwargs) -> ShoppingApp:
+    app = ShoppingApp(**kwargs)
+    app.load_products_from_dict(dummy_data)
+    for i in range(30):
+        product_id = app.add_product(name=f"Shoe {i % 7}")
+        app.add_item_to_product(product_id=product_id, price=10.1 * i + 0.07)
+    return app
+
+
+def test_catalog_matches_scan():
+    app = make_catalog_app()
+    products = app.products
+
+    # Reference implementations scanning the whole catalog
+    names = sorted({p.name: p.product_id for p in products.values()}.items())
+    for offset in [0, 3, 10]:
+        assert app.list_all_products(offset=offset, limit=4)["products"] == dict(
+            names[offset : offset + 4]
+        )
+    name_to_id = {p.name: p.product_id for p in products.values()}
+    for query in ["shoe 3", "Shoe", "ru", "missing"]:
+        expected = [
+            products[name_to_id[p.name]]
+            for p in products.values()
+            if query.lower() in p.name.lower()
+        ]
+        assert app.search_product(query, limit=100) == expected
+    for product_id, product in products.items():
+        for item_id in product.variants:
+            assert app._get_item(item_id)["product_id"] == product_id
+    assert app._get_item("missing") == {}
+
+    # Items replaced outside of the app are detected on lookup
+    product = app.products["8310926033"]
+    item_id = next(iter(product.variants))
+    product.variants[item_id] = Item(price=1.0, item_id=item_id)
+    assert app._get_item(item_id)["price"] == 1.0
+    app.update_item(item_id=item_id, new_price=2.0)
+    assert product.variants[item_id].price == 2.0
+    # Lookups of unknown items do not rebuild the catalog
+    with patch.object(ProductCatalog, "_index_items", side_effect=AssertionError):
+        assert app._get_item("missing") == {}
+        with pytest.raises(ValueError):
+            app.update_item(item_id="missing", new_price=2.0)
+
+
+def test_search_product_with_duplicate_names():
+    app = make_catalog_app()
+    results = app.search_product("Shoe 3", limit=100)
+    assert len(results) == 4
+    assert len({p.product_id for p in results}) == 1
+
+    app = make_catalog_app(collapse_duplicate_names=False)
+    results = app.search_product("Shoe 3", limit=100)
+    assert [p.product_id for p in results] == [
+        p.product_id for p in app.products.values() if p.name == "Shoe 3"
+    ]
+
+
+def test_checkout_total_matches_scan():
+    app = make_catalog_app()
+    environment = Environment()
+    environment.register_apps([app])
+    for i, product in enumerate(app.products.values()):
+        for item_id, item in product.variants.items():
+            if item.available:
+                app.add_to_cart(item_id, quantity=i % 3 + 1)
+                app.add_discount_code(item_id, {"SALE": 7.5 + i % 4})
+
+    expected = 0
+    for item_id, cart_item in app.cart.items():
+        expected += (
+            cart_item.price
+            * cart_item.quantity
+            * (1 - app.discount_codes[item_id]["SALE"] / 100)
+        )
+    order_id = app.checkout(discount_code="SALE")
+    assert app.orders[order_id].order_total == expected
+    assert type(app.orders[order_id].order_total) is float
@@ -0,0 +1,161 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import random
+import re
+
+from are.simulation.apps.contacts import Contact, ContactsApp
+from are.simulation.apps.messaging_v2 import MessageV2, MessagingAppV2
+from are.simulation.apps.utils.text_index import TextIndex, get_regex_literal
+
+
+def test_text_index_candidates():
+    index = TextIndex()
+    index.add("a", ["Hello World", None])
+    index.add("b", ["hello there"])
+    index.add("c", ["Goodbye"])
+
+    assert index.candidates("hello") == {"a", "b"}
+    assert index.candidates("WORLD") == {"a"}
+    assert index.candidates("missing") == set()
+    # Too short to use the index
+    assert index.candidates("he") is None
+
+    index.extend("c", ["world tour"])
+    assert index.candidates("world") == {"a", "c"}
+
+    # Re-registering a record replaces its texts
+    index.add("a", ["Nothing"])
+    assert index.candidates("world") == {"c"}
+
+    index.remove("c")
+    assert "c" not in index
+    assert index.candidates("world") == set()
+    assert len(index) == 2
+
+    index.clear()
+    assert len(index) == 0
+
+
+def test_text_index_sort_keys():
+    index = TextIndex()
+    for key in ["a", "b", "c"]:
+        index.add(key, [f"record {key}"])
+
+    # Keys are ordered as in a dict: re-registering keeps the position, re-adding moves to the end
+    index.add("a", ["record a edited"])
+    index.remove("b")
+    index.add("b", ["record b"])
+    assert index.sort_keys(index.candidates("record") or set()) == ["a", "c", "b"]
+
+
+def test_text_index_regex_candidates():
+    assert get_regex_literal("Taylor Swift") == "Taylor Swift"
+    assert get_regex_literal("Tay.or") is None
+    assert get_regex_literal("café") is None
+
+    index = TextIndex()
+    index.add("ascii", ["Taylor Swift"])
+    index.add("unicode", ["Café"])
+
+    # Records with non ASCII texts are always candidates of regex queries
+    assert index.regex_candidates("taylor") == {"ascii", "unicode"}
+    assert index.regex_candidates("tay.or") is None
+    assert index.regex_candidates("ta") is None
+
+
+def test_contacts_search_after_edits():
+    app = ContactsApp()
+    contact_id = app.add_contact(
+        Contact(first_name="John", last_name="Doe", phone="+1 555 0100")
+    )
+    app.add_contact(Contact(first_name="Jane", last_name="Smith"))
+    assert [c.contact_id for c in app.search_contacts("doe j")] == [contact_id]
+
+    app.edit_contact(contact_id, {"last_name": "Brown"})
+    assert app.search_contacts("doe") == []
+    assert [c.contact_id for c in app.search_contacts("john brown")] == [contact_id]
+
+    app.delete_contact(contact_id)
+    assert app.search_contacts("john") == []
+    assert len(app.search_contacts("jane")) == 1
+
+
+def test_contacts_search_follows_contacts_order():
+    app = ContactsApp()
+    contacts = [Contact(first_name=f"Alex {i}", last_name="Doe") for i in range(5)]
+    app.add_contacts(contacts)
+    app.delete_contact(contacts[0].contact_id)
+    app.add_contact(contacts[0])
+
+    def scan(query):
+        return [c for c in app.contacts.values() if query in c.first_name.lower()]
+
+    assert app.search_contacts("alex") == scan("alex")
+    assert app.search_contacts("alex")[-1] is contacts[0]
+
+    # A contacts dict of the same size replacing the indexed one is re-indexed
+    app.contacts = {
+        c.contact_id: c
+        for c in [Contact(first_name=f"Sam {i}", last_name="Roe") for i in range(5)]
+    }
+    assert app.search_contacts("alex") == []
+    assert app.search_contacts("sam") == scan("sam")
+
+
+def test_messaging_search_matches_scan():
+    rng = random.Random(0)
+    words = ["apple", "banana", "Cherry", "date", "elder", "FIG", "grape", "café"]
+    app = MessagingAppV2(current_user_id="42", current_user_name="Me")
+    app.add_users([f"user {i}" for i in range(10)])
+    user_ids = list(app.name_to_id.values())
+
+    def scan(query):
+        return [
+            c.conversation_id
+            for c in app.conversations.values()
+            if app._conversation_matches(c, query.lower())
+        ]
+
+    def regex_scan(query):
+        get_match = re.compile(query, re.IGNORECASE).search
+        return [
+            c.conversation_id
+            for c in app.conversations.values()
+            if app._regex_conversation_matches(c, get_match)
+        ]
+
+    for i in range(50):
+        conversation_id = app.create_group_conversation(
+            user_ids=rng.sample(user_ids[1:], 3),
+            title=" ".join(rng.sample(words, 2)) if i % 2 else None,
+        )
+        for _ in range(rng.randint(0, 5)):
+            app.send_message_to_group_conversation(
+                conversation_id=conversation_id,
+                content=" ".join(rng.choices(words, k=4)),
+            )
+        if i % 10 == 0:
+            # Scenarios may modify conversations without going through the app
+            app.conversations[conversation_id].messages.append(
+                MessageV2(sender_id=user_ids[1], content="Direct kiwi")
+            )
+            app.search("kiwi")
+            app.conversations[conversation_id].messages.append(
+                MessageV2(sender_id=user_ids[1], content="Direct lemon")
+            )
+        if i % 7 == 0:
+            app.change_conversation_title(conversation_id, "renamed melon")
+
+    queries = words + ["kiwi", "lemon", "melon", "user 3", "APP", "ap", "zzz"]
+    for query in queries:
+        assert app.search(query) == scan(query)
+        assert app.regex_search(query) == regex_scan(query)
+    assert app.regex_search("gr.pe") == regex_scan("gr.pe")
+
+    del app.conversations[next(iter(app.conversations))]
+    assert app.search("apple") == scan("apple")
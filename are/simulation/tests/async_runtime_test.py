@@ -0,0 +1,71 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import asyncio
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+
+from are.simulation.async_runtime import get_background_loop, run, submit
+from are.simulation.environment import Environment
+from are.simulation.tests.environment_test import DummyApp
+
+
+async def add(a: int, b: int) -> int:
+    await asyncio.sleep(0)
+    return a + b
+
+
+def test_coroutines_share_the_background_loop():
+    results = []
+    threads = [
+        threading.Thread(target=lambda i=i: results.append(run(add(i, 1))))
+        for i in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == list(range(1, 11))
+    assert submit(add(1, 2)).result(timeout=10) == 3
+    assert get_background_loop() is get_background_loop()
+
+
+def test_timeout_cancels_coroutine():
+    cancelled = threading.Event()
+
+    async def wait_forever():
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        run(wait_forever(), timeout=0.05)
+    assert cancelled.wait(timeout=10)
+
+
+def test_stop_event_cancels_coroutine():
+    stop_event = threading.Event()
+    future = submit(asyncio.sleep(3600), stop_event=stop_event)
+    threading.Timer(0.05, stop_event.set).start()
+    with pytest.raises(CancelledError):
+        future.result(timeout=10)
+
+    # Coroutines submitted after the stop are cancelled right away
+    with pytest.raises(CancelledError):
+        run(add(1, 2), stop_event=stop_event)
+
+
+def test_apps_get_the_stop_event_of_their_environment():
+    env = Environment()
+    app = DummyApp()
+    env.register_apps([app])
+    assert app.stop_event is env.stop_event
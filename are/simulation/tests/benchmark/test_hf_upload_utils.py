@@ -0,0 +1,237 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import shutil
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pyarrow.parquet as pq
+
+from are.simulation.benchmark.hf_upload_utils import (
+    ParquetTraceWriter,
+    build_trace_rows,
+    upload_consolidated_results_to_hf,
+)
+from are.simulation.scenarios.config import MultiScenarioRunnerConfig
+from are.simulation.scenarios.validation_result import (
+    MultiScenarioValidationResult,
+    ScenarioValidationResult,
+)
+
+STANDARD_KEY = ("standard", "execution", 0.0, False, False)
+NOISE_KEY = ("noise", "mini", 0.0, True, True)
+
+
+def create_results(
+    tmp_path: Path, num_scenarios: int
+) -> dict[tuple[str, str, float, bool, bool], MultiScenarioValidationResult]:
+    results = {}
+    for result_key in [STANDARD_KEY, NOISE_KEY]:
+        result = MultiScenarioValidationResult(
+            run_config=MultiScenarioRunnerConfig(model="model")
+        )
+        for i in range(num_scenarios):
+            trace_path = tmp_path / f"{result_key[0]}_{i}.json"
+            trace_path.write_text(f'{{"trace": {i}}}')
+            result.add_result(
+                ScenarioValidationResult(
+                    success=i % 2 == 0, export_path=str(trace_path)
+                ),
+                f"scenario_{i}",
+                1,
+            )
+        results[result_key] = result
+    return results
+
+
+class FakeHubApi:
+    """Dataset repository of the Hub holding the paths of its files."""
+
+    def __init__(self, files: set[str]):
+        self.files = set(files)
+
+    def create_repo(self, **kwargs: Any) -> None:
+        pass
+
+    def upload_folder(
+        self,
+        folder_path: str,
+        allow_patterns: list[str],
+        delete_patterns: list[str] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        uploaded = {
+            path.relative_to(folder_path).as_posix()
+            for path in Path(folder_path).rglob("*")
+            if path.is_file()
+        }
+        uploaded = {
+            path
+            for path in uploaded
+            if any(fnmatch(path, pattern) for pattern in allow_patterns)
+        }
+        self.files = {
+            path
+            for path in self.files
+            if not any(fnmatch(path, pattern) for pattern in delete_patterns or [])
+        } | uploaded
+
+
+def read_rows(paths: list[Path]) -> list[dict]:
+    rows = []
+    for path in paths:
+        rows.extend(pq.read_table(path).to_pylist())
+    return rows
+
+
+def test_parquet_trace_writer_streams_row_groups(tmp_path):
+    results = create_results(tmp_path, 5)
+    writer = ParquetTraceWriter(
+        tmp_path / "dataset", "test", row_group_size=2, max_rows_per_shard=4
+    )
+    on_result = writer.result_callback(STANDARD_KEY)
+    run_config = results[STANDARD_KEY].run_config
+    for (scenario_id, run_number), scenario_result in results[
+        STANDARD_KEY
+    ].scenario_results.items():
+        on_result(scenario_id, run_number, scenario_result, run_config)
+    # Full row groups are written as the results arrive
+    assert pq.read_metadata(writer.shards["execution"][0]) is not None
+    writer.write_results({NOISE_KEY: results[NOISE_KEY]})
+    writer.close()
+
+    assert writer.row_counts == {"execution": 5, "mini_noise": 5}
+    shards = writer.shards["execution"]
+    assert [path.name for path in shards] == [
+        "test-00000.parquet",
+        "test-00001.parquet",
+    ]
+    metadata = pq.read_metadata(shards[0])
+    assert metadata.num_rows == 4
+    assert metadata.num_row_groups == 2
+    assert metadata.row_group(0).column(0).compression == "ZSTD"
+
+    expected = build_trace_rows(
+        results[STANDARD_KEY].scenario_results, STANDARD_KEY, results[STANDARD_KEY]
+    )
+    rows = read_rows(shards)
+    assert [row["data"] for row in rows] == [row["data"] for row in expected]
+    assert [row["status"] for row in rows] == [row["status"] for row in expected]
+    assert rows[0]["run_config"] == expected[0]["run_config"]
+    assert rows[0]["exception_type"] is None
+
+    writer.discard("mini_noise")
+    assert writer.config_names == ["execution"]
+    assert not list((tmp_path / "dataset" / "mini_noise").glob("*.parquet"))
+
+
+def test_upload_pushes_shards(tmp_path):
+    results = create_results(tmp_path, 3)
+    writer = ParquetTraceWriter(tmp_path / "dataset", "validation")
+    # A shard left over by a previous run is replaced
+    (tmp_path / "dataset" / "execution").mkdir(parents=True)
+    (tmp_path / "dataset" / "execution" / "validation-00001.parquet").write_text("")
+    writer.write_results(results)
+    writer.close()
+    api = MagicMock()
+
+    assert upload_consolidated_results_to_hf(
+        results,
+        "org/dataset",
+        "model",
+        "provider",
+        False,
+        "gaia2",
+        "validation",
+        trace_writer=writer,
+        api=api,
+    )
+
+    api.create_repo.assert_called_once_with(
+        repo_id="org/dataset", repo_type="dataset", private=True, exist_ok=True
+    )
+    upload = api.upload_folder.call_args.kwargs
+    folder = Path(upload["folder_path"])
+    assert sorted(upload["delete_patterns"]) == [
+        "execution/validation-*.parquet",
+        "mini_noise/validation-*.parquet",
+    ]
+    assert sorted(upload["allow_patterns"]) == sorted(
+        [
+            "execution/validation-*.parquet",
+            "mini_noise/validation-*.parquet",
+            "README.md",
+            "computed_stats.json",
+        ]
+    )
+    assert sorted(path.name for path in (folder / "execution").iterdir()) == [
+        "validation-00000.parquet"
+    ]
+    assert "execution/validation-*" in (folder / "README.md").read_text()
+    assert (folder / "computed_stats.json").exists()
+    assert len(read_rows(writer.shards["mini_noise"])) == 3
+
+
+def test_upload_replaces_shards_on_the_hub(tmp_path):
+    results = create_results(tmp_path, 2)
+    writer = ParquetTraceWriter(tmp_path / "dataset", "validation")
+    writer.write_results(results)
+    writer.close()
+    api = FakeHubApi(
+        {
+            # Written by push_to_hub, then by a submission with more shards
+            "execution/validation-00000-of-00001.parquet",
+            "execution/validation-00003.parquet",
+            # Other splits and unrelated files are kept
+            "execution/test-00000.parquet",
+            ".gitattributes",
+        }
+    )
+
+    assert upload_consolidated_results_to_hf(
+        results,
+        "org/dataset",
+        "model",
+        "provider",
+        False,
+        "gaia2",
+        "validation",
+        trace_writer=writer,
+        api=api,
+    )
+
+    assert sorted(api.files) == [
+        ".gitattributes",
+        "README.md",
+        "computed_stats.json",
+        "execution/test-00000.parquet",
+        "execution/validation-00000.parquet",
+        "mini_noise/validation-00000.parquet",
+    ]
+
+
+def test_upload_without_writer_keeps_shards_on_failure(tmp_path):
+    results = create_results(tmp_path, 2)
+    api = MagicMock()
+    api.upload_folder.side_effect = RuntimeError("offline")
+
+    assert not upload_consolidated_results_to_hf(
+        results,
+        "org/dataset",
+        "model",
+        "provider",
+        True,
+        "gaia2",
+        "test",
+        api=api,
+    )
+    folder = Path(api.upload_folder.call_args.kwargs["folder_path"])
+    rows = read_rows(sorted(folder.glob("*/test-*.parquet")))
+    assert len(rows) == 4
+    shutil.rmtree(folder)
@@ -0,0 +1,174 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import json
+from unittest.mock import Mock, patch
+
+import polars as pl
+import pytest
+
+from are.simulation.benchmark.rejudge import (
+    find_trace_paths,
+    group_traces,
+    load_judge_config,
+    rejudge_traces,
+    save_rejudge_results,
+)
+from are.simulation.scenarios.validation_result import ScenarioValidationResult
+from are.simulation.tests.benchmark.test_huggingface_loader import (
+    create_mock_exported_trace,
+)
+
+
+def write_traces(tmp_path):
+    """Write two runs of one scenario, one run of another and a lite trace."""
+    hf_dir = tmp_path / "hf"
+    hf_dir.mkdir()
+    for scenario_id, run_number in [
+        ("scenario_a", 1),
+        ("scenario_a", 2),
+        ("scenario_b", 1),
+    ]:
+        trace = create_mock_exported_trace(scenario_id, run_number)
+        trace.metadata.definition.config = "execution"
+        path = hf_dir / f"{scenario_id}_run_{run_number}.json"
+        path.write_text(trace.model_dump_json())
+    lite_dir = tmp_path / "lite"
+    lite_dir.mkdir()
+    (lite_dir / "scenario_a_run_1.json").write_text(
+        json.dumps({"scenario_id": "scenario_a", "validation_decision": "Valid"})
+    )
+
+
+def test_group_traces(tmp_path):
+    """Test that runs of the same scenario are grouped and other files are skipped."""
+    write_traces(tmp_path)
+
+    paths = find_trace_paths(str(tmp_path))
+    assert len(paths) == 4
+
+    groups = group_traces(paths)
+    assert len(groups) == 2
+    runs = {
+        group.traces[0].scenario_id: [trace.run_number for trace in group.traces]
+        for group in groups
+    }
+    assert runs == {"scenario_a": [1, 2], "scenario_b": [1]}
+    assert all(trace.config == "execution" for g in groups for trace in g.traces)
+    assert all(trace.phase_name == "standard" for g in groups for trace in g.traces)
+
+
+def test_rejudge_traces_preprocesses_each_scenario_once(tmp_path):
+    """Test that the oracle run is shared by the traces of a scenario."""
+    write_traces(tmp_path)
+    validate = Mock(return_value=ScenarioValidationResult(success=True))
+
+    def preprocess(scenario, config, judge_options=None):
+        assert config.judge_only
+        assert judge_options is None
+        scenario.validate = validate
+
+    with patch(
+        "are.simulation.benchmark.rejudge.preprocess_scenario_from_config",
+        side_effect=preprocess,
+    ) as mock_preprocess:
+        results = rejudge_traces(str(tmp_path), executor_type="sequential")
+
+    assert mock_preprocess.call_count == 2
+    assert validate.call_count == 3
+    assert list(results.keys()) == ["unknown"]
+    (multi_result,) = results["unknown"].values()
+    assert set(multi_result.scenario_results.keys()) == {
+        ("scenario_a", 1),
+        ("scenario_a", 2),
+        ("scenario_b", 1),
+    }
+    assert multi_result.successful_count == 3
+    assert all(
+        result.export_path is not None
+        for result in multi_result.scenario_results.values()
+    )
+
+    save_rejudge_results(results, str(tmp_path / "out"))
+    df = pl.read_parquet(tmp_path / "out" / "rejudge_results.parquet")
+    assert df.height == 3
+    assert (tmp_path / "out" / "unknown" / "benchmark_stats.json").exists()
+
+
+def test_rejudge_traces_reports_preprocessing_failures(tmp_path):
+    """Test that a failing oracle run fails all the traces of its scenario."""
+    write_traces(tmp_path)
+
+    with patch(
+        "are.simulation.benchmark.rejudge.preprocess_scenario_from_config",
+        side_effect=Exception("Oracle run failed"),
+    ):
+        results = rejudge_traces(str(tmp_path), executor_type="sequential")
+
+    (multi_result,) = results["unknown"].values()
+    assert multi_result.failed_count == 3
+    assert all(
+        "Oracle run failed" in str(result.exception)
+        for result in multi_result.scenario_results.values()
+    )
+
+
+def test_rejudge_traces_reports_groups_without_results(tmp_path):
+    """Test that a group judged without results fails all its traces."""
+    write_traces(tmp_path)
+
+    with patch("are.simulation.benchmark.rejudge.rejudge_trace_group", return_value=[]):
+        results = rejudge_traces(str(tmp_path), executor_type="sequential")
+
+    (multi_result,) = results["unknown"].values()
+    assert multi_result.failed_count == 3
+
+
+def test_rejudge_traces_forwards_judge_options(tmp_path):
+    """Test that the judge config file options reach the preprocessing of each scenario."""
+    write_traces(tmp_path)
+    config_path = tmp_path / "judge.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "engine": {"model_name": "judge-model", "provider": "mock"},
+                "pre_event_tolerance_seconds": 5.0,
+            }
+        )
+    )
+    engine_config, judge_options = load_judge_config(str(config_path))
+    assert engine_config is not None
+    assert engine_config.model_name == "judge-model"
+    assert judge_options == {"pre_event_tolerance_seconds": 5.0}
+
+    def preprocess(scenario, config, judge_options=None):
+        assert config.judge_engine_config.model_name == "judge-model"
+        assert judge_options == {"pre_event_tolerance_seconds": 5.0}
+        scenario.validate = Mock(return_value=ScenarioValidationResult(success=True))
+
+    with patch(
+        "are.simulation.benchmark.rejudge.preprocess_scenario_from_config",
+        side_effect=preprocess,
+    ):
+        results = rejudge_traces(
+            str(tmp_path / "hf"),
+            judge_engine_config=engine_config,
+            judge_options=judge_options,
+            executor_type="sequential",
+        )
+
+    (multi_result,) = results["unknown"].values()
+    assert multi_result.successful_count == 3
+
+
+def test_load_judge_config_rejects_unknown_fields(tmp_path):
+    """Test that judge config fields which cannot be set are reported."""
+    config_path = tmp_path / "judge.json"
+    config_path.write_text(json.dumps({"engine_name": "judge-model"}))
+
+    with pytest.raises(ValueError, match="engine_name"):
+        load_judge_config(str(config_path))
@@ -0,0 +1,142 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import json
+import random
+from unittest.mock import patch
+
+from are.simulation.benchmark.scenario_executor import (
+    get_run_seed,
+    multiply_scenarios_iterator,
+    preprocess_scenarios_iterator,
+    share_initialization_scenarios_iterator,
+)
+from are.simulation.data_handler.importer import JsonScenarioImporter
+from are.simulation.scenarios.config import MultiScenarioRunnerConfig
+from are.simulation.scenarios.scenario_imported_from_json.benchmark_scenario import (
+    BenchmarkScenarioImportedFromJson,
+)
+from are.simulation.tests.scenarios.utils.test_oracle_cache import create_trace_json
+from are.simulation.utils.countable_iterator import CountableIterator
+from are.simulation.utils.serialization import EnumEncoder
+
+
+def create_scenarios_iterator(
+    scenario_ids: list[str], trace_json: str | None = None
+) -> CountableIterator[tuple[BenchmarkScenarioImportedFromJson, None]]:
+    trace_json = trace_json or create_trace_json()
+    scenarios = []
+    for scenario_id in scenario_ids:
+        scenario, _, _ = JsonScenarioImporter().import_from_json_to_benchmark(
+            trace_json, load_completed_events=False
+        )
+        scenario.scenario_id = scenario_id
+        scenarios.append((scenario, None))
+    return CountableIterator(iter(scenarios), len(scenarios))
+
+
+def get_app_states(scenario: BenchmarkScenarioImportedFromJson) -> dict[str, str]:
+    return {
+        app.name: json.dumps(app.get_state(), cls=EnumEncoder)
+        for app in scenario.apps or []
+    }
+
+
+def test_shared_initialization_initializes_each_scenario_once():
+    config = MultiScenarioRunnerConfig(model="model", oracle=True)
+    init_and_populate_apps = BenchmarkScenarioImportedFromJson.init_and_populate_apps
+
+    with patch.object(
+        BenchmarkScenarioImportedFromJson,
+        "init_and_populate_apps",
+        autospec=True,
+        side_effect=init_and_populate_apps,
+    ) as populate:
+        shared = share_initialization_scenarios_iterator(
+            create_scenarios_iterator(["scenario_a", "scenario_b"]), 3, config
+        )
+        assert len(shared) == 6
+        runs = list(preprocess_scenarios_iterator(shared, config))
+
+    assert populate.call_count == 2
+    assert [(s.scenario_id, s.run_number) for s, _ in runs] == [
+        ("scenario_a", 1),
+        ("scenario_a", 2),
+        ("scenario_a", 3),
+        ("scenario_b", 1),
+        ("scenario_b", 2),
+        ("scenario_b", 3),
+    ]
+    # The runs do not share any app
+    apps = [id(app) for scenario, _ in runs for app in scenario.apps or []]
+    assert len(apps) == len(set(apps))
+    for scenario, _ in runs:
+        for event in scenario.events:
+            action = getattr(event, "action", None)
+            if action is not None:
+                assert action.app is scenario.get_app(action.app.name)
+
+
+def test_shared_initialization_matches_multiplied_scenarios():
+    config = MultiScenarioRunnerConfig(model="model", oracle=True)
+    trace_json = create_trace_json()
+    multiplied = list(
+        preprocess_scenarios_iterator(
+            multiply_scenarios_iterator(
+                create_scenarios_iterator(["scenario"], trace_json), 2
+            ),
+            config,
+        )
+    )
+    shared = list(
+        preprocess_scenarios_iterator(
+            share_initialization_scenarios_iterator(
+                create_scenarios_iterator(["scenario"], trace_json), 2, config
+            ),
+            config,
+        )
+    )
+
+    assert len(shared) == len(multiplied) == 2
+    for (shared_scenario, _), (scenario, _) in zip(shared, multiplied):
+        assert shared_scenario.run_number == scenario.run_number
+        assert get_app_states(shared_scenario) == get_app_states(scenario)
+        assert [e.event_id for e in shared_scenario.events] == [
+            e.event_id for e in scenario.events
+        ]
+
+
+def test_shared_initialization_seeds_each_run():
+    config = MultiScenarioRunnerConfig(model="model", oracle=True)
+    scenario, _ = next(iter(create_scenarios_iterator(["scenario"])))
+    seed = scenario.seed
+    runs = list(
+        share_initialization_scenarios_iterator(
+            CountableIterator(iter([(scenario, None)]), 1), 3, config
+        )
+    )
+
+    assert [scenario.seed for scenario, _ in runs] == [
+        get_run_seed(seed, run_number) for run_number in [1, 2, 3]
+    ]
+    assert len({scenario.seed for scenario, _ in runs}) == 3
+    # The apps of each run draw from the seed of the run
+    app_seeds = [
+        {app.name: app.seed for app in scenario.apps or []} for scenario, _ in runs
+    ]
+    assert app_seeds[0].keys() == app_seeds[1].keys()
+    assert all(app_seeds[0][name] != app_seeds[1][name] for name in app_seeds[0])
+    for scenario, _ in runs:
+        for app in scenario.apps or []:
+            assert app.rng.getstate() == random.Random(app.seed).getstate()
+    # The runs share the populated apps
+    assert get_app_states(runs[0][0]) == get_app_states(runs[1][0])
+
+
+def test_get_run_seed_is_stable():
+    # Derived with SHA-512 rather than hash(), so the same in every process
+    assert get_run_seed(0, 1) == 2909505964
@@ -0,0 +1,84 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import threading
+
+from are.simulation.change_feed import ChangeFeed
+from are.simulation.environment import Environment
+from are.simulation.tests.environment_test import DummyApp
+
+
+def test_changes_are_merged_after_sequence():
+    feed = ChangeFeed()
+    first = feed.publish(events=["a"], app_names=["App1"])
+    feed.publish(events=["b", "c"], app_names=["App2"], world_logs_changed=True)
+    feed.publish(scenario_changed=True)
+
+    changes = feed.get_changes(0)
+    assert changes is not None
+    assert changes.sequence == 3
+    assert changes.events == ["a", "b", "c"]
+    assert changes.app_names == {"App1", "App2"}
+    assert changes.world_logs_changed and changes.scenario_changed
+
+    changes = feed.get_changes(first)
+    assert changes is not None
+    assert changes.events == ["b", "c"]
+    assert changes.app_names == {"App2"}
+
+    changes = feed.get_changes(feed.sequence)
+    assert changes is not None and changes.is_empty
+
+
+def test_resync_after_reset_or_truncated_history():
+    feed = ChangeFeed(max_history=2)
+    feed.publish(events=["a"])
+    feed.publish(reset=True)
+    assert feed.get_changes(1) is None
+    assert feed.get_changes(2) is not None
+
+    for event in ["b", "c", "d"]:
+        feed.publish(events=[event])
+    # The change with event b was dropped from the history
+    assert feed.get_changes(2) is None
+    changes = feed.get_changes(3)
+    assert changes is not None and changes.events == ["c", "d"]
+    # Unknown sequence numbers resync too
+    assert feed.get_changes(10) is None
+
+
+def test_wait_wakes_up_on_publish():
+    feed = ChangeFeed()
+    assert feed.wait(0, timeout=0.01) == 0
+
+    timer = threading.Timer(0.05, feed.publish)
+    timer.start()
+    assert feed.wait(0, timeout=10) == 1
+    timer.join()
+
+
+def test_environment_publishes_changes():
+    env = Environment()
+    app = DummyApp()
+    env.register_apps([app])
+
+    app.log_stuff("hello")
+    changes = env.changes.get_changes(0)
+    assert changes is not None
+    assert [event.event_id for event in changes.events] == [
+        event.event_id for event in env.event_log.list_view()
+    ]
+    assert changes.app_names == {app.name}
+
+    sequence = env.changes.sequence
+    env.reset_app_states()
+    changes = env.changes.get_changes(sequence)
+    assert changes is not None and app.name in changes.app_names
+
+    sequence = env.changes.sequence
+    env.delete_all_completed_events()
+    assert env.changes.get_changes(sequence) is None
@@ -0,0 +1,226 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import json
+from typing import Any
+
+from are.simulation.agents.agent_log import StepLog, ThoughtLog
+from are.simulation.apps import AgentUserInterface
+from are.simulation.apps.app import App
+from are.simulation.checkpoints import CheckpointStore
+from are.simulation.environment import Environment
+from are.simulation.replay import replay_logs
+from are.simulation.tool_utils import app_tool
+from are.simulation.types import (
+    CompletedEvent,
+    ConditionCheckAction,
+    EventMetadata,
+    EventType,
+    OperationType,
+    disable_events,
+    event_registered,
+)
+from are.simulation.utils import EnumEncoder, get_state_dict
+
+
+class NotesApp(App):
+    def __init__(self):
+        super().__init__()
+        self.notes: list[str] = []
+        self.calls = 0
+
+    def get_state(self) -> dict[str, Any]:
+        return get_state_dict(self, ["notes"])
+
+    def load_state(self, state_dict: dict[str, Any]):
+        self.notes = list(state_dict["notes"])
+
+    @app_tool()
+    @event_registered()
+    def add_note(self, note: str) -> str:
+        self.calls += 1
+        # Use the random generator so that its state matters
+        self.notes.append(f"{note}-{self.rng.randint(0, 1000)}")
+        return note
+
+    @event_registered(operation_type=OperationType.WRITE, event_type=EventType.ENV)
+    def receive_note(self, note: str) -> str:
+        self.notes.append(note)
+        return note
+
+
+def create_env(
+    checkpoints: CheckpointStore | None = None,
+) -> tuple[Environment, NotesApp]:
+    env = Environment()
+    app = NotesApp()
+    env.register_apps([AgentUserInterface(), app])
+    env.checkpoints = checkpoints
+    return env, app
+
+
+def run_steps(
+    env: Environment, app: NotesApp, steps: int, start_time: float | None = None
+) -> None:
+    """
+    Run agent steps adding a note each, one second apart from `start_time` when it is set,
+    so that replays complete their events in the same order as the run.
+    """
+    for i in range(steps):
+        timestamp = i if start_time is None else start_time + i
+        if start_time is not None:
+            env.time_manager.reset(start_time=timestamp)
+        env.append_to_world_logs(
+            StepLog(iteration=i, timestamp=timestamp, agent_id="agent")
+        )
+        env.append_to_world_logs(
+            ThoughtLog(content=f"step {i}", timestamp=timestamp, agent_id="agent")
+        )
+        app.add_note(f"note {i}")
+
+
+def test_replay_restores_nearest_checkpoint():
+    checkpoints = CheckpointStore()
+    env, app = create_env(checkpoints)
+    run_steps(env, app, 4)
+    # A checkpoint is taken before each step but the first one
+    assert len(checkpoints) == 3
+    world_logs = env.get_world_logs()
+
+    # Replay up to the thought of the third step
+    prefix = world_logs[:8]
+    replayed_env, replayed_app = create_env(checkpoints)
+    replay_logs(prefix, replayed_env, checkpoints)
+    scratch_env, scratch_app = create_env()
+    replay_logs(prefix, scratch_env)
+
+    assert replayed_app.notes == scratch_app.notes == app.notes[:2]
+    assert replayed_app.rng.getstate() == scratch_app.rng.getstate()
+    assert [event.event_id for event in replayed_env.event_log.list_view()][:2] == [
+        event.event_id for event in env.event_log.list_view()[:2]
+    ]
+    # Only the action after the checkpoint was replayed
+    assert replayed_app.calls == 0
+    assert scratch_app.calls == 2
+    # The checkpoints of the steps which are replaced were dropped
+    assert len(checkpoints) == 2
+
+    # The replayed run takes checkpoints again and can itself be replayed
+    run_steps(replayed_env, replayed_app, 1)
+    assert len(checkpoints) == 3
+    branch_env, branch_app = create_env(checkpoints)
+    replay_logs(replayed_env.get_world_logs(), branch_env, checkpoints)
+    assert branch_app.notes == replayed_app.notes
+
+
+def test_replay_without_matching_checkpoint():
+    checkpoints = CheckpointStore()
+    env, app = create_env(checkpoints)
+    run_steps(env, app, 2)
+    other_env, other_app = create_env()
+    run_steps(other_env, other_app, 2)
+
+    replayed_env, replayed_app = create_env(checkpoints)
+    replay_logs(other_env.get_world_logs(), replayed_env, checkpoints)
+    assert replayed_app.calls == 2
+    assert len(checkpoints) == 0
+
+
+def test_checkpoints_share_unchanged_states_and_respect_budget():
+    checkpoints = CheckpointStore()
+    env, app = create_env(checkpoints)
+    env.append_to_world_logs(StepLog(iteration=0, timestamp=0, agent_id="agent"))
+    env.append_to_world_logs(StepLog(iteration=1, timestamp=1, agent_id="agent"))
+    size = checkpoints.size
+    # Nothing changed, the states are shared
+    env.append_to_world_logs(StepLog(iteration=2, timestamp=2, agent_id="agent"))
+    assert len(checkpoints) == 2
+    assert checkpoints.size == size
+
+    app.add_note("note")
+    env.append_to_world_logs(StepLog(iteration=3, timestamp=3, agent_id="agent"))
+    assert checkpoints.size > size
+
+    app.add_note("other note")
+    # Only the states of the next checkpoint fit
+    checkpoints.max_bytes = sum(
+        len(json.dumps(app.get_state(), cls=EnumEncoder)) for app in env.apps.values()
+    )
+    env.append_to_world_logs(StepLog(iteration=4, timestamp=4, agent_id="agent"))
+    assert checkpoints.size == checkpoints.max_bytes
+    # The oldest checkpoints were evicted
+    assert len(checkpoints) == 1
+    assert checkpoints.find(env.world_logs[:2]) is None
+    checkpoint = checkpoints.find(env.world_logs)
+    assert checkpoint is not None
+    assert checkpoint.world_log_count == len(env.world_logs) - 1
+
+
+def test_checkpoint_matches_full_replay():
+    checkpoints = CheckpointStore()
+    env, app = create_env(checkpoints)
+    run_steps(env, app, 1, start_time=0)
+    # An environment event is logged as an action and replayed, a condition check is not
+    env.time_manager.reset(start_time=1)
+    app.receive_note("from env")
+    env.add_to_log(
+        CompletedEvent(
+            event_type=EventType.CONDITION,
+            action=ConditionCheckAction(function=lambda env: True),
+            metadata=EventMetadata(return_value=True),
+            event_time=1,
+        )
+    )
+    run_steps(env, app, 1, start_time=2)
+    world_logs = env.get_world_logs()
+
+    checkpoint = checkpoints.find(world_logs)
+    assert checkpoint is not None
+    # The events are copied when the checkpoint is taken
+    logged_events = env.event_log.list_view()
+    assert not any(
+        event is logged
+        for event in checkpoint.completed_events
+        for logged in logged_events
+    )
+
+    replayed_env, replayed_app = create_env(checkpoints)
+    replay_logs(world_logs, replayed_env, checkpoints)
+    scratch_env, scratch_app = create_env()
+    replay_logs(world_logs, scratch_env)
+
+    assert replayed_app.notes == scratch_app.notes == app.notes
+    assert [event.event_type for event in replayed_env.event_log.list_view()] == [
+        event.event_type for event in scratch_env.event_log.list_view()
+    ]
+    assert [event.event_type for event in scratch_env.event_log.list_view()] == [
+        EventType.AGENT,
+        EventType.ENV,
+        EventType.AGENT,
+    ]
+    assert EventType.CONDITION not in [
+        event.event_type for event in replayed_env.event_log.list_view()
+    ]
+
+
+def test_checkpoint_keeps_changes_without_events():
+    checkpoints = CheckpointStore()
+    env, app = create_env(checkpoints)
+    run_steps(env, app, 1)
+    with disable_events():
+        app.add_note("without event")
+    run_steps(env, app, 1)
+    world_logs = env.get_world_logs()
+
+    replayed_env, replayed_app = create_env(checkpoints)
+    replay_logs(world_logs, replayed_env, checkpoints)
+    scratch_env, scratch_app = create_env()
+    replay_logs(world_logs, scratch_env)
+
+    # The checkpoint restores the change, which a full replay does not reproduce
+    assert replayed_app.notes == app.notes
+    assert len(scratch_app.notes) == len(app.notes) - 1
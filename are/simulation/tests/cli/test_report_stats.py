@@ -6,10 +6,13 @@
 
 
 import json
+import random
 import tempfile
 from pathlib import Path
+from typing import Any
 from unittest.mock import Mock, patch
 
+import numpy as np
 import polars as pl
 import pytest
 
@@ -1190,3 +1193,213 @@ class TestIntegration:
         stats = calculate_statistics(df)
         assert stats["global"]["macro_success_rate"] == 0.0
         assert stats["global"]["micro_success_rate"] == 0.0
+
+
+def success_percentage(df: pl.DataFrame) -> float:
+    """Mean success of the runs of a non-empty dataframe, in percent."""
+    mean = df["success_numeric"].mean()
+    assert isinstance(mean, (int, float))
+    return mean * 100.0
+
+
+def reference_success_rate_stats(df: pl.DataFrame) -> dict[str, float]:
+    """Success rate statistics computed by filtering the runs one at a time."""
+    validated_df = df.filter(pl.col("success_numeric").is_not_null())
+    if validated_df.is_empty():
+        return {"success_rate": 0.0, "success_rate_std": 0.0, "success_rate_sem": 0.0}
+
+    run_level_means = []
+    for run_num in validated_df["run_number"].drop_nulls().unique().sort():
+        run_df = validated_df.filter(pl.col("run_number") == run_num)
+        if not run_df.is_empty():
+            run_level_means.append(success_percentage(run_df))
+    std = float(np.std(run_level_means, ddof=1)) if len(run_level_means) > 1 else 0.0
+    return {
+        "success_rate": success_percentage(validated_df),
+        "success_rate_std": std,
+        "success_rate_sem": (
+            std / float(np.sqrt(len(run_level_means)))
+            if len(run_level_means) > 1
+            else 0.0
+        ),
+    }
+
+
+def reference_run_level_std(df: pl.DataFrame, aggregation_type: str) -> float:
+    """STD of the run-level macro or micro scores computed one run at a time."""
+    validated_df = df.filter(pl.col("success_numeric").is_not_null())
+    run_level_scores = []
+    for run_num in validated_df["run_number"].drop_nulls().unique().sort():
+        run_df = validated_df.filter(pl.col("run_number") == run_num)
+        scores, counts = [], []
+        for config, phase_name in (
+            validated_df.select(["config", "phase_name"]).unique().iter_rows()
+        ):
+            capability_df = run_df.filter(
+                (pl.col("config") == config) & (pl.col("phase_name") == phase_name)
+            )
+            if not capability_df.is_empty():
+                scores.append(success_percentage(capability_df))
+                counts.append(len(capability_df))
+        if scores:
+            if aggregation_type == "macro":
+                run_level_scores.append(float(np.mean(scores)))
+            else:
+                run_level_scores.append(
+                    sum(s * c for s, c in zip(scores, counts)) / sum(counts)
+                )
+    return float(np.std(run_level_scores, ddof=1)) if len(run_level_scores) > 1 else 0.0
+
+
+def reference_per_capability_stats(df: pl.DataFrame) -> dict[str, dict[str, Any]]:
+    """Per-capability statistics computed by filtering each (config, phase_name)."""
+    per_capability = {}
+    for config, phase_name in df.select(["config", "phase_name"]).unique().iter_rows():
+        capability_df = df.filter(
+            (pl.col("config") == config) & (pl.col("phase_name") == phase_name)
+        )
+        validated_df = capability_df.filter(pl.col("success_numeric").is_not_null())
+        durations = capability_df["run_duration"].drop_nulls()
+        total_scenarios = capability_df.select(
+            ["base_scenario_id", "phase_name"]
+        ).n_unique()
+        scenario_rates = validated_df.group_by("base_scenario_id").agg(
+            pl.col("success_numeric").mean()
+        )["success_numeric"]
+        pass_at_k = int((scenario_rates > 0.0).sum())
+        pass_k = int((scenario_rates == 1.0).sum())
+        key = f"{config}_{phase_name}" if config == "mini" else config
+        per_capability[key] = {
+            "capability": f"{config} ({phase_name})" if config == "mini" else config,
+            "total_runs": len(capability_df),
+            "validated_runs": len(validated_df),
+            "success_runs": len(capability_df.filter(pl.col("status") == "success")),
+            "failed_runs": len(capability_df.filter(pl.col("status") == "failed")),
+            "exception_runs": len(
+                capability_df.filter(pl.col("status") == "exception")
+            ),
+            "no_validation_runs": len(
+                capability_df.filter(pl.col("status") == "no_validation")
+            ),
+            **reference_success_rate_stats(capability_df),
+            "pass_at_k": pass_at_k,
+            "pass_at_k_percent": pass_at_k / total_scenarios * 100,
+            "pass_k": pass_k,
+            "pass_k_percent": pass_k / total_scenarios * 100,
+            "total_scenarios": total_scenarios,
+            "avg_run_duration": durations.mean() if len(durations) else 0.0,
+            "avg_run_duration_std": (durations.std() if len(durations) > 1 else 0.0),
+        }
+    return per_capability
+
+
+def create_random_dataframe(seed: int) -> pl.DataFrame:
+    """Random result table over a few configs, phases, scenarios and runs."""
+    rng = random.Random(seed)
+    capabilities = rng.sample(
+        [
+            ("execution", "standard"),
+            ("search", "standard"),
+            ("time", "standard"),
+            ("mini", "agent2agent"),
+            ("mini", "noise"),
+        ],
+        rng.randint(1, 5),
+    )
+    statuses = {
+        "success": 1.0,
+        "failed": 0.0,
+        "exception": None,
+        "no_validation": None,
+    }
+    rows = []
+    for config, phase_name in capabilities:
+        for scenario in range(rng.randint(1, 8)):
+            for run_number in range(1, rng.randint(1, 4) + 1):
+                status = rng.choices(list(statuses), weights=[4, 4, 1, 1])[0]
+                rows.append(
+                    {
+                        "base_scenario_id": f"scenario_{scenario}",
+                        # Some results were collected without a run number
+                        "run_number": None if rng.random() < 0.05 else run_number,
+                        "success_numeric": statuses[status],
+                        "status": status,
+                        "phase_name": phase_name,
+                        "config": config,
+                        "a2a_app_prop": rng.choice([0.0, 0.5]),
+                        "has_tool_augmentation": rng.random() < 0.5,
+                        "has_env_events": False,
+                        "run_duration": (
+                            None if rng.random() < 0.1 else rng.uniform(1.0, 300.0)
+                        ),
+                        "job_duration": 300.0,
+                    }
+                )
+    return pl.DataFrame(
+        rows,
+        schema_overrides={
+            "run_number": pl.Int64,
+            "success_numeric": pl.Float64,
+            "run_duration": pl.Float64,
+        },
+    )
+
+
+class TestVectorizedStatistics:
+    """Compare the group-by statistics with row-filtering reference implementations."""
+
+    @pytest.mark.parametrize("seed", range(50))
+    def test_statistics_match_reference(self, seed):
+        df = create_random_dataframe(seed)
+        stats = calculate_statistics(df)
+
+        expected = reference_per_capability_stats(df)
+        assert stats["per_capability"].keys() == expected.keys()
+        for capability, capability_stats in stats["per_capability"].items():
+            assert capability_stats == pytest.approx(expected[capability])
+        assert _calculate_success_rate_stats(df) == pytest.approx(
+            reference_success_rate_stats(df)
+        )
+        for aggregation_type in ["macro", "micro"]:
+            assert stats["global"][
+                f"{aggregation_type}_success_rate_std"
+            ] == pytest.approx(reference_run_level_std(df, aggregation_type))
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_run_configurations_match_reference(self, seed):
+        df = create_random_dataframe(seed)
+        keys = [
+            "phase_name",
+            "config",
+            "a2a_app_prop",
+            "has_tool_augmentation",
+            "has_env_events",
+        ]
+        expected = []
+        for values in df.select(keys).unique().iter_rows():
+            run_df = df.filter(
+                pl.all_horizontal(
+                    pl.col(key) == value for key, value in zip(keys, values)
+                )
+            )
+            expected.append(
+                {
+                    **dict(zip(keys, values)),
+                    "total_runs": len(run_df),
+                    "validated_runs": run_df["success_numeric"].count(),
+                    **{
+                        f"{status}_runs": len(run_df.filter(pl.col("status") == status))
+                        for status in [
+                            "success",
+                            "failed",
+                            "exception",
+                            "no_validation",
+                        ]
+                    },
+                }
+            )
+
+        run_configs = generate_json_stats_report(df, "model", "provider")[
+            "run_configurations"
+        ]
+        assert sorted(run_configs, key=str) == sorted(expected, key=str)
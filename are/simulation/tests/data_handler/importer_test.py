@@ -5,11 +5,16 @@
 # the root directory of this source tree.
 
 
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from are.simulation.data_handler.importer import JsonScenarioImporter
+from are.simulation.data_handler.importer import (
+    JsonScenarioImporter,
+    TraceSection,
+    iter_json_object_members,
+)
 from are.simulation.data_handler.models import (
     TRACE_V1_VERSION,
     ExportedAction,
@@ -29,7 +34,7 @@ from are.simulation.scenarios.scenario_imported_from_json.benchmark_scenario imp
 from are.simulation.scenarios.scenario_imported_from_json.scenario import (
     ScenarioImportedFromJson,
 )
-from are.simulation.types import CapabilityTag, CompletedEvent, HintType
+from are.simulation.types import Action, CapabilityTag, CompletedEvent, HintType
 
 
 def test_map_action():
@@ -429,3 +434,193 @@ def test_run_number_import_export():
         load_completed_events=False,
     )
     assert scenario_benchmark_no_run.run_number is None
+
+
+def create_exported_trace_with_turns():
+    """Helper function to create an ExportedTrace with real apps and two turns."""
+
+    def completed_event(event_id, event_time, event_type, app, function, args):
+        return ExportedCompletedEvent(
+            event_id=event_id,
+            event_time=event_time,
+            event_relative_time=None,
+            class_name="CompletedEvent",
+            event_type=event_type,
+            dependencies=[],
+            metadata=ExportedEventMetadata(return_value=None),
+            action=ExportedAction(
+                action_id=f"action_{event_id}",
+                app=app,
+                function=function,
+                operation_type="WRITE",
+                args=[
+                    ExportedActionArg(name=name, value=value, value_type="str")
+                    for name, value in args.items()
+                ],
+            ),
+        )
+
+    trace = create_mock_exported_trace()
+    trace.apps = [
+        ExportedApp(name="AgentUserInterface", class_name="AgentUserInterface"),
+        ExportedApp(name="EmailClientApp", class_name="EmailClientV2"),
+    ]
+    trace.completed_events = [
+        completed_event(
+            "task",
+            10.0,
+            "USER",
+            "AgentUserInterface",
+            "send_message_to_agent",
+            {"content": "Check my emails"},
+        ),
+        completed_event(
+            "read",
+            11.0,
+            "AGENT",
+            "EmailClientApp",
+            "get_email_by_id",
+            {"email_id": "1"},
+        ),
+        completed_event(
+            "answer",
+            12.0,
+            "AGENT",
+            "AgentUserInterface",
+            "send_message_to_user",
+            {"content": "Done"},
+        ),
+        completed_event(
+            "followup",
+            13.0,
+            "AGENT",
+            "EmailClientApp",
+            "get_email_by_id",
+            {"email_id": "2"},
+        ),
+    ]
+    return trace
+
+
+def test_iter_json_object_members():
+    """Test that only the requested members are yielded, in document order."""
+    json_str = '{"a": [1, {"b": "}"}], "c": "x", "d": {"e": null}}'
+
+    assert list(iter_json_object_members(json_str)) == [
+        ("a", [1, {"b": "}"}]),
+        ("c", "x"),
+        ("d", {"e": None}),
+    ]
+    assert list(iter_json_object_members(json_str.encode(), keys={"d", "c"})) == [
+        ("c", "x"),
+        ("d", {"e": None}),
+    ]
+    assert list(iter_json_object_members("{ }")) == []
+    # The walk stops once all requested keys are found, the rest is never parsed
+    assert list(iter_json_object_members('{"a": 1, "b": not json', keys={"a"})) == [
+        ("a", 1)
+    ]
+    with pytest.raises(ValueError):
+        list(iter_json_object_members("[1, 2]"))
+
+
+def test_import_from_json_builds_real_completed_events():
+    """Test that completed events are built from the raw JSON with shared app instances."""
+    importer = JsonScenarioImporter()
+    json_str = create_exported_trace_with_turns().model_dump_json()
+
+    _, completed_events, _ = importer.import_from_json(json_str)
+
+    assert [e.event_id for e in completed_events] == [
+        "task",
+        "read",
+        "answer",
+        "followup",
+    ]
+    assert completed_events[1].tool_name == "EmailClientV2__get_email_by_id"
+    assert completed_events[1].get_args() == {"email_id": "1"}
+    assert isinstance(completed_events[1].action, Action)
+    assert isinstance(completed_events[3].action, Action)
+    assert completed_events[1].action.app is completed_events[3].action.app
+
+
+def test_import_from_json_fills_missing_event_metadata():
+    """Test that metadata keys left out of raw completed events get their default."""
+    importer = JsonScenarioImporter()
+    trace = json.loads(create_exported_trace_with_turns().model_dump_json())
+    for completed_event in trace["completed_events"]:
+        completed_event["metadata"] = {"return_value": "ok"}
+
+    _, completed_events, _ = importer.import_from_json(json.dumps(trace))
+
+    metadata = completed_events[1].metadata
+    assert metadata.return_value == "ok"
+    assert metadata.exception is None
+    assert metadata.exception_stack_trace is None
+
+
+def test_import_partial_metadata_only():
+    """Test that importing the metadata only leaves the other sections unset."""
+    importer = JsonScenarioImporter()
+    json_str = create_mock_exported_trace().model_dump_json()
+
+    trace = importer.import_partial(json_str)
+
+    assert trace.version == TRACE_V1_VERSION
+    assert trace.metadata is not None
+    assert trace.metadata.definition.scenario_id == "test_scenario_id"
+    assert trace.apps is None
+    assert trace.events is None
+    assert trace.completed_events is None
+    assert trace.world_logs is None
+
+
+def test_import_partial_apps_and_events():
+    """Test that apps and events sections are validated into exported models."""
+    importer = JsonScenarioImporter()
+    json_str = create_mock_exported_trace().model_dump_json()
+
+    trace = importer.import_partial(
+        json_str, sections=[TraceSection.APPS, TraceSection.EVENTS]
+    )
+
+    assert trace.metadata is None
+    assert trace.apps is not None and trace.events is not None
+    assert [app.name for app in trace.apps] == ["TestApp", "TestApp1"]
+    assert trace.events[0].event_id == "event1"
+    action = trace.events[0].action
+    assert action is not None and action.args is not None
+    assert action.args[0].value == "42"
+
+
+def test_import_partial_completed_events_of_one_turn():
+    """Test that completed events can be imported for a single turn."""
+    importer = JsonScenarioImporter()
+    json_str = create_exported_trace_with_turns().model_dump_json()
+
+    all_events = importer.import_partial(
+        json_str, sections=[TraceSection.COMPLETED_EVENTS]
+    ).completed_events
+    first_turn = importer.import_partial(
+        json_str, sections=[TraceSection.COMPLETED_EVENTS], turn_idx=0
+    ).completed_events
+    second_turn = importer.import_partial(
+        json_str, sections=[TraceSection.COMPLETED_EVENTS], turn_idx=1
+    ).completed_events
+
+    assert all_events is not None
+    assert first_turn is not None
+    assert second_turn is not None
+    assert [e.event_id for e in all_events] == ["task", "read", "answer", "followup"]
+    assert [e.event_id for e in first_turn] == ["task", "read", "answer"]
+    assert [e.event_id for e in second_turn] == ["followup"]
+
+
+def test_import_partial_unsupported_version():
+    """Test that partial import checks the trace version."""
+    importer = JsonScenarioImporter()
+    mock_trace = create_mock_exported_trace()
+    mock_trace.version = "unsupported_version"
+
+    with pytest.raises(Exception, match="Unsupported version: unsupported_version"):
+        importer.import_partial(mock_trace.model_dump_json())
@@ -0,0 +1,89 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Maximum time in seconds to import the environment, measured with python -X importtime.
+# It takes about 0.6s, the margin absorbs slower machines and loaded test runs.
+IMPORT_TIME_BUDGET = 3.0
+
+# Dependencies only needed to convert documents, upload results or serve the GUI
+HEAVY_MODULES = [
+    "bs4",
+    "datasets",
+    "mammoth",
+    "markdownify",
+    "numpy",
+    "pandas",
+    "pdfminer",
+    "polars",
+    "pptx",
+    "puremagic",
+    "requests",
+    "strawberry",
+]
+
+
+def run_python(code: str, *args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    # Import the package from this tree
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(Path(__file__).resolve().parents[3]), env.get("PYTHONPATH", "")]
+    )
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def get_import_time(module: str) -> float:
+    """Cumulative time in seconds to import a module in a new interpreter."""
+    result = run_python(f"import {module}", "-X", "importtime")
+    for line in result.stderr.splitlines():
+        # Lines are "import time: <self us> | <cumulative us> | <indented module name>"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1e6
+    raise ValueError(f"No import time reported for {module}")
+
+
+def get_imported_modules(code: str) -> set[str]:
+    result = run_python(f"{code}\nimport sys\nprint('\\n'.join(sys.modules))")
+    return set(result.stdout.split())
+
+
+def test_environment_import_time():
+    import_time = get_import_time("are.simulation.environment")
+    assert import_time < IMPORT_TIME_BUDGET, (
+        f"Importing are.simulation.environment took {import_time:.2f}s, "
+        f"over the budget of {IMPORT_TIME_BUDGET}s"
+    )
+
+
+def test_environment_does_not_import_heavy_modules():
+    modules = get_imported_modules(
+        "import are.simulation.environment\nimport are.simulation.apps"
+    )
+    assert sorted(modules & set(HEAVY_MODULES)) == []
+
+
+def test_converters_import_their_dependencies_on_first_use():
+    modules = get_imported_modules(
+        "import io\n"
+        "from are.simulation.core.mdconvert import MarkdownConverter\n"
+        "converter = MarkdownConverter()\n"
+        "converter.convert_io(io.BytesIO(b'text'), file_extension='.txt')\n"
+        "converter.convert_io(io.BytesIO(b'<p>html</p>'), file_extension='.html')"
+    )
+    assert {"bs4", "markdownify"} <= modules
+    assert sorted(modules & {"mammoth", "pandas", "pdfminer", "pptx"}) == []
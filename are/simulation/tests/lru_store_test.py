@@ -0,0 +1,55 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+from are.simulation.utils.lru_store import LRUDiskStore
+
+
+def test_evicts_least_recently_used_by_weight():
+    evicted = []
+    store: LRUDiskStore[str] = LRUDiskStore(
+        max_weight=6, weigh=len, on_evict=evicted.append
+    )
+    store.put("a", "aa")
+    store.put("b", "bb")
+    store.put("c", "cc")
+    # Reading a value makes it the most recently used
+    assert store.get("a") == "aa"
+    store.put("d", "dd")
+
+    assert evicted == ["b"]
+    assert store.get("b") is None
+    assert store.weight == 6
+    # Values heavier than the bound are not kept
+    store.put("e", "e" * 7)
+    assert store.get("e") is None
+    assert len(store) == 3
+
+
+def test_values_are_shared_through_the_directory(tmp_path):
+    def encode(value: list[int]) -> str | None:
+        return None if not value else ",".join(map(str, value))
+
+    def decode(text: str) -> list[int] | None:
+        return [int(x) for x in text.split(",")] if text else None
+
+    store = LRUDiskStore(
+        max_weight=10, cache_dir=tmp_path, suffix=".csv", encode=encode, decode=decode
+    )
+    store.put("numbers", [1, 2])
+    # Values which cannot be encoded are only kept in memory
+    store.put("empty", [])
+
+    other_store = LRUDiskStore(
+        max_weight=10, cache_dir=tmp_path, suffix=".csv", encode=encode, decode=decode
+    )
+    assert other_store.get("numbers") == [1, 2]
+    assert other_store.get("empty") is None
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["numbers.csv"]
+
+    # Invalid stored values are ignored
+    (tmp_path / "invalid.csv").write_text("")
+    assert other_store.get("invalid") is None
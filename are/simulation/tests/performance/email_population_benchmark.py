@@ -0,0 +1,104 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+"""
+Benchmark populating an EmailClientV2 universe, from the scenario JSON to the loaded app.
+
+Usage:
+    python -m are.simulation.tests.performance.email_population_benchmark --num_emails 10000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from are.simulation.apps.email_client import Email, EmailClientV2, EmailFolderName
+from are.simulation.data_handler.importer import JsonScenarioImporter
+from are.simulation.data_handler.models import ExportedApp
+from are.simulation.tests.benchmark.test_huggingface_loader import (
+    create_mock_exported_trace,
+)
+from are.simulation.utils.serialization import EnumEncoder
+
+
+def create_emails(num_emails: int, seed: int = 0) -> list[Email]:
+    rng = random.Random(seed)
+    return [
+        Email(
+            email_id=f"email_{i}",
+            sender=f"sender_{rng.randrange(100)}@example.com",
+            recipients=["user@meta.com"],
+            subject=f"Subject {i}",
+            content=f"Content of email {i}",
+            timestamp=rng.uniform(1_600_000_000, 1_700_000_000),
+        )
+        for i in range(num_emails)
+    ]
+
+
+def create_scenario_json(emails: list[Email]) -> str:
+    app = EmailClientV2()
+    app.folders[EmailFolderName.INBOX].emails = emails
+    trace = create_mock_exported_trace()
+    trace.apps = [
+        ExportedApp(
+            name="EmailClientV2",
+            class_name="EmailClientV2",
+            app_state=json.loads(json.dumps(app.get_state(), cls=EnumEncoder)),
+        )
+    ]
+    return trace.model_dump_json()
+
+
+def run_benchmark(num_emails: int) -> dict[str, float]:
+    """
+    Time loading a scenario with `num_emails` emails, then inserting and looking up each email.
+
+    :param num_emails: Number of emails in the INBOX folder
+    :returns: The duration of each step in seconds
+    """
+    emails = create_emails(num_emails)
+    scenario_json = create_scenario_json(emails)
+    timings = {}
+
+    start = time.perf_counter()
+    scenario, _, _ = JsonScenarioImporter().import_from_json_to_benchmark(
+        scenario_json, load_completed_events=False
+    )
+    scenario.initialize()
+    timings["load_scenario"] = time.perf_counter() - start
+    (app,) = [app for app in scenario.apps or [] if isinstance(app, EmailClientV2)]
+    assert len(app.folders[EmailFolderName.INBOX].emails) == num_emails
+
+    app = EmailClientV2()
+    start = time.perf_counter()
+    for email in emails:
+        app.folders[EmailFolderName.INBOX].add_email(email)
+    timings["add_emails"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for email in emails:
+        app.folders[EmailFolderName.INBOX].get_email_by_id(email.email_id)
+    timings["get_emails_by_id"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    app.delete_future_data(1_650_000_000)
+    timings["delete_future_data"] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num_emails", type=int, default=10000)
+    args = parser.parse_args()
+    for step, duration in run_benchmark(args.num_emails).items():
+        print(f"{step}: {duration:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+"""
+Benchmark rendering the user prompt of the judge for each agent/oracle comparison, with the
+compiled template cache of jinja_format and by compiling the template on every call.
+
+Usage:
+    python -m are.simulation.tests.performance.judge_prompt_benchmark --num_comparisons 10000
+"""
+
+import argparse
+import time
+from typing import Any
+
+from jinja2 import Environment, Template, meta
+
+from are.simulation.scenarios.utils.personalization.utils import (
+    TEMPLATE_CACHE,
+    jinja_format,
+)
+from are.simulation.validation.prompts import CONTENT_CHECKER_USER_PROMPT_TEMPLATE
+
+
+def uncached_jinja_format(template: str, **kwargs: Any) -> str:
+    """jinja_format with skip_validation=False, without the template cache."""
+    variables = meta.find_undeclared_variables(Environment().parse(template))
+    kwargs = {k: kwargs[k] for k in variables}
+    return Template(template, keep_trailing_newline=True).render(**kwargs)
+
+
+def create_prompt_args(num_comparisons: int) -> list[dict[str, str]]:
+    return [
+        {
+            "agent_action_call": f"EmailClientApp__send_email(recipients=['user{i}@example.com'], subject='Meeting {i}')",
+            "oracle_action_call": f"EmailClientApp__send_email(recipients=['user{i}@example.com'], subject='Meeting')",
+            "tool_name": "EmailClientApp__send_email",
+            "task": f"Send an email to user {i} about the meeting.",
+            "today_date": "2024-10-15",
+            "user_address": "1 Main Street",
+        }
+        for i in range(num_comparisons)
+    ]
+
+
+def run_benchmark(num_comparisons: int) -> dict[str, float]:
+    """
+    Time rendering the judge user prompt of `num_comparisons` comparisons.
+
+    :param num_comparisons: Number of comparisons
+    :returns: The duration of each step in seconds
+    """
+    prompt_args = create_prompt_args(num_comparisons)
+    template = CONTENT_CHECKER_USER_PROMPT_TEMPLATE
+    TEMPLATE_CACHE.clear()
+    timings = {}
+
+    start = time.perf_counter()
+    expected = [uncached_jinja_format(template, **args) for args in prompt_args]
+    timings["uncached"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [
+        jinja_format(template, skip_validation=False, **args) for args in prompt_args
+    ]
+    timings["cached"] = time.perf_counter() - start
+    assert results == expected
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num_comparisons", type=int, default=10000)
+    args = parser.parse_args()
+    for step, duration in run_benchmark(args.num_comparisons).items():
+        per_comparison = duration / args.num_comparisons * 1e6
+        print(f"{step}: {duration:.3f}s ({per_comparison:.1f}us per comparison)")
+
+
+if __name__ == "__main__":
+    main()
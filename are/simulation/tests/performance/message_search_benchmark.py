@@ -0,0 +1,127 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+"""
+Benchmark searching a MessagingAppV2 universe, with the text index and with a full scan.
+
+Usage:
+    python -m are.simulation.tests.performance.message_search_benchmark --num_messages 50000
+"""
+
+import argparse
+import random
+import re
+import time
+
+from are.simulation.apps.messaging_v2 import ConversationV2, MessageV2, MessagingAppV2
+
+WORDS = [
+    "meeting",
+    "lunch",
+    "project",
+    "deadline",
+    "weekend",
+    "birthday",
+    "flight",
+    "invoice",
+    "concert",
+    "dinner",
+]
+
+
+def create_app(
+    num_messages: int, messages_per_conversation: int = 50, seed: int = 0
+) -> MessagingAppV2:
+    rng = random.Random(seed)
+    app = MessagingAppV2(current_user_id="user_0", current_user_name="Me")
+    for i in range(0, num_messages, messages_per_conversation):
+        participant_ids = ["user_0", f"user_{rng.randrange(1, 1000)}"]
+        app.add_conversation(
+            ConversationV2(
+                participant_ids=participant_ids,
+                title=f"Conversation {i}",
+                messages=[
+                    MessageV2(
+                        sender_id=rng.choice(participant_ids),
+                        timestamp=1_600_000_000 + j,
+                        content=" ".join(rng.choices(WORDS, k=8)) + f" #{j}",
+                    )
+                    for j in range(i, min(i + messages_per_conversation, num_messages))
+                ],
+            )
+        )
+    return app
+
+
+def scan(app: MessagingAppV2, query: str) -> list[str]:
+    query = query.lower()
+    return [
+        conversation.conversation_id
+        for conversation in app.conversations.values()
+        if app._conversation_matches(conversation, query)
+    ]
+
+
+def regex_scan(app: MessagingAppV2, query: str) -> list[str]:
+    get_match = re.compile(query, re.IGNORECASE).search
+    return [
+        conversation.conversation_id
+        for conversation in app.conversations.values()
+        if app._regex_conversation_matches(conversation, get_match)
+    ]
+
+
+def run_benchmark(num_messages: int, num_queries: int = 100) -> dict[str, float]:
+    """
+    Time searches in an app with `num_messages` messages, with the text index and with a scan.
+
+    :param num_messages: Number of messages in the app
+    :param num_queries: Number of queries of each kind
+    :returns: The duration of each step in seconds
+    """
+    app = create_app(num_messages)
+    rng = random.Random(1)
+    # Rare queries, which the index filters best, and frequent ones
+    queries = [f"#{rng.randrange(num_messages)}" for _ in range(num_queries)]
+    queries += [rng.choice(WORDS).upper() for _ in range(num_queries)]
+    timings = {}
+
+    start = time.perf_counter()
+    app.search("warm up")
+    timings["build_index"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [app.search(query) for query in queries]
+    timings["search"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [scan(app, query) for query in queries]
+    timings["scan"] = time.perf_counter() - start
+    assert results == expected
+
+    start = time.perf_counter()
+    results = [app.regex_search(query) for query in queries]
+    timings["regex_search"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [regex_scan(app, query) for query in queries]
+    timings["regex_scan"] = time.perf_counter() - start
+    assert results == expected
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num_messages", type=int, default=50000)
+    parser.add_argument("--num_queries", type=int, default=100)
+    args = parser.parse_args()
+    for step, duration in run_benchmark(args.num_messages, args.num_queries).items():
+        print(f"{step}: {duration:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
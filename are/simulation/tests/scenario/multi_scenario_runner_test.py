@@ -107,6 +107,39 @@ def test_scenario_no_timeout_when_within_limit():
     assert scenario_result.exception is None
 
 
+def test_results_are_passed_to_callback_as_scenarios_finish(tmp_path):
+    """Test that the result of each scenario is passed to the callback of the run."""
+    config = MultiScenarioRunnerConfig(
+        model="test-model",
+        agent="test-agent",
+        timeout_seconds=1,
+        max_concurrent_scenarios=1,
+        export=False,
+        output_dir=str(tmp_path),
+    )
+    scenarios: list[Scenario] = [
+        MockSlowScenario("test_fast_scenario", sleep_duration=0.1),
+        MockSlowScenario("test_slow_scenario", sleep_duration=2.0),
+    ]
+    finished = []
+
+    with patch.object(ScenarioRunner, "run", side_effect=mock_slow_scenario_runner_run):
+        runner = MultiScenarioRunner()
+        result = runner.run(
+            config,
+            scenarios,
+            on_result=lambda scenario_id, run_number, scenario_result, run_config: (
+                finished.append((scenario_id, scenario_result.success, run_config))
+            ),
+        )
+
+    assert finished == [
+        ("test_fast_scenario", True, config),
+        ("test_slow_scenario", False, config),
+    ]
+    assert len(result.scenario_results) == 2
+
+
 def test_scenario_no_timeout_when_not_configured():
     """Test that scenarios run without timeout when timeout_seconds is None."""
     # Create a config without timeout
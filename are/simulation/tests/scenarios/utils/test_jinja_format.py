@@ -0,0 +1,45 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import pytest
+from jinja2 import Template
+
+from are.simulation.scenarios.utils.personalization.utils import (
+    TEMPLATE_CACHE,
+    TemplateCache,
+    jinja_format,
+)
+
+
+def test_jinja_format_compiles_templates_once():
+    TEMPLATE_CACHE.clear()
+    template = "Hello {{ name }}{% if loud %}!{% endif %}\n"
+    for name in ["Alice", "Bob"]:
+        assert jinja_format(template, name=name, loud=True) == Template(
+            template, keep_trailing_newline=True
+        ).render(name=name, loud=True)
+    assert jinja_format(template, skip_validation=False, name="Eve", loud=False) == (
+        "Hello Eve\n"
+    )
+    assert TEMPLATE_CACHE.misses == 1
+    assert TEMPLATE_CACHE.hits == 2
+
+    with pytest.raises(ValueError, match="Expected"):
+        jinja_format(template, skip_validation=False, name="Eve")
+    assert TEMPLATE_CACHE.misses == 1
+
+
+def test_template_cache_evicts_least_recently_used():
+    cache = TemplateCache(max_size=2)
+    first = cache.get("{{ a }}")
+    cache.get("{{ b }}")
+    assert cache.get("{{ a }}") is first
+    cache.get("{{ c }}")
+    assert len(cache) == 2
+    assert cache.get("{{ a }}") is first
+    assert cache.get("{{ b }}").variables == frozenset({"b"})
+    assert cache.misses == 4
@@ -0,0 +1,199 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import json
+from unittest.mock import Mock, patch
+
+from are.simulation.apps import AgentUserInterface, CalendarApp
+from are.simulation.apps.contacts import Contact, ContactsApp
+from are.simulation.data_handler.importer import JsonScenarioImporter
+from are.simulation.data_handler.models import (
+    ExportedAction,
+    ExportedActionArg,
+    ExportedApp,
+    ExportedEvent,
+    ExportedOracleEvent,
+)
+from are.simulation.scenarios.utils.oracle_cache import (
+    OracleRunCache,
+    get_scenario_fingerprint,
+)
+from are.simulation.tests.benchmark.test_huggingface_loader import (
+    create_mock_exported_trace,
+)
+from are.simulation.types import Action
+from are.simulation.utils.serialization import EnumEncoder
+from are.simulation.validation.utils.scenario_utils import run_oracle_mode
+
+
+def create_trace_json(seed: int = 42) -> str:
+    """Create a trace with one user task and one oracle answer."""
+
+    def app_state(app):
+        return json.loads(json.dumps(app.get_state(), cls=EnumEncoder))
+
+    def event(cls, event_id, event_type, function, dependencies, content):
+        return cls(
+            class_name=cls.__name__.removeprefix("Exported"),
+            event_type=event_type,
+            event_time=None,
+            event_id=event_id,
+            dependencies=dependencies,
+            event_relative_time=1,
+            action=ExportedAction(
+                action_id=f"action_{event_id}",
+                app="AgentUserInterface",
+                function=function,
+                operation_type="WRITE",
+                args=[
+                    ExportedActionArg(name="content", value=content, value_type="str")
+                ],
+            ),
+        )
+
+    contacts = ContactsApp()
+    contacts.add_contact(Contact(first_name="John", last_name="Doe", is_user=True))
+    trace = create_mock_exported_trace()
+    trace.metadata.definition.seed = seed
+    trace.apps = [
+        ExportedApp(
+            name="AgentUserInterface",
+            class_name="AgentUserInterface",
+            app_state=app_state(AgentUserInterface()),
+        ),
+        ExportedApp(
+            name="CalendarApp",
+            class_name="CalendarApp",
+            app_state=app_state(CalendarApp()),
+        ),
+        ExportedApp(
+            name="ContactsApp", class_name="ContactsApp", app_state=app_state(contacts)
+        ),
+    ]
+    trace.events = [
+        event(ExportedEvent, "task", "USER", "send_message_to_agent", [], "Hi"),
+        event(
+            ExportedOracleEvent,
+            "answer",
+            "AGENT",
+            "send_message_to_user",
+            ["task"],
+            "Hello",
+        ),
+    ]
+    return trace.model_dump_json()
+
+
+def load_scenario(trace_json: str):
+    scenario, _, _ = JsonScenarioImporter().import_from_json_to_benchmark(
+        trace_json, load_completed_events=False
+    )
+    scenario.initialize()
+    return scenario
+
+
+def test_fingerprint_depends_on_scenario_definition():
+    trace_json = create_trace_json()
+    fingerprint = get_scenario_fingerprint(load_scenario(trace_json))
+
+    assert fingerprint is not None
+    assert get_scenario_fingerprint(load_scenario(trace_json)) == fingerprint
+    assert get_scenario_fingerprint(load_scenario(create_trace_json(seed=0))) != (
+        fingerprint
+    )
+    assert (
+        get_scenario_fingerprint(load_scenario(trace_json), namespace="other")
+        != fingerprint
+    )
+
+
+def test_oracle_runs_once_per_scenario():
+    trace_json = create_trace_json()
+    cache = OracleRunCache()
+    scenarios = [load_scenario(trace_json) for _ in range(3)]
+
+    with patch(
+        "are.simulation.validation.utils.scenario_utils.ORACLE_RUN_CACHE", cache
+    ):
+        for scenario in scenarios:
+            run_oracle_mode(scenario)
+
+    assert cache.misses == 1
+    assert cache.hits == 2
+    logs = [scenario.oracle_run_event_log for scenario in scenarios]
+    assert logs[0] is not None and logs[1] is not None and logs[2] is not None
+    assert [e.event_id for e in logs[0]] == [e.event_id for e in logs[2]]
+    assert [e.event_time for e in logs[0]] == [e.event_time for e in logs[2]]
+    # Rebuilt events are bound to the apps of their own scenario
+    for scenario, log in zip(scenarios, logs):
+        assert log is not None
+        for event, oracle_event in zip(log, logs[0]):
+            assert isinstance(event.action, Action)
+            assert isinstance(oracle_event.action, Action)
+            assert event.action.app is not None
+            assert event.action.app is scenario.get_app(event.action.app.name)
+            assert event.action.args.keys() == oracle_event.action.args.keys()
+            assert event.action.args.get("content") == oracle_event.action.args.get(
+                "content"
+            )
+            if "self" in event.action.args:
+                assert event.action.args["self"] is event.action.app
+    assert logs[1][0] is not logs[2][0]
+    assert isinstance(logs[1][0].action, Action)
+    assert isinstance(logs[2][0].action, Action)
+    assert logs[1][0].action.args is not logs[2][0].action.args
+
+
+def test_oracle_runs_are_shared_through_disk(tmp_path):
+    trace_json = create_trace_json()
+    first_scenario = load_scenario(trace_json)
+    with patch(
+        "are.simulation.validation.utils.scenario_utils.ORACLE_RUN_CACHE",
+        OracleRunCache(cache_dir=tmp_path),
+    ):
+        run_oracle_mode(first_scenario)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    # A new cache, e.g. in another process, reuses the stored run
+    cache = OracleRunCache(cache_dir=tmp_path)
+    run_oracle = Mock()
+    events = cache.get_or_run(
+        load_scenario(trace_json), run_oracle, namespace="run_oracle_mode"
+    )
+    run_oracle.assert_not_called()
+    assert first_scenario.oracle_run_event_log is not None
+    assert [e.event_id for e in events] == [
+        e.event_id for e in first_scenario.oracle_run_event_log
+    ]
+
+
+def test_invalid_disk_entries_are_ignored(tmp_path):
+    scenario = load_scenario(create_trace_json())
+    fingerprint = get_scenario_fingerprint(scenario, namespace="run_oracle_mode")
+    (tmp_path / f"{fingerprint}.json").write_text('{"not": "an event log"}')
+
+    cache = OracleRunCache(cache_dir=tmp_path)
+    run_oracle = Mock(return_value=[])
+    assert cache.get_or_run(scenario, run_oracle, namespace="run_oracle_mode") == []
+    run_oracle.assert_called_once()
+
+
+def test_lru_eviction():
+    cache = OracleRunCache(max_size=1)
+    first = load_scenario(create_trace_json(seed=1))
+    second = load_scenario(create_trace_json(seed=2))
+
+    with patch(
+        "are.simulation.validation.utils.scenario_utils.ORACLE_RUN_CACHE", cache
+    ):
+        run_oracle_mode(first)
+        run_oracle_mode(second)
+        run_oracle_mode(load_scenario(create_trace_json(seed=1)))
+
+    assert len(cache) == 1
+    assert cache.misses == 3
+    assert cache.hits == 0
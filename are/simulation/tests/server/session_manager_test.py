@@ -16,6 +16,7 @@ with patch(
     return_value={},
 ):
     from are.simulation.gui.server.session_manager import SessionManager
+    from are.simulation.types import EnvironmentState
 
 
 def test_session_manager_initialization():
@@ -92,3 +93,149 @@ def test_stop_session_manager():
 
     mock_are_simulation1.stop.assert_called_once()
     mock_are_simulation2.stop.assert_called_once()
+
+
+def create_hibernating_manager(tmp_path, factory, hibernate_after=0):
+    return SessionManager(
+        300,
+        60,
+        memory_budget=100,
+        hibernate_after=hibernate_after,
+        hibernation_dir=str(tmp_path),
+        session_factory=factory,
+    )
+
+
+def create_mock_instance(memory_bytes: int, hibernated_session: str | None) -> Mock:
+    mock_are_simulation = Mock()
+    mock_are_simulation.get_memory_usage.return_value = memory_bytes
+    mock_are_simulation.hibernate.return_value = hibernated_session
+    mock_are_simulation.env.changes.sequence = 1
+    return mock_are_simulation
+
+
+def test_memory_budget_hibernates_least_recently_active_sessions(tmp_path):
+    restored_are_simulation = Mock()
+    factory = Mock(return_value=restored_are_simulation)
+    manager = create_hibernating_manager(tmp_path, factory)
+    old_are_simulation = create_mock_instance(80, "old session")
+    new_are_simulation = create_mock_instance(80, "new session")
+    manager.add_are_simulation_instance("old", old_are_simulation)
+    manager.add_are_simulation_instance("new", new_are_simulation)
+    manager.sessions["old"].last_active -= 10
+    manager.sessions["old"].last_changed -= 10
+
+    manager._enforce_memory_budget()
+
+    status = manager.get_status()
+    assert status["old"]["hibernated"] and status["old"]["memory_bytes"] == 0
+    assert not status["new"]["hibernated"] and status["new"]["memory_bytes"] == 80
+    assert manager.get_memory_usage() == 80
+    old_are_simulation.stop.assert_called_once()
+    old_are_simulation.remove_tmpdir.assert_called_once()
+    new_are_simulation.hibernate.assert_not_called()
+    assert (tmp_path / "old.json").read_text() == "old session"
+
+    # The next request restores the session
+    assert manager.get_are_simulation_instance("old") is restored_are_simulation
+    factory.assert_called_once_with("old")
+    restored_are_simulation.restore.assert_called_once_with("old session")
+    assert not manager.get_status()["old"]["hibernated"]
+    assert not (tmp_path / "old.json").exists()
+
+
+def test_active_sessions_are_not_hibernated(tmp_path):
+    manager = create_hibernating_manager(tmp_path, Mock(), hibernate_after=60)
+    recent_are_simulation = create_mock_instance(200, "recent session")
+    streamed_are_simulation = create_mock_instance(200, "streamed session")
+    failing_are_simulation = create_mock_instance(200, None)
+    manager.add_are_simulation_instance("recent", recent_are_simulation)
+    manager.add_are_simulation_instance("streamed", streamed_are_simulation)
+    manager.add_are_simulation_instance("failing", failing_are_simulation)
+    for session_id in ["streamed", "failing"]:
+        manager.sessions[session_id].last_active -= 120
+        manager.sessions[session_id].last_changed -= 120
+    manager.add_subscriber("streamed")
+
+    manager._enforce_memory_budget()
+
+    recent_are_simulation.hibernate.assert_not_called()
+    streamed_are_simulation.hibernate.assert_not_called()
+    # Sessions which cannot be serialized stay in memory
+    failing_are_simulation.hibernate.assert_called_once()
+    assert not any(s["hibernated"] for s in manager.get_status().values())
+    assert manager.get_memory_usage() == 600
+
+
+def test_live_runs_are_not_hibernated(tmp_path):
+    manager = create_hibernating_manager(tmp_path, Mock())
+    for state in [EnvironmentState.RUNNING, EnvironmentState.PAUSED]:
+        are_simulation = create_mock_instance(200, "live session")
+        are_simulation.env.state = state
+        manager.add_are_simulation_instance(state.value, are_simulation)
+
+        manager._enforce_memory_budget()
+
+        assert not manager.hibernate(state.value)
+        are_simulation.hibernate.assert_not_called()
+        are_simulation.stop.assert_not_called()
+
+
+def test_memory_of_idle_sessions_is_estimated_once(tmp_path):
+    manager = create_hibernating_manager(tmp_path, Mock(), hibernate_after=60)
+    are_simulation = create_mock_instance(50, "session")
+    manager.add_are_simulation_instance("session", are_simulation)
+    manager.sessions["session"].last_active -= 10
+    manager.sessions["session"].last_changed -= 10
+
+    manager._update_memory_usage()
+    manager._update_memory_usage()
+    assert are_simulation.get_memory_usage.call_count == 1
+
+    # Changes of the environment trigger a new estimate
+    are_simulation.env.changes.sequence = 2
+    manager._update_memory_usage()
+    assert are_simulation.get_memory_usage.call_count == 2
+
+
+def test_failed_restore_keeps_hibernated_session(tmp_path):
+    failed_are_simulation = Mock()
+    failed_are_simulation.restore.return_value = False
+    restored_are_simulation = Mock()
+    factory = Mock(side_effect=[failed_are_simulation, restored_are_simulation])
+    manager = create_hibernating_manager(tmp_path, factory)
+    manager.add_are_simulation_instance("session", create_mock_instance(200, "data"))
+    assert manager.hibernate("session")
+
+    with pytest.raises(ValueError, match="Failed to restore"):
+        manager.get_are_simulation_instance("session")
+    failed_are_simulation.stop.assert_called_once()
+    assert manager.get_status()["session"]["hibernated"]
+    assert (tmp_path / "session.json").read_text() == "data"
+
+    # The next request tries again
+    assert manager.get_are_simulation_instance("session") is restored_are_simulation
+    assert not (tmp_path / "session.json").exists()
+
+
+def test_cleanup_removes_hibernated_sessions(tmp_path):
+    manager = create_hibernating_manager(tmp_path, Mock())
+    manager.add_are_simulation_instance("session", create_mock_instance(200, "data"))
+    assert manager.hibernate("session")
+    assert (tmp_path / "session.json").exists()
+
+    manager.inactivity_limit = 0
+    time.sleep(0.01)
+    manager._cleanup_inactive_are_simulation()
+
+    assert not manager.session_exists("session")
+    assert not (tmp_path / "session.json").exists()
+
+
+def test_stop_wakes_up_cleanup_routine():
+    manager = SessionManager(300, 3600)
+    manager.start()
+    start = time.time()
+    manager.stop()
+    assert time.time() - start < 5
+    assert manager.cleanup_timer is not None and not manager.cleanup_timer.is_alive()
@@ -7,6 +7,7 @@
 
 import json
 import tempfile
+from types import SimpleNamespace
 from unittest.mock import Mock
 
 import pytest
@@ -37,12 +38,15 @@ from are.simulation.agents.agent_log import (
     ToolCallLog,
 )
 from are.simulation.agents.multimodal import Attachment
+from are.simulation.environment import Environment
 from are.simulation.gui.server.graphql.subscription import (
+    EnvironmentStateTracker,
     get_world_logs_for_graphql,
     graphql_cache,
     update_graphql_cache,
 )
 from are.simulation.gui.server.graphql.types import AgentLogTypeForGraphQL
+from are.simulation.tests.environment_test import DummyApp
 
 
 @pytest.fixture
@@ -80,6 +84,137 @@ def test_update_with_no_change(setup_environment):
     assert graphql_cache[session_id]["env_state"] == "test_string"
 
 
+class FakeAreSimulation:
+    def __init__(self, env: Environment):
+        self.env = env
+        self.scenario = SimpleNamespace(events=[], hints=[])
+
+    def get_world_logs(self):
+        return self.env.get_world_logs()
+
+
+def create_tracker(
+    session_id: str, deltas: bool
+) -> tuple[EnvironmentStateTracker, DummyApp]:
+    env = Environment()
+    app = DummyApp()
+    env.register_apps([app])
+    tracker = EnvironmentStateTracker(
+        session_id,
+        FakeAreSimulation(env),
+        cache_dir=f"{tempfile.mkdtemp()}/cache",
+        hosting_root="http://test.com/files",
+        deltas=deltas,
+    )
+    return tracker, app
+
+
+def get_app_state(apps_state_json: str, app_name: str) -> dict:
+    apps = json.loads(apps_state_json)["apps"]
+    return next(app for app in apps if app["app_name"] == app_name)
+
+
+def test_tracker_sends_deltas(setup_environment):
+    tracker, app = create_tracker(setup_environment, deltas=True)
+    env = tracker.are_simulation_instance.env
+
+    update = tracker.get_update()
+    assert update is not None and update.full_resync
+    assert update.event_log_json is not None and update.apps_state_json is not None
+    assert update.world_logs == []
+    # Nothing changed
+    assert tracker.get_update() is None
+
+    app.log_stuff("hello")
+    env.append_to_world_logs(
+        SystemPromptLog(content="prompt", timestamp=1.0, agent_id="agent")
+    )
+    update = tracker.get_update()
+    assert update is not None and not update.full_resync
+    assert update.sequence == env.changes.sequence
+    assert update.event_log_json is None and update.apps_state_json is None
+    assert update.appended_events_json is not None
+    assert [event["event_id"] for event in json.loads(update.appended_events_json)] == [
+        event.event_id for event in env.event_log.list_view()
+    ]
+    assert update.changed_apps_json is not None
+    changed_apps = json.loads(update.changed_apps_json)["apps"]
+    assert [app_state["app_name"] for app_state in changed_apps] == [app.name]
+    assert changed_apps[0]["logs"] == ["hello"]
+    assert update.world_logs is not None and update.world_logs_offset == 0
+    assert [log.content for log in update.world_logs] == ["prompt"]
+
+    env.append_to_world_logs(
+        ThoughtLog(content="thought", timestamp=2.0, agent_id="agent")
+    )
+    update = tracker.get_update()
+    assert update is not None and update.world_logs is not None
+    assert update.world_logs_offset == 1
+    assert [log.content for log in update.world_logs] == ["thought"]
+    assert update.appended_events_json is None
+
+    # Removed events cannot be sent as a delta
+    env.delete_all_completed_events()
+    update = tracker.get_update()
+    assert update is not None and update.full_resync
+    assert update.event_log_json is not None
+    assert json.loads(update.event_log_json)["event_log"]["past_events"] == []
+
+
+def test_tracker_sends_whole_state_without_deltas(setup_environment):
+    tracker, app = create_tracker(setup_environment, deltas=False)
+    tracker.get_update()
+
+    app.log_stuff("hello")
+    update = tracker.get_update()
+    assert update is not None and not update.full_resync
+    assert update.appended_events_json is None and update.changed_apps_json is None
+    assert update.event_log_json is not None and update.apps_state_json is not None
+    assert len(json.loads(update.event_log_json)["event_log"]["past_events"]) == 1
+    assert get_app_state(update.apps_state_json, app.name)["logs"] == ["hello"]
+    # The logs of the actions are not displayed
+    assert update.world_logs is None
+
+    # The cached JSON of the events and apps matches a whole serialization
+    app.log_stuff("world")
+    update = tracker.get_update()
+    assert update is not None
+    env = tracker.are_simulation_instance.env
+    assert update.event_log_json == env.event_log_json()
+    assert update.apps_state_json == env.apps_state_json()
+
+
+def test_tracker_sends_scenario_on_edits(setup_environment):
+    tracker, app = create_tracker(setup_environment, deltas=True)
+    env = tracker.are_simulation_instance.env
+    scenario = tracker.are_simulation_instance.scenario
+
+    update = tracker.get_update()
+    assert update is not None and update.initial_event_queue_json == "[]"
+
+    # Completed events do not change the world logs or the scenario
+    start_sequence = env.changes.sequence
+    app.log_stuff("hello")
+    changes = env.changes.get_changes(start_sequence)
+    assert changes is not None and not changes.world_logs_changed
+    update = tracker.get_update()
+    assert update is not None
+    assert update.initial_event_queue_json is None and update.hints is None
+
+    scenario.hints = ["hint"]
+    env.changes.publish(scenario_changed=True)
+    update = tracker.get_update()
+    assert update is not None and update.hints == ["hint"]
+
+    # A replaced scenario is sent without an edit notification
+    tracker.are_simulation_instance.scenario = SimpleNamespace(
+        events=[], hints=["new hint"]
+    )
+    app.log_stuff("world")
+    update = tracker.get_update()
+    assert update is not None and update.hints == ["new hint"]
+
+
 class TestGetWorldLogsForGraphQL:
     """Test suite for the refactored get_world_logs_for_graphql function."""
 
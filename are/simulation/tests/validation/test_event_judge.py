@@ -275,6 +275,37 @@ class TestAgentEventJudge(unittest.TestCase):
                         result = self.judge.compare(self.agent_event, self.oracle_event)
                         self.assertFalse(result)
 
+    def test_precheck_and_soft_check(self):
+        self.agent_event.event_type = EventType.AGENT
+        self.oracle_event.event_type = EventType.AGENT
+        tool_judge = self.judge.tool_judges["test_tool"]
+        with patch.object(self.judge, "check_time", return_value=True):
+            with patch.object(tool_judge, "hard_judge", return_value=True):
+                self.assertTrue(
+                    self.judge.precheck(self.agent_event, self.oracle_event)
+                )
+            with patch.object(tool_judge, "hard_judge", return_value=False):
+                self.assertFalse(
+                    self.judge.precheck(self.agent_event, self.oracle_event)
+                )
+        self.agent_event.tool_name = "other_tool"
+        self.assertFalse(self.judge.precheck(self.agent_event, self.oracle_event))
+
+        self.assertTrue(self.judge.need_soft_check("test_tool"))
+        with patch.object(tool_judge, "soft_judge", return_value=False) as soft_judge:
+            soft_judge.no_arg_to_check = False
+            self.assertFalse(self.judge.soft_check(self.agent_event, self.oracle_event))
+            soft_judge.no_arg_to_check = True
+            self.assertTrue(self.judge.soft_check(self.agent_event, self.oracle_event))
+            self.assertTrue(
+                self.judge.soft_precheck(self.agent_event, self.oracle_event)
+            )
+            soft_judge.no_arg_to_check = False
+            soft_judge.precompare.return_value = None
+            self.assertIsNone(
+                self.judge.soft_precheck(self.agent_event, self.oracle_event)
+            )
+
     def test_compare_tool_not_found(self):
         # Test compare with tool not found
         self.oracle_event.tool_name = "unknown_tool"
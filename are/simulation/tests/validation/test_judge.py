@@ -23,7 +23,12 @@ from are.simulation.validation.judge_states import (
     GraphPerEventJudgeState,
     InContextJudgeState,
 )
-from are.simulation.validation.judgment import Judgment, ToolCallCountsFailure
+from are.simulation.validation.judgment import (
+    EventComparisonFailureType,
+    Judgment,
+    OracleEventMatchingFailure,
+    ToolCallCountsFailure,
+)
 from are.simulation.validation.utils.scenario_utils import CompletedOracleEvent
 
 
@@ -376,8 +381,10 @@ class TestGraphPerEventJudge(unittest.TestCase):
         # Initialize state
         self.judge.state = MagicMock(spec=GraphPerEventJudgeState)
         self.judge.state.current_turn_agent_events = [MagicMock(spec=CompletedEvent)]
+        self.judge.state.current_turn_agent_events[0].tool_name = "test_tool"
         self.judge.state.agent_events = self.judge.state.current_turn_agent_events
         self.judge.state.agent_idx_to_oracle_id = {}
+        self.judge.state.oracle_id_to_agent_idx = {}
         self.judge.state.current_turn_oracle_graph = {"event1": []}
 
         # Mock oracle event
@@ -404,6 +411,89 @@ class TestGraphPerEventJudge(unittest.TestCase):
             self.assertTrue(result.success)
             self.judge.state.add_match.assert_called_once()
 
+    def _setup_candidate_filtering(self) -> tuple[list, MagicMock, MagicMock]:
+        agent_events = []
+        for i, tool_name in enumerate(["tool_b", "tool_a", "tool_b", "tool_b"]):
+            agent_event = MagicMock(spec=CompletedEvent)
+            agent_event.event_id = f"agent_{i}"
+            agent_event.tool_name = tool_name
+            agent_events.append(agent_event)
+        self.judge.state = GraphPerEventJudgeState(
+            initialized=True,
+            turn_to_agent_events=[agent_events],
+            turn_to_oracle_graph=[{"parent": [], "child": ["parent"]}],
+        )
+        self.judge.state.add_match(agent_idx=1, oracle_id="parent")
+
+        oracle_event = MagicMock(spec=CompletedOracleEvent)
+        oracle_event.event_type = EventType.AGENT
+        oracle_event.event_id = "child"
+        oracle_event.tool_name = "tool_b"
+        oracle_event.get_args.return_value = {}
+
+        # Agent event 0 violates causality and agent event 2 fails the hard checks
+        agent_judge = MagicMock()
+        agent_judge.tool_judges = {"tool_b": MagicMock()}
+        agent_judge.need_soft_check.return_value = True
+        agent_judge.precheck.side_effect = (
+            lambda agent_event, oracle_event, **kwargs: agent_event.event_id
+            != "agent_2"
+        )
+        agent_judge.soft_precheck.return_value = None
+        agent_judge.soft_check.return_value = True
+        self.judge.event_judges[EventType.AGENT] = agent_judge
+        return agent_events, oracle_event, agent_judge
+
+    def test_match_agent_oracle_event_filters_candidates_before_soft_check(self):
+        agent_events, oracle_event, agent_judge = self._setup_candidate_filtering()
+
+        with patch.object(self.judge, "get_judge_kwargs", return_value={}):
+            result = self.judge._match_agent_oracle_event(oracle_event)
+
+        self.assertTrue(result.success)
+        self.assertEqual(self.judge.state.oracle_id_to_agent_idx["child"], 3)
+        agent_judge.soft_check.assert_called_once_with(agent_events[3], oracle_event)
+        self.assertEqual(
+            [call.args[0] for call in agent_judge.precheck.call_args_list],
+            [agent_events[0], agent_events[2], agent_events[3]],
+        )
+        self.assertEqual(self.judge.state.nb_soft_checks, 1)
+        self.assertEqual(self.judge.state.nb_soft_checks_skipped, 2)
+
+    def test_match_agent_oracle_event_soft_precheck_skips_llm(self):
+        _, oracle_event, agent_judge = self._setup_candidate_filtering()
+        agent_judge.soft_precheck.return_value = True
+
+        with patch.object(self.judge, "get_judge_kwargs", return_value={}):
+            result = self.judge._match_agent_oracle_event(oracle_event)
+
+        self.assertTrue(result.success)
+        agent_judge.soft_check.assert_not_called()
+        self.assertEqual(self.judge.state.nb_soft_checks, 0)
+        self.assertEqual(self.judge.state.nb_soft_checks_skipped, 3)
+
+    def test_match_agent_oracle_event_reports_failures_in_agent_order(self):
+        _, oracle_event, agent_judge = self._setup_candidate_filtering()
+        agent_judge.soft_check.return_value = False
+
+        with patch.object(self.judge, "get_judge_kwargs", return_value={}):
+            result = self.judge._match_agent_oracle_event(oracle_event)
+
+        self.assertFalse(result.success)
+        assert isinstance(result.failure, OracleEventMatchingFailure)
+        self.assertEqual(
+            [
+                (failure.agent_event_id, failure.failure_type)
+                for failure in result.failure.comparison_failures
+            ],
+            [
+                ("agent_0", EventComparisonFailureType.CAUSALITY),
+                ("agent_1", EventComparisonFailureType.ALREADY_MATCHED),
+                ("agent_2", EventComparisonFailureType.TOOL_JUDGE_REJECT),
+                ("agent_3", EventComparisonFailureType.TOOL_JUDGE_REJECT),
+            ],
+        )
+
     def test_inner_call_success(self):
         # Initialize state
         with patch(
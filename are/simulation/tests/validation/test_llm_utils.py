@@ -5,7 +5,9 @@
 # the root directory of this source tree.
 
 
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 from are.simulation.validation.constants import SoftCheckerType
@@ -23,6 +25,8 @@ from are.simulation.validation.utils.llm_utils import (
     LLMFunction,
     build_llm_checkers,
     build_subtask_extractor,
+    get_executor,
+    iter_concurrently,
 )
 
 
@@ -349,6 +353,74 @@ class TestLLMChecker(unittest.TestCase):
 
         self.assertTrue(result)  # 2 successes out of 4, not >= 2
 
+    @patch("are.simulation.validation.utils.llm_utils.LLMFunction")
+    def test_call_stops_once_majority_is_decided(self, mock_llm_function_class):
+        mock_judge = MagicMock()
+        mock_judge.side_effect = ["[[Failure]]", "[[Failure]]", "[[Success]]"]
+        mock_llm_function_class.return_value = mock_judge
+
+        checker = LLMChecker(
+            engine=self.mock_engine,
+            prompt_templates=self.mock_prompt_templates,
+            num_votes=3,
+            max_concurrent_votes=1,
+        )
+
+        result = checker({"user_arg": "test"})
+
+        self.assertFalse(result)
+        self.assertEqual(mock_judge.call_count, 2)
+
+    @patch("are.simulation.validation.utils.llm_utils.LLMFunction")
+    def test_call_votes_concurrently(self, mock_llm_function_class):
+        # Every vote waits for the others, so this only passes if they run concurrently
+        barrier = threading.Barrier(3, timeout=5)
+
+        def judge(user_prompt_args):
+            barrier.wait()
+            return "[[Success]]"
+
+        mock_llm_function_class.return_value = judge
+
+        checker = LLMChecker(
+            engine=self.mock_engine,
+            prompt_templates=self.mock_prompt_templates,
+            num_votes=3,
+        )
+
+        self.assertTrue(checker({"user_arg": "test"}))
+
+    def test_is_decided(self):
+        self.assertTrue(LLMChecker.is_decided(2, 0, 1))
+        self.assertTrue(LLMChecker.is_decided(0, 2, 1))
+        self.assertFalse(LLMChecker.is_decided(1, 1, 1))
+        self.assertTrue(LLMChecker.is_decided(2, 2, 0))
+
+
+class TestIterConcurrently(unittest.TestCase):
+    def test_reuses_shared_executor(self):
+        self.assertIs(get_executor(), get_executor())
+
+    def test_nested_calls_complete_on_busy_pool(self):
+        # The inner calls cannot get a pool thread while the outer ones hold it,
+        # so this only passes if the calling threads run them
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with patch("are.simulation.validation.utils.llm_utils._executor", executor):
+
+                def outer(i):
+                    return sum(
+                        iter_concurrently([lambda j=j: i * 10 + j for j in range(3)])
+                    )
+
+                results = iter_concurrently([lambda i=i: outer(i) for i in range(3)])
+
+                self.assertEqual(sorted(results), [3, 33, 63])
+
+    def test_returns_all_results(self):
+        results = iter_concurrently([lambda i=i: i for i in range(40)], max_workers=4)
+
+        self.assertEqual(sorted(results), list(range(40)))
+
 
 class TestBuildLLMCheckers(unittest.TestCase):
     def setUp(self):
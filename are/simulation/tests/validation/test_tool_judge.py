@@ -5,6 +5,7 @@
 # the root directory of this source tree.
 
 
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -417,6 +418,58 @@ class TestSoftToolJudge(unittest.TestCase):
                 result = self.judge.compare(self.agent_event, self.oracle_event)
                 self.assertFalse(result)
 
+    def test_compare_runs_llm_checkers_concurrently(self):
+        # Every checker waits for the others, so this only passes if they run concurrently
+        barrier = threading.Barrier(2, timeout=5)
+
+        def checker(**kwargs):
+            barrier.wait()
+            return True
+
+        placeholder_checker = MagicMock(return_value=True)
+        self.judge.soft_checkers[SoftCheckerType.tone_checker.value] = checker
+        self.judge.soft_checkers[SoftCheckerType.email_checker.value] = checker
+        self.judge.soft_checkers[SoftCheckerType.placeholder_checker.value] = (
+            placeholder_checker
+        )
+        self.config.soft_checker_types = [
+            SoftCheckerType.tone_checker,
+            SoftCheckerType.placeholder_checker,
+            SoftCheckerType.email_checker,
+        ]
+
+        with patch.object(self.judge, "equality_checker", return_value=False):
+            with patch.object(
+                self.judge, "get_checker_kwargs", return_value={"task": "test task"}
+            ):
+                result = self.judge.compare(self.agent_event, self.oracle_event)
+        self.assertTrue(result)
+        placeholder_checker.assert_called_once()
+
+    def test_compare_placeholder_failure_skips_llm_checkers(self):
+        llm_checker = MagicMock(return_value=True)
+        self.judge.soft_checkers[SoftCheckerType.tone_checker.value] = llm_checker
+        self.judge.soft_checkers[SoftCheckerType.placeholder_checker.value] = MagicMock(
+            return_value=False
+        )
+        self.config.soft_checker_types = [
+            SoftCheckerType.tone_checker,
+            SoftCheckerType.placeholder_checker,
+        ]
+
+        with patch.object(self.judge, "equality_checker", return_value=False):
+            with patch.object(
+                self.judge, "get_checker_kwargs", return_value={"task": "test task"}
+            ) as mock_get_kwargs:
+                self.assertFalse(
+                    self.judge.precompare(self.agent_event, self.oracle_event)
+                )
+                result = self.judge.compare(self.agent_event, self.oracle_event)
+                # The subtask is not extracted for a rejected placeholder
+                mock_get_kwargs.assert_not_called()
+        self.assertFalse(result)
+        llm_checker.assert_not_called()
+
     def test_llm_checker_methods(self):
         # Test that LLM checker methods call the appropriate llm_checkers
         test_cases = [
@@ -1110,3 +1110,37 @@ class TestWaitForNotification:
         messages = env.notification_system.message_queue.list_view()
         early_messages = [m for m in messages if "early notification" in m.message]
         assert len(early_messages) >= 1, "Should have received early notification"
+
+    def test_wait_for_notification_until_future_reminder(self):
+        """Test that waiting fast-forwards to a reminder due before the timeout"""
+        env = Environment(EnvironmentConfig(duration=100))
+        system_app = SystemApp()
+        reminder_app = ReminderApp()
+        env.register_apps([system_app, reminder_app])
+
+        initial_time = env.time_manager.time()
+        due_time = datetime.fromtimestamp(initial_time + 10, tz=timezone.utc)
+        reminder_app.add_reminder(
+            title="Future Reminder",
+            due_datetime=due_time.strftime("%Y-%m-%d %H:%M:%S"),
+            description="Due before the timeout",
+        )
+        env.start()
+
+        start_time = time.time()
+        system_app.wait_for_notification(timeout=3600)
+        elapsed_real_time = time.time() - start_time
+        final_time = env.time_manager.time()
+
+        env.stop()
+        env.join()
+
+        assert elapsed_real_time < 10, (
+            f"Should complete efficiently, took {elapsed_real_time}s"
+        )
+        time_advance = final_time - initial_time
+        assert 9 <= time_advance <= 13, (
+            f"Should advance to the reminder due time (~10s), advanced {time_advance}s"
+        )
+        messages = env.notification_system.message_queue.list_view()
+        assert any("Future Reminder" in m.message for m in messages)
@@ -7,7 +7,7 @@
 
 import contextlib
 import copy
-import importlib
+import importlib.util
 import inspect
 import logging
 import re
@@ -21,27 +21,36 @@ from functools import wraps
 from types import MethodType
 from typing import TYPE_CHECKING, Any, Callable, Literal
 
-# Optional strawberry import for GraphQL support
-# When strawberry is not installed, we use no-op decorators
-try:
-    import strawberry
+# GraphQL types of the GUI. They are only registered with strawberry by
+# register_graphql_types, so that importing the simulation does not import strawberry.
+HAS_STRAWBERRY = importlib.util.find_spec("strawberry") is not None
+_GRAPHQL_ENUMS: list[type] = []
+_GRAPHQL_TYPES: list[type] = []
+
+
+def graphql_enum(cls):
+    """Declare an enum as a GraphQL enum of the GUI."""
+    _GRAPHQL_ENUMS.append(cls)
+    return cls
 
-    HAS_STRAWBERRY = True
-except ImportError:
-    HAS_STRAWBERRY = False
 
-    # Create no-op decorators when strawberry is not available
-    class _StrawberryStub:
-        def enum(self, cls):
-            """No-op decorator when strawberry is not available"""
-            return cls
+def graphql_type(cls):
+    """Declare a dataclass as a GraphQL type of the GUI."""
+    _GRAPHQL_TYPES.append(cls)
+    return dataclass(cls)
+
+
+def register_graphql_types() -> None:
+    """Register the GraphQL enums and types of this module with strawberry."""
+    import strawberry
 
-        def type(self, cls):
-            """Decorator that converts class to dataclass when strawberry is not available"""
-            # Apply dataclass decorator to provide __init__ method
-            return dataclass(cls)
+    for cls in _GRAPHQL_ENUMS:
+        if not hasattr(cls, "_enum_definition"):
+            strawberry.enum(cls)
+    for cls in _GRAPHQL_TYPES:
+        if not hasattr(cls, "__strawberry_definition__"):
+            strawberry.type(cls)
 
-    strawberry = _StrawberryStub()  # type: ignore
 
 from are.simulation.priority_queue import PriorityQueue
 from are.simulation.time_manager import TimeManager
@@ -54,7 +63,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-@strawberry.enum
+@graphql_enum
 class EnvironmentState(Enum):
     """
     The state of the environment.
@@ -71,7 +80,7 @@ class EnvironmentState(Enum):
     FAILED = "FAILED"
 
 
-@strawberry.enum
+@graphql_enum
 class EventTimeComparator(Enum):
     """
     Comparator for event time filtering.
@@ -122,7 +131,7 @@ class AbstractEnvironment(ABC):
         raise NotImplementedError("Method is not yet implemented.")
 
 
-@strawberry.enum
+@graphql_enum
 class HintType(Enum):
     """
     Type of the hint, depends on the linked event
@@ -133,7 +142,7 @@ class HintType(Enum):
     ENVIRONMENT_HINT = "ENVIRONMENT_HINT"
 
 
-@strawberry.type
+@graphql_type
 @dataclass
 class Hint:
     """
@@ -158,7 +167,7 @@ class EnvironmentType(Enum):
     GUI = "GUI"
 
 
-@strawberry.enum
+@graphql_enum
 class EventType(Enum):
     """
     Type of the events, depends on who initiated them.
@@ -270,10 +279,25 @@ class Action:
         return result
 
     @classmethod
-    def from_dict(cls, d: dict[str, Any]):
-        module = importlib.import_module("are.simulation.apps")
-        class_from_module = getattr(module, d["class_name"])
-        instance = class_from_module()
+    def from_dict(cls, d: dict[str, Any], app_instances: dict[str, Any] | None = None):
+        """
+        Rebuild an action from its dict representation.
+
+        :param d: The dict representation of the action.
+        :param app_instances: Optional cache of app instances keyed by class name.
+            When provided, a single app instance is created per class and shared
+            by all the actions built with the same cache, which avoids
+            instantiating an app for every imported event.
+        """
+        class_name = d["class_name"]
+        if app_instances is not None and class_name in app_instances:
+            instance = app_instances[class_name]
+        else:
+            module = importlib.import_module("are.simulation.apps")
+            class_from_module = getattr(module, class_name)
+            instance = class_from_module()
+            if app_instances is not None:
+                app_instances[class_name] = instance
         method = getattr(instance, d["function_name"])
         action = cls(
             operation_type=OperationType(d["operation_type"].lower()),
@@ -717,7 +741,7 @@ class CompletedEvent(AbstractEvent):
         return d
 
     @classmethod
-    def from_dict(cls, d: dict[str, Any]):
+    def from_dict(cls, d: dict[str, Any], app_instances: dict[str, Any] | None = None):
         return cls(
             event_type=EventType(d["event_type"]),
             event_time=d["event_time"],
@@ -726,7 +750,7 @@ class CompletedEvent(AbstractEvent):
             action=(
                 ConditionCheckAction.from_dict(d["action"])
                 if d["action"]["class_name"] == "ConditionCheckAction"
-                else Action.from_dict(d["action"])
+                else Action.from_dict(d["action"], app_instances=app_instances)
             ),
             metadata=EventMetadata.from_dict(d["metadata"]),
             dependencies=d["dependencies"],
@@ -1535,7 +1559,7 @@ event_registered = EventRegisterer.event_registered
 disable_events = EventRegisterer.disable
 
 
-@strawberry.enum
+@graphql_enum
 class CapabilityTag(Enum):
     Planning = "Planning"
     Memory = "Memory"
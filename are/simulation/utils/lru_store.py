@@ -0,0 +1,156 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+
+class LRUDiskStore(Generic[V]):
+    """
+    In-memory LRU of values bounded by their total weight, optionally backed by a directory
+    with a text file per key so that the values are shared between processes.
+
+    Values are weighed with `weigh`, 1 by default so that the bound is a number of values.
+    A value heavier than the bound is not kept in memory, since it would evict everything
+    else. Files are written to a temporary file first and then renamed, so that readers
+    never see a partial file.
+    """
+
+    def __init__(
+        self,
+        max_weight: int,
+        cache_dir: str | Path | None = None,
+        suffix: str = ".txt",
+        encode: Callable[[V], str | None] = str,
+        decode: Callable[[str], V | None] = lambda text: text,
+        weigh: Callable[[V], int] = lambda value: 1,
+        on_evict: Callable[[str], None] | None = None,
+        description: str = "entry",
+    ):
+        """
+        :param max_weight: Maximum total weight of the values kept in memory
+        :param cache_dir: Directory of the stored values, None to only keep them in memory
+        :param suffix: Suffix of the files of the stored values
+        :param encode: Encodes a value to store on disk, returns None if it must not be stored
+        :param decode: Decodes a stored value, returns None if it is invalid
+        :param weigh: Weight of a value
+        :param on_evict: Called with the key of each value evicted from memory
+        :param description: Description of the values in log messages
+        """
+        self.max_weight = max_weight
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.suffix = suffix
+        self._encode = encode
+        self._decode = decode
+        self._weigh = weigh
+        self._on_evict = on_evict
+        self._description = description
+        self._entries: OrderedDict[str, tuple[V, int]] = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def weight(self) -> int:
+        """Total weight of the values kept in memory."""
+        return self._weight
+
+    def clear(self) -> None:
+        """Forget the values kept in memory, the stored values are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    def get(self, key: str) -> V | None:
+        """
+        Get a value from memory, or else from disk.
+
+        :param key: The key of the value
+        :returns: The value, or None if it is not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+        value = self._load(key)
+        if value is not None:
+            self._put_in_memory(key, value)
+        return value
+
+    def put(self, key: str, value: V) -> None:
+        """
+        Keep a value in memory and store it on disk.
+
+        :param key: The key of the value
+        :param value: The value
+        """
+        self._put_in_memory(key, value)
+        if self.cache_dir is None:
+            return
+        text = self._encode(value)
+        if text is None:
+            return
+        path = self._path(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            # Keep the newlines as they are, they are part of the value
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to store cached {self._description} {path}: {e}")
+
+    def _put_in_memory(self, key: str, value: V) -> None:
+        weight = self._weigh(value)
+        if weight > self.max_weight:
+            return
+        evicted_keys = []
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._weight -= previous[1]
+            self._entries[key] = (value, weight)
+            self._weight += weight
+            while self._weight > self.max_weight:
+                evicted_key, (_, evicted_weight) = self._entries.popitem(last=False)
+                self._weight -= evicted_weight
+                evicted_keys.append(evicted_key)
+        if self._on_evict is not None:
+            for evicted_key in evicted_keys:
+                self._on_evict(evicted_key)
+
+    def _path(self, key: str) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def _load(self, key: str) -> V | None:
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8", newline="") as f:
+                value = self._decode(f.read())
+        except Exception as e:
+            logger.warning(f"Failed to load cached {self._description} {path}: {e}")
+            return None
+        if value is None:
+            logger.warning(f"Invalid cached {self._description} {path}")
+        return value
@@ -368,6 +368,10 @@ class SoftCheckerType(str, Enum):
             self.sanity_checker,
         }
 
+    @property
+    def need_llm(self) -> bool:
+        return self is not self.placeholder_checker
+
 
 PER_TOOL_TO_SOFT_CHECKER_TYPES = {
     "CalendarApp__add_calendar_event": [SoftCheckerType.event_checker],
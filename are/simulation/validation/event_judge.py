@@ -168,6 +168,61 @@ class AgentEventJudge(EventJudge):
             )
         return True
 
+    def precheck(
+        self, agent_event: CompletedEvent, oracle_event: CompletedOracleEvent, **kwargs
+    ) -> bool:
+        """
+        Run the cheap part of the comparison: the event type, tool name, time and hard arg checks.
+        A pair of events matches if it passes both the precheck and the soft check.
+        """
+        if (
+            agent_event.event_type != oracle_event.event_type
+            or agent_event.tool_name != oracle_event.tool_name
+        ):
+            return False
+        if not self.check_time(
+            agent_event=agent_event,
+            oracle_event=oracle_event,
+            max_parent_oracle_event_time=kwargs.get(
+                "max_parent_oracle_event_time", 0.0
+            ),
+            max_parent_agent_event_time=kwargs.get("max_parent_agent_event_time", 0.0),
+        ):
+            return False
+        return bool(
+            self.tool_judges[oracle_event.tool_name].hard_judge(
+                agent_event, oracle_event, **kwargs
+            )
+        )
+
+    def need_soft_check(self, tool_name: str) -> bool:
+        return not self.tool_judges[tool_name].soft_judge.no_arg_to_check
+
+    def soft_precheck(
+        self, agent_event: CompletedEvent, oracle_event: CompletedOracleEvent
+    ) -> bool | None:
+        """
+        Run the soft checks which do not call the LLM, on a pair of events which passed the precheck.
+        Returns None if the LLM-based soft check must decide.
+        """
+        if not self.need_soft_check(oracle_event.tool_name):
+            return True
+        return self.tool_judges[oracle_event.tool_name].soft_judge.precompare(
+            agent_event, oracle_event
+        )
+
+    def soft_check(
+        self, agent_event: CompletedEvent, oracle_event: CompletedOracleEvent, **kwargs
+    ) -> bool | None:
+        """
+        Run the LLM-based part of the comparison, on a pair of events which passed the precheck.
+        """
+        if not self.need_soft_check(oracle_event.tool_name):
+            return True
+        return self.tool_judges[oracle_event.tool_name].soft_judge(
+            agent_event, oracle_event, **kwargs
+        )
+
     def compare(
         self, agent_event: CompletedEvent, oracle_event: CompletedOracleEvent, **kwargs
     ) -> bool | None:
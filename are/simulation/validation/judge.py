@@ -6,7 +6,7 @@
 
 
 import logging
-from collections import Counter
+from collections import Counter, defaultdict
 from typing import Any, cast
 
 from are.simulation.scenarios.scenario import Scenario
@@ -266,6 +266,8 @@ class GraphPerEventJudge(BaseJudge):
         self.event_filter = EnvAgentEventFilter()
         # State
         self.state = GraphPerEventJudgeState()
+        # Agent events index, rebuilt when the agent events change
+        self._agent_idxs_by_tool_name: dict[str, list[int]] | None = None
 
     def get_judge_kwargs(self, oracle_event: CompletedOracleEvent) -> dict[str, Any]:
         judge_kwargs = {}
@@ -355,6 +357,7 @@ class GraphPerEventJudge(BaseJudge):
             turn_to_oracle_graph=turn_to_oracle_graph,
             oracle_event_id_to_turn_idx=scenario.event_id_to_turn_idx,  # type: ignore
         )
+        self._agent_idxs_by_tool_name = None
 
     def update_state(self, env: AbstractEnvironment):
         # Check if the state is initialized
@@ -365,6 +368,7 @@ class GraphPerEventJudge(BaseJudge):
         # Update agent events
         agent_events = extract_agent_events(env, self.event_filter, self.state.turn_idx)
         self.state.turn_to_agent_events.append(agent_events)
+        self._agent_idxs_by_tool_name = None
 
     @injected_traceable(trace_type="check_tool_call_counts", tags=["judge"])
     def check_tool_call_counts(
@@ -451,78 +455,109 @@ class GraphPerEventJudge(BaseJudge):
             ),
         )
 
+    def get_agent_idxs_by_tool_name(self) -> dict[str, list[int]]:
+        """
+        Index the agent events of all the turns so far by tool name.
+        """
+        if self._agent_idxs_by_tool_name is None:
+            self._agent_idxs_by_tool_name = defaultdict(list)
+            for i, agent_event in enumerate(self.state.agent_events):
+                self._agent_idxs_by_tool_name[agent_event.tool_name].append(i)
+        return self._agent_idxs_by_tool_name
+
     def _match_agent_oracle_event(
         self,
         oracle_event: CompletedOracleEvent,
     ) -> Judgment:
         """
         Match an agent oracle event. This is the most complex case.
+        The candidate agent events are filtered from the cheapest to the most expensive check:
+        tool name, time and hard arg checks, causality, soft checks which do not call the LLM,
+        and only then LLM-based soft checks. The first candidate in agent order which passes
+        all the checks is matched.
+        Agent events which pass the hard checks but violate causality are reported as causality
+        failures without running the soft checks on them.
         """
         # Get the tool name
         oracle_tool_name = oracle_event.tool_name  # type: ignore
+        agent_judge = cast(AgentEventJudge, self.event_judges[EventType.AGENT])
         # If there is no tool judge for this tool impossible to judge
-        if oracle_tool_name not in self.event_judges[EventType.AGENT].tool_judges:
+        if oracle_tool_name not in agent_judge.tool_judges:
             raise ValueError(f"Tool {oracle_tool_name} not supported")
-        # Search for a matching agent event
-        matched = False
-        failures = []
-        for i, agent_event in enumerate(self.state.agent_events):
-            # Compare agent event to oracle event
-            agent_tool_name = agent_event.tool_name
-            # If agent event not already matched to another oracle event call the tool judge
-            if i not in self.state.agent_idx_to_oracle_id:
-                judge_kwargs = self.get_judge_kwargs(oracle_event)
-                matched = self.event_judges[EventType.AGENT](
-                    agent_event, oracle_event, **judge_kwargs
-                )
-                if not matched and oracle_tool_name == agent_tool_name:
-                    failures.append(
-                        EventComparisonFailure(
-                            oracle_tool_name=oracle_tool_name,
-                            oracle_event_id=oracle_event.event_id,
-                            agent_tool_name=agent_tool_name,
-                            agent_event_id=agent_event.event_id,
-                            failure_type=EventComparisonFailureType.TOOL_JUDGE_REJECT,
-                        )
-                    )
-            else:
-                logger.info(
-                    "JUDGE REJECT: Agent event already matched to another oracle event"
-                )
-                failures.append(
+        need_soft_check = agent_judge.need_soft_check(oracle_tool_name)
+        agent_events = self.state.agent_events
+        # Causality: all parent oracle events must be matched with previous agent events
+        parent_ids = self.state.current_turn_oracle_graph[oracle_event.event_id]
+        min_agent_idx = max(
+            [
+                self.state.oracle_id_to_agent_idx.get(parent_id, len(agent_events))
+                for parent_id in parent_ids
+            ],
+            default=-1,
+        )
+        # Failures with the index of their agent event, reported in agent order
+        failures: list[tuple[int, EventComparisonFailure]] = []
+
+        def add_failure(i: int, failure_type: EventComparisonFailureType) -> None:
+            failures.append(
+                (
+                    i,
                     EventComparisonFailure(
                         oracle_tool_name=oracle_tool_name,
                         oracle_event_id=oracle_event.event_id,
-                        agent_tool_name=agent_tool_name,
-                        agent_event_id=agent_event.event_id,
-                        failure_type=EventComparisonFailureType.ALREADY_MATCHED,
-                    )
+                        agent_tool_name=agent_events[i].tool_name,
+                        agent_event_id=agent_events[i].event_id,
+                        failure_type=failure_type,
+                    ),
                 )
-            # Check causality if matched
-            if matched:
-                for parent_id in self.state.current_turn_oracle_graph[
-                    oracle_event.event_id
-                ]:
-                    if (
-                        parent_id not in self.state.oracle_id_to_agent_idx
-                        or self.state.oracle_id_to_agent_idx[parent_id] >= i
-                    ):
-                        logger.info("JUDGE REJECT: Causality violation")
-                        failures.append(
-                            EventComparisonFailure(
-                                oracle_tool_name=oracle_tool_name,
-                                oracle_event_id=oracle_event.event_id,
-                                agent_tool_name=agent_tool_name,
-                                agent_event_id=agent_event.event_id,
-                                failure_type=EventComparisonFailureType.CAUSALITY,
-                            )
-                        )
-                        matched = False
+            )
+
+        # Agent events already matched to another oracle event, whatever their tool
+        if self.state.agent_idx_to_oracle_id:
+            logger.info(
+                "JUDGE REJECT: Agent events already matched to another oracle event"
+            )
+        for i in self.state.agent_idx_to_oracle_id:
+            add_failure(i, EventComparisonFailureType.ALREADY_MATCHED)
+        # Search for matching candidates with the cheap checks
+        candidate_idxs = []
+        judge_kwargs = None
+        for i in self.get_agent_idxs_by_tool_name().get(oracle_tool_name, []):
+            if i in self.state.agent_idx_to_oracle_id:
+                continue
+            if judge_kwargs is None:
+                judge_kwargs = self.get_judge_kwargs(oracle_event)
+            if not agent_judge.precheck(agent_events[i], oracle_event, **judge_kwargs):
+                add_failure(i, EventComparisonFailureType.TOOL_JUDGE_REJECT)
+            elif i <= min_agent_idx:
+                logger.info("JUDGE REJECT: Causality violation")
+                add_failure(i, EventComparisonFailureType.CAUSALITY)
+            else:
+                candidate_idxs.append(i)
+                continue
+            self.state.nb_soft_checks_skipped += int(need_soft_check)
+        # Run the soft checks which do not call the LLM on all the candidates, so that the
+        # LLM is only called for the candidates they cannot decide
+        soft_prechecks = [
+            agent_judge.soft_precheck(agent_events[i], oracle_event)
+            for i in candidate_idxs
+        ]
+        # The first match in agent order wins
+        for i, matched in zip(candidate_idxs, soft_prechecks):
+            if matched is None:
+                self.state.nb_soft_checks += 1
+                matched = agent_judge.soft_check(
+                    agent_events[i],
+                    oracle_event,
+                    **(judge_kwargs or {}),
+                )
+            else:
+                self.state.nb_soft_checks_skipped += int(need_soft_check)
             logger.info(f"Matched: {matched}")
-            # If matched, update matching events
             if matched:
                 self.state.add_match(agent_idx=i, oracle_id=oracle_event.event_id)
                 return Judgment(success=True)
+            add_failure(i, EventComparisonFailureType.TOOL_JUDGE_REJECT)
         # No match found
         logger.info(f"JUDGE REJECT: cannot match {oracle_tool_name} oracle event")
         oracle_args = oracle_event.get_args()
@@ -533,7 +568,9 @@ class GraphPerEventJudge(BaseJudge):
                 oracle_tool_args={
                     k: str(v) for k, v in oracle_args.items() if k != "self"
                 },
-                comparison_failures=failures,
+                comparison_failures=[
+                    failure for _, failure in sorted(failures, key=lambda x: x[0])
+                ],
             ),
         )
 
@@ -562,6 +599,9 @@ class GraphPerEventJudge(BaseJudge):
     @injected_traceable(trace_type="judge", tags=["judge"], log_input_args=False)
     def __call__(self, env: AbstractEnvironment) -> Judgment:
         judgment = self.inner_call(env)
+        logger.info(
+            f"Ran {self.state.nb_soft_checks} soft checks, skipped {self.state.nb_soft_checks_skipped} with cheaper checks"
+        )
         judgment.agent_event_id_to_oracle_event_id = self.state.agent_id_to_oracle_id
         judgment.failure = str(judgment.failure)  # Only for logging purpose
         if not judgment.success:
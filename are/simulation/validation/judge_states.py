@@ -16,6 +16,9 @@ class GraphPerEventJudgeState(BaseJudgeState):
     agent_idx_to_oracle_id: dict[int, str] = field(default_factory=dict)
     oracle_id_to_agent_idx: dict[str, int] = field(default_factory=dict)
     agent_id_to_oracle_id: dict[str, str] = field(default_factory=dict)
+    # Matching instrumentation
+    nb_soft_checks: int = 0
+    nb_soft_checks_skipped: int = 0
 
     def add_match(self, agent_idx: int, oracle_id: str):
         self.agent_idx_to_oracle_id[agent_idx] = oracle_id
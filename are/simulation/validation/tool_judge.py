@@ -10,6 +10,7 @@ import logging
 import os
 import re
 from datetime import datetime, timezone
+from functools import partial
 from typing import Any
 
 from are.simulation.types import CompletedEvent
@@ -24,6 +25,7 @@ from are.simulation.validation.configs import (
 from are.simulation.validation.utils.llm_utils import (
     build_llm_checkers,
     build_subtask_extractor,
+    iter_concurrently,
 )
 from are.simulation.validation.utils.misc import (
     extract_text_between_tags,
@@ -539,16 +541,12 @@ class SoftToolJudge(ToolJudge):
             "subtask": subtask,
         }
 
-    def compare(
-        self,
-        agent_event: CompletedEvent,
-        oracle_event: CompletedOracleEvent,
-        **kwargs,
-    ) -> bool | None:
-        # If no args to check, then return True
-        if self.no_arg_to_check:
-            return True
-        # Get the args
+    def get_selected_args(
+        self, agent_event: CompletedEvent, oracle_event: CompletedOracleEvent
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """
+        Get the agent and oracle args checked by the llm, those with an oracle value.
+        """
         oracle_args = oracle_event.get_args()
         agent_args = agent_event.get_args()
         selected_action_args = [
@@ -558,35 +556,82 @@ class SoftToolJudge(ToolJudge):
             k: v for k, v in oracle_args.items() if k in selected_action_args
         }
         agent_args = {k: v for k, v in agent_args.items() if k in selected_action_args}
+        return agent_args, oracle_args
+
+    def precompare(
+        self, agent_event: CompletedEvent, oracle_event: CompletedOracleEvent
+    ) -> bool | None:
+        """
+        Run the soft checks which do not call the llm: equality of the args and the checkers
+        which only look at the agent args.
+        Returns True or False if they decide the comparison, None if the llm checkers must run.
+        """
+        # If no args to check, then return True
+        if self.no_arg_to_check:
+            return True
+        agent_args, oracle_args = self.get_selected_args(agent_event, oracle_event)
         # Check equality
         if self.equality_checker(
             agent_args=agent_args,
             oracle_args=oracle_args,
         ):
             return True
+        # The checkers which do not call the llm are run before the subtask is extracted
+        for checker in self.config.soft_checker_types:
+            if not checker.need_llm and not self.apply_soft_checker(
+                checker, agent_args, {}
+            ):
+                return False
+        return None
+
+    def compare(
+        self,
+        agent_event: CompletedEvent,
+        oracle_event: CompletedOracleEvent,
+        **kwargs,
+    ) -> bool | None:
+        # Apply the cheap checks first
+        result = self.precompare(agent_event, oracle_event)
+        if result is not None:
+            return result
+        agent_args, oracle_args = self.get_selected_args(agent_event, oracle_event)
         # Get checker kwargs
         checker_kwargs = self.get_checker_kwargs(
             kwargs=kwargs,
             oracle_event=oracle_event,
             oracle_args=oracle_args,
         )
-        # Apply soft checkers
-        for checker in self.config.soft_checker_types:
-            checker_fn = self.soft_checkers[checker.value]
-            # This is only for logging purposes
-            _checker_kwargs = {
-                k: v
-                for k, v in checker_kwargs.items()
-                if k in self.checker_to_args_names[checker.value]
-            }
-            # Call the checker
-            if not checker_fn(
-                agent_args=agent_args,
-                **_checker_kwargs,
-            ):
+        # The llm checkers are independent, run them concurrently and stop at the first failure
+        for passed in iter_concurrently(
+            [
+                partial(self.apply_soft_checker, checker, agent_args, checker_kwargs)
+                for checker in self.config.soft_checker_types
+                if checker.need_llm
+            ]
+        ):
+            if not passed:
                 return False
         return True
 
+    def apply_soft_checker(
+        self,
+        checker: SoftCheckerType,
+        agent_args: dict[str, Any],
+        checker_kwargs: dict[str, Any],
+    ) -> bool | None:
+        checker_fn = self.soft_checkers[checker.value]
+        # This is only for logging purposes
+        _checker_kwargs = {
+            k: v
+            for k, v in checker_kwargs.items()
+            if k in self.checker_to_args_names[checker.value]
+        }
+        # Call the checker
+        return checker_fn(
+            agent_args=agent_args,
+            **_checker_kwargs,
+        )
+
 
 class MildToolJudge(ToolJudge):
     """
@@ -5,8 +5,13 @@
 # the root directory of this source tree.
 
 
+import contextvars
+import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Callable
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterator
 
 from are.simulation.scenarios.utils.personalization.utils import jinja_format
 from are.simulation.validation.constants import SoftCheckerType
@@ -26,6 +31,82 @@ from are.simulation.validation.prompts import (
     LLMFunctionTemplates,
 )
 
+# Maximum number of judge LLM calls run concurrently in a process, shared by all the checkers
+MAX_CONCURRENT_LLM_CALLS = 16
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _reset_executor() -> None:
+    # The threads of the pool do not survive a fork
+    global _executor
+    _executor = None
+
+
+os.register_at_fork(after_in_child=_reset_executor)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool shared by the concurrent judge LLM calls, created on first use.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_CONCURRENT_LLM_CALLS, thread_name_prefix="judge_llm"
+            )
+        return _executor
+
+
+def iter_concurrently(
+    fns: list[Callable[[], Any]], max_workers: int | None = None
+) -> Iterator[Any]:
+    """
+    Call functions concurrently on the shared thread pool and yield their results as they complete.
+    The calling thread runs the calls the pool has not started, so that nested calls, e.g. the
+    votes of a checker run by a concurrent checker, cannot deadlock when the pool is busy.
+    When the caller stops iterating early, the calls which have not started yet are cancelled.
+
+    :param fns: The functions to call, without arguments
+    :param max_workers: Maximum number of concurrent calls, defaults to the size of the shared pool
+    :returns: An iterator over the results, in completion order
+    """
+    max_workers = min(max_workers or MAX_CONCURRENT_LLM_CALLS, len(fns))
+    if max_workers <= 1:
+        for fn in fns:
+            yield fn()
+        return
+    executor = get_executor()
+    queued = deque(fns)
+    futures: dict[Future, Callable[[], Any]] = {}
+    try:
+        while queued or futures:
+            # The calling thread is one of the workers
+            while queued and len(futures) < max_workers - 1:
+                # Each call runs in a copy of the caller context so that tracing context is preserved
+                fn = queued.popleft()
+                futures[executor.submit(contextvars.copy_context().run, fn)] = fn
+            done = {future for future in futures if future.done()}
+            if not done:
+                if queued:
+                    yield queued.popleft()()
+                    continue
+                # Take back the calls the pool has not started and run them here
+                taken_back = [future for future in futures if future.cancel()]
+                if taken_back:
+                    for future in taken_back:
+                        yield futures.pop(future)()
+                    continue
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                del futures[future]
+                yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
 
 class LLMFunctionBase(ABC):
     """
@@ -109,6 +190,8 @@ class LLMChecker(LLMFunctionBase):
     SoftChecker is a class that extends LLMFunctionBase to utilize a language model to evaluate prompts
     and determine success or failure. It supports multiple voting rounds to increase the reliability of the evaluation.
     The __call__ method returns a boolean indicating the majority vote on the success of the prompt evaluation.
+    Votes are issued concurrently on the shared judge thread pool, up to `max_concurrent_votes` at a time
+    (the pool size by default), and the voting stops as soon as the remaining votes cannot change the majority.
     """
 
     def __init__(
@@ -118,6 +201,7 @@ class LLMChecker(LLMFunctionBase):
         num_votes: int = 1,
         success_str: str = "[[Success]]",
         failure_str: str = "[[Failure]]",
+        max_concurrent_votes: int | None = None,
     ):
         super().__init__(engine, prompt_templates)
         self.judge = LLMFunction(
@@ -126,23 +210,48 @@ class LLMChecker(LLMFunctionBase):
         )
         # Num votes
         self.num_votes = num_votes
+        self.max_concurrent_votes = max_concurrent_votes
         # Response parsing
         self.success_str = success_str
         self.failure_str = failure_str
 
+    def parse_vote(self, response: str | None) -> bool | None:
+        if response is None:
+            return None
+        if self.success_str in response:
+            return True
+        if self.failure_str in response:
+            return False
+        return None
+
+    @staticmethod
+    def is_decided(num_successes: int, num_failures: int, num_pending: int) -> bool:
+        # The outcome is decided if it holds whatever the pending votes are,
+        # the worst cases being that they all go to the current minority
+        num_votes = num_successes + num_failures + num_pending
+        return (
+            num_successes >= num_votes / 2
+            or num_successes + num_pending < num_votes / 2
+        )
+
     def __call__(self, user_prompt_args: dict[str, str]) -> bool | None:
         # Voting
         votes = []
-        for _ in range(self.num_votes):
-            # Call the llm
-            response = self.judge(user_prompt_args)
+        num_pending = self.num_votes
+        for response in iter_concurrently(
+            [lambda: self.judge(user_prompt_args)] * self.num_votes,
+            max_workers=self.max_concurrent_votes,
+        ):
+            num_pending -= 1
             # Parse the response
-            if response is None:
-                continue
-            if self.success_str in response:
-                votes.append(True)
-            elif self.failure_str in response:
-                votes.append(False)
+            vote = self.parse_vote(response)
+            if vote is not None:
+                votes.append(vote)
+            # Stop early once the majority is decided
+            if votes and self.is_decided(
+                sum(votes), len(votes) - sum(votes), num_pending
+            ):
+                break
         if len(votes) == 0:
             return None
         return sum(votes) >= len(votes) / 2
@@ -8,8 +8,6 @@
 import string
 import unicodedata
 
-from bs4 import BeautifulSoup
-
 
 def extract_text_between_tags(html_content: str, tag_name: str) -> list[str]:
     """
@@ -19,6 +17,8 @@ def extract_text_between_tags(html_content: str, tag_name: str) -> list[str]:
     :return: list[str]: The text content of the last occurrence of the specified tag, or None if the tag is not found.
     """
 
+    from bs4 import BeautifulSoup
+
     # Parse the HTML content
     soup = BeautifulSoup(html_content, "html.parser")
 
@@ -15,6 +15,7 @@ from are.simulation.scenarios.scenario_imported_from_json.benchmark_scenario imp
     build_event_id_to_turn_idx,
     is_send_message_to_user,
 )
+from are.simulation.scenarios.utils.oracle_cache import ORACLE_RUN_CACHE
 from are.simulation.types import (
     AbstractEnvironment,
     CompletedEvent,
@@ -262,23 +263,29 @@ def run_oracle_mode(scenario: Scenario):
     # Run the scenario in oracle mode
     if not scenario._initialized:
         scenario.initialize()
-    env = Environment(
-        EnvironmentConfig(
-            oracle_mode=True,
-            queue_based_loop=True,
-            start_time=scenario.start_time,
-            duration=scenario.duration,
-            time_increment_in_seconds=scenario.time_increment_in_seconds,
-        )
-    )
-    env.run(scenario)
-    env.stop()
-    scenario.soft_reset()
-    oracle_run_event_log = env.event_log.list_view()
-    # Check clean run
-    if any(e.failed() for e in oracle_run_event_log):
-        raise Exception(
-            f"Oracle run failed: {[e.metadata.exception for e in oracle_run_event_log if e.failed()]}"
+
+    def run_oracle() -> list[CompletedEvent]:
+        env = Environment(
+            EnvironmentConfig(
+                oracle_mode=True,
+                queue_based_loop=True,
+                start_time=scenario.start_time,
+                duration=scenario.duration,
+                time_increment_in_seconds=scenario.time_increment_in_seconds,
+            )
         )
+        env.run(scenario)
+        env.stop()
+        scenario.soft_reset()
+        oracle_run_event_log = env.event_log.list_view()
+        # Check clean run
+        if any(e.failed() for e in oracle_run_event_log):
+            raise Exception(
+                f"Oracle run failed: {[e.metadata.exception for e in oracle_run_event_log if e.failed()]}"
+            )
+        return env.event_log.list_view()
+
     # Attach the oracle run events to the scenario for the judge
-    scenario.oracle_run_event_log = env.event_log.list_view()  # type: ignore
+    scenario.oracle_run_event_log = ORACLE_RUN_CACHE.get_or_run(  # type: ignore
+        scenario, run_oracle, namespace="run_oracle_mode"
+    )